@@ -0,0 +1,240 @@
+"""
+Fake adb server — speaks the adb host protocol on 127.0.0.1 so AdbClient can be tested on Linux.
+
+Supported services (what AdbClient sends):
+    host:devices, host:connect:<addr>, host-serial:<serial>:get-state, host:kill
+    host:track-devices -> the listing now and again after every set_device() / connect
+    host:transport:<serial> | host:transport-any, then
+        shell:<cmd>   -> FakeAdbServer.shell_handler(serial, cmd) -> str
+        exec:<cmd>    -> FakeAdbServer.exec_handler(serial, cmd) -> bytes
+        sync:         -> SEND / DATA / DONE / QUIT (files kept in FakeAdbServer.files)
+
+The default shell handler answers `pm install*` like the package manager, reports
+sys.boot_completed=1 and echoes anything else as "<cmd>\\n". Every request is recorded
+in FakeAdbServer.requests.
+
+Usage:
+    with FakeAdbServer({"emulator-5554": "device"}) as server:
+        client = AdbClient(port=server.port)
+"""
+
+from __future__ import annotations
+
+import socket
+import socketserver
+import struct
+import threading
+import time
+from typing import Callable, Optional
+
+
+def _default_shell(serial: str, cmd: str) -> str:
+    if cmd == "getprop sys.boot_completed":
+        return "1\n"
+    if cmd.startswith("pm install-create"):
+        return "Success: created install session [1234]\n"
+    if cmd.startswith("pm install-write"):
+        return "Success: streamed 1 bytes\n"
+    if cmd.startswith("pm install"):
+        return "Success\n"
+    return f"{cmd}\n"
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    server: "_TCPServer"
+
+    def _recv_exact(self, size: int) -> bytes:
+        buf = bytearray()
+        while len(buf) < size:
+            chunk = self.request.recv(size - len(buf))
+            if not chunk:
+                raise EOFError
+            buf += chunk
+        return bytes(buf)
+
+    def _recv_request(self) -> str:
+        size = int(self._recv_exact(4), 16)
+        return self._recv_exact(size).decode("utf-8")
+
+    def _okay(self, block: Optional[bytes] = None) -> None:
+        self.request.sendall(b"OKAY" + (b"" if block is None else f"{len(block):04x}".encode() + block))
+
+    def _fail(self, message: str) -> None:
+        data = message.encode()
+        self.request.sendall(b"FAIL" + f"{len(data):04x}".encode() + data)
+
+    def handle(self) -> None:
+        fake = self.server.fake
+        try:
+            request = self._recv_request()
+        except EOFError:
+            return
+        fake.requests.append(request)
+        fake._opened(+1)
+        try:
+            self._dispatch(fake, request)
+        except EOFError:
+            pass
+        finally:
+            fake._opened(-1)
+
+    def _dispatch(self, fake: "FakeAdbServer", request: str) -> None:
+        if request == "host:devices":
+            self._okay(fake._listing())
+        elif request == "host:track-devices":
+            with fake._lock:
+                self._okay(fake._listing())
+                fake._trackers.append(self.request)
+            try:
+                while self.request.recv(1):     # the client never sends; EOF = it hung up
+                    pass
+            except OSError:
+                pass
+            finally:
+                with fake._lock:
+                    if self.request in fake._trackers:
+                        fake._trackers.remove(self.request)
+        elif request.startswith("host:connect:"):
+            address = request.split(":", 2)[2]
+            if address not in fake.devices:
+                fake.set_device(address, "device")
+            self._okay(f"connected to {address}".encode())
+        elif request.startswith("host-serial:") and request.endswith(":get-state"):
+            serial = request[len("host-serial:"):-len(":get-state")]
+            if serial in fake.devices:
+                self._okay(fake.devices[serial].encode())
+            else:
+                self._fail(f"device '{serial}' not found")
+        elif request == "host:kill":
+            self._okay()
+        elif request.startswith("host:transport"):
+            serial = request.split(":", 2)[2] if request.startswith("host:transport:") else next(iter(fake.devices), None)
+            if serial not in fake.devices:
+                self._fail(f"device '{serial}' not found")
+                return
+            if fake.devices[serial] != "device":
+                self._fail("device offline")
+                return
+            self._okay()
+            self._device_service(fake, serial, self._recv_request())
+        else:
+            self._fail(f"unknown host service {request}")
+
+    def _device_service(self, fake: "FakeAdbServer", serial: str, service: str) -> None:
+        fake.requests.append(service)
+        if service.startswith("shell:"):
+            if fake.delay_sec:
+                time.sleep(fake.delay_sec)
+            self._okay()
+            self.request.sendall(fake.shell_handler(serial, service[len("shell:"):]).encode())
+        elif service.startswith("exec:"):
+            self._okay()
+            self.request.sendall(fake.exec_handler(serial, service[len("exec:"):]))
+        elif service == "sync:":
+            self._okay()
+            self._sync(fake, serial)
+        else:
+            self._fail(f"unknown device service {service}")
+
+    def _sync(self, fake: "FakeAdbServer", serial: str) -> None:
+        while True:
+            cmd, size = struct.unpack("<4sI", self._recv_exact(8))
+            if cmd == b"QUIT":
+                return
+            if cmd != b"SEND":
+                self.request.sendall(b"FAIL" + struct.pack("<I", 7) + b"bad cmd")
+                return
+            path, _, mode = self._recv_exact(size).decode().rpartition(",")
+            data = bytearray()
+            while True:
+                chunk_id, chunk_size = struct.unpack("<4sI", self._recv_exact(8))
+                if chunk_id == b"DONE":
+                    break
+                data += self._recv_exact(chunk_size)
+            fake.files[(serial, path)] = (bytes(data), int(mode))
+            self.request.sendall(b"OKAY" + struct.pack("<I", 0))
+
+
+class _TCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    fake: "FakeAdbServer"
+
+
+class FakeAdbServer:
+    """In-process adb server on an ephemeral port."""
+
+    def __init__(self, devices: Optional[dict] = None) -> None:
+        self.devices: dict[str, str] = dict(devices or {"emulator-5554": "device"})
+        self.files: dict[tuple[str, str], tuple[bytes, int]] = {}
+        self.requests: list[str] = []
+        self.shell_handler: Callable[[str, str], str] = _default_shell
+        self.exec_handler: Callable[[str, str], bytes] = lambda serial, cmd: cmd.encode()
+        self.delay_sec = 0.0                 # per shell: command, to hold connections open
+        self.open_connections = 0
+        self.peak_connections = 0
+        self._lock = threading.Lock()
+        self._trackers: list[socket.socket] = []
+        self._server = _TCPServer(("127.0.0.1", 0), _Handler)
+        self._server.fake = self
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def _opened(self, delta: int) -> None:
+        with self._lock:
+            self.open_connections += delta
+            self.peak_connections = max(self.peak_connections, self.open_connections)
+
+    def _listing(self) -> bytes:
+        return "".join(f"{serial}\t{state}\n" for serial, state in self.devices.items()).encode()
+
+    def set_device(self, serial: str, state: Optional[str]) -> None:
+        """Change (None: remove) a device and push the new listing to every track-devices client."""
+        with self._lock:
+            if state is None:
+                self.devices.pop(serial, None)
+            else:
+                self.devices[serial] = state
+            block = self._listing()
+            for sock in list(self._trackers):
+                try:
+                    sock.sendall(f"{len(block):04x}".encode() + block)
+                except OSError:
+                    self._trackers.remove(sock)
+
+    @property
+    def tracking_clients(self) -> int:
+        with self._lock:
+            return len(self._trackers)
+
+    def drop_trackers(self) -> None:
+        """Hang up on every track-devices client (what an adb server restart looks like)."""
+        with self._lock:
+            trackers, self._trackers = self._trackers, []
+        for sock in trackers:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def start(self) -> "FakeAdbServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.drop_trackers()
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeAdbServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def free_port() -> int:
+    """A port nothing listens on (for 'server not running' tests)."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
@@ -0,0 +1,139 @@
+"""Tests for the native adb host protocol client (runs against the in-process fake adb server)."""
+
+from __future__ import annotations
+
+from pathlib import Path
+import subprocess
+import sys
+import threading
+
+import pytest
+
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+if str(CURRENT_DIR) not in sys.path:
+    sys.path.insert(0, str(CURRENT_DIR))
+
+from backend.config import config
+
+if not config.is_loaded:
+    config.load()
+
+from backend.core import ldplayer_manager
+from backend.core.workflow import adb_client, adb_helper
+from backend.core.workflow.adb_client import AdbClient, AdbError, adb_install, adb_run
+from fake_adb_server import FakeAdbServer, free_port
+
+SERIAL = "emulator-5554"
+
+
+@pytest.fixture
+def server(monkeypatch):
+    """Fake server behind the shared client; any adb binary spawn fails the test."""
+    def no_spawn(cmd, *args, **kwargs):
+        raise AssertionError(f"adb binary spawned: {cmd}")
+
+    fake = FakeAdbServer({SERIAL: "device", "emulator-5556": "offline"}).start()
+    previous = adb_client.get_adb_client()
+    adb_client.set_adb_client(AdbClient(port=fake.port))
+    monkeypatch.setattr(adb_client.subprocess, "run", no_spawn)
+    try:
+        yield fake
+    finally:
+        adb_client.set_adb_client(previous)
+        fake.stop()
+
+
+def test_host_services(server):
+    client = adb_client.get_adb_client()
+
+    assert client.devices() == [(SERIAL, "device"), ("emulator-5556", "offline")]
+    assert client.get_state(SERIAL) == "device"
+    assert client.connect_device("127.0.0.1:5555") == "connected to 127.0.0.1:5555"
+    with pytest.raises(AdbError, match="not found"):
+        client.get_state("emulator-9999")
+
+
+def test_shell_and_exec_go_through_the_device_transport(server):
+    server.shell_handler = lambda serial, cmd: f"{serial}|{cmd}\r\n"
+    server.exec_handler = lambda serial, cmd: b"\x89PNG\r\n\x00" + cmd.encode()
+    client = adb_client.get_adb_client()
+
+    assert client.shell(SERIAL, "pidof com.app") == f"{SERIAL}|pidof com.app\n"
+    assert client.exec_out(SERIAL, "screencap -p") == b"\x89PNG\r\n\x00screencap -p"
+    assert server.requests[:2] == [f"host:transport:{SERIAL}", "shell:pidof com.app"]
+    with pytest.raises(AdbError, match="offline"):
+        client.shell("emulator-5556", "echo hi")
+
+
+def test_push_and_install(server, tmp_path):
+    client = adb_client.get_adb_client()
+    big = tmp_path / "base.apk"
+    big.write_bytes(bytes(range(256)) * 1000)        # several 64 KB DATA chunks
+    split = tmp_path / "split_config.apk"
+    split.write_bytes(b"split")
+
+    client.push(SERIAL, str(big), "/sdcard/base.apk")
+    assert server.files[(SERIAL, "/sdcard/base.apk")] == (big.read_bytes(), 0o100644)
+
+    assert adb_install(SERIAL, [str(big)]) == "Success"
+    assert "shell:pm install -r /data/local/tmp/base.apk" in server.requests
+
+    server.requests.clear()
+    assert adb_install(SERIAL, [str(big), str(split)]) == "Success"
+    shells = [r[len("shell:"):] for r in server.requests if r.startswith("shell:")]
+    assert shells[0].startswith("pm install-create -r -S 256005")
+    assert shells[1:3] == [
+        "pm install-write -S 256000 1234 0_base.apk /data/local/tmp/base.apk",
+        "pm install-write -S 5 1234 1_split_config.apk /data/local/tmp/split_config.apk",
+    ]
+    assert shells[3:] == ["pm install-commit 1234", "rm -f /data/local/tmp/base.apk /data/local/tmp/split_config.apk"]
+
+
+def test_adb_helper_calls_need_no_adb_process(server):
+    server.shell_handler = lambda serial, cmd: "1\n" if cmd == "getprop sys.boot_completed" else "4242\n"
+    fallbacks = adb_client.adb_client_stats()["binary_fallbacks"]
+
+    assert adb_helper.list_devices() == [SERIAL]
+    assert adb_helper._run_adb(["shell", "pidof", "com.app"], serial=SERIAL) == "4242"
+    assert adb_helper._run_adb(["get-state"], serial="emulator-9999") == ""   # FAIL -> empty, like adb.exe
+    assert ldplayer_manager.wait_for_device(0, timeout=5)
+    assert adb_client.adb_client_stats()["binary_fallbacks"] == fallbacks
+
+
+def test_unreachable_server_falls_back_to_the_adb_binary(monkeypatch):
+    spawned = []
+
+    def fake_run(cmd, *args, **kwargs):
+        spawned.append(cmd[1:])
+        return subprocess.CompletedProcess(cmd, 0, stdout="List of devices attached\n", stderr="")
+
+    previous = adb_client.get_adb_client()
+    client = AdbClient(port=free_port())
+    adb_client.set_adb_client(client)
+    monkeypatch.setattr(adb_client.subprocess, "run", fake_run)
+    try:
+        adb_run(["devices"])
+        adb_run(["shell", "echo", "hi"], serial=SERIAL)     # cooldown: no second connect attempt
+        adb_run(["start-server"])                            # never native
+    finally:
+        adb_client.set_adb_client(previous)
+
+    assert spawned == [["devices"], ["-s", SERIAL, "shell", "echo", "hi"], ["start-server"]]
+    assert client.requests == 1
+
+
+def test_pool_bounds_open_connections(server):
+    server.delay_sec = 0.1
+    client = AdbClient(port=server.port, max_connections=2)
+    threads = [threading.Thread(target=client.shell, args=(SERIAL, f"echo {i}")) for i in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    stats = client.stats()
+    assert stats["requests"] == 6 and stats["errors"] == 0
+    assert stats["peak_connections"] == 2 and server.peak_connections <= 2
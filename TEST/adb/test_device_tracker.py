@@ -0,0 +1,140 @@
+"""Tests for the host:track-devices device tracker (runs against the in-process fake adb server)."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+import sys
+import threading
+import time
+
+import pytest
+
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+if str(CURRENT_DIR) not in sys.path:
+    sys.path.insert(0, str(CURRENT_DIR))
+
+from backend.config import config
+
+if not config.is_loaded:
+    config.load()
+
+from backend.core import ldplayer_manager
+from backend.core.emulator import EmulatorManager, EmulatorStatus
+from backend.core.workflow import adb_client, device_tracker
+from backend.core.workflow.adb_client import AdbClient
+from backend.core.workflow.device_tracker import DeviceTracker
+from fake_adb_server import FakeAdbServer
+
+SERIAL = "emulator-5554"
+
+
+def _eventually(predicate, timeout: float = 5) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+@pytest.fixture
+def server(monkeypatch):
+    monkeypatch.setattr(device_tracker, "BOOT_PROBE_INTERVAL_SEC", 0.02)
+    monkeypatch.setattr(device_tracker, "TRACKER_RECONNECT_MIN_SEC", 0.05)
+    fake = FakeAdbServer({SERIAL: "device", "emulator-5556": "offline"}).start()
+    try:
+        yield fake
+    finally:
+        fake.stop()
+
+
+@pytest.fixture
+def tracker(server):
+    tracker = DeviceTracker(AdbClient(port=server.port)).start()
+    assert tracker.wait_connected(5)
+    try:
+        yield tracker
+    finally:
+        tracker.stop()
+
+
+def test_pushed_listings_update_the_map_without_polling(server, tracker):
+    assert tracker.wait_until_ready(SERIAL, 5) == SERIAL
+    assert tracker.snapshot()["emulator-5556"]["state"] == "offline"
+
+    server.set_device("emulator-5556", "device")
+    assert tracker.wait_until_ready("emulator-5556", 5) == "emulator-5556"
+    server.set_device(SERIAL, None)
+    assert _eventually(lambda: tracker.online_serials() == ["emulator-5556"])
+
+    assert "host:devices" not in server.requests
+    assert server.requests.count("host:track-devices") == 1
+
+
+def test_boot_completed_gates_readiness(server, tracker):
+    booted = threading.Event()
+    server.shell_handler = lambda serial, cmd: "1\n" if booted.is_set() else "0\n"
+    server.set_device("emulator-5556", "device")
+
+    assert tracker.wait_until_ready("emulator-5556", 0.2) is None
+    state = tracker.snapshot()["emulator-5556"]
+    assert (state["state"], state["boot_completed"], state["ready"]) == ("device", False, False)
+    booted.set()
+    assert tracker.wait_until_ready("emulator-5556", 5) == "emulator-5556"
+
+    server.set_device("emulator-5556", "offline")      # a reboot clears boot_completed
+    assert _eventually(lambda: not tracker.is_ready("emulator-5556"))
+
+
+def test_async_wait_resolves_from_the_tracker_thread(server, tracker):
+    async def main():
+        threading.Timer(0.1, server.set_device, args=("127.0.0.1:5557", "device")).start()
+        ready = await tracker.wait_ready(["emulator-5558", "127.0.0.1:5557"], timeout=5)
+        missing = await tracker.wait_ready("emulator-5560", timeout=0.1)
+        return ready, missing
+
+    assert asyncio.run(main()) == ("127.0.0.1:5557", None)
+    assert tracker.stats()["async_waiters"] == 0
+
+
+def test_reconnects_after_the_server_drops_the_stream(server, tracker):
+    tracker.wait_until_ready(SERIAL, 5)
+
+    server.drop_trackers()
+    # connected: the reconnected stream delivered its first listing (until then waits return None)
+    assert _eventually(lambda: tracker.reconnects == 1 and server.tracking_clients == 1 and tracker.connected)
+    server.set_device("emulator-5556", "device")
+    assert tracker.wait_until_ready("emulator-5556", 5) == "emulator-5556"
+    assert tracker.connected
+
+
+def test_wait_for_device_and_discover_use_the_shared_tracker(server, monkeypatch):
+    def no_spawn(cmd, *args, **kwargs):
+        raise AssertionError(f"adb binary spawned: {cmd}")
+
+    previous = adb_client.get_adb_client()
+    adb_client.set_adb_client(AdbClient(port=server.port))
+    monkeypatch.setattr(adb_client.subprocess, "run", no_spawn)
+    tracker = device_tracker.start_device_tracker()
+    try:
+        assert tracker.wait_connected(5)
+        threading.Timer(0.2, server.set_device, args=("emulator-5556", "device")).start()
+        assert ldplayer_manager.wait_for_device(1, timeout=5)
+
+        manager = EmulatorManager()
+        online = [emu.serial for emu in manager.discover()]
+        server.set_device(SERIAL, "offline")
+        assert _eventually(lambda: tracker.online_serials() == ["emulator-5556"])
+        manager.discover()
+    finally:
+        device_tracker.stop_device_tracker()
+        adb_client.set_adb_client(previous)
+
+    assert online == [SERIAL, "emulator-5556"]
+    assert manager.get(SERIAL).status == EmulatorStatus.OFFLINE
+    assert "host:devices" not in server.requests
+    assert device_tracker.get_device_tracker() is None
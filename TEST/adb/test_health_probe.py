@@ -0,0 +1,145 @@
+"""Tests for the one-round-trip app health probe behind check_app_crash (fake adb server)."""
+
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+import numpy as np
+import pytest
+
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+if str(CURRENT_DIR) not in sys.path:
+    sys.path.insert(0, str(CURRENT_DIR))
+
+from backend.config import config
+
+if not config.is_loaded:
+    config.load()
+
+from backend.core.workflow import adb_client, core_actions, frame_bus, health_probe
+from backend.core.workflow.adb_client import AdbClient
+from backend.core.workflow.health_probe import SECTION_MARKER, probe_app_health
+from fake_adb_server import FakeAdbServer
+
+SERIAL = "emulator-5554"
+PACKAGE = "com.farlightgames.samo.gp.vn"
+RESUMED = f"  topResumedActivity=ActivityRecord{{5d1 u0 {PACKAGE}/com.unity3d.player.UnityPlayerActivity t12}}"
+
+
+class FakeDevice:
+    """Answers the compound probe command like a device would."""
+
+    def __init__(self) -> None:
+        self.pid = "4242"
+        self.resumed = RESUMED
+        self.checksum = "9e107d9d372bb6826bd81d3542a419d6"
+
+    def __call__(self, serial: str, cmd: str) -> str:
+        lines = [self.pid, SECTION_MARKER, self.resumed]
+        if "screencap" in cmd:
+            lines += [SECTION_MARKER, f"{self.checksum}  -" if self.checksum else ""]
+        return "\n".join(lines) + "\n"
+
+
+@pytest.fixture
+def device(monkeypatch, tmp_path):
+    def no_capture(*args, **kwargs):
+        raise AssertionError("check_app_crash captured its own frame")
+
+    def no_spawn(cmd, *args, **kwargs):
+        raise AssertionError(f"adb binary spawned: {cmd}")
+
+    fake = FakeAdbServer({SERIAL: "device"}).start()
+    fake.shell_handler = FakeDevice()
+    previous = adb_client.get_adb_client()
+    adb_client.set_adb_client(AdbClient(port=fake.port))
+    monkeypatch.setattr(adb_client.subprocess, "run", no_spawn)
+    monkeypatch.setattr(frame_bus, "get_frame_source", no_capture)
+    monkeypatch.setattr(config, "db_path", str(tmp_path / "cod_manager.db"))   # workflow_logs/ of the crash prints
+    try:
+        yield fake
+    finally:
+        adb_client.set_adb_client(previous)
+        fake.stop()
+        frame_bus.drop_frame_bus(SERIAL)
+        core_actions._FREEZE_CACHE.pop(SERIAL, None)
+        core_actions._APP_HEALTH_CACHE.pop(SERIAL, None)
+        health_probe.reset_health_probe_stats(SERIAL)
+
+
+def _shell_requests(server) -> list[str]:
+    return [r for r in server.requests if r.startswith("shell:")]
+
+
+def _publish(value: int) -> None:
+    frame_bus.get_frame_bus(SERIAL, config.adb_path).publish(np.full((90, 160, 3), value, np.uint8))
+
+
+def test_probe_reads_pid_foreground_and_checksum_in_one_request(device):
+    health = probe_app_health(SERIAL, PACKAGE, frame_checksum=True)
+
+    assert health.pids == ["4242"] and health.foreground
+    assert health.focus.startswith("topResumedActivity=") and health.frame_checksum == device.shell_handler.checksum
+    assert len(_shell_requests(device)) == 1
+    assert probe_app_health(SERIAL, PACKAGE).frame_checksum is None
+    assert health_probe.health_probe_stats()[SERIAL]["probes"] == 2
+
+
+def test_freeze_detection_reuses_detector_frames(device):
+    _publish(10)
+    assert not core_actions.check_app_crash(SERIAL, PACKAGE)        # baseline
+    for _ in range(3):
+        _publish(10)                                                # detector frames, pixel identical
+        assert not core_actions.check_app_crash(SERIAL, PACKAGE)
+    _publish(10)
+    assert core_actions.check_app_crash(SERIAL, PACKAGE)
+
+    shells = _shell_requests(device)
+    assert len(shells) == 5 and not any("screencap" in r for r in shells)
+    assert health_probe.health_probe_stats()[SERIAL]["with_checksum"] == 0
+
+
+def test_probe_checksum_stands_in_when_no_new_frame(device):
+    fake_device = device.shell_handler
+    for i in range(5):
+        fake_device.checksum = f"{i:032x}"                          # screen keeps changing
+        assert not core_actions.check_app_crash(SERIAL, PACKAGE)
+    for _ in range(3):
+        assert not core_actions.check_app_crash(SERIAL, PACKAGE)    # same checksum: counting
+    assert core_actions.check_app_crash(SERIAL, PACKAGE)
+    assert all("screencap" in r for r in _shell_requests(device))
+
+
+def test_freeze_is_measured_against_the_previous_check_only(device):
+    for _ in range(4):
+        _publish(10)
+        assert not core_actions.check_app_crash(SERIAL, PACKAGE)    # baseline + 3 unchanged
+    assert not core_actions.check_app_crash(SERIAL, PACKAGE)        # no new frame: checksum sample
+    _publish(10)
+    assert not core_actions.check_app_crash(SERIAL, PACKAGE)        # not compared with the stale bus frame
+    assert core_actions._FREEZE_CACHE[SERIAL]["freeze_count"] == 0
+
+
+def test_crash_signals_from_the_probe(device):
+    fake_device = device.shell_handler
+    fake_device.checksum = ""
+    assert not core_actions.check_app_crash(SERIAL, PACKAGE)
+    assert not core_actions.check_app_crash(SERIAL, PACKAGE)
+    assert core_actions.check_app_crash(SERIAL, PACKAGE)            # 3 screencap failures
+
+    core_actions._APP_HEALTH_CACHE.pop(SERIAL)
+    _publish(1)
+    fake_device.resumed = "  topResumedActivity=ActivityRecord{1 u0 com.android.launcher3/.Launcher t1}"
+    assert not core_actions.check_app_crash(SERIAL, PACKAGE)
+    _publish(2)
+    assert core_actions.check_app_crash(SERIAL, PACKAGE)
+    assert core_actions._get_crash_reason(SERIAL) == "CRASH_NOT_FOREGROUND"
+
+    core_actions._APP_HEALTH_CACHE.pop(SERIAL)
+    fake_device.pid = ""
+    assert not core_actions.check_app_crash(SERIAL, PACKAGE)
+    assert core_actions.check_app_crash(SERIAL, PACKAGE)
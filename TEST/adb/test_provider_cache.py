@@ -0,0 +1,132 @@
+"""Tests for the per-serial provider cache behind detect_provider_from_emulator (fake adb server)."""
+
+from __future__ import annotations
+
+from pathlib import Path
+import sqlite3
+import sys
+
+import pytest
+
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+if str(CURRENT_DIR) not in sys.path:
+    sys.path.insert(0, str(CURRENT_DIR))
+
+from backend.config import config
+
+if not config.is_loaded:
+    config.load()
+
+from backend.core import apk_manager, ldplayer_manager
+from backend.core.workflow import adb_client, core_actions, provider_cache
+from backend.core.workflow.adb_client import AdbClient
+from fake_adb_server import FakeAdbServer, _default_shell
+
+SERIAL = "emulator-5554"
+GLOBAL_PKG = core_actions.PROVIDER_PACKAGES["Global"]
+FUNTAP_PKG = core_actions.PROVIDER_PACKAGES["Funtap"]
+
+
+@pytest.fixture
+def server(monkeypatch):
+    def no_spawn(cmd, *args, **kwargs):
+        raise AssertionError(f"adb binary spawned: {cmd}")
+
+    fake = FakeAdbServer({SERIAL: "device", "emulator-5556": "device"}).start()
+    installed = {SERIAL: GLOBAL_PKG, "emulator-5556": FUNTAP_PKG}
+
+    def shell(serial, cmd):
+        if cmd == "pm list packages":
+            return f"package:com.android.settings\npackage:{installed[serial]}\n"
+        if cmd == "dumpsys activity recents":
+            return "ACTIVITY MANAGER RECENT TASKS (dumpsys activity recents)\n"
+        return _default_shell(serial, cmd)
+
+    fake.shell_handler = shell
+    fake.installed = installed
+    previous = adb_client.get_adb_client()
+    adb_client.set_adb_client(AdbClient(port=fake.port))
+    monkeypatch.setattr(adb_client.subprocess, "run", no_spawn)
+    provider_cache.invalidate_provider()
+    try:
+        yield fake
+    finally:
+        provider_cache.invalidate_provider()
+        adb_client.set_adb_client(previous)
+        fake.stop()
+
+
+def _lookups(server) -> int:
+    return sum(1 for r in server.requests if r in ("shell:dumpsys activity recents", "shell:pm list packages"))
+
+
+def test_repeat_detections_are_served_from_the_cache(server):
+    before = provider_cache.provider_cache_stats()
+
+    assert core_actions.detect_provider_from_emulator(SERIAL) == "Global"
+    assert core_actions.detect_provider_from_emulator("emulator-5556") == "Funtap"
+    for _ in range(5):
+        assert core_actions.detect_provider_from_emulator(SERIAL) == "Global"
+
+    after = provider_cache.provider_cache_stats()
+    assert _lookups(server) == 4                    # recents + pm list, once per serial
+    assert after["misses"] - before["misses"] == 2 and after["hits"] - before["hits"] == 5
+    assert after["entries"][SERIAL]["source"] == "detected"
+
+
+def test_undetected_default_is_not_cached(server):
+    server.installed[SERIAL] = "com.other.app"
+    assert core_actions.detect_provider_from_emulator(SERIAL) == core_actions.DEFAULT_PROVIDER
+    assert SERIAL not in provider_cache.provider_cache_stats()["entries"]
+
+
+def test_apk_install_and_relaunch_invalidate(server, monkeypatch, tmp_path):
+    monkeypatch.setattr(apk_manager, "APK_DIR", tmp_path)
+    (tmp_path / "game.apk").write_bytes(b"apk")
+    monkeypatch.setitem(apk_manager.APK_REGISTRY, "game", {"id": "game", "name": "Game", "filename": "game.apk"})
+    monkeypatch.setattr(ldplayer_manager, "_run", lambda args, timeout=15: "")
+
+    core_actions.detect_provider_from_emulator(SERIAL)
+    server.installed[SERIAL] = FUNTAP_PKG
+    assert apk_manager.install_apk("game", SERIAL)["success"]
+    assert core_actions.detect_provider_from_emulator(SERIAL) == "Funtap"
+
+    ldplayer_manager.quit_instance(0)
+    assert SERIAL not in provider_cache.provider_cache_stats()["entries"]
+    core_actions.detect_provider_from_emulator(SERIAL)
+    ldplayer_manager.launch_instance(0)
+    assert SERIAL not in provider_cache.provider_cache_stats()["entries"]
+    assert _lookups(server) == 6
+
+
+def test_seeded_from_the_accounts_provider_column_and_confirmed_on_device(server, tmp_path):
+    db_path = tmp_path / "accounts.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.executescript(
+            """
+            CREATE TABLE emulators (id INTEGER PRIMARY KEY, emu_index INTEGER, serial TEXT);
+            CREATE TABLE accounts (id INTEGER PRIMARY KEY, emulator_id INTEGER, provider TEXT, is_active INTEGER);
+            INSERT INTO emulators VALUES (1, 0, 'emulator-5554'), (2, 1, 'emulator-5556'), (3, 2, 'emulator-5558');
+            INSERT INTO accounts VALUES (1, 1, 'Funtap', 0), (2, 1, 'Funtap', 0),
+                                        (3, 2, 'Global', 0), (4, 2, 'Funtap', 1),
+                                        (5, 3, 'Global', 0), (6, 3, 'Funtap', 0);
+            """
+        )
+
+    assert provider_cache.seed_providers_from_accounts(str(db_path)) == 2
+    entries = provider_cache.provider_cache_stats()["entries"]
+    assert {s: e["provider"] for s, e in entries.items()} == {SERIAL: "Funtap", "emulator-5556": "Funtap"}
+    assert entries[SERIAL]["source"] == "accounts"      # 5558: its accounts disagree, none active
+
+    assert core_actions.get_cached_provider(SERIAL) is None                 # a seed is only a hint
+    assert core_actions.detect_provider_from_emulator(SERIAL) == "Global"   # device disagrees
+    assert _lookups(server) == 3                                            # pm list, then full detection
+
+    for _ in range(3):
+        assert core_actions.detect_provider_from_emulator("emulator-5556") == "Funtap"
+    assert _lookups(server) == 4                                            # one pm list confirms it
+    entries = provider_cache.provider_cache_stats()["entries"]
+    assert entries[SERIAL]["source"] == "detected" and entries["emulator-5556"]["source"] == "confirmed"
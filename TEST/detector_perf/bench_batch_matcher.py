@@ -0,0 +1,97 @@
+"""
+Benchmark: per-frame cost of classifying state + construction + special.
+
+Rows:
+  legacy check_state_full   — sequential, early exit (only partial scores)
+  sequential full vector    — _match_single over every template (what a full vector costs today)
+  batched (1 thread)        — BatchMatcher groups, no pool
+  batched (pool)            — BatchMatcher groups across the shared thread pool
+
+Usage:
+    python TEST/detector_perf/bench_batch_matcher.py
+    python TEST/detector_perf/bench_batch_matcher.py --frames path/to/recorded_pngs --rounds 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import cv2
+
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.core.workflow import batch_matcher
+from backend.core.workflow.batch_matcher import match_many
+from backend.core.workflow.state_detector import GameStateDetector, UNKNOWN_STATE
+
+TEMPLATES_DIR = PROJECT_ROOT / "backend" / "core" / "workflow" / "templates"
+DEFAULT_FRAME = TEMPLATES_DIR / "clean_state_960x540.png"
+CATEGORIES = ["state", "construction", "special"]
+
+
+def _legacy_full(detector: GameStateDetector, screen) -> str:
+    state = detector._match_state_from_screen(screen)
+    if state == UNKNOWN_STATE:
+        detector._find_name_only(screen, detector.construction_templates) or \
+            detector._find_name_only(screen, detector.special_templates)
+    return state
+
+
+def _sequential_vector(detector: GameStateDetector, screen) -> int:
+    gray = detector._get_gray(screen)
+    n = 0
+    for category in CATEGORIES:
+        for entries in detector._registry[category].values():
+            for entry in entries:
+                detector._match_single(gray, entry, 0.8)
+                n += 1
+    return n
+
+
+def _median_ms(fn, rounds: int) -> float:
+    samples = []
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=Path, default=None, help="dir of recorded 960x540 .png frames")
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    paths = sorted(args.frames.glob("*.png")) if args.frames else [DEFAULT_FRAME]
+    frames = [cv2.imread(str(p), cv2.IMREAD_COLOR) for p in paths]
+    detector = GameStateDetector("adb", str(TEMPLATES_DIR), learn_rois=False, learn_transitions=False)
+    matchers = [detector._batch_matcher(c) for c in CATEGORIES]
+    n_templates = sum(len(m) for m in matchers)
+    n_groups = sum(len(m.groups) for m in matchers)
+
+    rows = {"legacy check_state_full": 0.0, "sequential full vector": 0.0,
+            "batched (1 thread)": 0.0, f"batched (pool x{batch_matcher.BATCH_MAX_WORKERS})": 0.0}
+    for screen in frames:
+        detector._cache.update(screen)
+        gray = detector._cache.gray
+        rows["legacy check_state_full"] += _median_ms(lambda: _legacy_full(detector, screen), args.rounds)
+        rows["sequential full vector"] += _median_ms(lambda: _sequential_vector(detector, screen), args.rounds)
+        rows["batched (1 thread)"] += _median_ms(lambda: match_many(matchers, gray, parallel=False), args.rounds)
+        rows[f"batched (pool x{batch_matcher.BATCH_MAX_WORKERS})"] += _median_ms(
+            lambda: match_many(matchers, gray, parallel=True), args.rounds)
+
+    print(f"frames: {len(frames)}  templates: {n_templates}  roi groups: {n_groups}  (median ms per frame)")
+    for label, total in rows.items():
+        print(f"  {label:<28} {total / len(frames):>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Micro-benchmark: PNG vs raw screencap decode on recorded dumps.
+
+Per frame, "png" mode pays a device-side PNG encode (measured here with cv2.imencode
+as a proxy) + host cv2.imdecode + BGR→gray. "raw" mode pays only decode_raw_screencap
+(np.frombuffer view + RGBA→BGR + RGBA→gray).
+
+Usage:
+    python TEST/detector_perf/bench_capture_modes.py
+    python TEST/detector_perf/bench_capture_modes.py --dumps path/to/dumps --rounds 50
+
+Dumps dir: `*.png` (from `adb exec-out screencap -p`) and/or `*.raw` (from `adb exec-out screencap`).
+The missing format is synthesized from the other so both modes decode identical pixels.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import struct
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.core.workflow.frame_source import decode_raw_screencap
+
+DEFAULT_DUMP = PROJECT_ROOT / "backend" / "core" / "workflow" / "templates" / "clean_state_960x540.png"
+
+
+def load_dumps(dumps_dir: Path | None) -> list[tuple[bytes, bytes]]:
+    """Return [(png_bytes, raw_bytes)] for every recorded dump."""
+    paths = sorted(dumps_dir.glob("*.png")) + sorted(dumps_dir.glob("*.raw")) if dumps_dir else [DEFAULT_DUMP]
+    pairs = []
+    for path in paths:
+        data = path.read_bytes()
+        if path.suffix == ".raw":
+            bgr, _ = decode_raw_screencap(data)
+            pairs.append((cv2.imencode(".png", bgr)[1].tobytes(), data))
+        else:
+            bgr = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+            h, w = bgr.shape[:2]
+            rgba = cv2.cvtColor(bgr, cv2.COLOR_BGR2RGBA)
+            pairs.append((data, struct.pack("<IIII", w, h, 1, 0) + rgba.tobytes()))
+    return pairs
+
+
+def _time_ms(fn, rounds: int) -> float:
+    samples = []
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dumps", type=Path, default=None, help="dir of recorded .png/.raw dumps")
+    parser.add_argument("--rounds", type=int, default=30)
+    args = parser.parse_args()
+
+    pairs = load_dumps(args.dumps)
+    png_encode = png_decode = raw_decode = 0.0
+    png_bytes = raw_bytes = 0
+    for png, raw in pairs:
+        bgr = cv2.imdecode(np.frombuffer(png, np.uint8), cv2.IMREAD_COLOR)
+
+        def _png_host():
+            img = cv2.imdecode(np.frombuffer(png, np.uint8), cv2.IMREAD_COLOR)
+            cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+
+        png_encode += _time_ms(lambda: cv2.imencode(".png", bgr), args.rounds)
+        png_decode += _time_ms(_png_host, args.rounds)
+        raw_decode += _time_ms(lambda: decode_raw_screencap(raw), args.rounds)
+        png_bytes += len(png)
+        raw_bytes += len(raw)
+
+    n = len(pairs)
+    print(f"dumps: {n}  rounds: {args.rounds}  (median ms per frame)")
+    print(f"{'mode':<6} {'device encode':>14} {'host decode+gray':>17} {'total':>8} {'payload KB':>11}")
+    print(f"{'png':<6} {png_encode / n:>14.2f} {png_decode / n:>17.2f} {(png_encode + png_decode) / n:>8.2f} {png_bytes / n / 1024:>11.0f}")
+    print(f"{'raw':<6} {0.0:>14.2f} {raw_decode / n:>17.2f} {raw_decode / n:>8.2f} {raw_bytes / n / 1024:>11.0f}")
+    print(f"speedup (total): {(png_encode + png_decode) / raw_decode:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark: per-frame capture latency, subprocess (PNG) vs persistent stream (raw).
+
+Usage:
+    python TEST/detector_perf/bench_frame_source.py                 # fake adb, recorded frames
+    python TEST/detector_perf/bench_frame_source.py --adb C:/LDPlayer/LDPlayer9/adb.exe --serial emulator-5554
+
+Note: fake adb is a Python script, so its process spawn (~interpreter start) is
+slower than adb.exe — the subprocess numbers are an upper bound on real spawn cost.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.core.workflow.frame_source import StreamFrameSource, SubprocessFrameSource
+
+FAKE_ADB = str(CURRENT_DIR / "fake_adb.py")
+
+
+def bench(source, frames: int) -> dict:
+    source.grab()  # warm-up (opens the stream shell)
+    samples = []
+    for _ in range(frames):
+        t0 = time.perf_counter()
+        frame = source.grab()
+        samples.append((time.perf_counter() - t0) * 1000)
+        if frame is None:
+            raise RuntimeError(f"{source.name}: capture failed")
+    source.close()
+    samples.sort()
+    total_s = sum(samples) / 1000
+    return {
+        "source": source.name,
+        "frames": frames,
+        "p50_ms": statistics.median(samples),
+        "p95_ms": samples[int(len(samples) * 0.95) - 1],
+        "fps": frames / total_s if total_s else 0.0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--adb", default=FAKE_ADB, help="adb binary (default: fake adb)")
+    parser.add_argument("--serial", default="emulator-5554")
+    parser.add_argument("--frames", type=int, default=30)
+    args = parser.parse_args()
+
+    rows = [
+        bench(SubprocessFrameSource(args.serial, args.adb), args.frames),
+        bench(StreamFrameSource(args.serial, args.adb), args.frames),
+    ]
+    print(f"{'source':<12} {'frames':>6} {'p50 ms':>9} {'p95 ms':>9} {'fps':>8}")
+    for r in rows:
+        print(f"{r['source']:<12} {r['frames']:>6} {r['p50_ms']:>9.1f} {r['p95_ms']:>9.1f} {r['fps']:>8.1f}")
+    print(f"speedup (p50): {rows[0]['p50_ms'] / rows[1]['p50_ms']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark: per-input latency, one `adb shell input ...` process per tap vs the persistent shell session.
+
+Usage:
+    python TEST/detector_perf/bench_input_session.py                 # fake adb
+    python TEST/detector_perf/bench_input_session.py --input-ms 40   # + simulated on-device `input` cost
+    python TEST/detector_perf/bench_input_session.py --adb C:/LDPlayer/LDPlayer9/adb.exe --serial emulator-5554
+
+Note: fake adb is a Python script, so its process spawn (~interpreter start) is
+slower than adb.exe — the one-shot numbers are an upper bound on real spawn cost.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.core.workflow.shell_session import SHELL_COMMAND_TIMEOUT_SEC, ShellSession
+
+FAKE_ADB = str(CURRENT_DIR / "fake_adb.py")
+
+
+def bench(name: str, send, taps: int) -> dict:
+    send("input tap 480 270")  # warm-up (opens the session shell)
+    samples = []
+    for i in range(taps):
+        t0 = time.perf_counter()
+        send(f"input tap {400 + i % 50} 270")
+        samples.append((time.perf_counter() - t0) * 1000)
+    samples.sort()
+    return {
+        "mode": name,
+        "taps": taps,
+        "p50_ms": statistics.median(samples),
+        "p95_ms": samples[int(len(samples) * 0.95) - 1],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--adb", default=FAKE_ADB, help="adb binary (default: fake adb)")
+    parser.add_argument("--serial", default="emulator-5554")
+    parser.add_argument("--taps", type=int, default=50)
+    parser.add_argument("--input-ms", type=float, default=0.0, help="fake adb: simulated on-device input cost")
+    args = parser.parse_args()
+    os.environ["FAKE_ADB_INPUT_MS"] = str(args.input_ms)
+
+    session = ShellSession(args.serial, args.adb)
+    try:
+        rows = [
+            bench("one-shot", lambda cmd: session._run_oneshot(cmd, SHELL_COMMAND_TIMEOUT_SEC), args.taps),
+            bench("session", session.run, args.taps),
+        ]
+    finally:
+        session.close()
+
+    print(f"{'mode':<10} {'taps':>5} {'p50 ms':>9} {'p95 ms':>9}")
+    for r in rows:
+        print(f"{r['mode']:<10} {r['taps']:>5} {r['p50_ms']:>9.1f} {r['p95_ms']:>9.1f}")
+    print(f"speedup (p50): {rows[0]['p50_ms'] / rows[1]['p50_ms']:.1f}x | session stats: {session.stats()}")
+
+
+if __name__ == "__main__":
+    main()
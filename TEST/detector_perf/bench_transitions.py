@@ -0,0 +1,130 @@
+"""
+Benchmark: expected matchTemplate calls per check_state poll, legacy order vs transition-ranked.
+
+Replays a state sequence and counts, for every poll, how many state templates each
+ordering would evaluate before reaching the observed state:
+  legacy   — last state, then STATE_PRIORITY, then STATE_BASE
+  ranked   — last state, then TransitionModel.predict(last, action), then the rest; a
+             predicted hit also pays for the higher-ranked states it overlaps
+             (STATE_CONFLICTS), exactly as _match_state_from_screen checks them
+The model learns online while replaying (as in production), so early polls cost the same.
+Assumes the first template of a state is the one that hits, that predicted hits are
+confident and that no other state passes; unknown frames pay for every template in both orders.
+
+Input: a workflow stdout log ("[serial] Current detected state: X" lines; "BACK" / "Tap"
+lines mark the input). Without --log a synthetic lobby/menu session is generated.
+
+Usage:
+    python TEST/detector_perf/bench_transitions.py
+    python TEST/detector_perf/bench_transitions.py --log path/to/workflow.log
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+from collections import Counter
+from pathlib import Path
+
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.core.workflow.detector_configs import STATE_BASE, STATE_CONFIGS, STATE_CONFLICTS, STATE_PRIORITY
+from backend.core.workflow.state_transitions import TransitionModel, _LOG_ACTION_RE, _LOG_STATE_RE
+
+ENTRIES = Counter(STATE_CONFIGS.values())
+ORDER = list(STATE_PRIORITY) + list(STATE_BASE)
+
+CITY, OUT = "IN-GAME LOBBY (IN_CITY)", "IN-GAME LOBBY (OUT_CITY)"
+PROFILE, DETAIL = "IN-GAME LOBBY (PROFILE MENU)", "IN-GAME LOBBY (PROFILE MENU DETAIL)"
+EVENTS, BAZAAR = "IN-GAME LOBBY (EVENTS MENU)", "IN-GAME LOBBY (BAZAAR)"
+ITEMS = "IN-GAME ITEMS (RESOURCES)"
+
+
+def _synthetic(rounds: int, seed: int = 3) -> list[tuple[str, str]]:
+    """[(action, state)] — loading, then lobby ↔ menu trips with a few steady polls each."""
+    rng = random.Random(seed)
+    seq = [("none", "LOADING SCREEN")] * 4 + [("none", None)] * 2
+    trips = [
+        [("tap", PROFILE), ("tap", DETAIL), ("back", PROFILE), ("back", CITY)],
+        [("tap", EVENTS), ("back", CITY)],
+        [("tap", BAZAAR), ("back", CITY)],
+        [("tap", ITEMS), ("back", CITY)],
+        [("tap", OUT), ("tap", CITY)],
+    ]
+    seq.append(("none", CITY))
+    for _ in range(rounds):
+        for action, state in rng.choice(trips):
+            if rng.random() < 0.2:
+                seq.append((action, None))          # mid-animation frame
+                action = "none"
+            seq += [(action, state)] + [("none", state)] * rng.randint(0, 3)
+    return seq
+
+
+def _from_log(path: Path) -> list[tuple[str, str]]:
+    seq, action = [], "none"
+    for line in path.read_text(encoding="utf-8", errors="replace").splitlines():
+        m = _LOG_STATE_RE.match(line)
+        if m:
+            state = m.group("state")
+            seq.append((action, None if state in ("None", "UNKNOWN / TRANSITION") else state))
+            action = "none"
+        elif _LOG_ACTION_RE.match(line):
+            action = _LOG_ACTION_RE.match(line).group("action").lower()
+    return seq
+
+
+def _cost(head: list[str], predicted: list[str], target: str | None) -> int:
+    """Templates matched before `target` is returned, mirroring _match_state_from_screen."""
+    calls, seen = 0, set()
+
+    def score(state: str) -> bool:
+        nonlocal calls
+        if state not in seen and state in ENTRIES:
+            seen.add(state)
+            calls += 1 if state == target else ENTRIES[state]
+        return state == target
+
+    if any(score(state) for state in head):
+        return calls
+    for state in predicted:
+        if state in STATE_CONFLICTS and score(state):
+            for other in STATE_CONFLICTS[state]:        # higher-ranked overlapping states
+                score(other)
+            return calls
+    for state in ORDER:
+        if score(state):
+            return calls
+    return calls
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--log", type=Path, help="Workflow stdout log to replay")
+    parser.add_argument("--rounds", type=int, default=200, help="Synthetic trips (without --log)")
+    args = parser.parse_args()
+
+    seq = _from_log(args.log) if args.log else _synthetic(args.rounds)
+    model = TransitionModel()
+    legacy = ranked = 0
+    last = None
+    for action, state in seq:
+        head = [last] if last else []
+        legacy += _cost(head, [], state)
+        ranked += _cost(head, model.predict(last, action), state)
+        model.add(last, action, state)
+        last = state
+
+    n = max(1, len(seq))
+    print(f"polls: {len(seq)}   contexts learned: {model.stats()['contexts']}")
+    print(f"legacy order : {legacy / n:6.2f} matchTemplate calls / poll")
+    print(f"ranked order : {ranked / n:6.2f} matchTemplate calls / poll   ({1 - ranked / max(1, legacy):.0%} fewer)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
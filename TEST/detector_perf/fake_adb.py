@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Fake `adb` stand-in that serves recorded frames — lets capture paths be benchmarked on Linux.
+
+Supported invocations (what the workflow code actually sends):
+    fake_adb.py -s SERIAL exec-out screencap -p   -> PNG bytes (encoded per call, like the device)
+    fake_adb.py -s SERIAL exec-out screencap      -> raw header (16B) + RGBA payload
+    fake_adb.py -s SERIAL shell -T                -> stdin command loop (getprop / screencap / echo / printf / input)
+    fake_adb.py -s SERIAL shell input tap X Y     -> one-shot shell command
+
+Shell lines may chain commands with `;` and `echo ... $?` (shell_session sentinels).
+
+Frames:
+    FAKE_ADB_FRAMES=<dir of .png>   recorded frames, served round-robin
+    (default: backend/core/workflow/templates/clean_state_960x540.png)
+Input:
+    FAKE_ADB_INPUT_LOG=<file>       append every `input ...` command received
+    FAKE_ADB_INPUT_MS=<ms>          simulated on-device cost of one `input` command (default 0)
+"""
+
+from __future__ import annotations
+
+import os
+import struct
+import sys
+import time
+from pathlib import Path
+
+import cv2
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_FRAME = PROJECT_ROOT / "backend" / "core" / "workflow" / "templates" / "clean_state_960x540.png"
+FAKE_SDK = 28
+RAW_FORMAT_RGBA_8888 = 1
+
+
+def load_frames() -> list:
+    frames_dir = os.environ.get("FAKE_ADB_FRAMES")
+    paths = sorted(Path(frames_dir).glob("*.png")) if frames_dir else [DEFAULT_FRAME]
+    frames = [cv2.imread(str(p), cv2.IMREAD_COLOR) for p in paths]
+    return [f for f in frames if f is not None]
+
+
+def encode_raw(frame) -> bytes:
+    h, w = frame.shape[:2]
+    rgba = cv2.cvtColor(frame, cv2.COLOR_BGR2RGBA)
+    return struct.pack("<IIII", w, h, RAW_FORMAT_RGBA_8888, 0) + rgba.tobytes()
+
+
+def encode_png(frame) -> bytes:
+    ok, buf = cv2.imencode(".png", frame)
+    return buf.tobytes() if ok else b""
+
+
+def _pick(frames: list):
+    # One-shot processes have no shared counter: rotate on wall clock (10 Hz)
+    return frames[int(time.time() * 10) % len(frames)]
+
+
+def run_input(command: str) -> int:
+    log_path = os.environ.get("FAKE_ADB_INPUT_LOG")
+    if log_path:
+        with open(log_path, "a", encoding="utf-8") as f:
+            f.write(command + "\n")
+    time.sleep(float(os.environ.get("FAKE_ADB_INPUT_MS", "0")) / 1000)
+    return 0
+
+
+def shell_loop(frames: list) -> None:
+    raw_frames = [encode_raw(f) for f in frames]
+    out = sys.stdout.buffer
+    index = 0
+    rc = 0
+    for line in sys.stdin.buffer:
+        for command in line.decode("utf-8", errors="ignore").split(";"):
+            command = command.strip()
+            if not command:
+                continue
+            if command == "getprop ro.build.version.sdk":
+                out.write(f"{FAKE_SDK}\n".encode())
+                rc = 0
+            elif command == "screencap":
+                out.write(raw_frames[index % len(raw_frames)])
+                index += 1
+                rc = 0
+            elif command.startswith("printf "):
+                out.write(command[7:].strip("'\"").encode())
+                rc = 0
+            elif command.startswith("echo "):
+                out.write(command[5:].replace("$?", str(rc)).encode() + b"\n")
+                rc = 0
+            elif command.startswith("input "):
+                rc = run_input(command)
+            elif command == ":":
+                rc = 0
+            elif command == "exit":
+                return
+            else:
+                rc = 127
+        out.flush()
+
+
+def main(argv: list[str]) -> int:
+    args = list(argv)
+    if len(args) >= 2 and args[0] == "-s":
+        args = args[2:]
+
+    if len(args) >= 2 and args[0] == "shell" and args[1].startswith("input"):
+        return run_input(" ".join(args[1:]))
+
+    frames = load_frames()
+    if not frames:
+        sys.stderr.write("fake_adb: no frames\n")
+        return 1
+
+    if args == ["exec-out", "screencap", "-p"]:
+        sys.stdout.buffer.write(encode_png(_pick(frames)))
+        return 0
+    if args == ["exec-out", "screencap"]:
+        sys.stdout.buffer.write(encode_raw(_pick(frames)))
+        return 0
+    if args and args[0] == "shell" and all(a == "-T" for a in args[1:]):
+        shell_loop(frames)
+        return 0
+
+    sys.stderr.write(f"fake_adb: unsupported command {args}\n")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,128 @@
+"""
+Report: coarse-to-fine pyramid vs full-resolution matching, per template.
+
+For every full-screen template (no ROI hint) this compares, over a set of frames:
+  - median match time (full-res vs pyramid),
+  - score difference and decision agreement at the category threshold,
+  - location error of the pyramid hit.
+
+Frames come from --frames (recorded 960x540 PNGs). Without it, a synthetic set is built:
+each template pasted into clean_state at random positions (positives) + untouched
+clean_state frames (negatives). Use recorded frames before adding PYRAMID_HINTS entries.
+
+Usage:
+    python TEST/detector_perf/report_pyramid.py
+    python TEST/detector_perf/report_pyramid.py --frames path/to/recorded_pngs --scale 0.25
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.core.workflow.detector_configs import CATEGORY_REGISTRY, PYRAMID_HINTS, ROI_HINTS
+from backend.core.workflow.state_detector import DEFAULT_THRESHOLDS
+from backend.core.workflow.template_pyramid import (
+    build_entry_pyramid, match_coarse_to_fine, downscale,
+)
+
+TEMPLATES_DIR = PROJECT_ROOT / "backend" / "core" / "workflow" / "templates"
+DEFAULT_FRAME = TEMPLATES_DIR / "clean_state_960x540.png"
+
+
+def _full_res(gray, tmpl):
+    res = cv2.matchTemplate(gray, tmpl, cv2.TM_CCOEFF_NORMED)
+    _, max_val, _, max_loc = cv2.minMaxLoc(res)
+    return max_val, max_loc
+
+
+def _synthetic_frames(tmpl_bgr, count: int, rng: random.Random) -> list[tuple[np.ndarray, tuple | None]]:
+    base = cv2.imread(str(DEFAULT_FRAME), cv2.IMREAD_COLOR)
+    h, w = tmpl_bgr.shape[:2]
+    frames = []
+    for _ in range(count):
+        frame = base.copy()
+        x, y = rng.randrange(0, base.shape[1] - w), rng.randrange(0, base.shape[0] - h)
+        frame[y:y + h, x:x + w] = tmpl_bgr
+        frames.append((frame, (x, y)))
+    frames += [(base, None)] * max(1, count // 4)
+    return frames
+
+
+def _timed(fn, *args):
+    t0 = time.perf_counter()
+    out = fn(*args)
+    return out, (time.perf_counter() - t0) * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=Path, help="Directory of recorded 960x540 PNG frames")
+    parser.add_argument("--scale", type=float, help="Override scale for every template (default: PYRAMID_HINTS or 0.5)")
+    parser.add_argument("--count", type=int, default=12, help="Synthetic positives per template")
+    parser.add_argument("--all", action="store_true", help="Include un-hinted full-screen templates")
+    args = parser.parse_args()
+
+    recorded = None
+    if args.frames:
+        recorded = [cv2.imread(str(p), cv2.IMREAD_COLOR) for p in sorted(args.frames.glob("*.png"))]
+        recorded = [(f, None) for f in recorded if f is not None]
+        if not recorded:
+            print(f"No PNG frames in {args.frames}")
+            return 1
+
+    rng = random.Random(7)
+    print(f"{'template':42s} {'scale':>5s} {'full ms':>8s} {'pyr ms':>7s} {'x':>5s} "
+          f"{'max dS':>7s} {'agree':>6s} {'loc err':>7s}")
+    for category, configs in CATEGORY_REGISTRY.items():
+        threshold = DEFAULT_THRESHOLDS.get(category, 0.8)
+        for filename in configs:
+            if filename in ROI_HINTS or (filename not in PYRAMID_HINTS and not args.all):
+                continue
+            path = TEMPLATES_DIR / filename
+            tmpl_bgr = cv2.imread(str(path), cv2.IMREAD_COLOR) if path.exists() else None
+            if tmpl_bgr is None:
+                continue
+            entry = {"color": tmpl_bgr, "gray": cv2.cvtColor(tmpl_bgr, cv2.COLOR_BGR2GRAY)}
+            scale = args.scale or PYRAMID_HINTS.get(filename, 0.5)
+            pyr = build_entry_pyramid(entry, scale)
+            if pyr is None:
+                print(f"{filename:42s} {scale:5.2f}  template too small for this scale")
+                continue
+
+            frames = recorded or _synthetic_frames(tmpl_bgr, args.count, rng)
+            full_ms, pyr_ms, diffs, agree, loc_err = [], [], [], 0, 0
+            for frame, _ in frames:
+                gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+                (fv, fl), t_full = _timed(_full_res, gray, entry["gray"])
+                (pv, pl), t_pyr = _timed(
+                    lambda g: match_coarse_to_fine(g, entry["gray"], pyr["gray"], downscale(g, scale), scale, threshold),
+                    gray,
+                )
+                full_ms.append(t_full)
+                pyr_ms.append(t_pyr)
+                diffs.append(abs(fv - pv))
+                agree += (fv >= threshold) == (pv >= threshold)
+                if fv >= threshold and pv >= threshold:
+                    loc_err = max(loc_err, abs(fl[0] - pl[0]) + abs(fl[1] - pl[1]))
+
+            f_med, p_med = statistics.median(full_ms), statistics.median(pyr_ms)
+            print(f"{filename:42s} {scale:5.2f} {f_med:8.2f} {p_med:7.2f} {f_med / p_med:5.1f} "
+                  f"{max(diffs):7.4f} {agree / len(frames):6.0%} {loc_err:7d}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
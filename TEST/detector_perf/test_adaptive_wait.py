@@ -0,0 +1,73 @@
+"""Tests for the adaptive polling schedule used by wait_for_state."""
+
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+import pytest
+
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.core.workflow import adaptive_wait
+from backend.core.workflow.adaptive_wait import (
+    AdaptiveWaiter, JitterPolicy, PollPolicy, poll_policy_for, reset_time_to_target_stats, time_to_target_stats,
+)
+from backend.core.workflow.state_transitions import note_action
+
+NO_JITTER = JitterPolicy(enabled=False)
+SERIAL = "emulator-wait-test"
+
+
+def test_backs_off_to_caps():
+    policy = PollPolicy()
+    waiter = AdaptiveWaiter(SERIAL, policy, NO_JITTER)
+
+    idle = [waiter.next_delay() for _ in range(6)]
+    assert idle[0] == policy.fast_sec
+    assert idle == sorted(idle) and idle[-1] == policy.idle_max_sec
+
+    loading = [waiter.next_delay(loading=True) for _ in range(8)]
+    assert loading[0] == policy.loading_start_sec
+    assert loading[-1] == policy.loading_max_sec
+
+
+def test_new_input_restarts_fast_polling():
+    waiter = AdaptiveWaiter(SERIAL, PollPolicy(), NO_JITTER)
+    for _ in range(5):
+        waiter.next_delay()
+    assert waiter.next_delay() == PollPolicy().idle_max_sec
+
+    note_action(SERIAL, "tap")
+    assert waiter.next_delay() == PollPolicy().fast_sec
+
+
+def test_jitter_is_separate_from_schedule():
+    jitter = JitterPolicy(variance=0.2)
+    samples = [jitter.apply(1.0) for _ in range(200)]
+    assert min(samples) != max(samples)
+    assert 0.9 < sum(samples) / len(samples) < 1.1
+    assert JitterPolicy(enabled=False).apply(1.0) == 1.0
+
+
+def test_time_to_target_is_recorded_per_transition(monkeypatch):
+    reset_time_to_target_stats()
+    clock = iter([100.0, 101.5])
+    monkeypatch.setattr(adaptive_wait.time, "time", lambda: next(clock))
+
+    waiter = AdaptiveWaiter(SERIAL, PollPolicy(), NO_JITTER)
+    waiter.observe("LOADING SCREEN")
+    waiter.observe("IN-GAME LOBBY (IN_CITY)")
+    assert waiter.reached("IN-GAME LOBBY (IN_CITY)") == pytest.approx(1.5)
+
+    (row,) = time_to_target_stats()
+    assert (row["from"], row["to"], row["count"], row["avg_polls"]) == ("LOADING SCREEN", "IN-GAME LOBBY (IN_CITY)", 1, 2.0)
+
+
+def test_fast_polling_requires_the_change_gate():
+    assert poll_policy_for(True).fast_sec == 0.15
+    ungated = AdaptiveWaiter(SERIAL, poll_policy_for(False), NO_JITTER)
+    assert ungated.next_delay() >= 0.3
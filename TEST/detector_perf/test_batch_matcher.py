@@ -0,0 +1,81 @@
+"""Tests for the batched multi-template matcher."""
+
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+import cv2
+import numpy as np
+import pytest
+
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.core.workflow.batch_matcher import BatchMatcher, group_by_roi
+from backend.core.workflow.state_detector import GameStateDetector, UNKNOWN_STATE
+
+TEMPLATES_DIR = PROJECT_ROOT / "backend" / "core" / "workflow" / "templates"
+
+
+@pytest.fixture(scope="module")
+def detector():
+    return GameStateDetector("adb", str(TEMPLATES_DIR), learn_rois=False, learn_transitions=False)
+
+
+def _frame_with(template_file: str, x: int, y: int) -> np.ndarray:
+    frame = cv2.imread(str(TEMPLATES_DIR / "clean_state_960x540.png"), cv2.IMREAD_COLOR)
+    tmpl = cv2.imread(str(TEMPLATES_DIR / template_file), cv2.IMREAD_COLOR)
+    h, w = tmpl.shape[:2]
+    frame[y:y + h, x:x + w] = tmpl
+    return frame
+
+
+def test_group_by_roi_merges_transitive_overlaps_only():
+    groups = group_by_roi([(0, 0, 10, 10), (20, 20, 30, 30), (5, 5, 25, 25), (100, 100, 120, 120), None])
+
+    assert ((0, 0, 30, 30), [0, 1, 2]) in groups
+    assert ((100, 100, 120, 120), [3]) in groups
+    assert (None, [4]) in groups
+
+
+@pytest.mark.parametrize("parallel", [False, True])
+def test_batch_scores_equal_sequential_scores(detector, parallel):
+    screen = _frame_with("lobby_hammer.png", 10, 390)
+    gray = cv2.cvtColor(screen, cv2.COLOR_BGR2GRAY)
+
+    for category in ("state", "construction", "special"):
+        scores = BatchMatcher(detector._registry[category]).match(gray, parallel=parallel)
+        i = 0
+        for entries in detector._registry[category].values():
+            for entry in entries:
+                expected, loc = detector._match_single(gray, entry, 0.8)
+                assert scores.scores[i] == pytest.approx(expected, abs=1e-5)
+                assert scores.locs[i] == loc
+                i += 1
+
+
+def test_check_state_full_classifies_from_one_pass(detector):
+    screen = _frame_with("lobby_hammer.png", 10, 390)
+    detector._last_matched_state = None
+    detector._cache.update(screen)
+
+    result = detector.check_state_full("emulator-5554")
+
+    assert result["state"] == "IN-GAME LOBBY (IN_CITY)"
+    assert result["construction"] is None and result["special"] is None
+    assert set(result["scores"]) == {"state", "construction", "special"}
+    assert result["scores"]["state"].score("IN-GAME LOBBY (IN_CITY)") >= 0.8
+
+
+def test_check_state_full_falls_through_to_construction(detector):
+    screen = _frame_with("contructions/con_tavern.png", 20, 5)
+    detector._last_matched_state = None
+    detector._cache.update(screen)
+
+    result = detector.check_state_full("emulator-5554")
+
+    assert result["state"] == UNKNOWN_STATE
+    assert result["construction"] == "TAVERN"
@@ -0,0 +1,138 @@
+"""Tests for the process-wide per-serial frame bus (runs against fake adb)."""
+
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+import threading
+
+import numpy as np
+
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.core.workflow.frame_bus import THUMB_SIZE, drop_frame_bus, get_frame_bus
+from backend.core.workflow.frame_source import close_all_frame_sources
+from backend.core.workflow.state_detector import GameStateDetector
+
+FAKE_ADB = str(CURRENT_DIR / "fake_adb.py")
+TEMPLATES_DIR = str(PROJECT_ROOT / "backend" / "core" / "workflow" / "templates")
+SERIAL = "emulator-5554"
+
+
+def teardown_function():
+    drop_frame_bus(SERIAL)
+    close_all_frame_sources()
+
+
+def test_bus_reuses_fresh_frame_and_honours_newer_than():
+    bus = get_frame_bus(SERIAL, FAKE_ADB)
+
+    first = bus.get()
+    again = bus.get()
+    newer = bus.get(newer_than=first.frame_id)
+
+    assert again is first
+    assert newer.frame_id > first.frame_id
+    assert first.gray.shape == (540, 960)
+    assert first.thumb.shape == (THUMB_SIZE[1], THUMB_SIZE[0])
+    assert bus.captures == 2
+
+
+def test_concurrent_requests_share_one_capture():
+    bus = get_frame_bus(SERIAL, FAKE_ADB)
+    start = threading.Barrier(6)
+    results = []
+
+    def _consumer():
+        start.wait()
+        results.append(bus.get(newer_than=0, max_age_ms=0))
+
+    threads = [threading.Thread(target=_consumer) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert all(r is not None for r in results)
+    assert bus.captures < len(results)
+
+
+def test_detectors_share_frames_and_invalidate_requests_newer_frame():
+    a = GameStateDetector(FAKE_ADB, TEMPLATES_DIR, learn_rois=False, learn_transitions=False)
+    b = GameStateDetector(FAKE_ADB, TEMPLATES_DIR, learn_rois=False, learn_transitions=False)
+
+    frame_a = a.screencap_memory(SERIAL)
+    frame_b = b.screencap_memory(SERIAL)
+    assert frame_b is frame_a  # one capture served both detectors
+
+    a._cache.invalidate()
+    refreshed = a.screencap_memory(SERIAL)
+    assert refreshed is not frame_a
+    assert a._cache.frame_id > b._cache.frame_id
+    assert np.array_equal(a._cache.gray, a.frame_bus(SERIAL).latest.gray)
+
+
+def test_change_gate_scenes_and_freeze_tracking():
+    bus = get_frame_bus(SERIAL, FAKE_ADB)
+    base = np.full((540, 960, 3), 80, np.uint8)
+
+    a = bus.publish(base)
+    same = bus.publish(base.copy())
+    noisy = base.copy()
+    noisy[::2, ::2] += 3                      # sub-tolerance change: same scene, but not frozen
+    near = bus.publish(noisy)
+    moved = base.copy()
+    moved[200:300, 400:500] = 255             # real change: new scene
+    new = bus.publish(moved)
+
+    assert not same.changed and same.scene_id == a.scene_id
+    assert near.changed and near.scene_id == a.scene_id
+    assert new.changed and new.scene_id == new.frame_id
+    assert bus.unchanged_since(new.frame_id)
+    assert not bus.unchanged_since(same.frame_id)
+
+
+def test_detector_skips_matching_on_unchanged_scene():
+    detector = GameStateDetector(FAKE_ADB, TEMPLATES_DIR, learn_rois=False, learn_transitions=False, change_gate=True)
+    bus = detector.frame_bus(SERIAL)
+    frame = np.full((540, 960, 3), 80, np.uint8)
+
+    bus.publish(frame)
+    first = detector.check_state(SERIAL)
+    calls = detector.match_calls
+
+    detector._cache.invalidate()
+    bus.publish(frame.copy())
+    assert detector.check_state(SERIAL) == first
+    assert detector.match_calls == calls and detector.gate_stats()["hits"] == 1
+
+    detector._cache.invalidate()
+    frame[100:200, 100:300] = 255
+    bus.publish(frame)
+    detector.check_state(SERIAL)
+    assert detector.match_calls > calls
+
+
+def test_change_gate_is_opt_in_and_never_covers_template_lookups():
+    default = GameStateDetector(FAKE_ADB, TEMPLATES_DIR, learn_rois=False, learn_transitions=False)
+    gated = GameStateDetector(FAKE_ADB, TEMPLATES_DIR, learn_rois=False, learn_transitions=False, change_gate=True)
+    bus = gated.frame_bus(SERIAL)
+    frame = np.full((540, 960, 3), 80, np.uint8)
+
+    for detector in (default, gated):
+        for _ in range(2):
+            detector._cache.invalidate()
+            bus.publish(frame.copy())
+            calls = detector.match_calls
+            detector.check_activity(SERIAL)
+            detector.check_construction(SERIAL)
+            assert detector.match_calls > calls      # lookups re-match every frame
+    default._cache.invalidate()
+    default.check_state(SERIAL)
+    default._cache.invalidate()
+    bus.publish(frame.copy())
+    default.check_state(SERIAL)
+    assert default.gate_stats()["hits"] == 0 and gated.gate_stats()["hits"] == 0
@@ -0,0 +1,150 @@
+"""Tests for the shared per-serial frame source layer (runs against fake adb)."""
+
+from __future__ import annotations
+
+from pathlib import Path
+import struct
+import sys
+
+import cv2
+import numpy as np
+import pytest
+
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.core.workflow import frame_source
+from backend.core.workflow.frame_source import (
+    RawFrameSource,
+    StreamFrameSource,
+    SubprocessFrameSource,
+    decode_raw_screencap,
+    get_frame_source,
+    parse_raw_header,
+)
+
+FAKE_ADB = str(CURRENT_DIR / "fake_adb.py")
+SERIAL = "emulator-5554"
+
+
+def test_parse_raw_header_reads_width_height_format():
+    header = struct.pack("<IIII", 960, 540, 1, 0)
+    assert parse_raw_header(header) == (960, 540, 1)
+
+
+@pytest.mark.parametrize("header_size", [12, 16])
+def test_decode_raw_screencap_returns_bgr_and_gray(header_size):
+    rgba = np.zeros((4, 6, 4), np.uint8)
+    rgba[..., 0] = 200  # R
+    rgba[..., 2] = 10   # B
+    header = struct.pack("<III", 6, 4, 1) + b"\0" * (header_size - 12)
+
+    bgr, gray = decode_raw_screencap(header + rgba.tobytes())
+
+    assert bgr.shape == (4, 6, 3)
+    assert tuple(bgr[0, 0]) == (10, 0, 200)
+    assert np.array_equal(gray, cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY))
+
+
+def test_decode_raw_screencap_rejects_implausible_header():
+    with pytest.raises(ValueError):
+        decode_raw_screencap(struct.pack("<IIII", 0, 540, 1, 0))
+    with pytest.raises(ValueError):
+        decode_raw_screencap(struct.pack("<IIII", 960, 540, 5, 0) + b"\0" * 960 * 540 * 4)
+
+
+def test_decode_raw_screencap_rejects_truncated_dump():
+    header = struct.pack("<IIII", 960, 540, 1, 0)
+    with pytest.raises(ValueError):
+        decode_raw_screencap(header + b"\0" * 100)
+
+
+def test_raw_mode_matches_png_mode():
+    png_frame = SubprocessFrameSource(SERIAL, FAKE_ADB).grab()
+    raw_frame, raw_gray = RawFrameSource(SERIAL, FAKE_ADB).grab_pair()
+
+    assert np.array_equal(raw_frame, png_frame)
+    assert raw_gray.shape == (540, 960)
+
+
+def test_stream_frame_matches_png_frame():
+    png_frame = SubprocessFrameSource(SERIAL, FAKE_ADB).grab()
+    stream = StreamFrameSource(SERIAL, FAKE_ADB)
+    try:
+        first = stream.grab()
+        second = stream.grab()
+    finally:
+        stream.close()
+
+    assert png_frame is not None and first is not None
+    assert first.shape == (540, 960, 3)
+    assert np.array_equal(first, png_frame)
+    # Reusable raw buffer must not alias frames already handed out
+    assert first is not second and np.array_equal(first, second)
+    assert stream.fallback_count == 0
+
+
+def test_stream_falls_back_to_subprocess_when_shell_breaks(tmp_path):
+    # adb that only understands the one-shot PNG path
+    broken = tmp_path / "adb_no_shell.py"
+    broken.write_text(
+        "#!/usr/bin/env python3\n"
+        "import sys, runpy\n"
+        "if 'shell' in sys.argv: sys.exit(1)\n"
+        f"sys.argv = [{FAKE_ADB!r}] + sys.argv[1:]\n"
+        f"runpy.run_path({FAKE_ADB!r}, run_name='__main__')\n"
+    )
+    broken.chmod(0o755)
+
+    stream = StreamFrameSource(SERIAL, str(broken))
+    try:
+        frame = stream.grab()
+    finally:
+        stream.close()
+
+    assert frame is not None
+    assert stream.fallback_count == 1
+
+
+def test_stream_rejects_a_corrupt_header_before_reading_the_payload(tmp_path):
+    # persistent shell whose screencap header names an unknown pixel format (no payload follows)
+    corrupt = tmp_path / "adb_corrupt_header.py"
+    corrupt.write_text(
+        "#!/usr/bin/env python3\n"
+        "import struct, sys, runpy\n"
+        "if sys.argv[-1] == '-T':\n"
+        "    for line in sys.stdin.buffer:\n"
+        "        cmd = line.strip()\n"
+        "        if cmd.startswith(b'getprop'): sys.stdout.buffer.write(b'28\\n')\n"
+        "        elif cmd == b'screencap': sys.stdout.buffer.write(struct.pack('<IIII', 2, 2, 7, 0))\n"
+        "        sys.stdout.buffer.flush()\n"
+        "    sys.exit(0)\n"
+        f"sys.argv = [{FAKE_ADB!r}] + sys.argv[1:]\n"
+        f"runpy.run_path({FAKE_ADB!r}, run_name='__main__')\n"
+    )
+    corrupt.chmod(0o755)
+
+    stream = StreamFrameSource(SERIAL, str(corrupt))
+    try:
+        frame = stream.grab()
+        assert not stream.stats()["stream_open"]
+    finally:
+        stream.close()
+
+    assert frame is not None and stream.fallback_count == 1
+    assert len(stream._buffer) == 16          # header only: no payload buffer was allocated
+
+
+def test_registry_shares_one_source_per_serial():
+    try:
+        a = get_frame_source(SERIAL, FAKE_ADB)
+        b = get_frame_source(SERIAL, FAKE_ADB)
+        c = get_frame_source("emulator-5556", FAKE_ADB)
+        d = get_frame_source(SERIAL, FAKE_ADB, mode="png")
+        assert a is b
+        assert a is not c
+        assert isinstance(d, SubprocessFrameSource) and d is not a
+    finally:
+        frame_source.close_all_frame_sources()
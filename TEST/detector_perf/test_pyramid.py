@@ -0,0 +1,80 @@
+"""Tests for coarse-to-fine pyramid matching of full-screen templates."""
+
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+import cv2
+import numpy as np
+import pytest
+
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.core.workflow import state_detector, template_pyramid
+from backend.core.workflow.detector_configs import PYRAMID_HINTS, ROI_HINTS
+from backend.core.workflow.state_detector import GameStateDetector
+from backend.core.workflow.template_pyramid import (
+    ScaledFrameCache, build_entry_pyramid, downscale, match_coarse_to_fine,
+)
+
+TEMPLATES_DIR = PROJECT_ROOT / "backend" / "core" / "workflow" / "templates"
+
+
+def _frame_with(template_file: str, x: int, y: int) -> np.ndarray:
+    frame = cv2.imread(str(TEMPLATES_DIR / "clean_state_960x540.png"), cv2.IMREAD_COLOR)
+    tmpl = cv2.imread(str(TEMPLATES_DIR / template_file), cv2.IMREAD_COLOR)
+    h, w = tmpl.shape[:2]
+    frame[y:y + h, x:x + w] = tmpl
+    return frame
+
+
+def test_pyramid_hints_only_cover_full_screen_templates():
+    assert not set(PYRAMID_HINTS) & set(ROI_HINTS)
+
+
+@pytest.mark.parametrize("x,y", [(331, 485), (49, 37), (520, 110)])
+def test_coarse_to_fine_matches_full_resolution_at_odd_offsets(x, y):
+    frame = cv2.cvtColor(_frame_with("alliance/no_rally.png", x, y), cv2.COLOR_BGR2GRAY)
+    tmpl = cv2.imread(str(TEMPLATES_DIR / "alliance/no_rally.png"), cv2.IMREAD_GRAYSCALE)
+
+    val, loc = match_coarse_to_fine(frame, tmpl, downscale(tmpl, 0.5), downscale(frame, 0.5), 0.5, 0.98)
+
+    assert val >= 0.98
+    assert loc == (x, y)
+
+
+def test_no_refine_window_falls_back_to_full_resolution(monkeypatch):
+    frame = cv2.cvtColor(_frame_with("alliance/no_rally.png", 331, 485), cv2.COLOR_BGR2GRAY)
+    tmpl = cv2.imread(str(TEMPLATES_DIR / "alliance/no_rally.png"), cv2.IMREAD_GRAYSCALE)
+    monkeypatch.setattr(template_pyramid, "PYRAMID_REFINE_PAD", -10_000)   # no refine window fits
+
+    val, loc = match_coarse_to_fine(frame, tmpl, downscale(tmpl, 0.5), downscale(frame, 0.5), 0.5, 0.98)
+
+    assert val >= 0.98 and loc == (331, 485)
+
+
+def test_small_templates_are_not_pyramided():
+    tiny = np.zeros((20, 20), np.uint8)
+    assert build_entry_pyramid({"gray": tiny, "color": tiny}, 0.5) is None
+
+
+def test_scaled_frame_cache_reuses_per_frame():
+    cache = ScaledFrameCache()
+    a, b = np.zeros((540, 960), np.uint8), np.zeros((540, 960), np.uint8)
+
+    assert cache.get(a, 0.5) is cache.get(a, 0.5)
+    assert cache.get(b, 0.5) is not cache.get(a, 0.5)
+
+
+def test_detector_uses_pyramid_for_hinted_templates(monkeypatch):
+    monkeypatch.setattr(state_detector, "PYRAMID_HINTS", {"contructions/con_tavern.png": 0.5})
+    detector = GameStateDetector("adb", str(TEMPLATES_DIR), learn_rois=False, learn_transitions=False)
+    entry = detector.construction_templates["TAVERN"][0]
+    assert entry["pyramid"] is not None and entry["pyramid"]["scale"] == 0.5
+
+    detector._cache.update(_frame_with("contructions/con_tavern.png", 301, 77))
+    assert detector.check_construction("emulator-5554", target="TAVERN") == "TAVERN"
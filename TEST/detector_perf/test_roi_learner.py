@@ -0,0 +1,118 @@
+"""Tests for learned ROIs of un-hinted templates."""
+
+from __future__ import annotations
+
+from pathlib import Path
+import json
+import sys
+
+import cv2
+import numpy as np
+
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.core.workflow import roi_learner
+from backend.core.workflow.roi_learner import (
+    ROI_FALLBACK_EVERY, ROI_LEARN_MARGIN, ROI_LEARN_MIN_HITS, ROI_LEARN_WINDOW, RoiLearner,
+)
+from backend.core.workflow.state_detector import GameStateDetector
+
+TEMPLATES_DIR = PROJECT_ROOT / "backend" / "core" / "workflow" / "templates"
+TEMPLATE = "tavern/free_draw_btn.png"
+
+
+def _frame_with(template_file: str, x: int, y: int) -> np.ndarray:
+    frame = cv2.imread(str(TEMPLATES_DIR / "clean_state_960x540.png"), cv2.IMREAD_COLOR)
+    tmpl = cv2.imread(str(TEMPLATES_DIR / template_file), cv2.IMREAD_COLOR)
+    h, w = tmpl.shape[:2]
+    frame[y:y + h, x:x + w] = tmpl
+    return frame
+
+
+def test_roi_is_learned_after_min_hits_and_persisted(tmp_path):
+    path = str(tmp_path / "learned_roi.json")
+    learner = RoiLearner(path)
+    for i in range(ROI_LEARN_MIN_HITS):
+        assert learner.roi_for(TEMPLATE) is None
+        learner.record(TEMPLATE, (400 + i, 300), (157, 51))
+
+    expected = (400 - ROI_LEARN_MARGIN, 300 - ROI_LEARN_MARGIN,
+                404 + 157 + ROI_LEARN_MARGIN, 351 + ROI_LEARN_MARGIN)
+    assert learner.roi_for(TEMPLATE) == expected
+    assert json.loads(Path(path).read_text())["templates"][TEMPLATE]["hits"] < ROI_LEARN_MIN_HITS  # debounced
+    learner.flush()
+    assert json.loads(Path(path).read_text())["templates"][TEMPLATE]["hits"] == ROI_LEARN_MIN_HITS
+    assert RoiLearner(path).roi_for(TEMPLATE) == expected
+
+
+def test_old_placements_age_out_of_the_roi(tmp_path):
+    learner = RoiLearner(str(tmp_path / "learned_roi.json"))
+    for _ in range(ROI_LEARN_MIN_HITS):
+        learner.record(TEMPLATE, (100, 100), (157, 51))
+    for _ in range(ROI_LEARN_WINDOW - 1):
+        learner.record(TEMPLATE, (500, 400), (157, 51))
+    assert learner.roi_for(TEMPLATE)[:2] == (100 - ROI_LEARN_MARGIN, 100 - ROI_LEARN_MARGIN)
+
+    learner.record(TEMPLATE, (500, 400), (157, 51))
+    assert learner.roi_for(TEMPLATE)[:2] == (500 - ROI_LEARN_MARGIN, 400 - ROI_LEARN_MARGIN)
+
+
+def test_oversized_roi_is_not_used(tmp_path):
+    learner = RoiLearner(str(tmp_path / "learned_roi.json"))
+    for i in range(ROI_LEARN_MIN_HITS):
+        learner.record(TEMPLATE, (0, 0) if i % 2 else (800, 480), (157, 51))
+    assert learner.roi_for(TEMPLATE) is None
+
+
+def test_detector_uses_learned_roi_and_falls_back_on_miss(tmp_path):
+    learner = RoiLearner(str(tmp_path / "learned_roi.json"))
+    detector = GameStateDetector("adb", str(TEMPLATES_DIR), learn_rois=False, learn_transitions=False)
+    detector.roi_learner = learner
+
+    for _ in range(ROI_LEARN_MIN_HITS):
+        detector._cache.update(_frame_with(TEMPLATE, 500, 400))
+        assert detector.check_activity("emulator-5554", target="TAVERN_FREE_DRAW")
+    assert learner.roi_for(TEMPLATE) is not None
+
+    detector._cache.update(_frame_with(TEMPLATE, 500, 400))
+    assert detector.check_activity("emulator-5554", target="TAVERN_FREE_DRAW")
+    assert learner.roi_hits == 1
+
+    # Button moved: learned ROI misses, full-frame fallback finds it and the ROI grows
+    detector._cache.update(_frame_with(TEMPLATE, 300, 250))
+    match = detector.check_activity("emulator-5554", target="TAVERN_FREE_DRAW")
+    assert match and match[1] == 300 + 157 // 2
+    assert learner.fallbacks == 1 and learner.fallback_hits == 1
+    assert learner.roi_for(TEMPLATE)[:2] == (300 - ROI_LEARN_MARGIN, 250 - ROI_LEARN_MARGIN)
+
+
+def test_roi_miss_is_trusted_until_a_recheck_is_due(tmp_path, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(roi_learner.time, "monotonic", lambda: clock[0])
+    learner = RoiLearner(str(tmp_path / "learned_roi.json"))
+    for _ in range(ROI_LEARN_MIN_HITS):
+        learner.record(TEMPLATE, (500, 400), (157, 51))
+    detector = GameStateDetector("adb", str(TEMPLATES_DIR), learn_rois=False, learn_transitions=False)
+    detector.roi_learner = learner
+
+    # Template absent: the first miss re-checks the full frame, the next ones stand
+    empty = cv2.imread(str(TEMPLATES_DIR / "clean_state_960x540.png"), cv2.IMREAD_COLOR)
+
+    def check():
+        detector._cache.update(empty)
+        return detector.check_activity("emulator-5554", target="TAVERN_FREE_DRAW")
+
+    for _ in range(ROI_FALLBACK_EVERY):
+        assert check() is None
+    assert (learner.fallbacks, learner.roi_misses) == (1, ROI_FALLBACK_EVERY - 1)
+    assert check() is None
+    assert learner.fallbacks == 2
+
+    # A new bus scene or enough elapsed time also triggers a re-check
+    assert learner.should_fallback(TEMPLATE, scene_id=7)
+    assert not learner.should_fallback(TEMPLATE, scene_id=7)
+    clock[0] += roi_learner.ROI_FALLBACK_INTERVAL_SEC
+    assert learner.should_fallback(TEMPLATE, scene_id=7)
@@ -0,0 +1,136 @@
+"""Tests for the persistent per-serial input shell behind adb_helper (runs against fake adb)."""
+
+from __future__ import annotations
+
+from pathlib import Path
+import stat
+import subprocess
+import sys
+
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.config import config
+from backend.core.workflow import adb_helper, shell_session
+from backend.core.workflow.shell_session import ShellSession
+
+FAKE_ADB = str(CURRENT_DIR / "fake_adb.py")
+SERIAL = "emulator-5554"
+
+
+def _input_log(tmp_path, monkeypatch) -> Path:
+    log = tmp_path / "input.log"
+    monkeypatch.setenv("FAKE_ADB_INPUT_LOG", str(log))
+    return log
+
+
+def test_input_helpers_share_one_shell(tmp_path, monkeypatch):
+    log = _input_log(tmp_path, monkeypatch)
+    monkeypatch.setattr(config, "adb_path", FAKE_ADB)
+    try:
+        adb_helper.tap(SERIAL, 100, 200)
+        adb_helper.swipe(SERIAL, 1, 2, 3, 4, 250)
+        adb_helper.press_back_n(SERIAL, 2, delay=0)
+        adb_helper.input_text(SERIAL, "Lord One")
+        stats = shell_session.shell_session_stats()[SERIAL]
+    finally:
+        shell_session.close_all_shell_sessions()
+
+    sent = log.read_text().splitlines()
+    assert sent[0].startswith("input tap ")
+    assert sent[1:] == [
+        "input swipe 1 2 3 4 250",
+        "input keyevent 4",
+        "input keyevent 4",
+        "input text Lord%sOne",
+    ]
+    assert (stats["commands"], stats["fallbacks"], stats["reconnects"]) == (5, 0, 0)
+
+
+def test_replies_are_framed_by_the_sentinel():
+    session = ShellSession(SERIAL, FAKE_ADB)
+    try:
+        assert session.run("echo first line") == "first line"
+        assert session.run("input keyevent 4") == ""
+        assert session.run("echo second") == "second"
+        assert session.run("printf 'no newline'") == "no newline"
+        assert session.run("echo after") == "after"
+        assert session.ping()
+    finally:
+        session.close()
+
+
+def test_dead_shell_is_reopened_before_the_next_command(tmp_path, monkeypatch):
+    log = _input_log(tmp_path, monkeypatch)
+    session = ShellSession(SERIAL, FAKE_ADB)
+    try:
+        session.run("input keyevent 4")
+        session._proc.kill()
+        session._proc.wait()
+        session.run("input keyevent 3")
+        assert session.is_open
+    finally:
+        session.close()
+
+    assert log.read_text().splitlines() == ["input keyevent 4", "input keyevent 3"]
+    assert (session.reconnects, session.fallback_count) == (1, 0)
+
+
+class _BrokenStdin:
+    def write(self, data):
+        raise BrokenPipeError(32, "Broken pipe")
+
+    def flush(self):
+        pass
+
+
+def test_command_is_resent_when_it_never_reached_the_shell(tmp_path, monkeypatch):
+    log = _input_log(tmp_path, monkeypatch)
+    session = ShellSession(SERIAL, FAKE_ADB)
+    try:
+        session.run("input keyevent 4")
+        stdin, session._proc.stdin = session._proc.stdin, _BrokenStdin()
+        stdin.close()
+        session.run("input keyevent 3")
+        assert session.is_open
+    finally:
+        session.close()
+
+    assert log.read_text().splitlines() == ["input keyevent 4", "input keyevent 3"]
+    assert (session.reconnects, session.failures, session.fallback_count) == (1, 0, 0)
+
+
+def test_idle_shell_that_stopped_answering_is_replaced(monkeypatch):
+    session = ShellSession(SERIAL, FAKE_ADB)
+    try:
+        session.run("echo warm")
+        session._proc.kill()
+        session._proc.wait()
+        # alive, but never answers (e.g. adbd wedged after an emulator hiccup)
+        session._proc = subprocess.Popen(
+            [sys.executable, "-c", "import time; time.sleep(30)"],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+        )
+        monkeypatch.setattr(shell_session, "SHELL_HEALTH_CHECK_IDLE_SEC", 0)
+        monkeypatch.setattr(shell_session, "SHELL_OPEN_TIMEOUT_SEC", 0.3)
+        assert session.run("echo after") == "after"
+    finally:
+        session.close()
+
+    assert (session.reconnects, session.failures, session.fallback_count) == (1, 0, 0)
+
+
+def test_falls_back_to_one_shot_adb_when_the_shell_will_not_open(tmp_path, monkeypatch):
+    log = _input_log(tmp_path, monkeypatch)
+    no_shell = tmp_path / "adb_no_persistent_shell.sh"
+    no_shell.write_text(f'#!/bin/sh\n[ "$4" = "-T" ] && exit 1\nexec "{sys.executable}" "{FAKE_ADB}" "$@"\n')
+    no_shell.chmod(no_shell.stat().st_mode | stat.S_IEXEC)
+
+    session = ShellSession(SERIAL, str(no_shell))
+    session.run("input tap 1 2")
+    session.run("input tap 3 4")     # within the retry cooldown: no new open attempt
+
+    assert log.read_text().splitlines() == ["input tap 1 2", "input tap 3 4"]
+    assert session.fallback_count == 2 and not session.is_open
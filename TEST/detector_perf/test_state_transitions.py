@@ -0,0 +1,105 @@
+"""Tests for the learned state-transition ranking used by check_state."""
+
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+import cv2
+import numpy as np
+
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.core.workflow.detector_configs import STATE_CONFLICTS
+from backend.core.workflow.state_detector import GameStateDetector
+from backend.core.workflow.state_transitions import TRANSITION_MIN_COUNT, TransitionModel
+
+TEMPLATES_DIR = PROJECT_ROOT / "backend" / "core" / "workflow" / "templates"
+CITY = "IN-GAME LOBBY (IN_CITY)"
+PROFILE = "IN-GAME LOBBY (PROFILE MENU)"
+
+
+def _frame_with(template_file: str, x: int, y: int) -> np.ndarray:
+    frame = cv2.imread(str(TEMPLATES_DIR / "clean_state_960x540.png"), cv2.IMREAD_COLOR)
+    tmpl = cv2.imread(str(TEMPLATES_DIR / template_file), cv2.IMREAD_COLOR)
+    h, w = tmpl.shape[:2]
+    frame[y:y + h, x:x + w] = tmpl
+    return frame
+
+
+def test_rank_uses_action_context_and_falls_back_to_none(tmp_path):
+    model = TransitionModel(str(tmp_path / "t.json"))
+    for _ in range(TRANSITION_MIN_COUNT):
+        model.add(PROFILE, "back", CITY)
+        model.add(PROFILE, "none", PROFILE)
+
+    assert model.predict(PROFILE, "back") == [CITY]
+    assert model.predict(PROFILE, "tap") == [PROFILE]   # unseen action → action-less context
+    assert model.predict(CITY, "back") == []            # not learned yet
+
+    model.save()
+    assert TransitionModel(str(tmp_path / "t.json")).predict(PROFILE, "back") == [CITY]
+
+
+def test_text_input_has_its_own_context(tmp_path):
+    model = TransitionModel(str(tmp_path / "t.json"))
+    for _ in range(TRANSITION_MIN_COUNT):
+        model.add(PROFILE, "text", CITY)
+        model.add(PROFILE, "none", PROFILE)
+
+    assert model.predict(PROFILE, "text") == [CITY]
+
+
+def test_fit_log_lines_reads_workflow_output():
+    model = TransitionModel()
+    lines = [
+        f"[emulator-5554] Current detected state: {PROFILE}",
+        "[emulator-5554] -> Popup X button detected. Pressing BACK to dismiss...",
+        f"[emulator-5554] Current detected state: {CITY}",
+    ] * TRANSITION_MIN_COUNT
+
+    assert model.fit_log_lines(lines) == 2 * TRANSITION_MIN_COUNT - 1
+    assert model.predict(PROFILE, "back") == [CITY]
+
+
+def _ranked_detector(last_state) -> GameStateDetector:
+    ranked = GameStateDetector("adb", str(TEMPLATES_DIR), learn_rois=False, learn_transitions=False)
+    ranked.transitions = TransitionModel()
+    for _ in range(TRANSITION_MIN_COUNT):
+        ranked.transitions.add(last_state, "back", CITY)
+    ranked._last_matched_state = last_state
+    ranked.transitions.note_action("emulator-5554", "back")
+    return ranked
+
+
+def test_predicted_state_skips_priority_scan():
+    frame = _frame_with("lobby_hammer.png", 10, 390)
+
+    legacy = GameStateDetector("adb", str(TEMPLATES_DIR), learn_rois=False, learn_transitions=False)
+    legacy._cache.update(frame)
+    assert legacy.check_state("emulator-5554") == CITY
+
+    ranked = _ranked_detector(PROFILE)
+    ranked._cache.update(frame)
+
+    # CITY's HUD regions only overlap the loading screens: the menus ranked above it are skipped
+    assert STATE_CONFLICTS[CITY] == ["LOADING SCREEN (NETWORK ISSUE)", "LOADING SCREEN"]
+    assert ranked.check_state("emulator-5554") == CITY
+    assert ranked.match_calls < legacy.match_calls
+    assert ranked.transitions.last_action("emulator-5554") == "none"   # action consumed
+
+
+def test_prediction_never_overrides_an_overlapping_higher_priority_state():
+    frame = _frame_with("lobby_hammer.png", 10, 390)
+    loading = cv2.imread(str(TEMPLATES_DIR / "lobby_loading.png"), cv2.IMREAD_COLOR)
+    frame[20:20 + loading.shape[0], 20:20 + loading.shape[1]] = loading   # loading overlay over the HUD
+
+    ranked = _ranked_detector("IN-GAME LOBBY (EVENTS MENU)")
+    ranked._cache.update(frame)
+    assert ranked.check_state("emulator-5554") == "LOADING SCREEN"
+
+    ranked = _ranked_detector("IN-GAME LOBBY (EVENTS MENU)")
+    assert ranked._state_full_from_screen(frame, 0.8, "emulator-5554")["state"] == "LOADING SCREEN"
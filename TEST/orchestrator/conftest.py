@@ -0,0 +1,114 @@
+"""Shared fixtures for the orchestrator tests."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+import sys
+
+import pytest
+
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.core.workflow import (
+    bot_orchestrator, execution_log, ocr_swap_logger, smart_wait_logger, swap_logger, workflow_registry,
+)
+from backend.core.workflow.bot_orchestrator import BotOrchestrator
+
+ACTIVITIES = [{"id": "act_a", "name": "A", "config": {}}, {"id": "act_b", "name": "B", "config": {}}]
+TIME_SCALE = 200  # orchestrator sleeps (boot grace, 2 s pre-activity wait) run 200x faster
+
+
+@pytest.fixture(autouse=True)
+def workflow_log_dirs(monkeypatch, tmp_path):
+    """JSONL diagnostics the orchestrator writes go to tmp_path, not backend/core/workflow/logs/."""
+    for logger, name in ((swap_logger, "swap_account"), (smart_wait_logger, "smart_queue"),
+                         (ocr_swap_logger, "ocr_swap")):
+        monkeypatch.setattr(logger, "_LOG_DIR", str(tmp_path / "logs" / name))
+    return tmp_path / "logs"
+
+
+@pytest.fixture
+def make_accounts():
+    """make_accounts(emulators, per_emu) -> account dicts, per_emu accounts on each emulator."""
+    def _accounts(emulators: int, per_emu: int) -> list[dict]:
+        return [
+            {"id": emu * 10 + n, "game_id": f"g{emu}{n}", "lord_name": f"lord{emu}{n}", "emu_index": emu}
+            for emu in range(emulators)
+            for n in range(per_emu)
+        ]
+
+    return _accounts
+
+
+@pytest.fixture
+def run_orchestrator(monkeypatch):
+    """run_orchestrator(accounts, misc, setup=None) -> (orch, probe), every account run once."""
+    return lambda accounts, misc, setup=None: _run(monkeypatch, accounts, misc, setup)
+
+
+def _run(monkeypatch, accounts: list[dict], misc: dict, setup=None) -> tuple[BotOrchestrator, dict]:
+    probe = {"running": 0, "peak": 0, "runs": [], "known_ids": []}
+    real_sleep = asyncio.sleep
+
+    async def fast_sleep(sec, *args, **kwargs):
+        await real_sleep(sec / TIME_SCALE)
+
+    async def noop(*args, **kwargs):
+        return 0
+
+    async def no_cooldown(*args, **kwargs):
+        return 0, 0
+
+    monkeypatch.setattr(asyncio, "sleep", fast_sleep)
+    for name in ("create_run", "complete_run", "get_last_account_run", "start_account_activity",
+                 "finish_account_activity", "append_step_log"):
+        monkeypatch.setattr(execution_log, name, noop)
+    monkeypatch.setattr(execution_log, "get_effective_cooldown_sec", no_cooldown)
+    monkeypatch.setattr(workflow_registry, "build_steps_for_activity", lambda act_id, cfg: [{"config": {}}])
+    monkeypatch.setattr(
+        bot_orchestrator, "list_all_instances",
+        lambda: [{"index": a["emu_index"], "name": f"LD{a['emu_index']}", "running": True} for a in accounts],
+    )
+
+    # Account cooldown keeps every account to one run; the test stops once all have run
+    orch = BotOrchestrator(1, accounts, ACTIVITIES, None, {"cooldown_min": 60, **misc})
+    total = len(accounts) * len(ACTIVITIES)
+
+    async def lobby_ok(serial, detector, load_timeout=180):
+        return True
+
+    async def correct_account(serial, detector, account_detector, expected_game_id, target_lord,
+                              known_current_account_id=None, emu_idx=0, acc_id=""):
+        probe["known_ids"].append((emu_idx, known_current_account_id))
+        return True, expected_game_id
+
+    async def cross_emu_swap(old_emu_index, new_emu_index):
+        return True
+
+    async def live_account(serial, detector, context):
+        return {"lobby_ok": True, "account_id": None}
+
+    async def execute(emu_idx, emu_name, steps):
+        probe["running"] += 1
+        probe["peak"] = max(probe["peak"], probe["running"])
+        await asyncio.sleep(5)
+        probe["running"] -= 1
+        probe["runs"].append(emu_idx)
+        if len(probe["runs"]) >= total:
+            orch.stop()
+        return {"success": True}
+
+    orch._ensure_lobby = lobby_ok
+    orch._ensure_correct_account = correct_account
+    orch._handle_cross_emu_swap = cross_emu_swap
+    orch._read_live_account_id = live_account
+    orch._execute_current_account = execute
+    orch._detector_for = lambda emu_idx: object()
+    if setup:
+        setup(orch, probe)
+    asyncio.run(orch.start())
+    return orch, probe
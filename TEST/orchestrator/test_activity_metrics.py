@@ -0,0 +1,92 @@
+"""Tests for the in-memory activity metrics behind broadcast_state."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta
+from pathlib import Path
+import sqlite3
+import sys
+
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.config import config
+from backend.core.workflow import activity_metrics, execution_log
+from backend.core.workflow.bot_orchestrator import BotOrchestrator
+
+GROUP_ID = 7
+ACTIVITIES = [{"id": "gather", "name": "Gather", "config": {}}, {"id": "pet", "name": "Pet", "config": {}}]
+
+SCHEMA = """
+CREATE TABLE account_activity_logs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, run_id TEXT NOT NULL, account_id INTEGER NOT NULL,
+    game_id TEXT NOT NULL, emulator_id INTEGER, group_id INTEGER, activity_id TEXT NOT NULL,
+    activity_name TEXT NOT NULL, status TEXT NOT NULL, error_code TEXT DEFAULT '',
+    error_message TEXT DEFAULT '', started_at TEXT NOT NULL, finished_at TEXT,
+    duration_ms INTEGER DEFAULT 0, attempts INTEGER DEFAULT 1, source TEXT DEFAULT 'workflow',
+    metadata_json TEXT DEFAULT '{}', result_json TEXT DEFAULT '{}'
+);
+"""
+
+
+def _make_db(path: Path) -> None:
+    now = datetime.now()
+    rows = [
+        ("gather", "SUCCESS", now - timedelta(days=1)),
+        ("gather", "SUCCESS", now - timedelta(minutes=30)),
+        ("gather", "FAILED", now - timedelta(minutes=10)),
+        ("pet", "SUCCESS", now - timedelta(days=2)),
+    ]
+    with sqlite3.connect(path) as db:
+        db.executescript(SCHEMA)
+        db.executemany(
+            """INSERT INTO account_activity_logs (run_id, account_id, game_id, group_id, activity_id,
+               activity_name, status, started_at) VALUES ('r', 1, 'g1', ?, ?, ?, ?, ?)""",
+            [(GROUP_ID, act, act, status, ts.isoformat()) for act, status, ts in rows],
+        )
+
+
+def test_metrics_follow_activity_events_without_db_reads(tmp_path, monkeypatch):
+    db_path = tmp_path / "metrics.db"
+    _make_db(db_path)
+    monkeypatch.setattr(config, "db_path", str(db_path))
+
+    orch = BotOrchestrator(GROUP_ID, [{"id": 1, "game_id": "g1", "emu_index": 0}], ACTIVITIES, None)
+    execution_log.add_activity_listener(orch._on_activity_event)
+    try:
+        async def scenario():
+            seeded = await orch._get_activity_metrics()
+            log_id = await execution_log.start_account_activity(
+                "r2", 1, "g1", 0, GROUP_ID, "pet", "Pet"
+            )
+            await execution_log.finish_account_activity(log_id, "SUCCESS")
+            connects = []
+            monkeypatch.setattr(activity_metrics.db_pool, "connect", lambda *a, **k: connects.append(a))
+            cached = await orch._get_activity_metrics()
+            return seeded, cached, connects
+
+        seeded, cached, connects = asyncio.run(scenario())
+    finally:
+        execution_log.remove_activity_listener(orch._on_activity_event)
+
+    assert seeded["gather"]["runs_today"] == 1 and seeded["pet"]["runs_today"] == 0
+    assert cached["pet"]["runs_today"] == 1
+    assert cached["pet"]["last_run"] > seeded["pet"]["last_run"]
+    assert cached["gather"] == seeded["gather"]
+    assert connects == []
+    # the finished SUCCESS also reached the cooldown scheduler
+    assert orch.cooldowns.activity_run("1", "pet")[0] > 0
+
+
+def test_runs_today_rolls_over_and_undo_marks_stale():
+    metrics = activity_metrics.ActivityMetrics(GROUP_ID, ["gather"])
+    metrics.on_activity_event({"group_id": str(GROUP_ID), "activity_id": "gather", "status": "SUCCESS",
+                               "started_at": "2026-01-01T23:59:00"})
+    assert metrics.snapshot(today="2026-01-01")["gather"]["runs_today"] == 1
+    assert metrics.snapshot(today="2026-01-02")["gather"]["runs_today"] == 0
+
+    metrics.on_activity_event({"group_id": None, "activity_id": "gather", "status": "UNDO"})
+    assert metrics.stale
@@ -0,0 +1,89 @@
+"""Tests for the heap-based cooldown scheduler used by BotOrchestrator."""
+
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+
+import pytest
+
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.core.workflow.cooldown_scheduler import CooldownScheduler
+
+NOW = 1_000_000.0
+HEAVY = {"id": "gather", "config": {"cooldown_enabled": True, "cooldown_minutes": 60, "weight": "heavy"}}
+LIGHT = {"id": "claim", "config": {"weight": "light"}}
+
+
+def _queue(n: int) -> list[dict]:
+    return [{"id": i, "emu_index": 0} for i in range(n)]
+
+
+def _run_turns(sched: CooldownScheduler, now: float, turns: int) -> list[str]:
+    order = []
+    for _ in range(turns):
+        acc_id = sched.pop(now)
+        if acc_id is None:
+            break
+        order.append(acc_id)
+        sched.finish(acc_id)
+    return order
+
+
+def test_account_cooldown_wakes_exactly_when_ready():
+    sched = CooldownScheduler([LIGHT], account_cooldown_sec=1800)
+    sched.record_account_run("1", NOW - 600)
+    sched.set_order(_queue(3))
+
+    assert sched.pop(NOW) == "0"
+    sched.record_account_run("0", NOW)
+    sched.finish("0")
+    assert sched.pop(NOW) == "2"
+    sched.record_account_run("2", NOW)
+    sched.finish("2")
+
+    assert sched.pop(NOW) is None
+    assert sched.next_ready_in(NOW) == pytest.approx(1200)
+    assert sched.pop(NOW + 1200) == "1"
+
+
+def test_light_only_accounts_wait_for_heavy_cooldown():
+    sched = CooldownScheduler([HEAVY, LIGHT])
+    sched.record_activity_run("0", "gather", NOW - 1800)
+    sched.record_activity_run("1", "gather", NOW - 1800, dynamic_cooldown_sec=2000)
+    sched.set_order(_queue(2))
+
+    assert sched.pop(NOW) is None                       # only the light activity is ready
+    assert sched.next_ready_in(NOW) == pytest.approx(200)   # dynamic cooldown wins over static
+    assert sched.pop(NOW + 200) == "1"
+
+    light_only = CooldownScheduler([LIGHT])
+    light_only.set_order(_queue(1))
+    assert light_only.pop(NOW) == "0"
+
+
+def test_account_ready_behind_cursor_waits_for_next_round():
+    sched = CooldownScheduler([LIGHT], account_cooldown_sec=100)
+    sched.record_account_run("0", NOW - 50)
+    sched.set_order(_queue(3))
+
+    assert _run_turns(sched, NOW, 2) == ["1", "2"]
+    # "0" became ready after the walk passed it → it runs in round 2, in queue order
+    assert _run_turns(sched, NOW + 60, 3) == ["0", "1", "2"]
+    assert sched.turn("2") == (3, 2)
+
+
+def test_partitions_and_requeue():
+    sched = CooldownScheduler([LIGHT])
+    sched.set_order(_queue(2) + [{"id": 5, "emu_index": 1}], partition_of=lambda a: a["emu_index"])
+
+    assert sched.pop(NOW, partition=1) == "5"
+    assert sched.pop(NOW, partition=1) is None
+    assert sched.pop(NOW, partition=0) == "0"
+    sched.requeue("0")                                   # turn not used up
+    assert sched.pop(NOW, partition=0) == "0"
+    assert sched.turn("0") == (1, 0)
@@ -0,0 +1,126 @@
+"""Tests for the per-emulator device executor."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+import sys
+import threading
+import time
+
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.core.workflow import device_executor
+from backend.core.workflow.device_executor import DeviceExecutor
+
+
+def _blocking_call(log: list, lock: threading.Lock, serial: str, sec: float = 0.05) -> str:
+    with lock:
+        log.append(("start", serial, threading.current_thread().name))
+    time.sleep(sec)
+    with lock:
+        log.append(("end", serial, threading.current_thread().name))
+    return serial
+
+
+def test_calls_for_one_serial_never_overlap():
+    executor = DeviceExecutor(global_slots=4)
+    log, lock = [], threading.Lock()
+
+    async def scenario():
+        return await asyncio.gather(*[
+            executor.run("emulator-5556", _blocking_call, log, lock, "emulator-5556", 0.02) for _ in range(4)
+        ])
+
+    try:
+        assert asyncio.run(scenario()) == ["emulator-5556"] * 4
+    finally:
+        executor.shutdown(wait=True)
+
+    kinds = [kind for kind, _, _ in log]
+    assert kinds == ["start", "end"] * 4
+    assert {name for _, _, name in log} == {"emu-5556_0"}
+
+    stats = executor.stats()["emulator-5556"]
+    assert stats["calls"] == 4 and stats["in_flight"] == 0
+    assert stats["wait_max_ms"] >= 40  # the last call queued behind three others
+
+
+def test_global_cap_bounds_lanes_running_at_once():
+    executor = DeviceExecutor(global_slots=2)
+    running, peak = [0], [0]
+    lock = threading.Lock()
+
+    def work():
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.05)
+        with lock:
+            running[0] -= 1
+
+    async def scenario():
+        await asyncio.gather(*[executor.run(f"emulator-{5554 + i * 2}", work) for i in range(4)])
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        executor.shutdown(wait=True)
+    assert peak[0] == 2
+
+
+def test_long_calls_do_not_hold_global_slots():
+    executor = DeviceExecutor(global_slots=1)
+    release = threading.Event()
+
+    def boot_wait():
+        release.wait(2)
+        return "booted"
+
+    async def scenario():
+        long = executor.run_long("emulator-5554", boot_wait)
+        short = executor.run("emulator-5556", lambda: "checked")
+        checked = await asyncio.wait_for(short, 1)   # would block behind boot_wait if it held the slot
+        release.set()
+        return checked, await long
+
+    try:
+        assert asyncio.run(scenario()) == ("checked", "booted")
+    finally:
+        release.set()
+        executor.shutdown(wait=True)
+    assert executor.stats()["emulator-5554"]["long_calls"] == 1
+
+
+def test_default_cap_covers_every_active_emulator(monkeypatch):
+    monkeypatch.setattr(device_executor, "default_global_slots", lambda: 2)
+    executor = DeviceExecutor()
+    try:
+        for i in range(5):
+            executor._lane(f"emulator-{5554 + i * 2}")
+        assert executor.global_slots == 5
+        assert DeviceExecutor(global_slots=2).global_slots == 2
+    finally:
+        executor.shutdown(wait=True)
+
+
+def test_errors_propagate_and_are_counted():
+    executor = DeviceExecutor(global_slots=1)
+
+    def boom():
+        raise ValueError("adb gone")
+
+    async def scenario():
+        try:
+            await executor.run("emulator-5554", boom)
+        except ValueError as e:
+            return str(e)
+
+    try:
+        assert asyncio.run(scenario()) == "adb gone"
+    finally:
+        executor.shutdown(wait=True)
+    assert executor.stats()["emulator-5554"]["errors"] == 1
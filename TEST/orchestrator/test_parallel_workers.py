@@ -0,0 +1,41 @@
+"""Tests for parallel emulator workers in BotOrchestrator (no emulator / DB needed)."""
+
+from __future__ import annotations
+
+
+def test_workers_run_emulators_concurrently(make_accounts, run_orchestrator):
+    accounts = make_accounts(3, 2)
+    orch, probe = run_orchestrator(accounts, {"parallel_emulators": True, "max_parallel_emulators": 3})
+
+    assert probe["peak"] == 3
+    assert sorted(probe["runs"]) == sorted([a["emu_index"] for a in accounts] * len(orch.activities))
+    assert orch.activities_completed == len(accounts) * len(orch.activities)
+    assert set(orch.last_run_times) == {str(a["id"]) for a in accounts}
+
+
+def test_concurrency_cap_limits_running_emulators(make_accounts, run_orchestrator):
+    _, probe = run_orchestrator(make_accounts(3, 1), {"parallel_emulators": True, "max_parallel_emulators": 2})
+    assert probe["peak"] == 2
+
+
+def test_verified_account_is_tracked_per_emulator(make_accounts, run_orchestrator):
+    orch, probe = run_orchestrator(make_accounts(2, 2), {"parallel_emulators": True, "max_parallel_emulators": 2})
+
+    # First account on each emulator starts unknown; the second one sees its own lane's previous account
+    assert set(probe["known_ids"]) == {(0, None), (0, "g00"), (1, None), (1, "g10")}
+    assert {emu: lane.last_verified_account_id for emu, lane in orch.lanes.items()} == {0: "g01", 1: "g11"}
+
+
+def test_sequential_mode_is_default(make_accounts, run_orchestrator):
+    orch, probe = run_orchestrator(make_accounts(2, 1), {})
+    assert probe["peak"] == 1 and not orch.lanes
+
+
+def test_activity_progress_stays_on_each_lane(make_accounts, run_orchestrator):
+    orch, _ = run_orchestrator(make_accounts(2, 1), {"parallel_emulators": True, "max_parallel_emulators": 2})
+
+    # Workers never write the orchestrator-level fields; the UI view merges the lanes
+    assert orch.current_activity is None
+    assert set(orch.activity_statuses.values()) == {"pending"}
+    assert all(set(lane.activity_statuses.values()) == {"done"} for lane in orch.lanes.values())
+    assert set(orch.live_activity_statuses().values()) == {"done"}
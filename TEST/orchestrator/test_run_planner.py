@@ -0,0 +1,86 @@
+"""Tests for the swap-minimizing run planner."""
+
+from __future__ import annotations
+
+from pathlib import Path
+import sys
+import time
+
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.core.workflow.bot_orchestrator import BotOrchestrator
+from backend.core.workflow.run_planner import SwapCosts, plan_cycle
+
+NOW = 1_000_000.0
+COSTS = SwapCosts({(0, 1): [100.0], (1, 0): [100.0]}, [20.0])
+
+
+def _accounts(*emus):
+    return [{"id": i + 1, "game_id": f"g{i + 1}", "emu_index": emu} for i, emu in enumerate(emus)]
+
+
+def _swaps(plan):
+    return [step["swap"] for step in plan["steps"]]
+
+
+def test_swap_costs_are_measured_from_swap_logs():
+    entries = [
+        {"ts": "2026-01-01T10:00:00", "event": "cross_emu_swap", "old_emu": 0, "new_emu": 1, "phase": "start"},
+        {"ts": "2026-01-01T10:00:30", "event": "cross_emu_swap", "old_emu": 0, "new_emu": 1, "phase": "quit_old"},
+        {"ts": "2026-01-01T10:01:30", "event": "cross_emu_swap", "old_emu": 0, "new_emu": 1, "phase": "complete", "success": True},
+        {"ts": "2026-01-01T10:02:00", "event": "ensure_correct_account", "serial": "emulator-5556", "phase": "start"},
+        {"ts": "2026-01-01T10:02:25", "event": "ensure_correct_account", "serial": "emulator-5556", "phase": "swap_loop_done"},
+        {"ts": "2026-01-01T10:03:00", "event": "ensure_correct_account", "serial": "emulator-5556", "phase": "start"},
+        {"ts": "2026-01-01T10:03:01", "event": "ensure_correct_account", "serial": "emulator-5556", "phase": "already_correct"},
+    ]
+    costs = SwapCosts.from_entries(entries)
+    assert costs.cross_emu(0, 1) == 90.0
+    assert costs.cross_emu(1, 2) == 90.0  # unseen pair falls back to the overall median
+    assert costs.in_game() == 25.0
+    assert costs.stats()["in_game_samples"] == 1
+
+
+def test_interleaved_queue_is_grouped_by_emulator():
+    queue = _accounts(0, 1, 0, 1)
+    plan = plan_cycle(queue, {}, COSTS, now=NOW, current_emu=0, active_game_id="g1", default_run_sec=60)
+
+    assert plan["order"] == ["1", "3", "2", "4"]
+    assert plan["cross_emu_swaps"] == 1 and plan["round_robin_cross_emu_swaps"] == 3
+    assert plan["estimated_savings_sec"] == 160.0  # two cross swaps traded for two in-game swaps
+    assert _swaps(plan) == ["none", "in_game", "cross_emu", "in_game"]
+
+
+def test_swap_time_is_weighed_against_cooldown_expiry():
+    queue = _accounts(0, 0, 1)
+
+    # Account 2 is ready by the time account 1 finishes: keep the round-robin order
+    plan = plan_cycle(queue, {"2": NOW + 30}, COSTS, now=NOW, default_run_sec=60)
+    assert plan["order"] == ["1", "2", "3"]
+    assert plan["estimated_savings_sec"] == 0.0
+
+    # Account 2 cools down for an hour: run emu 1 first so the late account
+    # costs an in-game swap instead of a cross-emu swap back
+    plan = plan_cycle(queue, {"2": NOW + 3600}, COSTS, now=NOW, default_run_sec=60)
+    assert plan["order"] == ["3", "1", "2"]
+    assert plan["steps"][-1]["wait_sec"] > 0 and plan["steps"][-1]["swap"] == "in_game"
+    assert plan["estimated_savings_sec"] == 80.0
+
+
+def test_orchestrator_plan_uses_in_memory_cooldowns():
+    activities = [{"id": "gather", "name": "Gather", "config": {}}]
+    orch = BotOrchestrator(1, _accounts(1, 2, 1), activities, None, {"cooldown_min": 60})
+    orch._swap_costs = COSTS
+    now = time.time()
+    orch.cooldowns.record_account_run("1", now - 600)  # 50 min of account cooldown left
+
+    plan = orch.plan_order(current_emu=1, active_game_id="g1", now=now)
+    # Leave emu 1 while account 1 cools down, come back once for both of its accounts
+    assert plan["order"][0] == "2" and plan["steps"][-1]["account_id"] == "1"
+    assert plan["estimated_savings_sec"] == 80.0
+    assert [a["id"] for a in orch.queue] == [1, 3, 2]  # dry run leaves the queue alone
+
+    assert orch._apply_swap_plan(1, "g1")
+    assert [a["id"] for a in orch.queue][0] == 2
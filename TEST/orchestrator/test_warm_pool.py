@@ -0,0 +1,106 @@
+"""Tests for the emulator warm pool used by the sequential orchestrator."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+import sys
+
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.core.workflow.warm_pool import WarmBudget, WarmPool
+
+
+def test_budget_caps_warm_instances():
+    assert WarmBudget(max_warm=3, ram_budget_mb=8192, cpu_budget_cores=6).capacity() == 2  # CPU: 3 - 1 active
+    assert WarmBudget(max_warm=3, ram_budget_mb=6144, cpu_budget_cores=16).capacity() == 2  # RAM: 3 - 1 active
+    assert WarmBudget(max_warm=1, cpu_budget_cores=16).capacity() == 1
+    assert WarmBudget(max_warm=2, cpu_budget_cores=2).capacity() == 0
+
+    budget = WarmBudget.from_misc({"max_warm_emulators": "2", "warm_ram_budget_mb": 4096, "ram_per_emulator_mb": None})
+    assert (budget.max_warm, budget.ram_budget_mb, budget.ram_per_emulator_mb) == (2, 4096, 2048)
+
+
+def test_pool_warms_window_and_cools_the_rest():
+    warmed, quit = [], []
+
+    async def warm(emu):
+        warmed.append(emu)
+        await asyncio.sleep(0.01)
+        return True
+
+    async def shut(emu):
+        quit.append(emu)
+
+    async def scenario():
+        pool = WarmPool(WarmBudget(max_warm=2, cpu_budget_cores=16), warm, shut)
+        assert pool.refresh(0, [0, 1, 2, 3]) == [1, 2]
+        assert await pool.claim(1) is True
+        assert await pool.claim(3) is None
+        pool.refresh(1, [3])  # Emu 2 fell out of the window
+        await asyncio.sleep(0)
+        await pool.shutdown()  # Emu 3 is still warm: quit with the pool
+        return pool
+
+    pool = asyncio.run(scenario())
+    assert warmed == [1, 2, 3]
+    assert quit == [2, 3]
+    assert (pool.hits, pool.misses, pool.cooled) == (1, 1, 1)
+
+
+def test_cooling_waits_for_the_cancelled_warm_up():
+    events = []
+
+    async def warm(emu):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            await asyncio.sleep(0.01)   # e.g. an adb call finishing before the task unwinds
+            events.append(f"warm {emu} cancelled")
+            raise
+        return True
+
+    async def shut(emu):
+        events.append(f"quit {emu}")
+
+    async def scenario():
+        pool = WarmPool(WarmBudget(max_warm=1, cpu_budget_cores=16), warm, shut)
+        pool.refresh(0, [1])
+        await asyncio.sleep(0)
+        pool.refresh(0, [])
+        await pool.shutdown()
+
+    asyncio.run(scenario())
+    assert events == ["warm 1 cancelled", "quit 1"]
+
+
+def test_sequential_run_swaps_to_prebooted_emulators(make_accounts, run_orchestrator):
+    events = {"warmed": [], "quit": [], "cold_swaps": 0}
+
+    def setup(orch, probe):
+        async def warm(emu):
+            events["warmed"].append(emu)
+            return True
+
+        async def shut(emu):
+            events["quit"].append(emu)
+
+        async def cold_swap(old_emu_index, new_emu_index):
+            events["cold_swaps"] += 1
+            return True
+
+        orch.warm_pool._warm_fn = warm
+        orch.warm_pool._quit_fn = shut
+        orch._handle_cross_emu_swap = cold_swap
+
+    misc = {"warm_pool": True, "max_warm_emulators": 1, "warm_cpu_budget_cores": 8, "swap_planner": False}
+    accounts = [{**acc, "emu_index": acc["emu_index"] + 1} for acc in make_accounts(3, 1)]
+    orch, probe = run_orchestrator(accounts, misc, setup)
+
+    assert probe["runs"] == [1, 1, 2, 2, 3, 3]
+    # Emu 3 is only warmed once Emu 2 is working (max_warm=1); each emulator left behind is shut down
+    assert events == {"warmed": [2, 3], "quit": [1, 2], "cold_swaps": 0}
+    assert orch.warm_pool.hits == 2
@@ -0,0 +1,134 @@
+"""
+Benchmark: /api/accounts list — per-account scan lookups vs. the account_latest_scan read model.
+
+  n+1        — the old get_all_accounts: accounts query, then latest snapshot by game_id,
+               emulator fallback and scan_resources for every account
+  read-model — Database.get_all_accounts: one query joining account_latest_scan
+
+Usage:
+    python TEST/storage/bench_accounts.py
+    python TEST/storage/bench_accounts.py --accounts 1000 --scans 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import io
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import aiosqlite
+
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.config import config
+
+if not config.is_loaded:
+    config.load()
+
+from backend.storage import db_pool
+from backend.storage.database import Database
+
+ACCOUNTS_PER_EMULATOR = 10
+
+
+async def _seed(db: Database, accounts: int, scans: int):
+    for i in range(accounts):
+        emu = i // ACCOUNTS_PER_EMULATOR
+        emu_id = await db.upsert_emulator(emu, f"emulator-{5554 + 2 * emu}", f"LDPlayer-{emu:02d}")
+        game_id = str(100000 + i)
+        await db.upsert_account(game_id, emulator_id=emu_id, lord_name=f"Lord {i}")
+        if i % 5 == 4:
+            continue        # no scan of its own: emulator fallback
+        for s in range(scans):
+            await db.save_scan_snapshot(
+                emu, f"emulator-{5554 + 2 * emu}", f"LDPlayer-{emu:02d}",
+                {"lord_name": f"Lord {i}", "power": 1000 * s + i, "hall_level": 20,
+                 "resources": {r: {"bag": s + 1, "total": 10 * (s + 1)} for r in ("gold", "wood", "ore", "mana")}},
+                game_id=game_id,
+            )
+
+
+async def _legacy_get_all_accounts(db_path: str) -> list[dict]:
+    """get_all_accounts before the read model (kept here for comparison)."""
+    async with db_pool.reader(db_path) as db:
+        db.row_factory = aiosqlite.Row
+        cursor = await db.execute(
+            """SELECT a.id as account_id, a.game_id, a.lord_name as acc_lord_name,
+                      e.id as emulator_db_id, e.emu_index
+               FROM accounts a LEFT JOIN emulators e ON a.emulator_id = e.id
+               ORDER BY a.is_active DESC, e.emu_index, a.game_id"""
+        )
+        accounts = [dict(row) for row in await cursor.fetchall()]
+        for acc in accounts:
+            scan_row = None
+            if acc["game_id"]:
+                cur = await db.execute(
+                    "SELECT * FROM scan_snapshots WHERE game_id = ? ORDER BY created_at DESC LIMIT 1",
+                    (acc["game_id"],),
+                )
+                scan_row = await cur.fetchone()
+            if not scan_row and acc.get("emulator_db_id"):
+                cur = await db.execute(
+                    "SELECT * FROM scan_snapshots WHERE emulator_id = ? ORDER BY created_at DESC LIMIT 1",
+                    (acc["emulator_db_id"],),
+                )
+                scan_row = await cur.fetchone()
+            if scan_row:
+                acc["power"] = scan_row["power"]
+                cur = await db.execute("SELECT * FROM scan_resources WHERE snapshot_id = ?", (scan_row["id"],))
+                for res in await cur.fetchall():
+                    acc[res["resource_type"]] = res["bag_value"]
+        return accounts
+
+
+async def _time(fn, repeats: int) -> list[float]:
+    samples = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--accounts", type=int, default=500)
+    parser.add_argument("--scans", type=int, default=3, help="snapshots per scanned account")
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config.db_path = str(Path(tmp) / "bench.db")
+        db = Database()
+        with contextlib.redirect_stdout(io.StringIO()):
+            db.init_sync()
+        asyncio.run(_seed(db, args.accounts, args.scans))
+
+        async def run():
+            await db_pool.open_pool(db.db_path)
+            try:
+                legacy = await _time(lambda: _legacy_get_all_accounts(db.db_path), args.repeats)
+                read_model = await _time(db.get_all_accounts, args.repeats)
+            finally:
+                await db_pool.close_pool()
+            return legacy, read_model
+
+        legacy, read_model = asyncio.run(run())
+
+    print(f"{args.accounts} accounts, {args.scans} scans each, {args.repeats} runs on the pooled reader")
+    print(f"{'mode':<11} {'p50 ms':>8} {'max ms':>8}")
+    for name, samples in (("n+1", legacy), ("read-model", read_model)):
+        print(f"{name:<11} {statistics.median(samples):>8.1f} {max(samples):>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Benchmark: activity-log inserts/sec and Task checklist latency by DB write path.
+
+  one-off  — every call opens its own aiosqlite connection, rollback journal (the old path)
+  pool     — db_pool.open_pool: one WAL writer + readers kept open, statement cache
+  batched  — pool + log_writer: execution_log records written behind in grouped transactions
+
+Writes go through execution_log.start_account_activity / finish_account_activity (one
+activity = INSERT + UPDATE, each with its task_daily_state upsert); reads through the
+/api/task/checklist handler.
+
+Usage:
+    python TEST/storage/bench_db_pool.py
+    python TEST/storage/bench_db_pool.py --accounts 500 --activities 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import io
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import aiosqlite
+
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.api import get_task_checklist   # loads config
+from backend.config import config
+from backend.core.workflow import execution_log, log_writer
+from backend.storage import db_pool
+from backend.storage.database import database
+
+ACTIVITIES = ["gather", "pet", "daily_claim", "alliance_help", "mail"]
+
+
+def _make_db(path: str, accounts: int, journal_mode: str):
+    config.db_path = path
+    database.db_path = path
+    database.init_sync()
+    with sqlite3.connect(path) as conn:
+        conn.execute(f"PRAGMA journal_mode = {journal_mode}")
+        conn.executemany(
+            "INSERT INTO accounts (game_id, lord_name) VALUES (?, ?)",
+            [(f"g{i}", f"Lord {i}") for i in range(accounts)],
+        )
+
+
+async def _run(accounts: int, activities: int, checklist_calls: int):
+    t0 = time.perf_counter()
+    for i in range(activities):
+        acc = i % accounts + 1
+        act = ACTIVITIES[i % len(ACTIVITIES)]
+        log_id = await execution_log.start_account_activity("bench", acc, f"g{acc - 1}", acc % 8, 1, act, act)
+        await execution_log.finish_account_activity(log_id, "SUCCESS", duration_ms=1000)
+    inserts_per_sec = activities / (time.perf_counter() - t0)
+
+    latencies = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(checklist_calls):
+            t0 = time.perf_counter()
+            await get_task_checklist(page_size=50)
+            latencies.append((time.perf_counter() - t0) * 1000)
+    return inserts_per_sec, statistics.median(latencies), max(latencies)
+
+
+async def _one_off(db_path, readonly=False):
+    return await aiosqlite.connect(db_path)
+
+
+def _bench(mode: str, accounts: int, activities: int, checklist_calls: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "bench.db")
+        _make_db(path, accounts, "DELETE" if mode == "one-off" else "WAL")
+
+        async def scenario():
+            if mode != "one-off":
+                await db_pool.open_pool(path)
+                if mode == "batched":
+                    log_writer.start()
+                try:
+                    return await _run(accounts, activities, checklist_calls)
+                finally:
+                    await log_writer.stop()
+                    await db_pool.close_pool()
+            return await _run(accounts, activities, checklist_calls)
+
+        if mode != "one-off":
+            return asyncio.run(scenario())
+        connect = db_pool.connect
+        db_pool.connect = _one_off
+        try:
+            return asyncio.run(scenario())
+        finally:
+            db_pool.connect = connect
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--accounts", type=int, default=100)
+    parser.add_argument("--activities", type=int, default=1000)
+    parser.add_argument("--checklist-calls", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{args.accounts} accounts, {args.activities} activities, {args.checklist_calls} checklist calls")
+    print(f"{'mode':<8} {'activities/s':>12} {'checklist p50 ms':>17} {'max ms':>8}")
+    for mode in ("one-off", "pool", "batched"):
+        rate, p50, worst = _bench(mode, args.accounts, args.activities, args.checklist_calls)
+        print(f"{mode:<8} {rate:>12.0f} {p50:>17.1f} {worst:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Tests for the account_latest_scan read model behind get_all_accounts."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+import sqlite3
+import sys
+
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.config import config
+
+if not config.is_loaded:
+    config.load()
+
+from backend.storage import db_pool
+from backend.storage.database import Database
+
+
+def _make_db(tmp_path: Path, monkeypatch) -> Database:
+    monkeypatch.setattr(config, "db_path", str(tmp_path / "accounts.db"))
+    db = Database()
+    db.init_sync()
+    return db
+
+
+async def _seed(db: Database):
+    emu_id = await db.upsert_emulator(1, "emulator-5556", "LDPlayer-01")
+    await db.upsert_account("111", emulator_id=emu_id, lord_name="Acc One", is_active=1)
+    await db.upsert_account("222", emulator_id=emu_id, lord_name="Acc Two")
+    await db.upsert_account("333", lord_name="Acc Three")
+    await db.save_scan_snapshot(1, "emulator-5556", "LDPlayer-01", {"lord_name": "Old", "power": 10}, game_id="111")
+    await db.save_scan_snapshot(
+        1, "emulator-5556", "LDPlayer-01",
+        {"lord_name": "Lord One", "power": 99, "hall_level": 21,
+         "resources": {"gold": {"bag": 5, "total": 50}, "ore": 7}},
+        game_id="111",
+    )
+
+
+def test_accounts_come_with_latest_scan_in_one_query(tmp_path, monkeypatch):
+    db = _make_db(tmp_path, monkeypatch)
+    statements = []
+    connect = db_pool.connect
+
+    async def traced_connect(*args, **kwargs):
+        conn = await connect(*args, **kwargs)
+        await conn.set_trace_callback(statements.append)
+        return conn
+
+    async def scenario():
+        await _seed(db)
+        monkeypatch.setattr(db_pool, "connect", traced_connect)
+        return await db.get_all_accounts(), list(statements)
+
+    accounts, queries = asyncio.run(scenario())
+    by_game = {a["game_id"]: a for a in accounts}
+
+    assert len(queries) == 1
+    one = by_game["111"]
+    assert (one["lord_name"], one["power"], one["hall_level"]) == ("Lord One", 99, 21)
+    assert (one["gold"], one["gold_total"], one["ore"], one["ore_total"]) == (5, 50, 7, 7)
+    assert "wood" not in one and "mana" not in one
+    # no scan of its own: falls back to the emulator's latest scan
+    two = by_game["222"]
+    assert two["scan_id"] == one["scan_id"] and two["power"] == 99
+    three = by_game["333"]
+    assert (three["lord_name"], three["power"], three["last_scan_at"]) == ("Acc Three", 0, "")
+    assert "scan_id" not in three
+    assert [a["game_id"] for a in accounts][0] == "111"     # is_active first
+
+
+def test_single_account_lookups_match_the_list(tmp_path, monkeypatch):
+    db = _make_db(tmp_path, monkeypatch)
+
+    async def scenario():
+        await _seed(db)
+        return await db.get_all_accounts(), await db.get_account_by_game_id("222"), await db.get_account_by_emu_index(1)
+
+    accounts, two, on_emu = asyncio.run(scenario())
+    listed = {a["game_id"]: a for a in accounts}
+    assert two == listed["222"]
+    assert on_emu == [listed["111"], listed["222"]]
+
+
+def test_read_model_is_backfilled_for_existing_databases(tmp_path, monkeypatch):
+    db = _make_db(tmp_path, monkeypatch)
+
+    async def seed_and_list():
+        await _seed(db)
+        return await db.get_all_accounts()
+
+    before = asyncio.run(seed_and_list())
+    with sqlite3.connect(db.db_path) as conn:
+        conn.execute("DELETE FROM account_latest_scan")
+
+    Database().init_sync()
+    after = asyncio.run(db.get_all_accounts())
+
+    assert after == before
@@ -0,0 +1,146 @@
+"""Tests for the shared WAL connection pool behind Database / execution_log / the API."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+import sqlite3
+import sys
+
+import aiosqlite
+import pytest
+
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.config import config
+
+if not config.is_loaded:
+    config.load()
+
+from backend.core.workflow import execution_log
+from backend.storage import db_pool
+from backend.storage.database import Database
+
+
+def _make_db(tmp_path: Path, monkeypatch) -> Database:
+    path = str(tmp_path / "pool.db")
+    monkeypatch.setattr(config, "db_path", path)
+    db = Database()
+    db.init_sync()
+    return db
+
+
+def _with_pool(path: str, scenario, readers: int = 2):
+    async def run():
+        pool = await db_pool.open_pool(path, readers=readers)
+        try:
+            return await scenario(pool)
+        finally:
+            await db_pool.close_pool()
+
+    return asyncio.run(run())
+
+
+def test_pooled_connections_are_wal_and_come_back_clean(tmp_path, monkeypatch):
+    db = _make_db(tmp_path, monkeypatch)
+
+    async def scenario(pool):
+        async with db_pool.writer(foreign_keys=True) as conn:
+            mode = (await (await conn.execute("PRAGMA journal_mode")).fetchone())[0]
+            fk_inside = (await (await conn.execute("PRAGMA foreign_keys")).fetchone())[0]
+            conn.row_factory = aiosqlite.Row
+        async with db_pool.writer() as conn:
+            fk_after = (await (await conn.execute("PRAGMA foreign_keys")).fetchone())[0]
+            assert conn.row_factory is None
+
+        async with db_pool.reader() as conn:
+            conn.row_factory = aiosqlite.Row
+            with pytest.raises(sqlite3.OperationalError):
+                await conn.execute("INSERT INTO emulators (emu_index, serial) VALUES (1, 'x')")
+        for _ in range(pool.readers):
+            async with db_pool.reader() as conn:
+                assert conn.row_factory is None
+        return mode, fk_inside, fk_after, pool.stats()
+
+    mode, fk_inside, fk_after, stats = _with_pool(db.db_path, scenario)
+
+    assert mode == "wal"
+    assert (fk_inside, fk_after) == (1, 0)
+    assert stats["writes"] == 2 and stats["idle_readers"] == 2 and not stats["writer_busy"]
+
+
+def test_readers_do_not_wait_for_an_open_write_transaction(tmp_path, monkeypatch):
+    db = _make_db(tmp_path, monkeypatch)
+    sql = "INSERT INTO emulators (emu_index, serial) VALUES (?, ?)"
+
+    async def scenario(pool):
+        async with db_pool.writer() as conn:
+            await conn.execute(sql, (1, "committed"))
+            await conn.commit()
+        async with db_pool.writer() as conn:
+            await conn.execute(sql, (2, "pending"))
+            async with db_pool.reader() as rd:
+                seen_during = (await (await rd.execute("SELECT COUNT(*) FROM emulators")).fetchone())[0]
+            await conn.commit()
+        async with db_pool.reader() as rd:
+            seen_after = (await (await rd.execute("SELECT COUNT(*) FROM emulators")).fetchone())[0]
+        return seen_during, seen_after
+
+    assert _with_pool(db.db_path, scenario) == (1, 2)
+
+
+def test_writer_left_mid_transaction_is_rolled_back(tmp_path, monkeypatch):
+    db = _make_db(tmp_path, monkeypatch)
+
+    async def scenario(pool):
+        with pytest.raises(RuntimeError):
+            async with db_pool.writer() as conn:
+                await conn.execute("INSERT INTO emulators (emu_index, serial) VALUES (1, 'lost')")
+                raise RuntimeError("handler failed before commit")
+        async with db_pool.writer() as conn:
+            await conn.execute("INSERT INTO emulators (emu_index, serial) VALUES (2, 'kept')")
+            await conn.commit()
+        async with db_pool.reader() as rd:
+            return [r[0] for r in await (await rd.execute("SELECT serial FROM emulators")).fetchall()]
+
+    assert _with_pool(db.db_path, scenario) == ["kept"]
+
+
+def test_activity_log_round_trip_with_and_without_pool(tmp_path, monkeypatch):
+    db = _make_db(tmp_path, monkeypatch)
+
+    async def log_one(game_id):
+        log_id = await execution_log.start_account_activity("r1", 1, game_id, 0, 3, "gather", "Gather")
+        await execution_log.finish_account_activity(log_id, "SUCCESS")
+        return await execution_log.get_last_account_run(1)
+
+    # No pool open: one-off connections
+    assert asyncio.run(log_one("g1")) > 0
+
+    async def scenario(pool):
+        last = await log_one("g2")
+        return last, pool.stats()
+
+    last, stats = _with_pool(db.db_path, scenario)
+    assert last > 0
+    assert stats["writes"] == 2 and stats["reads"] == 1
+
+    with sqlite3.connect(db.db_path) as conn:
+        rows = conn.execute("SELECT game_id, status FROM account_activity_logs ORDER BY id").fetchall()
+    assert rows == [("g1", "SUCCESS"), ("g2", "SUCCESS")]
+
+
+def test_pool_is_ignored_for_other_databases(tmp_path, monkeypatch):
+    db = _make_db(tmp_path, monkeypatch)
+    other = tmp_path / "other.db"
+    sqlite3.connect(other).close()
+
+    async def scenario(pool):
+        return db_pool.get_pool(db.db_path) is pool, db_pool.get_pool(str(other))
+
+    assert _with_pool(db.db_path, scenario) == (True, None)
+    # closed pools and foreign event loops fall back to one-off connections
+    assert db_pool.get_pool(db.db_path) is None
@@ -0,0 +1,159 @@
+"""Tests for the write-behind execution log."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+import sqlite3
+import sys
+
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.config import config
+
+if not config.is_loaded:
+    config.load()
+
+from backend.core.workflow import execution_log, log_writer
+from backend.storage.database import Database
+
+INSERT_EMU = "INSERT INTO emulators (emu_index, serial) VALUES (?, ?)"
+
+
+def _make_db(tmp_path: Path, monkeypatch) -> str:
+    path = str(tmp_path / "logs.db")
+    monkeypatch.setattr(config, "db_path", path)
+    Database().init_sync()
+    return path
+
+
+def _count(path: str, table: str) -> int:
+    with sqlite3.connect(path) as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def test_activity_logs_are_queued_and_flushed_on_stop(tmp_path, monkeypatch):
+    path = _make_db(tmp_path, monkeypatch)
+
+    async def scenario():
+        log_writer.start()
+        try:
+            await execution_log.create_run("run1", {"source_page": "test"})
+            ids = []
+            for i in range(10):
+                log_id = await execution_log.start_account_activity("run1", i, f"g{i}", 0, 1, "gather", "Gather")
+                await execution_log.append_step_log("run1", i, "gather", {}, {"ok": True}, "SUCCESS")
+                await execution_log.finish_account_activity(log_id, "SUCCESS")
+                ids.append(log_id)
+            await execution_log.complete_run("run1", "COMPLETED", 1000)
+            queued = log_writer.stats()["pending"]
+            on_disk = _count(path, "account_activity_logs")
+        finally:
+            await log_writer.stop()
+        return ids, queued, on_disk, log_writer.stats()
+
+    ids, queued, on_disk, stats = asyncio.run(scenario())
+
+    assert queued == 32 and on_disk == 0     # nothing waited on the disk
+    assert ids == list(range(ids[0], ids[0] + 10))
+    with sqlite3.connect(path) as conn:
+        rows = conn.execute("SELECT id, status FROM account_activity_logs ORDER BY id").fetchall()
+        run = conn.execute("SELECT status FROM task_runs WHERE run_id = 'run1'").fetchone()
+    assert rows == [(i, "SUCCESS") for i in ids]
+    assert run == ("COMPLETED",)
+    assert _count(path, "task_run_steps") == 10
+    assert stats["pending"] == 0 and not stats["active"]
+
+
+def test_flushes_on_size_or_interval(tmp_path, monkeypatch):
+    path = _make_db(tmp_path, monkeypatch)
+
+    async def scenario():
+        by_size = log_writer.WriteBehindLog(max_records=4, interval_sec=60)
+        by_size.start()
+        for i in range(4):
+            await by_size.add(path, INSERT_EMU, (i, f"emulator-{5554 + 2 * i}"))
+        await asyncio.sleep(0.05)
+        after_size = _count(path, "emulators")
+        await by_size.stop()
+
+        by_time = log_writer.WriteBehindLog(max_records=100, interval_sec=0.05)
+        by_time.start()
+        await by_time.add(path, INSERT_EMU, (10, "emulator-5600"))
+        before = _count(path, "emulators")
+        await asyncio.sleep(0.2)
+        after_time = _count(path, "emulators")
+        await by_time.stop()
+        return after_size, before, after_time, by_size.stats()
+
+    after_size, before, after_time, stats = asyncio.run(scenario())
+    assert after_size == 4
+    assert (before, after_time) == (4, 5)
+    assert stats["batches"] == 1 and stats["max_batch"] == 4
+
+
+def test_reserved_ids_do_not_collide_with_other_inserts(tmp_path, monkeypatch):
+    path = _make_db(tmp_path, monkeypatch)
+    writer = log_writer.WriteBehindLog()
+    manual = """INSERT INTO account_activity_logs
+                (run_id, account_id, game_id, activity_id, activity_name, status, started_at)
+                VALUES ('manual', 1, 'g1', 'gather', 'Gather', 'SUCCESS', '2026-01-01T00:00:00')"""
+
+    async def scenario():
+        first = await writer.next_id(path, "account_activity_logs")
+        with sqlite3.connect(path) as conn:    # e.g. a manual mark from the Task page
+            manual_id = conn.execute(manual).lastrowid
+        second = await writer.next_id(path, "account_activity_logs")
+        return first, second, manual_id
+
+    first, second, manual_id = asyncio.run(scenario())
+    assert second == first + 1
+    assert manual_id >= first + log_writer.LOG_ID_BLOCK
+
+
+def test_bad_record_does_not_drop_the_batch(tmp_path, monkeypatch):
+    path = _make_db(tmp_path, monkeypatch)
+    writer = log_writer.WriteBehindLog()
+
+    async def scenario():
+        writer.start()
+        await writer.add(path, INSERT_EMU, (1, "emulator-5556"))
+        await writer.add(path, INSERT_EMU, (1, "duplicate emu_index"))
+        await writer.add(path, INSERT_EMU, (2, "emulator-5558"))
+        await writer.stop()
+
+    asyncio.run(scenario())
+    with sqlite3.connect(path) as conn:
+        serials = [r[0] for r in conn.execute("SELECT serial FROM emulators ORDER BY emu_index")]
+    assert serials == ["emulator-5556", "emulator-5558"]
+    assert writer.stats()["failed"] == 1
+
+
+def test_failed_write_keeps_the_batch_queued(tmp_path, monkeypatch):
+    path = _make_db(tmp_path, monkeypatch)
+    writer = log_writer.WriteBehindLog(max_records=2, interval_sec=0.05)
+    real_write = writer._write
+    failures = []
+
+    async def locked_once(db_path, records):
+        if not failures:
+            failures.append(len(records))
+            raise sqlite3.OperationalError("database is locked")
+        await real_write(db_path, records)
+
+    monkeypatch.setattr(writer, "_write", locked_once)
+
+    async def scenario():
+        writer.start()
+        await writer.add(path, INSERT_EMU, (1, "emulator-5556"))
+        await writer.add(path, INSERT_EMU, (2, "emulator-5558"))
+        await asyncio.sleep(0.3)                 # failed flush, then the retry
+        on_disk = _count(path, "emulators")
+        await writer.stop()
+        return on_disk
+
+    assert asyncio.run(scenario()) == 2
+    assert failures == [2] and writer.stats()["pending"] == 0
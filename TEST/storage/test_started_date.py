@@ -0,0 +1,152 @@
+"""Tests for account_activity_logs.started_date and the per-day indexes behind KPI / Monitor queries."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import io
+from datetime import datetime, timedelta
+from pathlib import Path
+import sqlite3
+import sys
+
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.config import config
+
+if not config.is_loaded:
+    config.load()
+
+from backend import api
+from backend.core.workflow import execution_log, kpi_calculator
+from backend.storage import db_pool
+from backend.storage.database import database
+
+GROUP_ID = 7
+
+
+def _make_db(tmp_path: Path, monkeypatch) -> str:
+    path = str(tmp_path / "activity.db")
+    monkeypatch.setattr(config, "db_path", path)
+    monkeypatch.setattr(database, "db_path", path)
+    with contextlib.redirect_stdout(io.StringIO()):
+        database.init_sync()
+    return path
+
+
+async def _log_today():
+    for account_id, status, duration in ((1, "SUCCESS", 1000), (1, "FAILED", 500), (2, "SUCCESS", 700)):
+        log_id = await execution_log.start_account_activity("run1", account_id, f"g{account_id}", 0, GROUP_ID, "gather", "Gather")
+        await execution_log.finish_account_activity(log_id, status, duration_ms=duration)
+
+
+def _traced(monkeypatch) -> list[str]:
+    statements = []
+    connect = db_pool.connect
+
+    async def traced_connect(*args, **kwargs):
+        conn = await connect(*args, **kwargs)
+        await conn.set_trace_callback(statements.append)
+        return conn
+
+    monkeypatch.setattr(db_pool, "connect", traced_connect)
+    return statements
+
+
+def _plans(path: str, statements: list[str]) -> list[str]:
+    with sqlite3.connect(path) as conn:
+        return [
+            " | ".join(row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}"))
+            for sql in statements
+            if "account_activity_logs" in sql
+        ]
+
+
+def test_writers_store_started_date(tmp_path, monkeypatch):
+    path = _make_db(tmp_path, monkeypatch)
+    asyncio.run(_log_today())
+    asyncio.run(api.mark_task_checklist({"account_id": 3, "activity_id": "pet", "status": "SUCCESS", "game_id": "g3"}))
+    with sqlite3.connect(path) as conn:      # raw INSERT without the column: filled by the trigger
+        conn.execute(
+            """INSERT INTO account_activity_logs (run_id, account_id, game_id, activity_id, activity_name,
+               status, started_at) VALUES ('r', 4, 'g4', 'pet', 'Pet', 'SUCCESS', '2026-01-02T03:04:05')"""
+        )
+        rows = conn.execute("SELECT started_at, started_date FROM account_activity_logs").fetchall()
+
+    assert len(rows) == 5
+    assert all(started_date == started_at[:10] for started_at, started_date in rows)
+
+
+def test_existing_logs_are_backfilled(tmp_path, monkeypatch):
+    path = str(tmp_path / "old.db")
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            """CREATE TABLE account_activity_logs (
+                   id INTEGER PRIMARY KEY AUTOINCREMENT, run_id TEXT NOT NULL, account_id INTEGER NOT NULL,
+                   game_id TEXT NOT NULL, emulator_id INTEGER, group_id INTEGER, activity_id TEXT NOT NULL,
+                   activity_name TEXT NOT NULL, status TEXT NOT NULL, error_code TEXT DEFAULT '',
+                   error_message TEXT DEFAULT '', started_at TEXT NOT NULL, finished_at TEXT,
+                   duration_ms INTEGER DEFAULT 0, attempts INTEGER DEFAULT 1, source TEXT DEFAULT 'workflow',
+                   metadata_json TEXT DEFAULT '{}', result_json TEXT DEFAULT '{}')"""
+        )
+        conn.executemany(
+            """INSERT INTO account_activity_logs (run_id, account_id, game_id, group_id, activity_id,
+               activity_name, status, started_at) VALUES ('r', 1, 'g1', ?, 'gather', 'Gather', 'SUCCESS', ?)""",
+            [(GROUP_ID, "2026-03-01T23:59:59"), (GROUP_ID, datetime.now().isoformat())],
+        )
+
+    monkeypatch.setattr(database, "db_path", path)
+    with contextlib.redirect_stdout(io.StringIO()) as out:
+        database.init_sync()
+
+    with sqlite3.connect(path) as conn:
+        dates = [r[0] for r in conn.execute("SELECT started_date FROM account_activity_logs ORDER BY id")]
+        indexes = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert dates == ["2026-03-01", datetime.now().strftime("%Y-%m-%d")]
+    assert {"idx_aal_group_date_status", "idx_aal_account_date"} <= indexes
+    assert "2 rows backfilled" in out.getvalue()
+
+
+def test_kpi_queries_are_served_by_the_group_index(tmp_path, monkeypatch):
+    path = _make_db(tmp_path, monkeypatch)
+    asyncio.run(_log_today())
+    with sqlite3.connect(path) as conn:      # yesterday's runs must not count
+        conn.execute(
+            """INSERT INTO account_activity_logs (run_id, account_id, game_id, group_id, activity_id, activity_name,
+               status, started_at, duration_ms) VALUES ('old', 1, 'g1', ?, 'gather', 'Gather', 'SUCCESS', ?, 9000)""",
+            (GROUP_ID, (datetime.now() - timedelta(days=1)).isoformat()),
+        )
+    statements = _traced(monkeypatch)
+
+    kpi = asyncio.run(kpi_calculator.compute_kpi_summary(GROUP_ID))
+    plans = _plans(path, statements)
+
+    assert (kpi["total_runs_today"], kpi["total_errors_today"], kpi["total_exec_ms"]) == (3, 1, 2200)
+    assert kpi["fairness_index"] == 1.0
+    assert len(plans) == 4
+    aggregates, runtime = plans[:3], plans[3]
+    assert all("USING COVERING INDEX idx_aal_group_date_status" in plan for plan in aggregates), aggregates
+    assert "USING INDEX idx_aal_group_date_status" in runtime
+    assert not any(plan.startswith("SCAN") for plan in plans), plans
+
+
+def test_monitor_and_history_use_the_account_index(tmp_path, monkeypatch):
+    path = _make_db(tmp_path, monkeypatch)
+    asyncio.run(database.upsert_account("g1"))
+    asyncio.run(_log_today())
+    statements = _traced(monkeypatch)
+
+    today = datetime.now().strftime("%Y-%m-%d")
+    monitor = asyncio.run(api.get_monitor_account_activities(1))
+    history = asyncio.run(api.get_task_account_history(1, date=today))
+    plans = _plans(path, statements)
+
+    assert monitor["data"]["activities"][0]["runs"] == 2
+    assert len(history["items"]) == 2
+    assert len(plans) == 2
+    for plan in plans:
+        assert "USING INDEX idx_aal_account_date (account_id=? AND started_date=?)" in plan, plan
+    assert "TEMP B-TREE" not in plans[0]        # monitor: rows come out in started_at order
@@ -0,0 +1,139 @@
+"""Tests for the incrementally maintained task_daily_state read model (Task page checklist)."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import io
+from datetime import datetime
+from pathlib import Path
+import sqlite3
+import sys
+
+CURRENT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = CURRENT_DIR.parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.config import config
+
+if not config.is_loaded:
+    config.load()
+
+from backend import api
+from backend.core.workflow import execution_log, log_writer
+from backend.storage import db_pool
+from backend.storage.database import database
+
+COLUMNS = (
+    "date, account_id, game_id, group_id, emulator_id, emulator_name, activity_id, activity_name, "
+    "status, last_run, runs_today, total_duration_ms, last_error"
+)
+
+
+def _make_db(tmp_path: Path, monkeypatch) -> str:
+    path = str(tmp_path / "tasks.db")
+    monkeypatch.setattr(config, "db_path", path)
+    monkeypatch.setattr(database, "db_path", path)
+    with contextlib.redirect_stdout(io.StringIO()):
+        database.init_sync()
+    asyncio.run(database.upsert_emulator(2, "emulator-5558", "LDPlayer-02"))
+    return path
+
+
+def _state(path: str) -> list[tuple]:
+    with sqlite3.connect(path) as conn:
+        return conn.execute(f"SELECT {COLUMNS} FROM task_daily_state ORDER BY account_id, activity_id").fetchall()
+
+
+async def _run_activities():
+    """Two accounts; retries, a failure and one activity left RUNNING."""
+    plan = [
+        (1, "gather", "SUCCESS", "", 1200),
+        (1, "gather", "FAILED", "timeout", 800),
+        (1, "pet", "SUCCESS", "", 300),
+        (2, "gather", "SUCCESS", "", 1000),
+        (1, "gather", "SUCCESS", "", 900),
+        (2, "pet", None, "", 0),
+    ]
+    for account_id, activity_id, status, error, duration in plan:
+        log_id = await execution_log.start_account_activity(
+            "run1", account_id, f"g{account_id}", 2, 7, activity_id, activity_id.title()
+        )
+        if status:
+            await execution_log.finish_account_activity(log_id, status, error_message=error, duration_ms=duration)
+
+
+def _rebuilt(path: str) -> list[tuple]:
+    asyncio.run(database.rebuild_task_daily_state(datetime.now().strftime("%Y-%m-%d")))
+    return _state(path)
+
+
+def test_incremental_rows_match_a_full_rebuild(tmp_path, monkeypatch):
+    path = _make_db(tmp_path, monkeypatch)
+    asyncio.run(_run_activities())
+
+    incremental = _state(path)
+    by_cell = {(row[1], row[6]): row for row in incremental}
+
+    gather = by_cell[(1, "gather")]
+    assert (gather[8], gather[10], gather[11], gather[5]) == ("SUCCESS", 3, 2900, "LDPlayer-02")
+    assert by_cell[(2, "pet")][8] == "RUNNING"
+    assert incremental == _rebuilt(path)
+
+
+def test_write_behind_keeps_log_and_read_model_together(tmp_path, monkeypatch):
+    path = _make_db(tmp_path, monkeypatch)
+
+    async def scenario():
+        log_writer.start()
+        try:
+            await _run_activities()
+            queued = _state(path)
+        finally:
+            await log_writer.stop()
+        return queued
+
+    assert asyncio.run(scenario()) == []
+    assert len(_state(path)) == 4
+    assert _state(path) == _rebuilt(path)
+
+
+def test_manual_mark_and_undo_update_only_their_cell(tmp_path, monkeypatch):
+    path = _make_db(tmp_path, monkeypatch)
+    asyncio.run(_run_activities())
+
+    async def mark(status):
+        return await api.mark_task_checklist(
+            {"account_id": 2, "activity_id": "gather", "status": status, "game_id": "g2", "group_id": 7}
+        )
+
+    assert asyncio.run(mark("SUCCESS")) == {"status": "ok"}
+    marked = {(r[1], r[6]): r for r in _state(path)}
+    assert marked[(2, "gather")][10] == 2
+    assert _state(path) == _rebuilt(path)
+
+    assert asyncio.run(mark("UNDO")) == {"status": "ok"}
+    undone = {(r[1], r[6]): r for r in _state(path)}
+    assert undone[(2, "gather")][10] == 1
+    assert undone[(1, "gather")] == marked[(1, "gather")]
+    assert _state(path) == _rebuilt(path)
+
+
+def test_checklist_read_does_not_write(tmp_path, monkeypatch):
+    path = _make_db(tmp_path, monkeypatch)
+    asyncio.run(_run_activities())
+
+    async def scenario():
+        pool = await db_pool.open_pool(path)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = await api.get_task_checklist()
+            return result, pool.stats()
+        finally:
+            await db_pool.close_pool()
+
+    result, stats = asyncio.run(scenario())
+    assert stats["writes"] == 0 and stats["reads"] == 1
+    assert [a["account_id"] for a in result["accounts"]] == [1, 2]
+    assert result["accounts"][0]["activities"]["gather"]["runs_today"] == 3
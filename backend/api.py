@@ -22,6 +22,8 @@ if not config.is_loaded:
 from backend.core.emulator import emulator_manager
 from backend.tasks.task_queue import task_queue
 from backend.storage.database import database
+from backend.storage import db_pool
+from backend.core.workflow import log_writer
 from backend.websocket import ws_manager
 from backend.models.scan_result import TaskType
 
@@ -910,6 +912,61 @@ async def delete_workflow_log_file(serial: str, date: str):
     return {"deleted": True, "serial": serial, "date": date}
 
 
+@app.get("/api/workflow/timing")
+async def get_workflow_timing():
+    """Time-to-target per state transition recorded by wait_for_state (this process)."""
+    from backend.core.workflow.adaptive_wait import time_to_target_stats
+    return {"transitions": time_to_target_stats()}
+
+
+@app.get("/api/workflow/executor")
+async def get_workflow_executor_stats():
+    """Per-emulator lanes of the device executor: in-flight calls, queue wait and run time (this process)."""
+    from backend.core.workflow.device_executor import device_executor_stats
+    return device_executor_stats()
+
+
+@app.get("/api/workflow/adb-client")
+async def get_workflow_adb_client_stats():
+    """Native adb protocol client: requests, open / peak sockets, errors and adb binary fallbacks."""
+    from backend.core.workflow.adb_client import adb_client_stats
+    return adb_client_stats()
+
+
+@app.get("/api/workflow/device-tracker")
+async def get_workflow_device_tracker_stats():
+    """host:track-devices stream: connected, list updates, reconnects, boot probes and per-serial state."""
+    from backend.core.workflow.device_tracker import device_tracker_stats
+    return device_tracker_stats()
+
+
+@app.get("/api/workflow/health-probe")
+async def get_workflow_health_probe_stats():
+    """check_app_crash probes per emulator: count, checksum probes, avg / max ms and share of wall time."""
+    from backend.core.workflow.health_probe import health_probe_stats
+    return health_probe_stats()
+
+
+@app.get("/api/workflow/provider-cache")
+async def get_workflow_provider_cache_stats():
+    """Per-serial provider cache: hits / misses (device shell calls), seeds, invalidations and entries."""
+    from backend.core.workflow.provider_cache import provider_cache_stats
+    return provider_cache_stats()
+
+
+@app.get("/api/workflow/shell-sessions")
+async def get_workflow_shell_session_stats():
+    """Persistent input shells per emulator: commands sent, avg latency, reconnects, one-shot fallbacks."""
+    from backend.core.workflow.shell_session import shell_session_stats
+    return shell_session_stats()
+
+
+@app.get("/api/workflow/log-writer")
+async def get_workflow_log_writer_stats():
+    """Write-behind execution log: queued records, batches flushed, avg batch size / flush time."""
+    return log_writer.stats()
+
+
 # Mount debug_captures directory for serving screenshots
 import os as _os
 from pathlib import Path as _Path
@@ -1288,7 +1345,7 @@ async def run_bot_activities(body: dict):
     # Resolve emulator indices from group's account_ids
     if not emulator_indices and group_id:
         try:
-            async with aiosqlite.connect(config.db_path) as db:
+            async with db_pool.reader() as db:
                 db.row_factory = aiosqlite.Row
 
                 # Get group's account_ids JSON array
@@ -1340,6 +1397,36 @@ async def run_bot_activities(body: dict):
     return {"status": "accepted", "emulators": launched, "steps": len(steps)}
 
 
+async def _fetch_group_accounts(group_id: int) -> list[dict]:
+    """Accounts of a group with their emulator index (id, game_id, lord_name, emu_index)."""
+    import json as json_mod
+    import aiosqlite
+
+    accounts = []
+    async with db_pool.reader() as db:
+        db.row_factory = aiosqlite.Row
+
+        # Get group's account_ids JSON array
+        cursor = await db.execute(
+            "SELECT account_ids FROM account_groups WHERE id = ?", (int(group_id),)
+        )
+        row = await cursor.fetchone()
+        if row:
+            account_ids = json_mod.loads(row["account_ids"] or "[]")
+            if account_ids:
+                placeholders = ",".join("?" for _ in account_ids)
+                # Join accounts -> emulators to get emu_index and lord_name
+                cursor2 = await db.execute(
+                    f"""SELECT a.id, a.game_id, a.lord_name, e.emu_index 
+                        FROM accounts a
+                        LEFT JOIN emulators e ON a.emulator_id = e.id
+                        WHERE a.id IN ({placeholders})""",
+                    account_ids,
+                )
+                accounts = [dict(r) for r in await cursor2.fetchall()]
+    return accounts
+
+
 @app.post("/api/bot/run-sequential")
 async def run_bot_sequential(body: dict):
     """
@@ -1347,8 +1434,6 @@ async def run_bot_sequential(body: dict):
     Body: { group_id: int, activities: [{name, config}], close_after_min: int }
     """
     from backend.core.workflow.bot_orchestrator import start_sequential_orchestrator
-    import json as json_mod
-    import aiosqlite
 
     group_id = body.get("group_id")
     activities = body.get("activities", [])
@@ -1357,29 +1442,8 @@ async def run_bot_sequential(body: dict):
     if not group_id or not activities:
         return {"status": "error", "error": "Missing group_id or activities"}
 
-    accounts = []
     try:
-        async with aiosqlite.connect(config.db_path) as db:
-            db.row_factory = aiosqlite.Row
-
-            # Get group's account_ids JSON array
-            cursor = await db.execute(
-                "SELECT account_ids FROM account_groups WHERE id = ?", (int(group_id),)
-            )
-            row = await cursor.fetchone()
-            if row:
-                account_ids = json_mod.loads(row["account_ids"] or "[]")
-                if account_ids:
-                    placeholders = ",".join("?" for _ in account_ids)
-                    # Join accounts -> emulators to get emu_index and lord_name
-                    cursor2 = await db.execute(
-                        f"""SELECT a.id, a.game_id, a.lord_name, e.emu_index 
-                            FROM accounts a
-                            LEFT JOIN emulators e ON a.emulator_id = e.id
-                            WHERE a.id IN ({placeholders})""",
-                        account_ids,
-                    )
-                    accounts = [dict(r) for r in await cursor2.fetchall()]
+        accounts = await _fetch_group_accounts(int(group_id))
     except Exception as exc:
         return {"status": "error", "error": f"Failed to fetch group accounts: {exc}"}
 
@@ -1414,6 +1478,31 @@ async def run_bot_sequential(body: dict):
     return {"status": "started", "group_id": group_id, "accounts_queued": len(accounts)}
 
 
+@app.post("/api/bot/plan")
+async def plan_bot_sequential(body: dict):
+    """
+    Dry run of the swap planner: the order the next cycle would run in and the
+    estimated time saved against the plain round-robin queue. Nothing is started.
+    Body: same as /api/bot/run-sequential.
+    """
+    from backend.core.workflow.bot_orchestrator import preview_run_plan
+
+    group_id = body.get("group_id")
+    activities = body.get("activities", [])
+    if not group_id or not activities:
+        return {"status": "error", "error": "Missing group_id or activities"}
+
+    try:
+        accounts = await _fetch_group_accounts(int(group_id))
+    except Exception as exc:
+        return {"status": "error", "error": f"Failed to fetch group accounts: {exc}"}
+    if not accounts:
+        return {"status": "error", "error": "No accounts found in this group."}
+
+    plan = await preview_run_plan(int(group_id), accounts, activities, body.get("misc", {}))
+    return {"status": "ok", "data": plan}
+
+
 @app.post("/api/bot/stop")
 async def stop_bot(body: dict):
     """Signals the orchestrator to stop running after current account finishes."""
@@ -1474,21 +1563,20 @@ async def get_kpi_summary(group_id: int):
 async def get_monitor_account_activities(account_id: int, group_id: int = None):
     """Get today's activity breakdown for a specific account (Monitor tab detail)."""
     import aiosqlite
-    from backend.config import config as app_config
     from datetime import datetime as dt
 
     today = dt.now().strftime("%Y-%m-%d")
     try:
-        async with aiosqlite.connect(app_config.db_path) as db:
+        async with db_pool.reader() as db:
             db.row_factory = aiosqlite.Row
             cursor = await db.execute(
                 """SELECT activity_id, activity_name, status,
                           started_at, finished_at, duration_ms,
                           error_message
                    FROM account_activity_logs
-                   WHERE account_id = ? AND started_at LIKE ?
+                   WHERE account_id = ? AND started_date = ?
                    ORDER BY started_at DESC""",
-                (account_id, f"{today}%"),
+                (account_id, today),
             )
             rows = [dict(r) for r in await cursor.fetchall()]
 
@@ -1606,7 +1694,7 @@ async def get_monitor_account_activities(account_id: int, group_id: int = None):
 
                     orch = _active_orchestrators.get(group_id)
                     if orch and orch.is_running:
-                        for act_id, live_status in orch.activity_statuses.items():
+                        for act_id, live_status in orch.live_activity_statuses().items():
                             if act_id in summary:
                                 if live_status == "running":
                                     summary[act_id]["last_status"] = "RUNNING"
@@ -1796,12 +1884,10 @@ async def get_activity_config(group_id: int):
             )
 
         # Enrich with live DB metrics (last_run, runs_today) since we do per-account tracking now
-        import aiosqlite
-        from backend.config import config as app_config
         from datetime import datetime
         try:
             today_prefix = datetime.now().strftime('%Y-%m-%d')
-            async with aiosqlite.connect(app_config.db_path) as db:
+            async with db_pool.reader() as db:
                 for act_id, act_node in data.get("activities", {}).items():
                     # Get Last Run
                     async with db.execute(
@@ -1817,8 +1903,8 @@ async def get_activity_config(group_id: int):
                             async with db.execute(
                                 """SELECT COUNT(*) FROM account_activity_logs 
                                    WHERE group_id = ? AND activity_id = ? AND status = 'SUCCESS'
-                                   AND started_at LIKE ?""", 
-                                (group_id, act_id, f"{today_prefix}%")
+                                   AND started_date = ?""", 
+                                (group_id, act_id, today_prefix)
                             ) as cursor2:
                                 count_row = await cursor2.fetchone()
                                 act_node["runs_today"] = count_row[0] if count_row else 0
@@ -1986,7 +2072,7 @@ async def get_execution_runs():
     import aiosqlite
     import json
 
-    async with aiosqlite.connect(config.db_path) as db:
+    async with db_pool.reader() as db:
         db.row_factory = aiosqlite.Row
         cursor = await db.execute(
             "SELECT * FROM task_runs ORDER BY start_at DESC LIMIT 100"
@@ -2006,7 +2092,7 @@ async def get_execution_run_detail(run_id: str):
     import aiosqlite
     import json
 
-    async with aiosqlite.connect(config.db_path) as db:
+    async with db_pool.reader() as db:
         db.row_factory = aiosqlite.Row
         # Get run summary
         cursor = await db.execute("SELECT * FROM task_runs WHERE run_id = ?", (run_id,))
@@ -2084,8 +2170,8 @@ async def get_task_checklist(
 
     try:
         t0 = time.perf_counter()
-        await database.rebuild_task_daily_state(target_date)
-        async with aiosqlite.connect(config.db_path) as db:
+        # task_daily_state is maintained as activities are logged: a pure indexed read
+        async with db_pool.reader() as db:
             db.row_factory = aiosqlite.Row
 
             where_parts = ["date = ?"]
@@ -2245,7 +2331,7 @@ async def get_task_account_history(
     limit = max(1, min(int(limit or 100), 300))
 
     try:
-        async with aiosqlite.connect(config.db_path) as db:
+        async with db_pool.reader() as db:
             db.row_factory = aiosqlite.Row
 
             account_cursor = await db.execute(
@@ -2273,7 +2359,7 @@ async def get_task_account_history(
                        started_at, finished_at, duration_ms, attempts, source,
                        metadata_json, result_json
                    FROM account_activity_logs
-                   WHERE account_id = ? AND date(started_at) = ?
+                   WHERE account_id = ? AND started_date = ?
                    ORDER BY started_at DESC, id DESC
                    LIMIT ?""",
                 (account_id, target_date, limit),
@@ -2416,6 +2502,11 @@ async def mark_task_checklist(body: dict):
     import json
     from datetime import datetime as dt_cls
     from backend.core.workflow import workflow_registry
+    from backend.storage.database import (
+        TASK_DAILY_STATE_DELETE_SQL,
+        TASK_DAILY_STATE_LOG_SQL,
+        TASK_DAILY_STATE_REBUILD_SQL,
+    )
 
     account_id = body.get("account_id")
     activity_id = body.get("activity_id")
@@ -2430,7 +2521,11 @@ async def mark_task_checklist(body: dict):
         }
 
     try:
-        async with aiosqlite.connect(config.db_path) as db:
+        from backend.core.workflow import execution_log
+
+        # UNDO must see (and delete) rows still queued on the write-behind log
+        await execution_log.flush()
+        async with db_pool.writer() as db:
             db.row_factory = aiosqlite.Row
             if status == "SUCCESS":
                 reg = workflow_registry.get_activity_registry()
@@ -2459,32 +2554,45 @@ async def mark_task_checklist(body: dict):
 
                 run_id = f"manual_{uuid.uuid4().hex[:8]}"
                 now_str = dt_cls.now().isoformat()
+                row = {
+                    "run_id": run_id,
+                    "account_id": int(account_id),
+                    "game_id": game_id,
+                    "emulator_id": None,
+                    "group_id": group_id,
+                    "activity_id": activity_id,
+                    "activity_name": activity_name,
+                    "status": "SUCCESS",
+                    "started_at": now_str,
+                    "duration_ms": 0,
+                    "error_message": "",
+                }
 
                 await db.execute(
                     """INSERT INTO account_activity_logs (
                         run_id, account_id, game_id, group_id,
-                        activity_id, activity_name, status, started_at, finished_at,
+                        activity_id, activity_name, status, started_at, started_date, finished_at,
                         source, duration_ms
-                    ) VALUES (?, ?, ?, ?, ?, ?, 'SUCCESS', ?, ?, 'manual', 0)""",
-                    (
-                        run_id,
-                        int(account_id),
-                        game_id,
-                        group_id,
-                        activity_id,
-                        activity_name,
-                        now_str,
-                        now_str,
-                    ),
+                    ) VALUES (
+                        :run_id, :account_id, :game_id, :group_id,
+                        :activity_id, :activity_name, :status, :started_at, substr(:started_at, 1, 10), :started_at,
+                        'manual', :duration_ms
+                    )""",
+                    row,
                 )
+                await db.execute(TASK_DAILY_STATE_LOG_SQL, row)
             elif status == "UNDO":
                 today = dt_cls.now().strftime("%Y-%m-%d")
                 await db.execute(
                     """DELETE FROM account_activity_logs 
                        WHERE account_id = ? AND activity_id = ? 
-                         AND source = 'manual' AND date(started_at) = ?""",
+                         AND source = 'manual' AND started_date = ?""",
                     (int(account_id), activity_id, today),
                 )
+                # Recompute just this account / activity cell from the remaining logs
+                scope = {"date": today, "account_id": int(account_id), "activity_id": activity_id}
+                await db.execute(TASK_DAILY_STATE_DELETE_SQL, scope)
+                await db.execute(TASK_DAILY_STATE_REBUILD_SQL, scope)
             else:
                 return {
                     "status": "error",
@@ -2493,9 +2601,17 @@ async def mark_task_checklist(body: dict):
 
             await db.commit()
 
-            target_date = dt_cls.now().strftime("%Y-%m-%d")
-            await database.rebuild_task_daily_state(target_date)
-            return {"status": "ok"}
+        # Keep running orchestrators' in-memory metrics / cooldowns in sync
+        execution_log.publish_activity_event({
+            "account_id": int(account_id),
+            "group_id": group_id,
+            "activity_id": activity_id,
+            "status": status,
+            "started_at": now_str if status == "SUCCESS" else None,
+            "source": "manual",
+            "result": {},
+        })
+        return {"status": "ok"}
     except Exception as e:
         return {"status": "error", "error": str(e)}
 
@@ -2506,7 +2622,7 @@ async def get_checklist_templates(scope: str = "org", scope_id: int = 0):
     import aiosqlite
 
     try:
-        async with aiosqlite.connect(config.db_path) as db:
+        async with db_pool.reader() as db:
             db.row_factory = aiosqlite.Row
             cursor = await db.execute(
                 "SELECT * FROM task_templates WHERE scope = ? AND scope_id = ? ORDER BY is_default DESC, id DESC LIMIT 1",
@@ -2533,7 +2649,6 @@ async def get_checklist_templates(scope: str = "org", scope_id: int = 0):
 @app.post("/api/task/checklist/templates")
 async def save_checklist_template(body: dict):
     """Save/update a template. Body: { name, scope, scope_id, items: [{activity_id, sort_order, is_critical}] }"""
-    import aiosqlite
 
     name = body.get("name", "Default Strategy")
     scope = body.get("scope", "org")
@@ -2541,7 +2656,7 @@ async def save_checklist_template(body: dict):
     items = body.get("items", [])
 
     try:
-        async with aiosqlite.connect(config.db_path) as db:
+        async with db_pool.writer() as db:
             # Upsert the template
             cursor = await db.execute(
                 "SELECT id FROM task_templates WHERE scope = ? AND scope_id = ?",
@@ -2594,10 +2709,21 @@ async def startup():
     # Wire up WebSocket callback to task queue
     task_queue.set_ws_callback(ws_manager.broadcast_sync)
 
-    # Init database
+    # Init database, then open the shared connection pool (WAL)
     database.init_sync()
+    await db_pool.open_pool(config.db_path)
+    log_writer.start()
 
-    # Discover devices
+    # Provider hints per emulator, so the first run confirms with one package lookup
+    from backend.core.workflow.provider_cache import seed_providers_from_accounts
+
+    seed_providers_from_accounts(config.db_path)
+
+    # Track devices over one adb server stream, then discover them
+    import asyncio
+    from backend.core.workflow.device_tracker import start_device_tracker
+
+    await asyncio.to_thread(start_device_tracker().wait_connected, 2)
     emulator_manager.discover()
 
     # Start background scheduler
@@ -2608,3 +2734,14 @@ async def startup():
     print(f"[API] Started on port {config.server_port}")
     print(f"[API] Devices found: {len(emulator_manager.get_all())}")
 
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Flush queued execution logs to disk, then close pooled database connections."""
+    import asyncio
+    from backend.core.workflow.device_tracker import stop_device_tracker
+
+    await asyncio.to_thread(stop_device_tracker)
+    await log_writer.stop()
+    await db_pool.close_pool()
+
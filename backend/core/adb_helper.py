@@ -7,6 +7,7 @@ import random
 import subprocess
 import time
 from backend.config import config
+from backend.core.workflow.state_transitions import note_action as _note_action
 
 
 def _run_adb(cmd_list: list[str], serial: str = None) -> str:
@@ -60,6 +61,7 @@ def tap(serial: str, x: int, y: int):
     jx = x + random.randint(-2, 2)
     jy = y + random.randint(-2, 2)
     _run_adb(["shell", "input", "tap", str(jx), str(jy)], serial=serial)
+    _note_action(serial, "tap")
 
 
 def swipe(serial: str, x1: int, y1: int, x2: int, y2: int, duration: int = 300):
@@ -68,11 +70,13 @@ def swipe(serial: str, x1: int, y1: int, x2: int, y2: int, duration: int = 300):
         ["shell", "input", "swipe", str(x1), str(y1), str(x2), str(y2), str(duration)],
         serial=serial,
     )
+    _note_action(serial, "swipe")
 
 
 def press_back(serial: str):
     """Send BACK key event."""
     _run_adb(["shell", "input", "keyevent", "4"], serial=serial)
+    _note_action(serial, "back")
 
 
 def press_back_n(serial: str, count: int = 1, delay: float = 1.5):
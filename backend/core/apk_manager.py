@@ -12,7 +12,8 @@ import urllib.request
 import zipfile
 from pathlib import Path
 
-from backend.config import config
+from backend.core.workflow.adb_client import adb_install, adb_run
+from backend.core.workflow.provider_cache import invalidate_provider
 
 # APK storage directory
 APK_DIR = (
@@ -106,17 +107,9 @@ def _ensure_adb_connected(serial: str) -> str:
     Falls back to `adb connect 127.0.0.1:<tcp_port>` when not found.
     Returns the working serial (may be TCP format).
     """
-    adb_path = config.adb_path
-    si = subprocess.STARTUPINFO()
-    si.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-
     # Check if device is already visible
     try:
-        result = subprocess.run(
-            [adb_path, "devices"],
-            capture_output=True, text=True, startupinfo=si, timeout=10,
-        )
-        for line in result.stdout.splitlines():
+        for line in adb_run(["devices"], timeout=10).splitlines():
             if serial in line and "device" in line:
                 return serial
     except Exception:
@@ -129,16 +122,9 @@ def _ensure_adb_connected(serial: str) -> str:
         tcp_port = port + 1
         tcp_serial = f"127.0.0.1:{tcp_port}"
         print(f"[APK] Device {serial} not in adb devices. Trying adb connect {tcp_serial}...")
-        subprocess.run(
-            [adb_path, "connect", tcp_serial],
-            capture_output=True, text=True, startupinfo=si, timeout=10,
-        )
+        adb_run(["connect", tcp_serial], timeout=10)
         # Verify connection
-        result = subprocess.run(
-            [adb_path, "devices"],
-            capture_output=True, text=True, startupinfo=si, timeout=10,
-        )
-        for line in result.stdout.splitlines():
+        for line in adb_run(["devices"], timeout=10).splitlines():
             if tcp_serial in line and "device" in line:
                 print(f"[APK] Connected via {tcp_serial}")
                 return tcp_serial
@@ -220,6 +206,12 @@ def download_apk(app_id: str, progress_callback=None) -> dict:
         return {"success": False, "error": str(e)}
 
 
+def _forget_provider(*serials: str) -> None:
+    """An install (even a failed one) may change which game build is on the device."""
+    for serial in set(serials):
+        invalidate_provider(serial, reason="apk install")
+
+
 def install_xapk(app_id: str, serial: str) -> dict:
     """Install XAPK (split-APK bundle) on a single emulator via ADB."""
     app = APK_REGISTRY.get(app_id)
@@ -230,12 +222,9 @@ def install_xapk(app_id: str, serial: str) -> dict:
     if not xapk_path.exists():
         return {"success": False, "error": f"XAPK not found: {app['filename']}"}
 
+    requested = serial
     serial = _ensure_adb_connected(serial)
 
-    adb_path = config.adb_path
-    startupinfo = subprocess.STARTUPINFO()
-    startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-
     try:
         with tempfile.TemporaryDirectory(prefix="xapk_") as tmp_dir:
             print(f"[APK] Extracting {app['filename']} to temp dir...")
@@ -251,25 +240,13 @@ def install_xapk(app_id: str, serial: str) -> dict:
                 f"[APK] Found {len(apk_files)} split APK(s), "
                 f"installing on {serial}..."
             )
-            cmd = (
-                [adb_path, "-s", serial, "install-multiple", "-r"]
-                + [str(f) for f in apk_files]
-            )
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                startupinfo=startupinfo,
-                timeout=300,
-            )
+            output = adb_install(serial, [str(f) for f in apk_files], timeout=300)
 
-            if "Success" in result.stdout:
+            if "Success" in output:
                 print(f"[APK] {app['name']} installed on {serial}")
                 return {"success": True, "message": f"Installed on {serial}"}
 
-            error_msg = (
-                result.stdout.strip() or result.stderr.strip() or "Unknown error"
-            )
+            error_msg = output or "Unknown error"
             print(f"[APK] XAPK install failed on {serial}: {error_msg}")
             return {"success": False, "error": error_msg}
 
@@ -279,6 +256,8 @@ def install_xapk(app_id: str, serial: str) -> dict:
         return {"success": False, "error": "Install timed out (300s)"}
     except Exception as e:
         return {"success": False, "error": str(e)}
+    finally:
+        _forget_provider(requested, serial)
 
 
 def install_apk(app_id: str, serial: str) -> dict:
@@ -295,36 +274,25 @@ def install_apk(app_id: str, serial: str) -> dict:
     if not apk_path.exists():
         return {"success": False, "error": f"APK not downloaded: {app['filename']}"}
 
-    adb_path = config.adb_path
-    startupinfo = subprocess.STARTUPINFO()
-    startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-
+    requested = serial
     serial = _ensure_adb_connected(serial)
 
     try:
         # Install with -r (replace existing)
         print(f"[APK] Installing {app['name']} on {serial}...")
-        cmd = [adb_path, "-s", serial, "install", "-r", str(apk_path)]
-        result = subprocess.run(
-            cmd, capture_output=True, text=True, startupinfo=startupinfo, timeout=120
-        )
+        output = adb_install(serial, [str(apk_path)], timeout=120)
 
-        if "Success" in result.stdout:
+        if "Success" in output:
             print(f"[APK] {app['name']} installed on {serial}")
 
             # Run post-install command if defined
             if app.get("post_install"):
-                post_cmd = [adb_path, "-s", serial] + app["post_install"]
-                subprocess.run(
-                    post_cmd, capture_output=True, startupinfo=startupinfo, timeout=10
-                )
+                adb_run(app["post_install"], serial=serial, timeout=10)
                 print(f"[APK] Post-install command executed on {serial}")
 
             return {"success": True, "message": f"Installed on {serial}"}
         else:
-            error_msg = (
-                result.stdout.strip() or result.stderr.strip() or "Unknown error"
-            )
+            error_msg = output or "Unknown error"
             print(f"[APK] Install failed on {serial}: {error_msg}")
             return {"success": False, "error": error_msg}
 
@@ -332,6 +300,8 @@ def install_apk(app_id: str, serial: str) -> dict:
         return {"success": False, "error": "Install timed out (120s)"}
     except Exception as e:
         return {"success": False, "error": str(e)}
+    finally:
+        _forget_provider(requested, serial)
 
 
 def install_apk_on_multiple(app_id: str, serials: list[str], ws_callback=None) -> dict:
@@ -119,8 +119,18 @@ class EmulatorManager:
         ]
 
     def discover(self) -> list[Emulator]:
-        """Refresh device list from ADB and update registry."""
-        serials = adb_helper.list_devices()
+        """Refresh device list from ADB and update registry.
+
+        Reads the device tracker's pushed list when it is connected; otherwise runs
+        `adb devices`.
+        """
+        from backend.core.workflow.device_tracker import get_device_tracker
+
+        tracker = get_device_tracker()
+        if tracker is not None and tracker.connected:
+            serials = tracker.online_serials()
+        else:
+            serials = adb_helper.list_devices()
 
         # Mark missing devices as OFFLINE
         with self._lock:
@@ -72,26 +72,66 @@ def list_all_instances() -> list[dict]:
 
 def launch_instance(index: int) -> bool:
     """Start an emulator by index."""
+    from backend.core.workflow.provider_cache import invalidate_provider
+
     _run(["launch", "--index", str(index)], timeout=30)
+    for serial in adb_serials(index):
+        invalidate_provider(serial, reason="relaunch")
     # ldconsole launch doesn't return useful output, but doesn't error
     return True
 
 
+def adb_serials(index: int) -> tuple[str, str]:
+    """(emulator serial, LDPlayer TCP serial) an instance can show up under in `adb devices`."""
+    return f"emulator-{5554 + index * 2}", f"127.0.0.1:{5555 + index * 2}"
+
+
+def _wait_tracked(tracker, serial: str, tcp_serial: str, timeout: float):
+    """wait_for_device on the device tracker: True / False, or None if its stream dropped."""
+    import time
+    from backend.core.workflow import adb_helper
+
+    deadline = time.monotonic() + timeout
+    ready = tracker.wait_until_ready([serial, tcp_serial], min(timeout, 15))
+    if ready is None and tracker.connected and not tracker.seen([serial, tcp_serial]):
+        print(f"[{serial}] Device not in 'adb devices'. Trying 'adb connect {tcp_serial}'...")
+        adb_helper._run_adb(["connect", tcp_serial], timeout=5)
+    if ready is None and tracker.connected:
+        ready = tracker.wait_until_ready([serial, tcp_serial], max(0.0, deadline - time.monotonic()))
+    if ready is not None:
+        print(f"[{serial}] Android boot completed (serial: {ready}).")
+        return True
+    return None if not tracker.connected else False
+
+
 def wait_for_device(index: int, timeout: int = 120) -> bool:
     """Wait for an emulator to fully boot by checking sys.boot_completed via ADB.
     
     Handles LDPlayer quirk: devices don't always auto-register in `adb devices`.
     Uses `adb connect` as fallback when device not found.
+
+    With the device tracker running this waits on its pushed device list instead of
+    polling `adb devices`; polling (and the kill-server last resort) only runs while the
+    tracker's stream is down.
     """
     import time
     from backend.core.workflow import adb_helper
+    from backend.core.workflow.device_tracker import get_device_tracker
     
-    serial = f"emulator-{5554 + index * 2}"
-    # LDPlayer TCP port for adb connect fallback
-    tcp_port = 5555 + index * 2
-    tcp_serial = f"127.0.0.1:{tcp_port}"
+    # LDPlayer TCP serial for adb connect fallback
+    serial, tcp_serial = adb_serials(index)
     
     start_time = time.time()
+    tracker = get_device_tracker()
+    if tracker is not None and tracker.connected:
+        print(f"[{serial}] Waiting for Android to boot completely (timeout: {timeout}s, tracked)...")
+        tracked = _wait_tracked(tracker, serial, tcp_serial, timeout)
+        if tracked is not None:
+            if not tracked:
+                print(f"[{serial}] Timeout waiting for Android boot.")
+            return tracked
+        print(f"[{serial}] Device tracker disconnected. Polling 'adb devices'...")
+
     adb_restarted = False
     connect_attempted = False
     
@@ -153,7 +193,19 @@ def wait_for_device(index: int, timeout: int = 120) -> bool:
 
 def quit_instance(index: int) -> bool:
     """Stop an emulator by index."""
+    from backend.core.workflow.frame_bus import drop_frame_bus
+    from backend.core.workflow.frame_source import close_frame_source
+    from backend.core.workflow.provider_cache import invalidate_provider
+    from backend.core.workflow.shell_session import close_shell_session
+
     _run(["quit", "--index", str(index)], timeout=15)
+    # Drop the persistent capture / input shells + last frame; all reopen on first use after relaunch
+    serial = f"emulator-{5554 + index * 2}"
+    close_frame_source(serial)
+    close_shell_session(serial)
+    drop_frame_bus(serial)
+    for known in adb_serials(index):
+        invalidate_provider(known, reason="quit")
     return True
 
 
@@ -12,7 +12,6 @@ import cv2
 import numpy as np
 import pytesseract
 from pytesseract import Output
-import subprocess
 
 # Root directory (Part3_Control_EMU)
 root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
@@ -32,6 +31,7 @@ pytesseract.pytesseract.tesseract_cmd = config.tesseract_path
 from workflow import adb_helper
 from workflow.ocr_name_utils import sanitize_lord_name
 from workflow.ocr_swap_logger import log_ocr_swap_attempt
+from backend.core.workflow.frame_bus import get_frame_bus
 
 
 class AccountNotFoundError(Exception):
@@ -87,20 +87,10 @@ class AccountDetector:
         self.adb_path = adb_path or config.adb_path
 
     def screencap_memory(self, serial: str) -> np.ndarray:
-        """Captures screen directly to RAM."""
-        cmd = [self.adb_path, "-s", serial, "exec-out", "screencap", "-p"]
-        startupinfo = subprocess.STARTUPINFO()
-        startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-
+        """Captures screen directly to RAM (shared per-serial frame bus)."""
         try:
-            result = subprocess.run(
-                cmd, capture_output=True, startupinfo=startupinfo, timeout=5
-            )
-            if not result.stdout:
-                return None
-            image_array = np.frombuffer(result.stdout, np.uint8)
-            img = cv2.imdecode(image_array, cv2.IMREAD_COLOR)
-            return img
+            bus_frame = get_frame_bus(serial, self.adb_path).get()
+            return bus_frame.bgr if bus_frame is not None else None
         except Exception as e:
             print(f"[ERROR] Screencap failed: {e}")
             return None
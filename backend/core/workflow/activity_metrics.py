@@ -0,0 +1,101 @@
+"""
+Activity Metrics — in-memory last_run / runs_today per activity for one target group.
+
+broadcast_state used to open an aiosqlite connection and run two queries per activity
+(latest SUCCESS + a `started_at LIKE 'YYYY-MM-DD%'` COUNT) on every orchestrator
+transition. ActivityMetrics loads the same numbers with one grouped query at start and
+then follows execution_log activity events, so a broadcast costs no DB round-trip.
+
+- SUCCESS events of the group bump last_run and today's count.
+- Counts are kept per day, so runs_today resets by itself at midnight.
+- Manual UNDO marks delete rows; the store is flagged stale and reloaded on next use.
+
+Usage:
+    metrics = ActivityMetrics(group_id, activity_ids)
+    await metrics.load(config.db_path)
+    execution_log.add_activity_listener(metrics.on_activity_event)
+    metrics.snapshot()    # {activity_id: {"last_run": iso | None, "runs_today": int}}
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from backend.storage import db_pool
+
+
+class ActivityMetrics:
+    """last_run / runs_today per activity of a group, maintained from activity events."""
+
+    def __init__(self, group_id: int, activity_ids: Iterable[str]):
+        self.group_id = group_id
+        self.activity_ids = [a for a in activity_ids if a]
+        self._last_run: Dict[str, str] = {}
+        self._day_counts: Dict[str, Tuple[str, int]] = {}  # activity_id -> (YYYY-MM-DD, count)
+        self.loaded = False
+        self.stale = False
+        self.loads = 0
+
+    async def load(self, db_path: str):
+        """(Re)seed from account_activity_logs with a single grouped query."""
+        today = datetime.now().strftime("%Y-%m-%d")
+        tomorrow = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
+        last_run: Dict[str, str] = {}
+        day_counts: Dict[str, Tuple[str, int]] = {}
+        if self.activity_ids:
+            placeholders = ",".join("?" for _ in self.activity_ids)
+            async with db_pool.reader(db_path) as db:
+                async with db.execute(
+                    f"""SELECT activity_id, MAX(started_at),
+                               SUM(CASE WHEN started_at >= ? AND started_at < ? THEN 1 ELSE 0 END)
+                        FROM account_activity_logs
+                        WHERE group_id = ? AND status = 'SUCCESS' AND activity_id IN ({placeholders})
+                        GROUP BY activity_id""",
+                    (today, tomorrow, self.group_id, *self.activity_ids),
+                ) as cursor:
+                    for act_id, latest, runs_today in await cursor.fetchall():
+                        if latest:
+                            last_run[act_id] = latest
+                            day_counts[act_id] = (today, int(runs_today or 0))
+        self._last_run = last_run
+        self._day_counts = day_counts
+        self.loaded = True
+        self.stale = False
+        self.loads += 1
+
+    def _in_group(self, group_id: Any) -> bool:
+        return group_id is not None and str(group_id) == str(self.group_id)
+
+    def on_activity_event(self, event: Dict[str, Any]):
+        """execution_log listener."""
+        status = event.get("status")
+        if status == "UNDO":
+            # Manual undo may not carry a group; reload rather than guess
+            if event.get("group_id") is None or self._in_group(event.get("group_id")):
+                self.stale = True
+            return
+        if status != "SUCCESS" or not self._in_group(event.get("group_id")):
+            return
+        act_id = event.get("activity_id")
+        started_at = event.get("started_at")
+        if act_id not in self.activity_ids or not started_at:
+            return
+        if started_at > self._last_run.get(act_id, ""):
+            self._last_run[act_id] = started_at
+        day = started_at[:10]
+        counted_day, count = self._day_counts.get(act_id, (day, 0))
+        if day == counted_day:
+            self._day_counts[act_id] = (day, count + 1)
+        elif day > counted_day:
+            self._day_counts[act_id] = (day, 1)
+
+    def snapshot(self, today: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """Same shape as the old per-activity queries returned."""
+        today = today or datetime.now().strftime("%Y-%m-%d")
+        metrics = {}
+        for act_id in self.activity_ids:
+            day, count = self._day_counts.get(act_id, (today, 0))
+            metrics[act_id] = {
+                "last_run": self._last_run.get(act_id),
+                "runs_today": count if day == today else 0,
+            }
+        return metrics
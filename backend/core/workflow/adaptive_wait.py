@@ -0,0 +1,167 @@
+"""
+Adaptive Wait — polling schedule for wait_for_state (replaces fixed 0.5 s / 3 s sleeps).
+
+- Right after an input (tap / swipe / back reported through state_transitions.note_action)
+  the screen changes within a few hundred ms → poll fast (PollPolicy.fast_sec). The
+  0.15 s interval is only used when the polled detector has the frame-change gate on
+  (unchanged frames cost no matching); ungated detectors start at 0.3 s (poll_policy_for).
+- The interval then grows by `backoff` per poll up to idle_max_sec.
+- Loading screens start at loading_start_sec and back off up to loading_max_sec.
+- Anti-detection jitter is a separate JitterPolicy applied on top of the schedule,
+  so timing stays human-like without being baked into the poll interval.
+- Every reached target is recorded as a (from_state → to_state) time-to-target sample;
+  time_to_target_stats() shows where workflows spend wall-clock time.
+
+Usage:
+    waiter = AdaptiveWaiter(serial)
+    while ...:
+        state = detector.check_state(serial)
+        waiter.observe(state)
+        if state in targets:
+            waiter.reached(state)
+            break
+        waiter.sleep(loading=state == "LOADING SCREEN")
+"""
+
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from backend.core.workflow.state_transitions import last_input_at
+
+# ── Policies ──────────────────────────────────────────────────────
+
+
+@dataclass(frozen=True)
+class PollPolicy:
+    fast_sec: float = 0.15            # First poll after an input / phase change
+    idle_max_sec: float = 0.5         # Cap for normal polls (old fixed delay)
+    loading_start_sec: float = 0.5
+    loading_max_sec: float = 3.0      # Cap while loading (old fixed delay)
+    backoff: float = 1.6
+
+
+@dataclass(frozen=True)
+class JitterPolicy:
+    """Gaussian jitter (same shape as _human_delay) applied on top of the poll schedule."""
+    enabled: bool = True
+    variance: float = 0.2
+    floor_sec: float = 0.05
+
+    def apply(self, delay: float) -> float:
+        if not self.enabled or delay <= 0:
+            return max(0.0, delay)
+        return max(self.floor_sec, random.gauss(delay, delay * self.variance))
+
+
+DEFAULT_POLL_POLICY = PollPolicy()
+UNGATED_POLL_POLICY = PollPolicy(fast_sec=0.3)   # Every poll pays a full scan without the gate
+DEFAULT_JITTER_POLICY = JitterPolicy()
+
+
+def poll_policy_for(change_gate: bool) -> PollPolicy:
+    """Fast polling only pays off when unchanged frames skip classification."""
+    return DEFAULT_POLL_POLICY if change_gate else UNGATED_POLL_POLICY
+
+
+# ── Time-to-target stats ──────────────────────────────────────────
+
+_TTT: dict[tuple[str, str], dict] = {}
+_TTT_LOCK = threading.Lock()
+
+
+def record_time_to_target(from_state: str, to_state: str, elapsed_sec: float, polls: int) -> None:
+    with _TTT_LOCK:
+        item = _TTT.setdefault((from_state, to_state), {"count": 0, "total_sec": 0.0, "max_sec": 0.0, "polls": 0})
+        item["count"] += 1
+        item["total_sec"] += elapsed_sec
+        item["max_sec"] = max(item["max_sec"], elapsed_sec)
+        item["polls"] += polls
+
+
+def time_to_target_stats() -> list[dict]:
+    """Per-transition wall-clock stats, most total time first."""
+    with _TTT_LOCK:
+        rows = [
+            {
+                "from": src, "to": dst, "count": v["count"],
+                "total_sec": round(v["total_sec"], 2),
+                "avg_sec": round(v["total_sec"] / v["count"], 3),
+                "max_sec": round(v["max_sec"], 3),
+                "avg_polls": round(v["polls"] / v["count"], 1),
+            }
+            for (src, dst), v in _TTT.items()
+        ]
+    return sorted(rows, key=lambda r: r["total_sec"], reverse=True)
+
+
+def reset_time_to_target_stats() -> None:
+    with _TTT_LOCK:
+        _TTT.clear()
+
+
+# ── Waiter ────────────────────────────────────────────────────────
+
+
+class AdaptiveWaiter:
+    """Poll schedule for one wait: fast after input, exponential backoff, separate jitter."""
+
+    def __init__(
+        self, serial: str,
+        policy: PollPolicy = DEFAULT_POLL_POLICY,
+        jitter: JitterPolicy = DEFAULT_JITTER_POLICY,
+    ) -> None:
+        self.serial = serial
+        self.policy = policy
+        self.jitter = jitter
+        self.started = time.time()
+        self.from_state: Optional[str] = None
+        self.polls = 0
+        self.slept_sec = 0.0
+        self._phase = ""
+        self._streak = 0
+        self._input_seen = last_input_at(serial)
+
+    def observe(self, state: Optional[str]) -> None:
+        """Record a polled state; the first one is the transition's origin."""
+        self.polls += 1
+        if self.from_state is None:
+            self.from_state = state or "None"
+
+    def next_delay(self, loading: bool = False) -> float:
+        """Un-jittered delay before the next poll."""
+        p = self.policy
+        input_at = last_input_at(self.serial)
+        if input_at > self._input_seen:
+            # New input since the last poll → restart the fast schedule
+            self._input_seen = input_at
+            self._phase, self._streak = "", 0
+
+        phase = "loading" if loading else "idle"
+        if phase != self._phase:
+            self._phase, self._streak = phase, 0
+
+        if loading:
+            base, cap = p.loading_start_sec, p.loading_max_sec
+        else:
+            base, cap = p.fast_sec, p.idle_max_sec
+        delay = min(cap, base * p.backoff ** self._streak)
+        self._streak += 1
+        return delay
+
+    def sleep(self, loading: bool = False) -> float:
+        delay = self.jitter.apply(self.next_delay(loading))
+        time.sleep(delay)
+        self.slept_sec += delay
+        return delay
+
+    def elapsed(self) -> float:
+        return time.time() - self.started
+
+    def reached(self, state: str) -> float:
+        """Record time-to-target for this wait and return it (seconds)."""
+        elapsed = self.elapsed()
+        record_time_to_target(self.from_state or "None", state, elapsed, self.polls)
+        return elapsed
@@ -0,0 +1,383 @@
+"""
+ADB Client — talks the adb host protocol to the adb server over TCP (no adb.exe spawn).
+
+Every device call used to go through `subprocess.run([adb_path, ...])`: one process
+per pidof / dumpsys / getprop / devices / connect / install, each needing Windows-only
+STARTUPINFO. The adb server already listens on 127.0.0.1:5037; AdbClient sends it the
+same requests adb.exe would.
+
+- Requests are `<4 hex digit length><payload>`, answered by OKAY or FAIL + message.
+- Host services: `host:devices`, `host:connect:<addr>`, `host-serial:<serial>:get-state`.
+- Device services after `host:transport:<serial>`: `shell:` (text), `exec:` (binary-safe),
+  `sync:` (SEND only — push). install = push to /data/local/tmp + `pm install`
+  (install-multiple goes through a `pm install-create` session).
+- The server closes a connection when its service ends, so connections cannot be reused;
+  the pool bounds how many are open at once (ADB_MAX_CONNECTIONS) and counts them.
+- adb_run() is the drop-in for `subprocess.run([adb, "-s", serial, *args])`: args it knows
+  go over the socket; anything else (start-server, ...) and an unreachable server fall
+  back to the adb binary. Timeouts raise subprocess.TimeoutExpired on both paths, so
+  existing handlers keep working.
+
+Usage:
+    from backend.core.workflow.adb_client import adb_run, get_adb_client
+    out = adb_run(["shell", "pidof", package], serial=serial, timeout=5)
+    get_adb_client().devices()      # [("emulator-5554", "device"), ...]
+    adb_client_stats()
+"""
+
+import os
+import posixpath
+import socket
+import struct
+import subprocess
+import sys
+import threading
+import time
+from typing import Optional, Union
+
+from backend.config import config
+
+# ── Module Constants ──────────────────────────────────────────────
+
+ADB_SERVER_HOST = "127.0.0.1"
+ADB_SERVER_PORT = int(os.environ.get("ANDROID_ADB_SERVER_PORT", "5037"))
+ADB_CONNECT_TIMEOUT_SEC = 2
+ADB_MAX_CONNECTIONS = 32         # open sockets to the server at once (10+ emulators, several lanes each)
+ADB_RETRY_COOLDOWN_SEC = 30      # after the server refused a connection, use adb.exe for this long
+SYNC_CHUNK_SIZE = 64 * 1024      # max DATA payload of the sync protocol
+SYNC_FILE_MODE = 0o100644        # regular file, rw-r--r--
+DEVICE_TMP_DIR = "/data/local/tmp"
+
+
+def hidden_startupinfo():
+    """Hide the console window on Windows; None elsewhere."""
+    if sys.platform != "win32":
+        return None
+    startupinfo = subprocess.STARTUPINFO()
+    startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+    return startupinfo
+
+
+class AdbError(Exception):
+    """The adb server (or the device) answered FAIL."""
+
+
+class AdbConnectionError(AdbError):
+    """The adb server is not reachable."""
+
+
+class AdbClient:
+    """adb host protocol over TCP. Thread-safe: every request uses its own socket."""
+
+    def __init__(self, host: str = ADB_SERVER_HOST, port: int = ADB_SERVER_PORT,
+                 max_connections: int = ADB_MAX_CONNECTIONS) -> None:
+        self.host = host
+        self.port = port
+        self._slots = threading.BoundedSemaphore(max_connections)
+        self._stats_lock = threading.Lock()
+        self.max_connections = max_connections
+        self.requests = 0
+        self.errors = 0
+        self.open_connections = 0
+        self.peak_connections = 0
+        self.bytes_received = 0
+        self.total_request_ms = 0.0
+
+    # ── Wire format ───────────────────────────────────────────────
+
+    def _connect(self, timeout: float) -> socket.socket:
+        try:
+            sock = socket.create_connection((self.host, self.port), timeout=min(timeout, ADB_CONNECT_TIMEOUT_SEC))
+        except OSError as e:
+            raise AdbConnectionError(f"adb server not reachable at {self.host}:{self.port}: {e}") from e
+        sock.settimeout(timeout)
+        return sock
+
+    @staticmethod
+    def _send(sock: socket.socket, payload: str) -> None:
+        data = payload.encode("utf-8")
+        sock.sendall(f"{len(data):04x}".encode("ascii") + data)
+
+    @staticmethod
+    def _recv_exact(sock: socket.socket, size: int) -> bytes:
+        buf = bytearray()
+        while len(buf) < size:
+            chunk = sock.recv(size - len(buf))
+            if not chunk:
+                raise AdbError("adb server closed the connection")
+            buf += chunk
+        return bytes(buf)
+
+    def _recv_hex_block(self, sock: socket.socket) -> bytes:
+        size = int(self._recv_exact(sock, 4), 16)
+        return self._recv_exact(sock, size)
+
+    def _check_status(self, sock: socket.socket) -> None:
+        status = self._recv_exact(sock, 4)
+        if status == b"OKAY":
+            return
+        if status == b"FAIL":
+            raise AdbError(self._recv_hex_block(sock).decode("utf-8", errors="replace"))
+        raise AdbError(f"unexpected adb status {status!r}")
+
+    @staticmethod
+    def _recv_all(sock: socket.socket) -> bytes:
+        chunks = []
+        while True:
+            chunk = sock.recv(SYNC_CHUNK_SIZE)
+            if not chunk:
+                return b"".join(chunks)
+            chunks.append(chunk)
+
+    def _request(self, fn, timeout: float):
+        """Run fn(sock) on a fresh connection, bounded by the pool; keeps the counters."""
+        self._slots.acquire()
+        t0 = time.perf_counter()
+        with self._stats_lock:
+            self.requests += 1
+            self.open_connections += 1
+            self.peak_connections = max(self.peak_connections, self.open_connections)
+        try:
+            with self._connect(timeout) as sock:
+                return fn(sock)
+        except Exception:
+            with self._stats_lock:
+                self.errors += 1
+            raise
+        finally:
+            with self._stats_lock:
+                self.open_connections -= 1
+                self.total_request_ms += (time.perf_counter() - t0) * 1000
+            self._slots.release()
+
+    def _transport(self, sock: socket.socket, serial: Optional[str]) -> None:
+        self._send(sock, f"host:transport:{serial}" if serial else "host:transport-any")
+        self._check_status(sock)
+
+    # ── Host services ─────────────────────────────────────────────
+
+    def host_query(self, request: str, timeout: float = 10) -> str:
+        """A host service that answers with one length-prefixed block (devices, connect, get-state)."""
+        def _run(sock):
+            self._send(sock, request)
+            self._check_status(sock)
+            return self._recv_hex_block(sock).decode("utf-8", errors="replace")
+        return self._request(_run, timeout)
+
+    def devices(self, timeout: float = 10) -> list[tuple[str, str]]:
+        """[(serial, state)] — state is device / offline / unauthorized / ..."""
+        out = self.host_query("host:devices", timeout)
+        return [tuple(line.split("\t", 1)) for line in out.splitlines() if "\t" in line]
+
+    def get_state(self, serial: str, timeout: float = 10) -> str:
+        return self.host_query(f"host-serial:{serial}:get-state", timeout)
+
+    def connect_device(self, address: str, timeout: float = 10) -> str:
+        return self.host_query(f"host:connect:{address}", timeout)
+
+    def kill_server(self, timeout: float = 5) -> None:
+        def _run(sock):
+            self._send(sock, "host:kill")
+            self._check_status(sock)
+        self._request(_run, timeout)
+
+    # ── Device services ───────────────────────────────────────────
+
+    def _stream_service(self, serial: Optional[str], service: str, timeout: float) -> bytes:
+        def _run(sock):
+            self._transport(sock, serial)
+            self._send(sock, service)
+            self._check_status(sock)
+            data = self._recv_all(sock)
+            with self._stats_lock:
+                self.bytes_received += len(data)
+            return data
+        return self._request(_run, timeout)
+
+    def shell(self, serial: Optional[str], command: str, timeout: float = 30) -> str:
+        """`adb shell <command>` — stdout (+stderr on shell v1) as text, CRLF normalized."""
+        data = self._stream_service(serial, f"shell:{command}", timeout)
+        return data.decode("utf-8", errors="replace").replace("\r\n", "\n")
+
+    def exec_out(self, serial: Optional[str], command: str, timeout: float = 30) -> bytes:
+        """`adb exec-out <command>` — raw stdout bytes (no pty, no line-ending rewrite)."""
+        return self._stream_service(serial, f"exec:{command}", timeout)
+
+    def push(self, serial: Optional[str], local_path: str, remote_path: str,
+             mode: int = SYNC_FILE_MODE, timeout: float = 120) -> None:
+        """`adb push` one file through the sync protocol (SEND / DATA / DONE)."""
+        def _run(sock):
+            self._transport(sock, serial)
+            self._send(sock, "sync:")
+            self._check_status(sock)
+            header = f"{remote_path},{mode}".encode("utf-8")
+            sock.sendall(b"SEND" + struct.pack("<I", len(header)) + header)
+            with open(local_path, "rb") as f:
+                while True:
+                    chunk = f.read(SYNC_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    sock.sendall(b"DATA" + struct.pack("<I", len(chunk)) + chunk)
+            sock.sendall(b"DONE" + struct.pack("<I", int(os.path.getmtime(local_path))))
+            reply_id, size = struct.unpack("<4sI", self._recv_exact(sock, 8))
+            message = self._recv_exact(sock, size).decode("utf-8", errors="replace") if size else ""
+            sock.sendall(b"QUIT" + struct.pack("<I", 0))
+            if reply_id != b"OKAY":
+                raise AdbError(message or f"push failed ({reply_id!r})")
+        self._request(_run, timeout)
+
+    def install(self, serial: Optional[str], apk_paths: list[str], replace: bool = True,
+                timeout: float = 300) -> str:
+        """Push the APK(s) to the device and install them with pm. Returns pm's output."""
+        flags = "-r " if replace else ""
+        remote = [posixpath.join(DEVICE_TMP_DIR, os.path.basename(p)) for p in apk_paths]
+        try:
+            for local, dest in zip(apk_paths, remote):
+                self.push(serial, local, dest, timeout=timeout)
+            if len(apk_paths) == 1:
+                return self.shell(serial, f"pm install {flags}{remote[0]}", timeout).strip()
+
+            total = sum(os.path.getsize(p) for p in apk_paths)
+            created = self.shell(serial, f"pm install-create {flags}-S {total}", timeout)
+            if "[" not in created:
+                return created.strip()
+            session = created.split("[", 1)[1].split("]", 1)[0]
+            for index, (local, dest) in enumerate(zip(apk_paths, remote)):
+                written = self.shell(
+                    serial, f"pm install-write -S {os.path.getsize(local)} {session} {index}_{os.path.basename(dest)} {dest}",
+                    timeout,
+                )
+                if "Success" not in written:
+                    self.shell(serial, f"pm install-abandon {session}", timeout)
+                    return written.strip()
+            return self.shell(serial, f"pm install-commit {session}", timeout).strip()
+        finally:
+            try:
+                self.shell(serial, "rm -f " + " ".join(remote), timeout=10)
+            except (AdbError, OSError):
+                pass
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            avg = self.total_request_ms / self.requests if self.requests else 0.0
+            return {
+                "server": f"{self.host}:{self.port}",
+                "requests": self.requests,
+                "errors": self.errors,
+                "open_connections": self.open_connections,
+                "peak_connections": self.peak_connections,
+                "max_connections": self.max_connections,
+                "bytes_received": self.bytes_received,
+                "avg_request_ms": round(avg, 2),
+            }
+
+
+# ── Shared client + adb.exe-compatible entry point ────────────────
+
+_client = AdbClient()
+_native_enabled = True
+_native_disabled_until = 0.0
+_fallbacks = 0
+
+
+def get_adb_client() -> AdbClient:
+    return _client
+
+
+def set_adb_client(client: AdbClient) -> None:
+    """Point the shared client at another server (tests, non-default port)."""
+    global _client, _native_disabled_until
+    _client = client
+    _native_disabled_until = 0.0
+
+
+def set_adb_native(enabled: bool) -> None:
+    """False routes every call through the adb binary (the pre-client behaviour)."""
+    global _native_enabled
+    _native_enabled = enabled
+
+
+def _native(client: AdbClient, args: list[str], serial: Optional[str], timeout: float, binary: bool):
+    """Serve adb CLI args over the socket; None if these args have no native mapping."""
+    cmd, rest = (args[0], args[1:]) if args else ("", [])
+    if cmd == "devices" and not rest:
+        lines = "".join(f"{s}\t{state}\n" for s, state in client.devices(timeout))
+        return "List of devices attached\n" + lines
+    if cmd == "connect" and len(rest) == 1:
+        return client.connect_device(rest[0], timeout)
+    if cmd == "get-state" and not rest and serial:
+        return client.get_state(serial, timeout)
+    if cmd == "shell" and rest and not rest[0].startswith("-"):
+        # adb.exe joins shell args with single spaces, unquoted — same here
+        return client.shell(serial, " ".join(rest), timeout)
+    if cmd == "exec-out" and rest:
+        data = client.exec_out(serial, " ".join(rest), timeout)
+        return data if binary else data.decode("utf-8", errors="replace")
+    return None
+
+
+def _run_binary(args: list[str], serial: Optional[str], timeout: float, adb_path: Optional[str], binary: bool):
+    cmd = [adb_path or config.adb_path] + (["-s", serial] if serial else []) + list(args)
+    result = subprocess.run(
+        cmd, capture_output=True, text=not binary, startupinfo=hidden_startupinfo(), timeout=timeout,
+    )
+    return result.stdout
+
+
+def adb_run(args: list[str], serial: Optional[str] = None, timeout: float = 30,
+            adb_path: Optional[str] = None, binary: bool = False) -> Union[str, bytes]:
+    """
+    Equivalent of `adb [-s serial] <args>` → stdout (str, or bytes with binary=True).
+
+    A FAIL from the server (device not found, offline, ...) returns empty output, as the
+    adb binary would on stdout. Raises subprocess.TimeoutExpired on timeout.
+    """
+    global _native_disabled_until, _fallbacks
+    client = _client
+    if _native_enabled and time.monotonic() >= _native_disabled_until:
+        try:
+            out = _native(client, list(args), serial, timeout, binary)
+        except AdbConnectionError as e:
+            print(f"[ADB] {e} — using adb binary for {ADB_RETRY_COOLDOWN_SEC}s")
+            _native_disabled_until = time.monotonic() + ADB_RETRY_COOLDOWN_SEC
+        except socket.timeout as e:
+            raise subprocess.TimeoutExpired(["adb", *args], timeout) from e
+        except (AdbError, OSError):
+            return b"" if binary else ""
+        else:
+            if out is not None:
+                return out
+    _fallbacks += 1
+    return _run_binary(args, serial, timeout, adb_path, binary)
+
+
+def adb_install(serial: str, apk_paths: list[str], replace: bool = True, timeout: float = 300,
+                adb_path: Optional[str] = None) -> str:
+    """`adb install -r` / `adb install-multiple -r` → output text ("Success" on success)."""
+    global _native_disabled_until, _fallbacks
+    client = _client
+    if _native_enabled and time.monotonic() >= _native_disabled_until:
+        try:
+            return client.install(serial, apk_paths, replace, timeout)
+        except AdbConnectionError as e:
+            print(f"[ADB] {e} — using adb binary for {ADB_RETRY_COOLDOWN_SEC}s")
+            _native_disabled_until = time.monotonic() + ADB_RETRY_COOLDOWN_SEC
+        except socket.timeout as e:
+            raise subprocess.TimeoutExpired(["adb", "install", *apk_paths], timeout) from e
+        except (AdbError, OSError) as e:
+            return f"error: {e}"
+    _fallbacks += 1
+    verb = "install" if len(apk_paths) == 1 else "install-multiple"
+    args = [verb] + (["-r"] if replace else []) + [str(p) for p in apk_paths]
+    cmd = [adb_path or config.adb_path, "-s", serial] + args
+    result = subprocess.run(
+        cmd, capture_output=True, text=True, startupinfo=hidden_startupinfo(), timeout=timeout,
+    )
+    return (result.stdout.strip() or result.stderr.strip())
+
+
+def adb_client_stats() -> dict:
+    data = _client.stats()
+    data["native"] = _native_enabled and time.monotonic() >= _native_disabled_until
+    data["binary_fallbacks"] = _fallbacks
+    return data
@@ -1,33 +1,26 @@
 """
 ADB Helper — Low-level ADB command wrapper.
 Extracted and enhanced from cod_app_sync.py.
+
+Input commands (tap / swipe / back / text) go through the per-serial persistent shell
+in shell_session; everything else goes to the adb server over its socket (adb_client),
+falling back to one `adb` process per call.
 """
 
 import random
+import shlex
 import subprocess
 import time
 from backend.config import config
+from backend.core.workflow.adb_client import adb_run
+from backend.core.workflow.shell_session import run_shell
+from backend.core.workflow.state_transitions import note_action as _note_action
 
 
 def _run_adb(cmd_list: list[str], serial: str = None, timeout: int = 30) -> str:
-    """Execute an ADB command and return stdout."""
+    """Execute an ADB command (native adb protocol, adb binary fallback) and return stdout."""
     try:
-        base = [config.adb_path]
-        if serial:
-            base += ["-s", serial]
-        base += cmd_list
-
-        startupinfo = subprocess.STARTUPINFO()
-        startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-
-        result = subprocess.run(
-            base,
-            capture_output=True,
-            text=True,
-            startupinfo=startupinfo,
-            timeout=timeout,
-        )
-        return result.stdout.strip()
+        return adb_run(cmd_list, serial=serial, timeout=timeout).strip()
     except subprocess.TimeoutExpired:
         return ""
     except Exception as e:
@@ -35,6 +28,11 @@ def _run_adb(cmd_list: list[str], serial: str = None, timeout: int = 30) -> str:
         return ""
 
 
+def _run_shell(command: str, serial: str, timeout: int = 30) -> str:
+    """Run a shell command over the serial's persistent shell session and return stdout."""
+    return run_shell(serial, config.adb_path, command, timeout)
+
+
 def list_devices() -> list[str]:
     """Get list of connected ADB device serials."""
     out = _run_adb(["devices"])
@@ -59,20 +57,20 @@ def tap(serial: str, x: int, y: int):
     """Send tap event to device with ±2px random offset for anti-detection."""
     jx = x + random.randint(-2, 2)
     jy = y + random.randint(-2, 2)
-    _run_adb(["shell", "input", "tap", str(jx), str(jy)], serial=serial)
+    _run_shell(f"input tap {jx} {jy}", serial=serial)
+    _note_action(serial, "tap")
 
 
 def swipe(serial: str, x1: int, y1: int, x2: int, y2: int, duration: int = 300):
     """Send swipe event to device."""
-    _run_adb(
-        ["shell", "input", "swipe", str(x1), str(y1), str(x2), str(y2), str(duration)],
-        serial=serial,
-    )
+    _run_shell(f"input swipe {x1} {y1} {x2} {y2} {duration}", serial=serial)
+    _note_action(serial, "swipe")
 
 
 def press_back(serial: str):
     """Send BACK key event."""
-    _run_adb(["shell", "input", "keyevent", "4"], serial=serial)
+    _run_shell("input keyevent 4", serial=serial)
+    _note_action(serial, "back")
 
 
 def press_back_n(serial: str, count: int = 1, delay: float = 1.5):
@@ -82,34 +80,28 @@ def press_back_n(serial: str, count: int = 1, delay: float = 1.5):
         time.sleep(delay)
 
 
+def input_text(serial: str, text: str):
+    """Type text into the focused field (`input text`; spaces are sent as %s)."""
+    _run_shell(f"input text {shlex.quote(text.replace(' ', '%s'))}", serial=serial)
+    _note_action(serial, "text")
+
+
 def screencap(serial: str, local_path: str) -> bool:
     """Capture screenshot from device and pull to local path.
 
     Returns True on success.
     """
     try:
-        # Using exec-out to bypass the shell's CRLF line ending conversions
-        # and avoid writing an intermediate file to /sdcard/
-        cmd = [config.adb_path, "-s", serial, "exec-out", "screencap", "-p"]
-
-        startupinfo = subprocess.STARTUPINFO()
-        startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            startupinfo=startupinfo,
-            timeout=15,
-        )
+        # exec-out bypasses the shell's CRLF line ending conversions
+        # and avoids writing an intermediate file to /sdcard/
+        data = adb_run(["exec-out", "screencap", "-p"], serial=serial, timeout=15, binary=True)
 
-        if result.returncode == 0 and len(result.stdout) > 0:
+        if data:
             with open(local_path, "wb") as f:
-                f.write(result.stdout)
+                f.write(data)
             return True
         else:
-            print(
-                f"[ADB] Screencap returned code {result.returncode}, len {len(result.stdout)}"
-            )
+            print(f"[ADB] Screencap returned no data for {serial}")
             return False
 
     except Exception as e:
@@ -0,0 +1,271 @@
+"""
+Batch Matcher — evaluate every template of a category against one frame in a single pass.
+
+The sequential engine (`GameStateDetector._match_single` in a loop) stops at the first
+hit, which is ideal for "is it still state X?" polls but wasteful when the caller wants
+the whole picture (check_state_full). BatchMatcher instead:
+
+- groups templates whose ROIs overlap and crops each group region once;
+  every template then slices its own ROI window out of that crop, so scores are
+  identical to the sequential path,
+- runs the groups across a shared thread pool (cv2.matchTemplate releases the GIL),
+- returns a full score vector (BatchScores) for the frame.
+
+Full-screen templates with a "pyramid" entry (PYRAMID_HINTS) go coarse-to-fine, sharing
+one downscaled frame per pass (template_pyramid.py).
+
+Usage:
+    matcher = BatchMatcher(registry["state"])
+    scores = matcher.match(gray)                 # or match(gray, color=frame) when use_color
+    scores.score("LOADING SCREEN")               # best score across that name's templates
+    scores.first_passing(order, threshold=0.8)
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+import cv2
+import numpy as np
+
+from backend.core.workflow.template_pyramid import ScaledFrameCache, match_entry
+
+# ── Module Constants ──────────────────────────────────────────────
+
+BATCH_MAX_WORKERS = max(1, min(4, (os.cpu_count() or 2) - 1))
+LARGE_ROI_RATIO = 0.5   # ROIs above this fraction of the frame are not merged into groups
+
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=BATCH_MAX_WORKERS, thread_name_prefix="batch-match")
+        return _pool
+
+
+@dataclass
+class _Item:
+    """One template entry inside a group. window = its own ROI relative to the group crop."""
+    index: int
+    name: str
+    entry: dict
+    window: Optional[tuple[int, int, int, int]]
+
+
+@dataclass
+class _Group:
+    roi: Optional[tuple[int, int, int, int]]    # union ROI; None = full frame
+    items: list[_Item] = field(default_factory=list)
+
+
+@dataclass
+class BatchScores:
+    """Full score vector for one frame: one row per template entry."""
+    names: list[str]
+    scores: np.ndarray                  # float32, aligned with names
+    locs: list[tuple[int, int]]         # top-left in absolute screen coordinates
+    sizes: list[tuple[int, int]]        # (w, h) per template
+    times_ms: np.ndarray                # per-template match time
+    total_ms: float = 0.0
+
+    def score(self, name: str) -> float:
+        """Best score across all templates registered under name (0.0 if none)."""
+        best = 0.0
+        for i, n in enumerate(self.names):
+            if n == name and self.scores[i] > best:
+                best = float(self.scores[i])
+        return best
+
+    def best_index(self, name: str) -> int:
+        idx = [i for i, n in enumerate(self.names) if n == name]
+        return max(idx, key=lambda i: self.scores[i]) if idx else -1
+
+    def center(self, index: int) -> tuple[int, int]:
+        (x, y), (w, h) = self.locs[index], self.sizes[index]
+        return x + w // 2, y + h // 2
+
+    def first_passing(self, order: Iterable[str], threshold: float) -> Optional[str]:
+        """First name in `order` whose best score clears threshold."""
+        for name in order:
+            if self.score(name) >= threshold:
+                return name
+        return None
+
+    def as_dict(self) -> dict[str, float]:
+        """{name: best score} — compact form for logs / API payloads."""
+        out: dict[str, float] = {}
+        for n, s in zip(self.names, self.scores):
+            out[n] = max(out.get(n, 0.0), round(float(s), 4))
+        return out
+
+
+def _overlaps(a: tuple, b: tuple) -> bool:
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+def _union(a: tuple, b: tuple) -> tuple:
+    return (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+
+
+def _area(roi: tuple) -> int:
+    return (roi[2] - roi[0]) * (roi[3] - roi[1])
+
+
+def group_by_roi(
+    rois: list[Optional[tuple]], frame_area: int = 960 * 540,
+) -> list[tuple[Optional[tuple], list[int]]]:
+    """
+    Cluster ROIs that overlap (transitively). Returns [(union_roi, [indices])].
+
+    Entries without ROI, or with an ROI covering more than LARGE_ROI_RATIO of the
+    frame, stay ungrouped (one group each) — folding them in would collapse every
+    cluster into one full-frame group and serialize the whole batch.
+    """
+    groups: list[tuple[tuple, list[int]]] = []
+    loose: list[tuple[Optional[tuple], list[int]]] = []
+    for i, roi in enumerate(rois):
+        if not roi or _area(roi) > LARGE_ROI_RATIO * frame_area:
+            loose.append((tuple(roi) if roi else None, [i]))
+            continue
+        merged_roi, members = tuple(roi), [i]
+        changed = True
+        while changed:
+            changed = False
+            for g in groups:
+                if _overlaps(g[0], merged_roi):
+                    merged_roi = _union(g[0], merged_roi)
+                    members = g[1] + members
+                    groups.remove(g)
+                    changed = True
+                    break
+        groups.append((merged_roi, members))
+    return [(roi, sorted(m)) for roi, m in groups] + loose
+
+
+class BatchMatcher:
+    """Pre-grouped template set for one category (gray or color)."""
+
+    def __init__(self, template_dict: dict, use_color: bool = False) -> None:
+        self.use_color = use_color
+        flat: list[tuple[str, dict]] = [
+            (name, entry) for name, entries in template_dict.items() for entry in entries
+        ]
+        self.names = [name for name, _ in flat]
+        self.entries = [entry for _, entry in flat]
+        self.sizes = [(e["gray"].shape[1], e["gray"].shape[0]) for _, e in flat]
+        self.groups: list[_Group] = []
+        for roi, members in group_by_roi([e.get("roi") for _, e in flat]):
+            group = _Group(roi=roi)
+            for i in members:
+                name, entry = flat[i]
+                own = entry.get("roi")
+                window = None
+                if roi and own:
+                    window = (own[0] - roi[0], own[1] - roi[1], own[2] - roi[0], own[3] - roi[1])
+                group.items.append(_Item(index=i, name=name, entry=entry, window=window))
+            self.groups.append(group)
+        # Longest groups first → better packing across the pool
+        self.groups.sort(key=self._group_cost, reverse=True)
+
+    def _group_cost(self, group: _Group) -> int:
+        cost = 0
+        for item in group.items:
+            own = item.entry.get("roi")
+            cost += _area(own) if own else 960 * 540
+        return cost
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _match_group(
+        self, group: _Group, screen: np.ndarray, out: tuple,
+        threshold: float = 0.8, scaled: Optional[ScaledFrameCache] = None,
+    ) -> None:
+        scores, locs, times = out
+        if group.roi:
+            x1, y1, x2, y2 = group.roi
+            crop = screen[y1:y2, x1:x2]
+            ox, oy = x1, y1
+        else:
+            crop, ox, oy = screen, 0, 0
+
+        for item in group.items:
+            t0 = time.perf_counter()
+            tmpl = item.entry["color"] if self.use_color else item.entry["gray"]
+            region, rx, ry = crop, ox, oy
+            if item.window:
+                wx1, wy1, wx2, wy2 = item.window
+                region = crop[wy1:wy2, wx1:wx2]
+                rx, ry = ox + wx1, oy + wy1
+                # Same fallback as _match_single: ROI smaller than template → full frame
+                if region.shape[0] < tmpl.shape[0] or region.shape[1] < tmpl.shape[1]:
+                    region, rx, ry = screen, 0, 0
+
+            pyramid = None
+            if region is screen:
+                pyramid = match_entry(screen, item.entry, threshold, self.use_color, scaled or ScaledFrameCache())
+
+            if pyramid is not None:
+                scores[item.index], locs[item.index] = pyramid
+            elif region.shape[0] < tmpl.shape[0] or region.shape[1] < tmpl.shape[1]:
+                scores[item.index], locs[item.index] = 0.0, (0, 0)
+            else:
+                res = cv2.matchTemplate(region, tmpl, cv2.TM_CCOEFF_NORMED)
+                _, max_val, _, max_loc = cv2.minMaxLoc(res)
+                scores[item.index] = max_val
+                locs[item.index] = (max_loc[0] + rx, max_loc[1] + ry)
+            times[item.index] = (time.perf_counter() - t0) * 1000
+
+    def _new_output(self) -> tuple:
+        n = len(self.names)
+        return np.zeros(n, np.float32), [(0, 0)] * n, np.zeros(n, np.float32)
+
+    def _scores(self, out: tuple, total_ms: float) -> BatchScores:
+        scores, locs, times = out
+        return BatchScores(
+            names=self.names, scores=scores, locs=locs, sizes=self.sizes,
+            times_ms=times, total_ms=total_ms,
+        )
+
+    def match(
+        self, gray: np.ndarray, color: Optional[np.ndarray] = None, parallel: bool = True,
+        threshold: float = 0.8,
+    ) -> BatchScores:
+        """Score every template against the frame. Thread pool is used when parallel and >1 group."""
+        return match_many([self], gray, color, parallel, threshold)[0]
+
+
+def match_many(
+    matchers: list[BatchMatcher], gray: np.ndarray, color: Optional[np.ndarray] = None,
+    parallel: bool = True, threshold: float = 0.8,
+) -> list[BatchScores]:
+    """
+    Score several categories against one frame in a single pass: every group of every
+    matcher goes into the pool together, so small categories don't serialize behind big ones.
+    threshold only steers pyramid refinement (which coarse candidates are worth confirming).
+    """
+    outs = [m._new_output() for m in matchers]
+    scaled = ScaledFrameCache()
+    jobs = [
+        (m, g, color if m.use_color and color is not None else gray, out)
+        for m, out in zip(matchers, outs) for g in m.groups
+    ]
+
+    t0 = time.perf_counter()
+    if parallel and BATCH_MAX_WORKERS > 1 and len(jobs) > 1:
+        pool = _get_pool()
+        for f in [pool.submit(m._match_group, g, screen, out, threshold, scaled) for m, g, screen, out in jobs]:
+            f.result()
+    else:
+        for m, g, screen, out in jobs:
+            m._match_group(g, screen, out, threshold, scaled)
+    total_ms = (time.perf_counter() - t0) * 1000
+
+    return [m._scores(out, total_ms) for m, out in zip(matchers, outs)]
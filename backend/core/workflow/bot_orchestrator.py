@@ -1,6 +1,8 @@
 import asyncio
 import random
 import time
+from dataclasses import dataclass, field
+from datetime import datetime
 from typing import List, Dict, Any, Callable, Optional, Tuple
 from backend.core.workflow import (
     adb_helper,
@@ -24,7 +26,14 @@ from backend.core.workflow.swap_logger import (
     log_main_loop_swap_decision,
 )
 from backend.core.workflow.smart_wait_logger import log_smart_wait_eval
+from backend.core.workflow.cooldown_scheduler import CooldownScheduler
+from backend.core.workflow.activity_metrics import ActivityMetrics
+from backend.core.workflow.run_planner import SwapCosts, plan_cycle
+from backend.core.workflow.warm_pool import WarmBudget, WarmPool
+from backend.core.workflow.device_executor import run_long_on_device, run_on_device
+from backend.core.workflow.device_tracker import get_device_tracker
 from backend.core.ldplayer_manager import (
+    adb_serials,
     list_all_instances,
     quit_instance,
     launch_instance,
@@ -37,6 +46,50 @@ import os
 _active_orchestrators = {}
 
 
+def _serial(emu_idx: int) -> str:
+    """ADB serial of an LDPlayer instance (device executor lane key)."""
+    return f"emulator-{5554 + emu_idx * 2}"
+
+
+# ── Parallel emulator mode ──
+# A running LDPlayer instance keeps roughly this many host cores busy.
+CPU_CORES_PER_EMULATOR = 2
+
+
+def default_parallel_cap() -> int:
+    """How many emulators this host can drive at once (at least 1)."""
+    return max(1, (os.cpu_count() or 1) // CPU_CORES_PER_EMULATOR)
+
+
+@dataclass
+class EmulatorLane:
+    """State of one emulator's worker in parallel mode. Never shared between workers."""
+
+    emu_index: int
+    emu_name: str
+    serial: str
+    state: str = "idle"  # idle | waiting_slot | booting | running | cooldown | done
+    cycle: int = 1
+    booted: bool = False
+    account_id: Optional[str] = None
+    last_verified_account_id: Optional[str] = None
+    current_activity: Optional[Dict[str, Any]] = None
+    activity_statuses: Dict[str, str] = field(default_factory=dict)
+    activities_completed: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "emu_index": self.emu_index,
+            "emu_name": self.emu_name,
+            "state": self.state,
+            "cycle": self.cycle,
+            "account_id": self.account_id,
+            "current_activity": self.current_activity,
+            "activity_statuses": self.activity_statuses,
+            "activities_completed": self.activities_completed,
+        }
+
+
 class BotOrchestrator:
     """
     Manages sequential execution of accounts within a Target Group.
@@ -63,6 +116,7 @@ class BotOrchestrator:
         self.package_name = core_actions.get_package_for_provider()  # default, auto-detected per-emu in _ensure_lobby
 
         self.main_task: asyncio.Task = None
+        self.start_account_id = start_account_id
 
         # Sort accounts by emu_index so all accounts on the same emulator
         # run consecutively, minimizing expensive cross-emu swaps
@@ -112,6 +166,52 @@ class BotOrchestrator:
         for act in ACTIVITY_REGISTRY:
             self._weight_map[act["id"]] = act.get("weight", "heavy")
 
+        # Parallel mode: one worker per emulator, at most max_parallel_emulators at once
+        self.parallel_emulators = bool(self.misc_config.get("parallel_emulators", False))
+        try:
+            parallel_cap = int(self.misc_config.get("max_parallel_emulators", 0) or 0)
+        except (TypeError, ValueError):
+            parallel_cap = 0
+        self.max_parallel_emulators = parallel_cap if parallel_cap > 0 else default_parallel_cap()
+        self.lanes: Dict[int, EmulatorLane] = {}
+
+        self._last_verified_account_id = None
+        self._detectors: Dict[int, GameStateDetector] = {}  # emu_index -> detector
+        self._packages: Dict[str, str] = {}  # serial -> package detected by _ensure_lobby
+        self.activities_completed = 0
+
+        # In-memory cooldown scheduler (seeded from the DB in start())
+        self.cooldowns = CooldownScheduler(
+            self.activities,
+            self._weight_map,
+            account_cooldown_sec=self.misc_config.get("cooldown_min", 0) * 60,
+            skip_cooldown=self.skip_cooldown,
+        )
+        self._partition_of = None  # emu index per account in parallel mode
+        self._accounts_by_id = {str(acc["id"]): acc for acc in self.queue}
+        self._by_game_id: Dict[str, Dict[str, Any]] = {}
+        self._wake = asyncio.Event()  # set by stop() to cut cooldown sleeps short
+
+        # Swap planner: per-cycle order minimizing swap cost (sequential mode)
+        self.swap_planner = bool(self.misc_config.get("swap_planner", True))
+        self._swap_costs: Optional[SwapCosts] = None  # loaded from swap_logger in start()
+        self._run_sec: Dict[str, float] = {}  # acc_id -> measured duration of its last run
+        self._last_emu_index: Optional[int] = None
+        self.last_plan: Optional[Dict[str, Any]] = None
+
+        # Warm pool: pre-boot upcoming emulators while the current one works (sequential mode)
+        self.warm_pool: Optional[WarmPool] = None
+        if self.misc_config.get("warm_pool", False):
+            self.warm_pool = WarmPool(
+                WarmBudget.from_misc(self.misc_config), self._warm_emulator, self._quit_emulator
+            )
+        self.warm_lookahead_sec = float(self.misc_config.get("warm_lookahead_min", 15) or 0) * 60
+
+        # broadcast_state metrics, kept in memory from execution_log activity events
+        self.activity_metrics = ActivityMetrics(
+            self.group_id, [act.get("id", act.get("name")) for act in self.activities]
+        )
+
     async def broadcast_state(self):
         """Sends the current orchestrator queue state to the frontend via WebSocket."""
         if not self.ws_callback:
@@ -148,7 +248,7 @@ class BotOrchestrator:
             "current_idx": self.current_idx,
             "total_accounts": len(self.queue),
             "current_activity": self.current_activity,
-            "activity_statuses": self.activity_statuses,
+            "activity_statuses": self.live_activity_statuses(),
             "accounts": accounts_payload,
             "activity_metrics": await self._get_activity_metrics(),
             "cooldown_config": {
@@ -157,6 +257,9 @@ class BotOrchestrator:
                 "skip_cooldown": self.skip_cooldown,
             },
             "smart_wait_active": self._smart_wait_info,
+            "parallel": self._parallel_payload(),
+            "throughput": self._throughput(),
+            "warm_pool": self.warm_pool.stats() if self.warm_pool else None,
         }
 
         import inspect
@@ -166,9 +269,35 @@ class BotOrchestrator:
         else:
             self.ws_callback("bot_queue_update", data)
 
+    def live_activity_statuses(self) -> Dict[str, str]:
+        """Activity statuses of the sequential run, or every lane's merged (running wins)."""
+        merged = dict(self.activity_statuses)
+        for lane in self.lanes.values():
+            for act_id, status in lane.activity_statuses.items():
+                if status == "running" or merged.get(act_id, "pending") == "pending":
+                    merged[act_id] = status
+        return merged
+
+    def _parallel_payload(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.parallel_emulators,
+            "max_parallel": self.max_parallel_emulators,
+            "lanes": [lane.to_dict() for lane in self.lanes.values()],
+        }
+
+    def _throughput(self) -> Dict[str, Any]:
+        """Successful activities since start, overall and per hour."""
+        started = getattr(self, "run_start_time", None)
+        hours = (time.time() - started) / 3600 if started else 0
+        return {
+            "activities_completed": self.activities_completed,
+            "activities_per_hour": round(self.activities_completed / hours, 1) if hours > 0 else 0.0,
+        }
+
     def stop(self):
         """Requests the loop to stop and aborts immediately."""
         self.stop_requested = True
+        self._wake.set()
         if self.main_task and not self.main_task.done():
             print(
                 f"[BotOrchestrator] Cancelling running task for group {self.group_id}..."
@@ -234,159 +363,182 @@ class BotOrchestrator:
             self.ws_callback("timeline_event", data)
 
     async def _get_activity_metrics(self) -> Dict[str, Any]:
-        """Queries the database for live metrics (last_run, runs_today) for all activities in this group."""
-        metrics = {}
-        import aiosqlite
-        from datetime import datetime
-        
-        try:
-            today_prefix = datetime.now().strftime('%Y-%m-%d')
-            async with aiosqlite.connect(config.db_path) as db:
-                for act in self.activities:
-                    act_id = act.get("id", act.get("name"))
-                    if not act_id:
-                        continue
-                        
-                    metrics[act_id] = {"last_run": None, "runs_today": 0}
-                    
-                    # Get Last Run
-                    async with db.execute(
-                        """SELECT started_at FROM account_activity_logs 
-                           WHERE group_id = ? AND activity_id = ? AND status = 'SUCCESS'
-                           ORDER BY started_at DESC LIMIT 1""", 
-                        (self.group_id, act_id)
-                    ) as cursor:
-                        row = await cursor.fetchone()
-                        if row and row[0]:
-                            metrics[act_id]["last_run"] = row[0]
-                            
-                            # Get Runs Today
-                            async with db.execute(
-                                """SELECT COUNT(*) FROM account_activity_logs 
-                                   WHERE group_id = ? AND activity_id = ? AND status = 'SUCCESS'
-                                   AND started_at LIKE ?""", 
-                                (self.group_id, act_id, f"{today_prefix}%")
-                            ) as cursor2:
-                                count_row = await cursor2.fetchone()
-                                metrics[act_id]["runs_today"] = count_row[0] if count_row else 0
-        except Exception as e:
-            print(f"[BotOrchestrator] Error fetching activity metrics: {e}")
-            
-        return metrics
-
-    async def _all_activities_on_cooldown(self, acc_id: str) -> bool:
-        """Check if ALL activities are on cooldown for this account.
-        Returns True if every activity with cooldown_enabled is still cooling down,
-        meaning a swap to this account would be pointless.
-        """
-        if self.skip_cooldown:
-            return False
-
-        now = time.time()
-        has_any_runnable = False
+        """Live metrics (last_run, runs_today) for all activities in this group.
 
-        for i, act in enumerate(self.activities):
-            act_id_or_name = act.get("id", act.get("name", f"act_{i}"))
-            act_cfg = act.get("config", {})
-
-            if not act_cfg.get("cooldown_enabled"):
-                # Activity has no cooldown → always runnable
-                has_any_runnable = True
-                break
-
-            cd_minutes = act_cfg.get("cooldown_minutes", 0)
-            if cd_minutes <= 0:
-                has_any_runnable = True
-                break
-
-            last_act_run, dynamic_cd = await execution_log.get_effective_cooldown_sec(
-                int(acc_id), act_id_or_name
-            )
-            effective_cd = dynamic_cd if dynamic_cd > 0 else (cd_minutes * 60)
-            if last_act_run <= 0 or (now - last_act_run) >= effective_cd:
-                # Never run before OR cooldown expired → runnable
-                has_any_runnable = True
-                break
-
-        return not has_any_runnable
-
-    async def _only_light_tasks_ready(self, acc_id: str) -> bool:
-        """Check if only light-weight tasks are ready while heavy tasks exist but are all on cooldown.
-        Returns True if the account should be skipped to preserve global cooldown for heavy tasks.
-        If there are NO heavy tasks at all → return False (run everything normally).
+        Served from memory: loaded once (again only after a manual UNDO) and kept
+        current by _on_activity_event, so broadcasting costs no DB queries.
         """
-        if self.skip_cooldown:
-            return False
+        if not self.activity_metrics.loaded or self.activity_metrics.stale:
+            try:
+                await self.activity_metrics.load(config.db_path)
+            except Exception as e:
+                print(f"[BotOrchestrator] Error fetching activity metrics: {e}")
+        return self.activity_metrics.snapshot()
 
-        now = time.time()
-        has_heavy = False
-        has_heavy_ready = False
-        has_any_ready = False
+    def _on_activity_event(self, event: Dict[str, Any]):
+        """execution_log listener: keep metrics and activity cooldowns current without DB reads."""
+        self.activity_metrics.on_activity_event(event)
 
-        for i, act in enumerate(self.activities):
-            act_id = act.get("id", act.get("name", f"act_{i}"))
-            act_cfg = act.get("config", {})
-            weight = act_cfg.get("weight") or self._weight_map.get(act_id, "heavy")
+        acc_id = str(event.get("account_id"))
+        if event.get("status") != "SUCCESS" or acc_id not in self._accounts_by_id:
+            return
+        try:
+            started = datetime.fromisoformat(event.get("started_at") or "").timestamp()
+        except ValueError:
+            return
+        dynamic_cd = (event.get("result") or {}).get("dynamic_cooldown_sec", 0) or 0
+        self.cooldowns.record_activity_run(acc_id, event.get("activity_id"), started, dynamic_cd)
 
-            # Determine if this activity is currently on cooldown
-            is_on_cd = False
-            if act_cfg.get("cooldown_enabled"):
-                cd_minutes = act_cfg.get("cooldown_minutes", 0)
-                if cd_minutes > 0:
-                    last_act_run, dynamic_cd = await execution_log.get_effective_cooldown_sec(
-                        int(acc_id), act_id
-                    )
-                    effective_cd = dynamic_cd if dynamic_cd > 0 else (cd_minutes * 60)
-                    if last_act_run > 0 and (now - last_act_run) < effective_cd:
-                        is_on_cd = True
+    async def _load_last_run_times(self):
+        """Pre-populate last_run_times from database (always, so UI shows "last run")."""
+        for acc in self.accounts:
+            db_last_run = await execution_log.get_last_account_run(int(acc["id"]))
+            if db_last_run > 0:
+                self.last_run_times[str(acc["id"])] = db_last_run
 
-            if weight == "heavy":
-                has_heavy = True
-                if not is_on_cd:
-                    has_heavy_ready = True
+    async def _seed_cooldowns(self):
+        """Load account / activity cooldown state into the scheduler (the run's only cooldown DB reads)."""
+        for acc_id, last_run in self.last_run_times.items():
+            self.cooldowns.record_account_run(acc_id, last_run)
+        if self.skip_cooldown:
+            return
+        for acc in self.accounts:
+            for act_id in self.cooldowns.cooldown_activity_ids():
+                last_run, dynamic_cd = await execution_log.get_effective_cooldown_sec(
+                    int(acc["id"]), act_id
+                )
+                if last_run > 0:
+                    self.cooldowns.record_activity_run(acc["id"], act_id, last_run, dynamic_cd)
+
+    def _sync_schedule_order(self, start_acc: Optional[Dict[str, Any]] = None):
+        """Hand the current queue order to the scheduler (accounts without emulator are left out)."""
+        scheduled = [a for a in self.queue if self._emu_of(a) is not None]
+        start_pos = scheduled.index(start_acc) if start_acc in scheduled else 0
+        self.cooldowns.set_order(scheduled, self._partition_of, start_pos)
+        self._by_game_id = {
+            str(a.get("game_id") or "").strip(): a for a in scheduled if a.get("game_id")
+        }
 
-            if not is_on_cd:
-                has_any_ready = True
+    def plan_order(
+        self,
+        current_emu: Optional[int] = None,
+        active_game_id: Optional[str] = None,
+        now: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """Swap-minimizing order for the next cycle from the in-memory cooldown state (no side effects)."""
+        scheduled = [a for a in self.queue if self._emu_of(a) is not None]
+        ready_at = {str(a["id"]): self.cooldowns.ready_at(a["id"]) for a in scheduled}
+        return plan_cycle(
+            scheduled,
+            ready_at,
+            self._swap_costs or SwapCosts(),
+            now=now,
+            current_emu=current_emu,
+            active_game_id=active_game_id,
+            run_sec=self._run_sec,
+        )
 
-        # If no heavy tasks exist at all → normal behavior (all light = run normally)
-        if not has_heavy:
+    def _apply_swap_plan(self, current_emu: Optional[int], active_game_id: Optional[str]) -> bool:
+        """Reorder the queue to the planner's order. Returns True if the order changed."""
+        plan = self.plan_order(current_emu, active_game_id)
+        self.last_plan = plan
+        old_order = [str(a.get("game_id", "")) for a in self.queue]
+        position = {acc_id: i for i, acc_id in enumerate(plan["order"])}
+        reordered = sorted(self.queue, key=lambda a: position.get(str(a["id"]), len(position)))
+        if reordered == self.queue:
             return False
+        self.queue = reordered
+        self._sync_schedule_order()
+        new_order = [str(a.get("game_id", "")) for a in self.queue]
+        print(
+            f"[BotOrchestrator] Swap Planner: {plan['cross_emu_swaps']} cross-emu swaps "
+            f"(round-robin {plan['round_robin_cross_emu_swaps']}), est. saving "
+            f"{plan['estimated_savings_sec'] / 60:.1f}m. Order: {old_order} → {new_order}"
+        )
+        log_queue_reorder(active_game_id or "", old_order, new_order, trigger="swap_planner")
+        return True
 
-        # Heavy tasks exist but none are ready, and some light tasks are ready → skip
-        return has_any_ready and not has_heavy_ready
+    async def _sleep_until_ready(self, seconds: float):
+        """Sleep exactly until the next account is eligible; stop() wakes it early."""
+        if seconds <= 0 or self.stop_requested:
+            return
+        try:
+            await asyncio.wait_for(self._wake.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
 
-    async def _earliest_activity_ready_sec(self, heavy_only: bool = False) -> float:
-        """Scan all accounts × activities to find the shortest remaining cooldown.
-        Returns seconds until the earliest activity becomes runnable.
-        If heavy_only=True, only considers heavy-weight activities.
-        Falls back to 60s if nothing can be computed.
-        """
-        now = time.time()
-        min_remaining = float("inf")
+    async def _next_account(
+        self,
+        active_game_id: Optional[str] = None,
+        lane: Optional["EmulatorLane"] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Wait for and return the next account to run (None when stopping or nothing is scheduled).
 
-        for acc in self.queue:
-            aid = str(acc["id"])
-            for i, act in enumerate(self.activities):
-                act_cfg = act.get("config", {})
-                act_id = act.get("id", act.get("name", f"act_{i}"))
-                weight = act_cfg.get("weight") or self._weight_map.get(act_id, "heavy")
-                if heavy_only and weight != "heavy":
-                    continue  # Skip light activities when waiting for heavy
-                if not act_cfg.get("cooldown_enabled"):
-                    return 0  # At least one activity has no cooldown → ready now
-                cd_minutes = act_cfg.get("cooldown_minutes", 0)
-                if cd_minutes <= 0:
-                    return 0
-                last_run, dynamic_cd = await execution_log.get_effective_cooldown_sec(int(aid), act_id)
-                if last_run <= 0:
-                    return 0  # Never run → ready now
-                effective_cd = dynamic_cd if dynamic_cd > 0 else (cd_minutes * 60)
-                remaining = effective_cd - (now - last_run)
-                if remaining <= 0:
-                    return 0  # Already expired
-                min_remaining = min(min_remaining, remaining)
-
-        return min_remaining if min_remaining < float("inf") else 60
+        Smart Wait: if the account already logged in (active_game_id) becomes eligible within
+        swap_wait_threshold_min, wait for it instead of swapping to the scheduler's pick.
+        """
+        partition = lane.emu_index if lane else None
+        label = f"Emu {lane.emu_index}: all accounts" if lane else "All accounts"
+        swap_wait_threshold = self.misc_config.get("swap_wait_threshold_min", 0) * 60
+
+        while not self.stop_requested:
+            acc_id = self.cooldowns.pop(partition=partition)
+            if acc_id is None:
+                sleep_sec = self.cooldowns.next_ready_in(partition=partition)
+                if sleep_sec is None:
+                    print(f"[BotOrchestrator] {label} have nothing left to schedule. Stopping.")
+                    return None
+                sleep_min = round(sleep_sec / 60, 1)
+                print(
+                    f"[BotOrchestrator] {label} on cooldown. Sleeping {sleep_min}m until next account is ready."
+                )
+                if lane:
+                    lane.state = "cooldown"
+                await self._emit_timeline("\ud83d\udca4", f"{label} on cooldown. Sleeping {sleep_min}m", lane.emu_index if lane else None)
+                await self.broadcast_state()
+                await self._sleep_until_ready(sleep_sec)
+                continue
+
+            acc = self._accounts_by_id[acc_id]
+            active = self._by_game_id.get(active_game_id) if active_game_id else None
+            if not active or active is acc or swap_wait_threshold <= 0:
+                return acc
+            active_id = str(active["id"])
+            remaining_cd = self.cooldowns.ready_in(active_id)
+            if remaining_cd <= 0 or self.cooldowns.turn(active_id) > self.cooldowns.turn(acc_id):
+                return acc  # active account is ready, or its turn comes after the pick anyway
+
+            emu_idx = self._emu_of(active)
+            decision = "Waiting" if remaining_cd <= swap_wait_threshold else "Skipped (Over Threshold)"
+            print(
+                f"[BotOrchestrator] Smart Wait Eval for {active_id}: "
+                f"CD=({remaining_cd/60:.1f}m / {swap_wait_threshold/60:.0f}m) "
+                f"| ActiveID='{active_game_id}' vs NextID='{acc.get('game_id', '')}' "
+                f"-> {decision}"
+            )
+            log_smart_wait_eval(
+                serial=f"emulator-{5554 + emu_idx * 2}",
+                target_account_id=active_id,
+                active_account_id=active_game_id,
+                remaining_cd_sec=remaining_cd,
+                threshold_sec=swap_wait_threshold,
+                decision=decision,
+            )
+            if decision != "Waiting":
+                return acc
+
+            # ── SMART WAIT: active account's cooldown ends soon, wait instead of swapping ──
+            self.cooldowns.requeue(acc_id)
+            self._smart_wait_info = {"account_id": active_id, "remaining_sec": round(remaining_cd, 1)}
+            if lane:
+                lane.state = "cooldown"
+            await self._emit_timeline("\u23f3", f"Emu {emu_idx}: Smart Wait for {active.get('lord_name') or active_id} ({remaining_cd/60:.1f}m remaining)", emu_idx, active_id)
+            await self.broadcast_state()
+            await self._sleep_until_ready(remaining_cd)
+            self._smart_wait_info = {"account_id": None, "remaining_sec": None}
+            if self.cooldowns.take(active_id):
+                return active
+        return None
 
     async def _handle_cross_emu_swap(self, old_emu_index: int, new_emu_index: int) -> bool:
         """Closes old emulator / game and boots new one. Returns True on success."""
@@ -401,22 +553,22 @@ class BotOrchestrator:
         log_cross_emu_swap(old_emu_index, new_emu_index, "start", True)
 
         print(f"[BotOrchestrator] Quitting Emu {old_emu_index}...")
-        await asyncio.to_thread(quit_instance, old_emu_index)
+        await run_on_device(_serial(old_emu_index), quit_instance, old_emu_index)
         log_cross_emu_swap(old_emu_index, new_emu_index, "quit_old", True)
 
         await asyncio.sleep(3)  # Wait for LDPlayer to close properly
 
         print(f"[BotOrchestrator] Launching Emu {new_emu_index}...")
-        await asyncio.to_thread(launch_instance, new_emu_index)
+        await run_on_device(_serial(new_emu_index), launch_instance, new_emu_index)
         log_cross_emu_swap(old_emu_index, new_emu_index, "launch_new", True)
 
         print(f"[BotOrchestrator] Waiting for Emu {new_emu_index} to fully boot...")
-        boot_ok = await asyncio.to_thread(wait_for_device, new_emu_index, 120)
+        boot_ok = await self._wait_booted(new_emu_index, 120)
         if not boot_ok:
             # Retry once with shorter timeout
             print(f"[BotOrchestrator] Boot timeout. Retrying with 60s...")
             log_cross_emu_swap(old_emu_index, new_emu_index, "boot_retry", False, "First boot timeout, retrying 60s")
-            boot_ok = await asyncio.to_thread(wait_for_device, new_emu_index, 60)
+            boot_ok = await self._wait_booted(new_emu_index, 60)
         if not boot_ok:
             print(f"[BotOrchestrator] Emu {new_emu_index} boot FAILED after retry.")
             log_cross_emu_swap(old_emu_index, new_emu_index, "complete", False, "Boot FAILED after retry")
@@ -426,15 +578,114 @@ class BotOrchestrator:
         log_cross_emu_swap(old_emu_index, new_emu_index, "complete", True)
         return True
 
+    async def _wait_booted(self, emu_idx: int, timeout: int) -> bool:
+        """
+        Await boot_completed on the device tracker without holding a device lane.
+
+        Falls back to wait_for_device on the lane when the tracker is down, or has not seen
+        the instance after 15 s (LDPlayer sometimes needs the `adb connect` it does).
+        """
+        tracker = get_device_tracker()
+        if tracker is not None and tracker.connected:
+            serials = adb_serials(emu_idx)
+            deadline = time.monotonic() + timeout
+            ready = await tracker.wait_ready(serials, min(timeout, 15))
+            if ready is None and tracker.connected and tracker.seen(serials):
+                ready = await tracker.wait_ready(serials, max(0.0, deadline - time.monotonic()))
+            if ready is not None:
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining < 1:
+                return False
+            timeout = int(remaining)
+        return await run_on_device(_serial(emu_idx), wait_for_device, emu_idx, timeout)
+
+    async def _boot_emulator(self, emu_idx: int) -> bool:
+        """Launch an emulator unless it is already running and wait for boot. Returns True on success."""
+        # Check if already running to save wait time
+        is_running = any(
+            inst["index"] == emu_idx and inst.get("running")
+            for inst in list_all_instances()
+        )
+        if is_running:
+            print(f"[BotOrchestrator] Initial Emu {emu_idx} is already running.")
+            return True
+
+        await run_on_device(_serial(emu_idx), launch_instance, emu_idx)
+        print(f"[BotOrchestrator] Waiting for initial Emu {emu_idx} to fully boot...")
+        boot_ok = await self._wait_booted(emu_idx, 120)
+        if not boot_ok:
+            # Retry once
+            print(f"[BotOrchestrator] Boot timeout. Retrying with 60s...")
+            boot_ok = await self._wait_booted(emu_idx, 60)
+        if not boot_ok:
+            return False
+        await asyncio.sleep(5)
+        return True
+
+    # ── Warm pool ─────────────────────────────────────────────────
+
+    async def _warm_emulator(self, emu_idx: int) -> bool:
+        """Background warm-up: boot the emulator and bring the game to the lobby."""
+        if not await self._boot_emulator(emu_idx):
+            return False
+        return await self._ensure_lobby(_serial(emu_idx), self._detector_for(emu_idx))
+
+    async def _quit_emulator(self, emu_idx: int):
+        await run_on_device(_serial(emu_idx), quit_instance, emu_idx)
+
+    def _warm_lookahead(self, active_emu: int) -> List[int]:
+        """Emulators of the next accounts in queue order that are ready within warm_lookahead_min."""
+        upcoming = []
+        for step in range(1, len(self.queue) + 1):
+            acc = self.queue[(self.current_idx + step) % len(self.queue)]
+            emu = self._emu_of(acc)
+            if emu is None or emu == active_emu or emu in upcoming:
+                continue
+            if self.cooldowns.ready_in(acc["id"]) <= self.warm_lookahead_sec:
+                upcoming.append(emu)
+        return upcoming
+
+    def _refresh_warm_pool(self, active_emu: int):
+        if self.warm_pool and not self.stop_requested:
+            self.warm_pool.refresh(active_emu, self._warm_lookahead(active_emu))
+
+    async def _swap_to_emulator(self, old_emu_index: int, new_emu_index: int) -> bool:
+        """Cross-emu swap that takes the target from the warm pool when it was pre-booted."""
+        if self.warm_pool and self.warm_pool.is_warm(new_emu_index):
+            log_cross_emu_swap(old_emu_index, new_emu_index, "start", True, "warm pool")
+            print(f"[BotOrchestrator] Cross-Emu Swap: Emu {new_emu_index} is warm, switching from Emu {old_emu_index}")
+            if await self.warm_pool.claim(new_emu_index):
+                await self.warm_pool.release(old_emu_index)
+                log_cross_emu_swap(old_emu_index, new_emu_index, "complete", True, "warm pool hit")
+                return True
+            log_cross_emu_swap(old_emu_index, new_emu_index, "complete", False, "warm-up failed, cold swap")
+            print(f"[BotOrchestrator] Warm Pool: Emu {new_emu_index} warm-up failed. Falling back to a cold swap.")
+        return await self._handle_cross_emu_swap(old_emu_index, new_emu_index)
+
+    def _detector_for(self, emu_idx: int) -> GameStateDetector:
+        """One detector per emulator, kept for the whole run (state + frame caches stay per-device)."""
+        detector = self._detectors.get(emu_idx)
+        if detector is None:
+            detector = GameStateDetector(
+                adb_path=config.adb_path,
+                templates_dir=self.templates_dir,
+                change_gate=True,  # polled every few hundred ms by wait_for_state
+            )
+            self._detectors[emu_idx] = detector
+        return detector
+
     async def _ensure_lobby(
         self, serial: str, detector: GameStateDetector, load_timeout: int = 180
     ) -> bool:
         """Ensure the game is running and at lobby before account-sensitive actions."""
         # Auto-detect provider from running emulator (Global vs Funtap)
-        detected_provider = core_actions.detect_provider_from_emulator(serial)
+        # Off the event loop: other emulator workers keep running in parallel mode
+        detected_provider = await run_on_device(serial, core_actions.detect_provider_from_emulator, serial)
         pkg = core_actions.get_package_for_provider(detected_provider)
-        self.package_name = pkg  # update instance-level for other methods
-        result = await asyncio.to_thread(
+        self._packages[serial] = pkg
+        result = await run_long_on_device(
+            serial,
             core_actions.startup_to_lobby,
             serial,
             detector,
@@ -482,18 +733,19 @@ class BotOrchestrator:
             log_account_verification(serial, context, "<unknown>", None, False, "Lobby not reachable")
             return {"lobby_ok": False, "account_id": None}
 
-        profile_ok = await asyncio.to_thread(core_actions.go_to_profile, serial, detector)
+        profile_ok = await run_on_device(serial, core_actions.go_to_profile, serial, detector)
         if not profile_ok:
             print(
                 f"[BotOrchestrator] Cannot verify account during {context}: profile not reachable."
             )
             log_account_verification(serial, context, "<unknown>", None, False, "Profile not reachable")
-            await asyncio.to_thread(core_actions.back_to_lobby, serial, detector)
+            await run_long_on_device(serial, core_actions.back_to_lobby, serial, detector)
             return {"lobby_ok": True, "account_id": None}
 
         account_id = None
         try:
-            account_id = await asyncio.to_thread(
+            account_id = await run_on_device(
+                serial,
                 core_actions.extract_player_id,
                 serial,
                 detector,
@@ -503,13 +755,14 @@ class BotOrchestrator:
                     f"[BotOrchestrator] Account ID read failed during {context}. Retrying once..."
                 )
                 log_account_verification(serial, context, "<unknown>", None, False, "First extract failed, retrying")
-                account_id = await asyncio.to_thread(
+                account_id = await run_on_device(
+                    serial,
                     core_actions.extract_player_id,
                     serial,
                     detector,
                 )
         finally:
-            await asyncio.to_thread(core_actions.back_to_lobby, serial, detector)
+            await run_long_on_device(serial, core_actions.back_to_lobby, serial, detector)
 
         if account_id:
             print(
@@ -530,9 +783,10 @@ class BotOrchestrator:
         """Restart the game app as a last-resort recovery before the final swap attempt."""
         print(f"[BotOrchestrator] Restarting game app on {serial} before final swap attempt...")
         log_restart_recovery(serial, expected_game_id, False, "Initiating force-stop")
-        await asyncio.to_thread(
+        await run_on_device(
+            serial,
             adb_helper._run_adb,
-            ["shell", "am", "force-stop", self.package_name],
+            ["shell", "am", "force-stop", self._packages.get(serial, self.package_name)],
             serial,
             15,
         )
@@ -601,7 +855,8 @@ class BotOrchestrator:
             swap_ok = False
             try:
                 await self._emit_timeline("\ud83d\udd04", f"Emu {emu_idx}: Swapping to {target_lord or expected_game_id} ({expected_game_id}) \u2014 attempt {attempt}/3", emu_idx, acc_id)
-                swap_ok = await asyncio.to_thread(
+                swap_ok = await run_on_device(
+                    serial,
                     core_actions.swap_account,
                     serial,
                     account_detector,
@@ -677,6 +932,7 @@ class BotOrchestrator:
         self.stop_requested = False
         self.run_start_time = time.time()
         self._last_verified_account_id = None
+        self._last_emu_index = None
 
         await execution_log.create_run(self.run_id, self.run_meta)
 
@@ -684,12 +940,9 @@ class BotOrchestrator:
         for key in self.account_statuses:
             self.account_statuses[key] = "pending"
 
-        # Pre-populate last_run_times from database (always, so UI shows "last run")
-        for acc in self.accounts:
-            db_last_run = await execution_log.get_last_account_run(int(acc["id"]))
-            if db_last_run > 0:
-                self.last_run_times[str(acc["id"])] = db_last_run
+        await self._load_last_run_times()
 
+        execution_log.add_activity_listener(self._on_activity_event)
         await self.broadcast_state()
 
         # Pre-fetch emulator names for logging
@@ -697,197 +950,57 @@ class BotOrchestrator:
 
         last_emu_index = None
         last_account_id = None
-        consecutive_skips = 0  # Track how many accounts skipped in a row
+        parallel = self.parallel_emulators and len(self._emulator_indexes()) > 1
+
+        for acc in self.queue:
+            if self._emu_of(acc) is None:
+                print(
+                    f"[BotOrchestrator] Skipping account {acc.get('game_id', 'Unknown')} — no emulator assigned."
+                )
+                self.account_statuses[str(acc["id"])] = "error"
+
+        # Cooldowns are read from the DB once here; the loop then schedules from memory
+        self._partition_of = self._emu_of if parallel else None
+        await self._seed_cooldowns()
+        if self.swap_planner and not parallel:
+            self._swap_costs = await asyncio.to_thread(SwapCosts.from_logs)
+            if not self.start_account_id:
+                self._apply_swap_plan(None, None)
+        start_acc = self.queue[self.current_idx] if self.queue and not parallel else None
+        self._sync_schedule_order(start_acc)
 
         try:
+            if parallel:
+                await self._run_parallel(name_map)
+                return
+
             while not self.stop_requested:
-                acc = self.queue[self.current_idx]
+                acc = await self._next_account(last_account_id)
+                if acc is None:
+                    break
                 acc_id = str(acc["id"])
 
-                # Force emu_idx to be an integer (avoid string concatenation issues)
-                raw_emu = acc.get("emu_index")
-                if raw_emu is None or str(raw_emu).strip() == "":
-                    print(
-                        f"[BotOrchestrator] Skipping account {acc.get('game_id', 'Unknown')} — no emulator assigned."
-                    )
-                    self.account_statuses[acc_id] = "error"
-                    consecutive_skips += 1
-                    self._advance_queue()
-                    if consecutive_skips >= len(self.queue):
-                        print(
-                            "[BotOrchestrator] All accounts have no emulator. Stopping."
-                        )
-                        break
-                    continue
-
-                emu_idx = int(raw_emu)
-                emu_name = name_map.get(emu_idx, f"Emulator-{emu_idx}")
-
-                # ── ENFORCE COOLDOWN ──
-                cooldown_min = self.misc_config.get("cooldown_min", 0)
-                last_run = self.last_run_times.get(acc_id, 0)
-                cooldown_sec = cooldown_min * 60
-                # DEBUG: Account Cooldown values
-                _elapsed = round((time.time() - last_run) / 60, 1) if last_run > 0 else -1
-                print(f"[DEBUG-CD] Account {acc_id}: cooldown_min={cooldown_min}, last_run={last_run:.0f}, elapsed={_elapsed}m, skip_cooldown={self.skip_cooldown}")
-                
-                if (
-                    not self.skip_cooldown
-                    and cooldown_min > 0
-                    and last_run > 0
-                    and (time.time() - last_run) < cooldown_sec
-                ):
-                    remaining_cd = cooldown_sec - (time.time() - last_run)
-
-                    # ── SMART WAIT: if active account's cooldown ends soon, wait instead of swapping ──
-                    expected_gid_for_wait = str(acc.get("game_id") or "").strip()
-                    swap_wait_threshold = self.misc_config.get("swap_wait_threshold_min", 0) * 60
-                    
-                    # Detailed debug logging for Smart Wait evaluation
-                    is_active_account = bool(last_account_id and expected_gid_for_wait == last_account_id)
-                    is_within_threshold = (swap_wait_threshold > 0 and remaining_cd <= swap_wait_threshold)
-                    
-                    if swap_wait_threshold > 0:
-                        decision = 'Waiting' if (is_active_account and is_within_threshold) else 'Skipped'
-                        if decision == 'Skipped':
-                            if not is_active_account:
-                                decision = 'Skipped (Not Active)'
-                            elif not is_within_threshold:
-                                decision = 'Skipped (Over Threshold)'
-                                
-                        eval_msg = (
-                            f"[BotOrchestrator] Smart Wait Eval for {acc_id}: "
-                            f"CD=({remaining_cd/60:.1f}m / {swap_wait_threshold/60:.0f}m) "
-                            f"| ActiveID='{last_account_id}' vs TargetID='{expected_gid_for_wait}' "
-                            f"-> {decision}"
-                        )
-                        print(eval_msg)
-                        
-                        # Log to file for historical debugging
-                        log_smart_wait_eval(
-                            serial=f"emulator-{5554 + emu_idx * 2}",
-                            target_account_id=acc_id,
-                            active_account_id=last_account_id or "UNKNOWN",
-                            remaining_cd_sec=remaining_cd,
-                            threshold_sec=swap_wait_threshold,
-                            decision=decision,
-                        )
-
-                    if is_active_account and is_within_threshold:
-                        print(
-                            f"[BotOrchestrator] Smart Wait: account {acc_id} is active and cooldown ends in "
-                            f"{remaining_cd/60:.1f}m (threshold: {swap_wait_threshold/60:.0f}m). Waiting..."
-                        )
-                        self._smart_wait_info = {"account_id": acc_id, "remaining_sec": round(remaining_cd, 1)}
-                        await self._emit_timeline("\u23f3", f"Emu {emu_idx}: Smart Wait for {acc.get('lord_name') or acc_id} ({remaining_cd/60:.1f}m remaining)", emu_idx, acc_id)
-                        await self.broadcast_state()
-                        while remaining_cd > 0 and not self.stop_requested:
-                            chunk = min(remaining_cd, 10)
-                            await asyncio.sleep(chunk)
-                            remaining_cd -= chunk
-                            self._smart_wait_info["remaining_sec"] = round(max(0, remaining_cd), 1)
-                        self._smart_wait_info = {"account_id": None, "remaining_sec": None}
-                        # Fall through to normal processing — no skip, no swap needed
+                # First account of a new cycle: reset statuses, put the active account first
+                cycle = self.cooldowns.turn(acc_id)[0]
+                if cycle > self.cycle:
+                    self.cycle = cycle
+                    for key in self.account_statuses:
+                        self.account_statuses[key] = "pending"
+                    if self.swap_planner:
+                        # Plan the cycle from the running emulator and its logged-in account
+                        reordered = self._apply_swap_plan(last_emu_index, self._last_verified_account_id)
                     else:
-                        # Normal cooldown skip
-                        consecutive_skips += 1
-
-                        # If we've skipped ALL accounts → everyone is on cooldown
-                        if consecutive_skips >= len(self.queue):
-                            now = time.time()
-                            wait_times = []
-                            for a in self.queue:
-                                aid = str(a["id"])
-                                lr = self.last_run_times.get(aid, 0)
-                                if lr > 0:
-                                    remaining = cooldown_sec - (now - lr)
-                                    if remaining > 0:
-                                        wait_times.append(remaining)
-
-                            sleep_sec = min(wait_times) if wait_times else 30
-                            sleep_min = round(sleep_sec / 60, 1)
-                            print(
-                                f"[BotOrchestrator] All accounts on cooldown. Sleeping {sleep_min}m until next account is ready."
-                            )
-                            await self._emit_timeline("\ud83d\udca4", f"All accounts on cooldown. Sleeping {sleep_min}m")
-                            await self.broadcast_state()
-
-                            while sleep_sec > 0 and not self.stop_requested:
-                                chunk = min(sleep_sec, 10)
-                                await asyncio.sleep(chunk)
-                                sleep_sec -= chunk
-
-                            consecutive_skips = 0
-                        else:
-                            self.account_statuses[acc_id] = "pending"
-                            self._advance_queue()
-                        continue
-
-                # ── PRE-CHECK: Skip swap if ALL activities are on cooldown ──
-                if await self._all_activities_on_cooldown(acc_id):
-                    print(
-                        f"[BotOrchestrator] All activities on cooldown for Account {acc_id}. "
-                        f"Skipping swap."
-                    )
-                    await self._emit_timeline(
-                        "⏭️",
-                        f"Skipped {acc.get('lord_name') or acc_id}: all activities on cooldown",
-                        emu_idx, acc_id,
-                    )
-                    self.account_statuses[acc_id] = "pending"
-                    consecutive_skips += 1
-                    if consecutive_skips >= len(self.queue):
-                        # All accounts fully on cooldown → compute sleep from activity cooldowns
-                        sleep_sec = await self._earliest_activity_ready_sec()
-                        sleep_min = round(sleep_sec / 60, 1)
-                        print(
-                            f"[BotOrchestrator] All accounts on cooldown (activity-level). "
-                            f"Sleeping {sleep_min}m until next activity is ready."
+                        # Smart reorder: prioritize currently-active account to avoid swap-back
+                        reordered = bool(self._last_verified_account_id) and self._reorder_queue_for_active_account(
+                            self._last_verified_account_id
                         )
-                        await self._emit_timeline("💤", f"All accounts on cooldown. Sleeping {sleep_min}m")
-                        await self.broadcast_state()
-                        while sleep_sec > 0 and not self.stop_requested:
-                            chunk = min(sleep_sec, 10)
-                            await asyncio.sleep(chunk)
-                            sleep_sec -= chunk
-                        consecutive_skips = 0
-                    else:
-                        self._advance_queue()
-                    continue
-
-                # ── PRE-CHECK: Skip swap if only light tasks are ready (heavy tasks on cooldown) ──
-                if await self._only_light_tasks_ready(acc_id):
-                    print(
-                        f"[BotOrchestrator] Only light activities ready for Account {acc_id}. "
-                        f"Skipping swap to preserve cooldown for heavy tasks."
-                    )
-                    await self._emit_timeline(
-                        "🪶",
-                        f"Skipped {acc.get('lord_name') or acc_id}: only light tasks ready, waiting for heavy",
-                        emu_idx, acc_id,
-                    )
-                    self.account_statuses[acc_id] = "pending"
-                    consecutive_skips += 1
-                    if consecutive_skips >= len(self.queue):
-                        sleep_sec = await self._earliest_activity_ready_sec(heavy_only=True)
-                        sleep_min = round(sleep_sec / 60, 1)
-                        print(
-                            f"[BotOrchestrator] All accounts waiting for heavy tasks. "
-                            f"Sleeping {sleep_min}m until next heavy activity is ready."
-                        )
-                        await self._emit_timeline("💤", f"Waiting for heavy tasks. Sleeping {sleep_min}m")
-                        await self.broadcast_state()
-                        while sleep_sec > 0 and not self.stop_requested:
-                            chunk = min(sleep_sec, 10)
-                            await asyncio.sleep(chunk)
-                            sleep_sec -= chunk
-                        consecutive_skips = 0
-                    else:
-                        self._advance_queue()
-                    continue
+                    if reordered:
+                        self.cooldowns.requeue(acc_id)
+                        continue
 
-                # Account is ready — reset skip counter
-                consecutive_skips = 0
+                self.current_idx = self.queue.index(acc)
+                emu_idx = self._emu_of(acc)
+                emu_name = name_map.get(emu_idx, f"Emulator-{emu_idx}")
 
                 self.account_statuses[acc_id] = "running"
                 # Resolve package per-account provider (Global → .gp, Asia → .gp.vn)
@@ -907,12 +1020,12 @@ class BotOrchestrator:
                             decision="cross_emu_swap",
                             detail=f"Emu {last_emu_index} -> {emu_idx}",
                         )
-                        swap_ok = await self._handle_cross_emu_swap(last_emu_index, emu_idx)
+                        swap_ok = await self._swap_to_emulator(last_emu_index, emu_idx)
                         if not swap_ok:
                             print(f"[BotOrchestrator] Cross-emu swap FAILED. Skipping account.")
                             self.account_statuses[acc_id] = "error"
                             # Do NOT set last_emu_index - next account should retry boot
-                            self._advance_queue()
+                            self._advance_queue(acc_id)
                             continue
                         
                         # Reset known live account since we just booted a new emulator
@@ -937,41 +1050,15 @@ class BotOrchestrator:
                         detail=f"Initial boot of Emu {emu_idx}",
                     )
                     print(f"[BotOrchestrator] Launching initial Emu {emu_idx}...")
-
-                    # Check if already running to save wait time
-                    current_instances = list_all_instances()
-                    is_running = any(
-                        inst["index"] == emu_idx and inst.get("running")
-                        for inst in current_instances
-                    )
-
-                    if not is_running:
-                        await asyncio.to_thread(launch_instance, emu_idx)
-                        print(
-                            f"[BotOrchestrator] Waiting for initial Emu {emu_idx} to fully boot..."
-                        )
-                        boot_ok = await asyncio.to_thread(wait_for_device, emu_idx, 120)
-                        if not boot_ok:
-                            # Retry once
-                            print(f"[BotOrchestrator] Boot timeout. Retrying with 60s...")
-                            boot_ok = await asyncio.to_thread(wait_for_device, emu_idx, 60)
-                        if not boot_ok:
-                            print(f"[BotOrchestrator] Emu {emu_idx} boot FAILED after retry. Skipping account.")
-                            self.account_statuses[acc_id] = "error"
-                            # Do NOT set last_emu_index - next account should retry boot
-                            self._advance_queue()
-                            continue
-                        await asyncio.sleep(5)
-                    else:
-                        print(
-                            f"[BotOrchestrator] Initial Emu {emu_idx} is already running."
-                        )
+                    if not await self._boot_emulator(emu_idx):
+                        print(f"[BotOrchestrator] Emu {emu_idx} boot FAILED after retry. Skipping account.")
+                        self.account_statuses[acc_id] = "error"
+                        # Do NOT set last_emu_index - next account should retry boot
+                        self._advance_queue(acc_id)
+                        continue
 
                 serial = f"emulator-{5554 + emu_idx * 2}"
-                detector = GameStateDetector(
-                    adb_path=config.adb_path,
-                    templates_dir=self.templates_dir,
-                )
+                detector = self._detector_for(emu_idx)
 
                 print(f"[BotOrchestrator] Ensuring game is running and at lobby on Emu {emu_idx}...")
                 lobby_ok = await self._ensure_lobby(serial, detector, 180)
@@ -980,7 +1067,7 @@ class BotOrchestrator:
                     print(f"[BotOrchestrator] Failed to reach lobby on Emu {emu_idx}. Skipping account.")
                     self.account_statuses[acc_id] = "error"
                     last_emu_index = emu_idx
-                    self._advance_queue()
+                    self._advance_queue(acc_id)
                     continue
 
                 # ── SMART QUEUE: Early probe on first iteration to reorder queue ──
@@ -998,18 +1085,15 @@ class BotOrchestrator:
                             detail="Detected active account, triggering queue reorder",
                         )
                         self._reorder_queue_for_active_account(last_account_id)
-                        
-                        # Fix misaligned current_idx: Reset to the start of this emulator's group
-                        # and let the main loop re-evaluate from the newly ordered head!
-                        first_idx_for_emu = next(
-                            (i for i, a in enumerate(self.queue) if int(a.get("emu_index") or 0) == emu_idx), 
-                            self.current_idx
-                        )
+
+                        # Give this account its turn back and let the scheduler hand out
+                        # the newly ordered head of this emulator's group.
+                        self.account_statuses[acc_id] = "pending"
+                        self.cooldowns.requeue(acc_id)
                         print(
-                            f"[BotOrchestrator] Restarting evaluation for Emu {emu_idx} at index {first_idx_for_emu} after reorder."
+                            f"[BotOrchestrator] Restarting evaluation for Emu {emu_idx} after reorder."
                         )
-                        self.current_idx = first_idx_for_emu
-                        
+
                         # Preserve last_emu_index so the next iteration doesn't reset last_account_id 
                         # and cause an infinite probe loop.
                         last_emu_index = emu_idx
@@ -1027,7 +1111,7 @@ class BotOrchestrator:
                     )
                     self.account_statuses[acc_id] = "error"
                     last_emu_index = emu_idx
-                    self._advance_queue()
+                    self._advance_queue(acc_id)
                     continue
 
                 target_lord = (acc.get("lord_name") or "").strip() or None
@@ -1065,7 +1149,7 @@ class BotOrchestrator:
                     )
                     self.account_statuses[acc_id] = "error"
                     last_emu_index = emu_idx
-                    self._advance_queue()
+                    self._advance_queue(acc_id)
                     continue
 
                 if verified_account_id != expected_game_id:
@@ -1089,330 +1173,503 @@ class BotOrchestrator:
                         )
                         self.account_statuses[acc_id] = "error"
                         last_emu_index = emu_idx
-                        self._advance_queue()
+                        self._advance_queue(acc_id)
                         continue
 
-                # Wait slightly before starting activities
-                await asyncio.sleep(2)
-
-                # Reset all activity statuses for the current account run
-                act_keys = [
-                    act.get("id", act.get("name", f"act_{i}"))
-                    for i, act in enumerate(self.activities)
-                ]
-                self.activity_statuses = {k: "pending" for k in act_keys}
-
-                # Shuffle activity order per-account for anti-detection
-                # Then fix relative order of troop-dependent activities:
-                #   claim_scout_sentry → attack_darkling → catch_pet/gather_rss_center (random) → gather_resource (last)
-                # because gather_resource uses ALL troops and would block the others.
-                TROOP_ORDER = {
-                    "claim_scout_sentry_task": 0,   # scouts needed before combat
-                    "attack_darkling_legions": 1,    # uses combat troops
-                    "catch_pet": 2,                  # uses troops (random with rss_center)
-                    "gather_rss_center": 2,          # uses troops (random with catch_pet)
-                    "gather_resource": 99,           # LAST — uses ALL remaining troops
-                }
+                self._refresh_warm_pool(emu_idx)
+                await self._run_account_activities(acc, emu_idx, emu_name)
 
-                run_order = list(range(len(self.activities)))
-                random.shuffle(run_order)
-
-                # Find positions where troop activities landed after shuffle
-                troop_positions = []  # (position_in_run_order, original_index)
-                for pos, orig_idx in enumerate(run_order):
-                    aid = act_keys[orig_idx]
-                    if aid in TROOP_ORDER:
-                        troop_positions.append((pos, orig_idx))
-
-                if len(troop_positions) >= 2:
-                    # Sort troop items by their priority, with same-priority items shuffled
-                    troop_items = [(TROOP_ORDER[act_keys[oi]], random.random(), oi) for _, oi in troop_positions]
-                    troop_items.sort()
-                    desired_troop_order = [oi for _, _, oi in troop_items]
-
-                    # Assign desired order into the sorted positions
-                    sorted_positions = sorted(p for p, _ in troop_positions)
-                    for slot_pos, orig_idx in zip(sorted_positions, desired_troop_order):
-                        run_order[slot_pos] = orig_idx
-
-                shuffled_activities = [self.activities[j] for j in run_order]
-                shuffled_keys = [act_keys[j] for j in run_order]
-                print(
-                    f"[BotOrchestrator] Shuffled activity order for Account {acc_id}: "
-                    f"{[a.get('name', k) for a, k in zip(shuffled_activities, shuffled_keys)]}"
-                )
+                last_emu_index = emu_idx
+                self._last_emu_index = emu_idx
+                last_account_id = verified_account_id
+                self._last_verified_account_id = verified_account_id
 
-                limit_min = self.misc_config.get("limit_min", 0)
-                account_success = True
-                ran_heavy = False  # Track if any heavy activity succeeded (for conditional account CD)
-                ran_heavy_attempted = False  # Track if any heavy activity was attempted (for failure CD)
-
-                # Execute activities one by one (shuffled order)
-                for i, act in enumerate(shuffled_activities):
-                    if self.stop_requested:
-                        break
-
-                    act_id_or_name = shuffled_keys[i]
-                    act_cfg = act.get("config", {})
-
-                    # ── ACTIVITY-LEVEL COOLDOWN (dynamic override > static config) ──
-                    if not self.skip_cooldown and act_cfg.get("cooldown_enabled"):
-                        cd_minutes = act_cfg.get("cooldown_minutes", 0)
-                        if cd_minutes > 0:
-                            last_act_run, dynamic_cd = await execution_log.get_effective_cooldown_sec(int(acc_id), act_id_or_name)
-                            effective_cd = dynamic_cd if dynamic_cd > 0 else (cd_minutes * 60)
-                            if last_act_run > 0 and (time.time() - last_act_run) < effective_cd:
-                                cd_src = "dynamic" if dynamic_cd > 0 else "static"
-                                remain_m = round((effective_cd - (time.time() - last_act_run)) / 60, 1)
-                                print(f"[BotOrchestrator] Activity '{act_id_or_name}' on cooldown ({cd_src}: {effective_cd/60:.0f}m, {remain_m}m left) for Account {acc_id}. Skipping.")
-                                self.activity_statuses[act_id_or_name] = "skipped"
-                                await self.broadcast_state()
-                                continue
-
-                    steps = workflow_registry.build_steps_for_activity(
-                        act_id_or_name, act_cfg
-                    )
+                self._advance_queue(acc_id)
 
-                    if not steps:
-                        print(
-                            f"[BotOrchestrator] Unknown activity '{act_id_or_name}', skipping."
-                        )
-                        self.activity_statuses[act_id_or_name] = "skipped"
-                        continue
+        except asyncio.CancelledError:
+            print(
+                f"[BotOrchestrator] Execution cancelled via stop() for group {self.group_id}."
+            )
+            self.stop_requested = True  # Ensure this is flagged
+        except Exception as e:
+            print(f"[BotOrchestrator] Fatal error in loop: {e}")
+        finally:
+            self.is_running = False
+            if self.warm_pool:
+                await self.warm_pool.shutdown()
+            await self.broadcast_state()
+            execution_log.remove_activity_listener(self._on_activity_event)
 
-                    # Inject account_id + global limits into each step config
-                    for step in steps:
-                        step_cfg = step.setdefault("config", {})
-                        step_cfg["account_id"] = acc_id
-                        step_cfg["max_power"] = self.misc_config.get("max_power", 14_000_000)
-                        step_cfg["max_hall_level"] = self.misc_config.get("max_hall_level", 21)
-
-                    self.current_activity = {
-                        "id": act_id_or_name,
-                        "name": act.get("name", act_id_or_name),
-                        "status": "running",
-                    }
-                    self.activity_statuses[act_id_or_name] = "running"
-                    await self.broadcast_state()
-
-                    # Track heavy attempt BEFORE execution (for failure cooldown)
-                    act_weight_pre = act_cfg.get("weight") or self._weight_map.get(act_id_or_name, "heavy")
-                    if act_weight_pre == "heavy":
-                        ran_heavy_attempted = True
-
-                    step_start = time.time()
-                    result = None
-                    step_status = "FAILED"
-                    step_error = ""
-                    error_code = ""
-
-                    # ── LOG: Activity Started ──
-                    log_id = await execution_log.start_account_activity(
-                        run_id=self.run_id,
-                        account_id=int(acc_id),
-                        game_id=acc.get("game_id", ""),
-                        emulator_id=emu_idx,
-                        group_id=self.group_id,
-                        activity_id=act_id_or_name,
-                        activity_name=act.get("name", act_id_or_name),
-                        source="workflow",
-                        metadata=act_cfg,
-                    )
+            duration = int(
+                (time.time() - getattr(self, "run_start_time", time.time())) * 1000
+            )
+            await execution_log.complete_run(
+                self.run_id, "STOPPED" if self.stop_requested else "COMPLETED", duration
+            )
+            await execution_log.flush(durable=True)
 
-                    # Emit WS event: activity started
-                    await self._emit_activity_event(
-                        "activity_started",
-                        acc_id,
-                        act_id_or_name,
-                        act.get("name", act_id_or_name),
-                    )
-                    await self._emit_timeline("\u25b6\ufe0f", f"{acc.get('lord_name') or acc_id}: Starting {act.get('name', act_id_or_name)}", emu_idx, acc_id)
+            # Clean up active instances
+            if self.group_id in _active_orchestrators:
+                del _active_orchestrators[self.group_id]
 
-                    try:
-                        if limit_min > 0:
-                            result = await asyncio.wait_for(
-                                self._execute_current_account(emu_idx, emu_name, steps),
-                                timeout=limit_min * 60,
-                            )
-                        else:
-                            result = await self._execute_current_account(
-                                emu_idx, emu_name, steps
-                            )
-
-                        if not result or not result.get("success", False):
-                            account_success = False
-                            self.activity_statuses[act_id_or_name] = "error"
-                            self.current_activity["status"] = "error"
-                            step_error = (
-                                result.get("error", "Unknown execution failure")
-                                if result
-                                else "No result returned"
-                            )
-                            error_code = "EXEC_FAIL"
-                        else:
-                            self.activity_statuses[act_id_or_name] = "done"
-                            step_status = "SUCCESS"
-                            # Track if a heavy activity succeeded (for conditional account CD)
-                            act_weight = act_cfg.get("weight") or self._weight_map.get(act_id_or_name, "heavy")
-                            if act_weight == "heavy":
-                                ran_heavy = True
-
-                            # ── RANDOM COOLDOWN RANGE ──
-                            # If user configured a range (cooldown_minutes_max > cooldown_minutes)
-                            # and core_actions didn't already set a dynamic_cooldown, pick a random
-                            # value and inject it into result so it gets persisted to DB.
-                            try:
-                                cd_min = int(act_cfg.get("cooldown_minutes", 0) or 0)
-                                cd_max = int(act_cfg.get("cooldown_minutes_max", 0) or 0)
-                            except (TypeError, ValueError):
-                                cd_min, cd_max = 0, 0
-                            has_dynamic = (result or {}).get("dynamic_cooldown_sec", 0) > 0
-                            if cd_max > cd_min > 0 and not has_dynamic:
-                                rand_cd_sec = int(random.uniform(cd_min, cd_max) * 60)
-                                if result is None:
-                                    result = {}
-                                result["dynamic_cooldown_sec"] = rand_cd_sec
-                                print(
-                                    f"[BotOrchestrator] 🎲 Random cooldown for '{act_id_or_name}': "
-                                    f"{rand_cd_sec // 60}m (range: {cd_min}-{cd_max}m)"
-                                )
+    async def _run_account_activities(
+        self,
+        acc: Dict[str, Any],
+        emu_idx: int,
+        emu_name: str,
+        lane: Optional["EmulatorLane"] = None,
+    ):
+        """Run the shuffled activity list for an account that is verified and at lobby.
 
-                        await self.broadcast_state()
+        Updates account/activity statuses and last_run_times. With a lane (parallel mode)
+        the activity progress is kept on the lane instead of the orchestrator, so workers
+        don't overwrite each other.
+        """
+        acc_id = str(acc["id"])
+        run_started = time.time()
+        # Wait slightly before starting activities
+        await asyncio.sleep(2)
 
-                    except asyncio.TimeoutError:
-                        print(
-                            f"[BotOrchestrator] Account {acc_id} hit Time Limit ({limit_min}m) during {act_id_or_name}. Forcing swap."
-                        )
-                        account_success = False
-                        self.activity_statuses[act_id_or_name] = "error"
-                        self.current_activity["status"] = "error"
-                        step_error = f"Timeout limit {limit_min}m reached"
-                        error_code = "TIMEOUT"
-                        await self.broadcast_state()
-                    except Exception as e:
-                        account_success = False
-                        self.activity_statuses[act_id_or_name] = "error"
-                        self.current_activity["status"] = "error"
-                        step_error = str(e)
-                        error_code = "EXCEPTION"
+        # Reset all activity statuses for the current account run
+        act_keys = [
+            act.get("id", act.get("name", f"act_{i}"))
+            for i, act in enumerate(self.activities)
+        ]
+        statuses = {k: "pending" for k in act_keys}
+        if lane:
+            lane.account_id = acc_id
+            lane.activity_statuses = statuses
+        else:
+            self.activity_statuses = statuses
+
+        # Shuffle activity order per-account for anti-detection
+        # Then fix relative order of troop-dependent activities:
+        #   claim_scout_sentry → attack_darkling → catch_pet/gather_rss_center (random) → gather_resource (last)
+        # because gather_resource uses ALL troops and would block the others.
+        TROOP_ORDER = {
+            "claim_scout_sentry_task": 0,   # scouts needed before combat
+            "attack_darkling_legions": 1,    # uses combat troops
+            "catch_pet": 2,                  # uses troops (random with rss_center)
+            "gather_rss_center": 2,          # uses troops (random with catch_pet)
+            "gather_resource": 99,           # LAST — uses ALL remaining troops
+        }
+
+        run_order = list(range(len(self.activities)))
+        random.shuffle(run_order)
+
+        # Find positions where troop activities landed after shuffle
+        troop_positions = []  # (position_in_run_order, original_index)
+        for pos, orig_idx in enumerate(run_order):
+            aid = act_keys[orig_idx]
+            if aid in TROOP_ORDER:
+                troop_positions.append((pos, orig_idx))
+
+        if len(troop_positions) >= 2:
+            # Sort troop items by their priority, with same-priority items shuffled
+            troop_items = [(TROOP_ORDER[act_keys[oi]], random.random(), oi) for _, oi in troop_positions]
+            troop_items.sort()
+            desired_troop_order = [oi for _, _, oi in troop_items]
+
+            # Assign desired order into the sorted positions
+            sorted_positions = sorted(p for p, _ in troop_positions)
+            for slot_pos, orig_idx in zip(sorted_positions, desired_troop_order):
+                run_order[slot_pos] = orig_idx
+
+        shuffled_activities = [self.activities[j] for j in run_order]
+        shuffled_keys = [act_keys[j] for j in run_order]
+        print(
+            f"[BotOrchestrator] Shuffled activity order for Account {acc_id}: "
+            f"{[a.get('name', k) for a, k in zip(shuffled_activities, shuffled_keys)]}"
+        )
+
+        limit_min = self.misc_config.get("limit_min", 0)
+        account_success = True
+        ran_heavy = False  # Track if any heavy activity succeeded (for conditional account CD)
+        ran_heavy_attempted = False  # Track if any heavy activity was attempted (for failure CD)
+
+        # Execute activities one by one (shuffled order)
+        for i, act in enumerate(shuffled_activities):
+            if self.stop_requested:
+                break
+
+            act_id_or_name = shuffled_keys[i]
+            act_cfg = act.get("config", {})
+
+            # ── ACTIVITY-LEVEL COOLDOWN (dynamic override > static config) ──
+            if not self.skip_cooldown and act_cfg.get("cooldown_enabled"):
+                cd_minutes = act_cfg.get("cooldown_minutes", 0)
+                if cd_minutes > 0:
+                    last_act_run, dynamic_cd = self.cooldowns.activity_run(acc_id, act_id_or_name)
+                    effective_cd = dynamic_cd if dynamic_cd > 0 else (cd_minutes * 60)
+                    if last_act_run > 0 and (time.time() - last_act_run) < effective_cd:
+                        cd_src = "dynamic" if dynamic_cd > 0 else "static"
+                        remain_m = round((effective_cd - (time.time() - last_act_run)) / 60, 1)
+                        print(f"[BotOrchestrator] Activity '{act_id_or_name}' on cooldown ({cd_src}: {effective_cd/60:.0f}m, {remain_m}m left) for Account {acc_id}. Skipping.")
+                        statuses[act_id_or_name] = "skipped"
                         await self.broadcast_state()
+                        continue
 
-                    step_end = time.time()
-                    latency = int((step_end - step_start) * 1000)
-
-                    # ── LOG: Activity Finished ──
-                    await execution_log.finish_account_activity(
-                        log_id=log_id,
-                        status=step_status,
-                        error_code=error_code,
-                        error_message=step_error,
-                        duration_ms=latency,
-                        result=result if isinstance(result, dict) else {},
-                    )
+            steps = workflow_registry.build_steps_for_activity(
+                act_id_or_name, act_cfg
+            )
 
-                    # Emit WS event: activity completed/failed
-                    ws_event = (
-                        "activity_completed"
-                        if step_status == "SUCCESS"
-                        else "activity_failed"
+            if not steps:
+                print(
+                    f"[BotOrchestrator] Unknown activity '{act_id_or_name}', skipping."
+                )
+                statuses[act_id_or_name] = "skipped"
+                continue
+
+            # Inject account_id + global limits into each step config
+            for step in steps:
+                step_cfg = step.setdefault("config", {})
+                step_cfg["account_id"] = acc_id
+                step_cfg["max_power"] = self.misc_config.get("max_power", 14_000_000)
+                step_cfg["max_hall_level"] = self.misc_config.get("max_hall_level", 21)
+
+            current = {
+                "id": act_id_or_name,
+                "name": act.get("name", act_id_or_name),
+                "status": "running",
+            }
+            if lane:
+                lane.current_activity = current
+            else:
+                self.current_activity = current
+            statuses[act_id_or_name] = "running"
+            await self.broadcast_state()
+
+            # Track heavy attempt BEFORE execution (for failure cooldown)
+            act_weight_pre = act_cfg.get("weight") or self._weight_map.get(act_id_or_name, "heavy")
+            if act_weight_pre == "heavy":
+                ran_heavy_attempted = True
+
+            step_start = time.time()
+            result = None
+            step_status = "FAILED"
+            step_error = ""
+            error_code = ""
+
+            # ── LOG: Activity Started ──
+            log_id = await execution_log.start_account_activity(
+                run_id=self.run_id,
+                account_id=int(acc_id),
+                game_id=acc.get("game_id", ""),
+                emulator_id=emu_idx,
+                group_id=self.group_id,
+                activity_id=act_id_or_name,
+                activity_name=act.get("name", act_id_or_name),
+                source="workflow",
+                metadata=act_cfg,
+            )
+
+            # Emit WS event: activity started
+            await self._emit_activity_event(
+                "activity_started",
+                acc_id,
+                act_id_or_name,
+                act.get("name", act_id_or_name),
+            )
+            await self._emit_timeline("\u25b6\ufe0f", f"{acc.get('lord_name') or acc_id}: Starting {act.get('name', act_id_or_name)}", emu_idx, acc_id)
+
+            try:
+                if limit_min > 0:
+                    result = await asyncio.wait_for(
+                        self._execute_current_account(emu_idx, emu_name, steps),
+                        timeout=limit_min * 60,
                     )
-                    await self._emit_activity_event(
-                        ws_event,
-                        acc_id,
-                        act_id_or_name,
-                        act.get("name", act_id_or_name),
-                        step_status,
-                        step_error,
-                        latency,
+                else:
+                    result = await self._execute_current_account(
+                        emu_idx, emu_name, steps
                     )
-                    tl_icon = "\u2705" if step_status == "SUCCESS" else "\u274c"
-                    tl_dur = f" ({latency/1000:.1f}s)" if latency > 0 else ""
-                    await self._emit_timeline(tl_icon, f"{acc.get('lord_name') or acc_id}: {act.get('name', act_id_or_name)} {step_status.lower()}{tl_dur}", emu_idx, acc_id)
-
-                    await execution_log.append_step_log(
-                        run_id=self.run_id,
-                        step_index=i,
-                        function_id=act_id_or_name,
-                        input_dict=act_cfg,
-                        output_dict=result or {},
-                        status=step_status,
-                        error_msg=step_error,
-                        latency_ms=latency,
+
+                if not result or not result.get("success", False):
+                    account_success = False
+                    statuses[act_id_or_name] = "error"
+                    current["status"] = "error"
+                    step_error = (
+                        result.get("error", "Unknown execution failure")
+                        if result
+                        else "No result returned"
                     )
+                    error_code = "EXEC_FAIL"
+                else:
+                    statuses[act_id_or_name] = "done"
+                    step_status = "SUCCESS"
+                    self.activities_completed += 1
+                    if lane:
+                        lane.activities_completed += 1
+                    # Track if a heavy activity succeeded (for conditional account CD)
+                    act_weight = act_cfg.get("weight") or self._weight_map.get(act_id_or_name, "heavy")
+                    if act_weight == "heavy":
+                        ran_heavy = True
+
+                    # ── RANDOM COOLDOWN RANGE ──
+                    # If user configured a range (cooldown_minutes_max > cooldown_minutes)
+                    # and core_actions didn't already set a dynamic_cooldown, pick a random
+                    # value and inject it into result so it gets persisted to DB.
+                    try:
+                        cd_min = int(act_cfg.get("cooldown_minutes", 0) or 0)
+                        cd_max = int(act_cfg.get("cooldown_minutes_max", 0) or 0)
+                    except (TypeError, ValueError):
+                        cd_min, cd_max = 0, 0
+                    has_dynamic = (result or {}).get("dynamic_cooldown_sec", 0) > 0
+                    if cd_max > cd_min > 0 and not has_dynamic:
+                        rand_cd_sec = int(random.uniform(cd_min, cd_max) * 60)
+                        if result is None:
+                            result = {}
+                        result["dynamic_cooldown_sec"] = rand_cd_sec
+                        print(
+                            f"[BotOrchestrator] 🎲 Random cooldown for '{act_id_or_name}': "
+                            f"{rand_cd_sec // 60}m (range: {cd_min}-{cd_max}m)"
+                        )
 
-                    if not account_success:
-                        if self.continue_on_error:
-                            print(f"[BotOrchestrator] Activity '{act_id_or_name}' failed, but continue_on_error is globally enabled. Continuing.")
-                            account_success = True
-                        else:
-                            break  # stop processing activities for this account on error
+                await self.broadcast_state()
 
-                # End of activities loop for this account
-                # Log finalized account status and broadcast fresh metrics
+            except asyncio.TimeoutError:
+                print(
+                    f"[BotOrchestrator] Account {acc_id} hit Time Limit ({limit_min}m) during {act_id_or_name}. Forcing swap."
+                )
+                account_success = False
+                statuses[act_id_or_name] = "error"
+                current["status"] = "error"
+                step_error = f"Timeout limit {limit_min}m reached"
+                error_code = "TIMEOUT"
+                await self.broadcast_state()
+            except Exception as e:
+                account_success = False
+                statuses[act_id_or_name] = "error"
+                current["status"] = "error"
+                step_error = str(e)
+                error_code = "EXCEPTION"
                 await self.broadcast_state()
 
-                self.current_activity = None
+            step_end = time.time()
+            latency = int((step_end - step_start) * 1000)
+
+            # ── LOG: Activity Finished ──
+            await execution_log.finish_account_activity(
+                log_id=log_id,
+                status=step_status,
+                error_code=error_code,
+                error_message=step_error,
+                duration_ms=latency,
+                result=result if isinstance(result, dict) else {},
+            )
 
-                # Update last run time for cooldown tracking
-                # - SUCCESS path: only update if heavy activity ran (light-only = no account CD)
-                # - ERROR path: ALWAYS update (prevent rapid re-run after failure)
-                print(f"[DEBUG-CD] Account {acc_id} POST-LOOP: ran_heavy={ran_heavy}, ran_heavy_attempted={ran_heavy_attempted}, account_success={account_success}")
-                if ran_heavy or ran_heavy_attempted or (not account_success):
-                    self.last_run_times[acc_id] = time.time()
-                    print(f"[DEBUG-CD] Account {acc_id}: last_run_times UPDATED to {time.time():.0f}")
+            # Emit WS event: activity completed/failed
+            ws_event = (
+                "activity_completed"
+                if step_status == "SUCCESS"
+                else "activity_failed"
+            )
+            await self._emit_activity_event(
+                ws_event,
+                acc_id,
+                act_id_or_name,
+                act.get("name", act_id_or_name),
+                step_status,
+                step_error,
+                latency,
+            )
+            tl_icon = "\u2705" if step_status == "SUCCESS" else "\u274c"
+            tl_dur = f" ({latency/1000:.1f}s)" if latency > 0 else ""
+            await self._emit_timeline(tl_icon, f"{acc.get('lord_name') or acc_id}: {act.get('name', act_id_or_name)} {step_status.lower()}{tl_dur}", emu_idx, acc_id)
+
+            await execution_log.append_step_log(
+                run_id=self.run_id,
+                step_index=i,
+                function_id=act_id_or_name,
+                input_dict=act_cfg,
+                output_dict=result or {},
+                status=step_status,
+                error_msg=step_error,
+                latency_ms=latency,
+            )
 
-                if account_success and not self.stop_requested:
-                    self.account_statuses[acc_id] = "done"
+            if not account_success:
+                if self.continue_on_error:
+                    print(f"[BotOrchestrator] Activity '{act_id_or_name}' failed, but continue_on_error is globally enabled. Continuing.")
+                    account_success = True
                 else:
+                    break  # stop processing activities for this account on error
+
+        # End of activities loop for this account
+        # Log finalized account status and broadcast fresh metrics
+        await self.broadcast_state()
+
+        if lane:
+            lane.current_activity = None
+        else:
+            self.current_activity = None
+
+        # Update last run time for cooldown tracking
+        # - SUCCESS path: only update if heavy activity ran (light-only = no account CD)
+        # - ERROR path: ALWAYS update (prevent rapid re-run after failure)
+        print(f"[DEBUG-CD] Account {acc_id} POST-LOOP: ran_heavy={ran_heavy}, ran_heavy_attempted={ran_heavy_attempted}, account_success={account_success}")
+        if ran_heavy or ran_heavy_attempted or (not account_success):
+            self.last_run_times[acc_id] = time.time()
+            self.cooldowns.record_account_run(acc_id, self.last_run_times[acc_id])
+            print(f"[DEBUG-CD] Account {acc_id}: last_run_times UPDATED to {time.time():.0f}")
+
+        if account_success and not self.stop_requested:
+            self._run_sec[acc_id] = time.time() - run_started
+            self.account_statuses[acc_id] = "done"
+        else:
+            self.account_statuses[acc_id] = "error"
+
+    # ── Parallel emulator workers ─────────────────────────────────
+
+    @staticmethod
+    def _emu_of(acc: Dict[str, Any]) -> Optional[int]:
+        raw_emu = acc.get("emu_index")
+        if raw_emu is None or str(raw_emu).strip() == "":
+            return None
+        return int(raw_emu)
+
+    def _emulator_indexes(self) -> List[int]:
+        """Distinct emulators of this group, in queue order."""
+        seen = []
+        for acc in self.queue:
+            emu = self._emu_of(acc)
+            if emu is not None and emu not in seen:
+                seen.append(emu)
+        return seen
+
+    async def _run_parallel(self, name_map: Dict[int, str]):
+        """Run every emulator of the group at once: one worker per emulator, capped by CPU."""
+        self.lanes = {
+            emu: EmulatorLane(
+                emu_index=emu,
+                emu_name=name_map.get(emu, f"Emulator-{emu}"),
+                serial=f"emulator-{5554 + emu * 2}",
+            )
+            for emu in self._emulator_indexes()
+        }
+        slots = asyncio.Semaphore(self.max_parallel_emulators)
+        print(
+            f"[BotOrchestrator] Parallel mode: {len(self.lanes)} emulator workers, "
+            f"up to {self.max_parallel_emulators} running at once."
+        )
+        await self._emit_timeline(
+            "\U0001f500",
+            f"Parallel mode: {len(self.lanes)} emulators, max {self.max_parallel_emulators} at once",
+        )
+        await asyncio.gather(*(self._emulator_worker(lane, slots) for lane in self.lanes.values()))
+
+    async def _emulator_worker(self, lane: EmulatorLane, slots: asyncio.Semaphore):
+        """Run the accounts the scheduler hands out for this emulator's partition."""
+        while not self.stop_requested:
+            acc = await self._next_account(lane.last_verified_account_id, lane)
+            if acc is None:
+                break
+            acc_id = str(acc["id"])
+
+            cycle = self.cooldowns.turn(acc_id)[0]
+            if cycle > lane.cycle and self._start_lane_cycle(lane, cycle):
+                self.cooldowns.requeue(acc_id)
+                continue
+
+            lane.state = "waiting_slot"
+            async with slots:
+                if self.stop_requested:
+                    break
+                try:
+                    await self._run_account_on_lane(acc, lane)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    print(f"[BotOrchestrator] Emu {lane.emu_index}: account {acc_id} failed: {e}")
                     self.account_statuses[acc_id] = "error"
+            self._advance_queue(acc_id)
+            lane.state = "idle"
+            lane.account_id = None
 
-                last_emu_index = emu_idx
-                last_account_id = verified_account_id
-                self._last_verified_account_id = verified_account_id
+        lane.state = "done"
 
-                self._advance_queue()
+    def _start_lane_cycle(self, lane: EmulatorLane, cycle: int) -> bool:
+        """A lane reached its next cycle: reset its statuses and put its active account first.
 
-        except asyncio.CancelledError:
+        Returns True if the queue order changed (the caller re-picks).
+        """
+        lane.cycle = cycle
+        self.cycle = min(l.cycle for l in self.lanes.values())
+        for acc in self.queue:
+            if self._emu_of(acc) == lane.emu_index:
+                self.account_statuses[str(acc["id"])] = "pending"
+        if lane.last_verified_account_id:
+            # Only moves accounts within their own emulator group
+            return self._reorder_queue_for_active_account(lane.last_verified_account_id)
+        return False
+
+    async def _run_account_on_lane(self, acc: Dict[str, Any], lane: EmulatorLane):
+        """Boot (once), verify the account and run its activities on this lane's emulator."""
+        acc_id = str(acc["id"])
+        emu_idx = lane.emu_index
+        self.account_statuses[acc_id] = "running"
+        lane.account_id = acc_id
+        await self.broadcast_state()
+        print(
+            f"[BotOrchestrator] --- EMU {emu_idx} | CYCLE {lane.cycle} | ACCOUNT {acc_id} ---"
+        )
+        await self._emit_timeline("\ud83d\udd01", f"Emu {emu_idx}: Cycle {lane.cycle} \u2014 {acc.get('lord_name') or acc_id}", emu_idx, acc_id)
+
+        if not lane.booted:
+            lane.state = "booting"
+            if not await self._boot_emulator(emu_idx):
+                print(f"[BotOrchestrator] Emu {emu_idx} boot FAILED after retry. Skipping account.")
+                self.account_statuses[acc_id] = "error"
+                return
+            lane.booted = True
+        lane.state = "running"
+
+        detector = self._detector_for(emu_idx)
+        if not await self._ensure_lobby(lane.serial, detector, 180):
+            print(f"[BotOrchestrator] Failed to reach lobby on Emu {emu_idx}. Skipping account.")
+            self.account_statuses[acc_id] = "error"
+            return
+
+        expected_game_id = str(acc.get("game_id") or "").strip()
+        if not expected_game_id:
             print(
-                f"[BotOrchestrator] Execution cancelled via stop() for group {self.group_id}."
+                f"[BotOrchestrator] Account {acc_id} has no expected game_id. Skipping account."
             )
-            self.stop_requested = True  # Ensure this is flagged
-        except Exception as e:
-            print(f"[BotOrchestrator] Fatal error in loop: {e}")
-        finally:
-            self.is_running = False
-            await self.broadcast_state()
+            self.account_statuses[acc_id] = "error"
+            return
 
-            duration = int(
-                (time.time() - getattr(self, "run_start_time", time.time())) * 1000
+        if lane.last_verified_account_id == expected_game_id:
+            account_ready, verified_account_id = True, expected_game_id
+        else:
+            target_lord = (acc.get("lord_name") or "").strip() or None
+            account_ready, verified_account_id = await self._ensure_correct_account(
+                lane.serial,
+                detector,
+                AccountDetector(adb_path=config.adb_path),
+                expected_game_id,
+                target_lord,
+                known_current_account_id=lane.last_verified_account_id,
+                emu_idx=emu_idx,
+                acc_id=acc_id,
             )
-            await execution_log.complete_run(
-                self.run_id, "STOPPED" if self.stop_requested else "COMPLETED", duration
+        lane.last_verified_account_id = verified_account_id
+        if not account_ready or verified_account_id != expected_game_id:
+            print(
+                f"[BotOrchestrator] Could not verify target account {expected_game_id} on Emu {emu_idx}. Skipping account."
             )
+            self.account_statuses[acc_id] = "error"
+            return
 
-            # Clean up active instances
-            if self.group_id in _active_orchestrators:
-                del _active_orchestrators[self.group_id]
+        await self._run_account_activities(acc, emu_idx, lane.emu_name, lane)
 
-    def _advance_queue(self):
-        """Moves to the next account, incrementing cycle if it loops."""
+    def _advance_queue(self, acc_id: str):
+        """Ends this account's turn; the scheduler queues it for its next cycle."""
         if self.stop_requested:
             return
+        self.cooldowns.finish(acc_id)
 
-        self.current_idx += 1
-        if self.current_idx >= len(self.queue):
-            self.current_idx = 0
-            self.cycle += 1
-            # Smart reorder: prioritize currently-active account to avoid swap-back
-            if self._last_verified_account_id:
-                self._reorder_queue_for_active_account(self._last_verified_account_id)
-            # Reset all statuses for the new cycle
-            for key in self.account_statuses:
-                self.account_statuses[key] = "pending"
-
-    def _reorder_queue_for_active_account(self, active_account_id: str):
+    def _reorder_queue_for_active_account(self, active_account_id: str) -> bool:
         """Reorder queue so the currently-active account on each emulator
-        runs first, minimizing unnecessary swaps.
+        runs first, minimizing unnecessary swaps. Returns True if the order changed.
 
         Groups accounts by emu_index, then within each group:
         - If the active account is in this group → move it to front of group
@@ -1448,6 +1705,7 @@ class BotOrchestrator:
 
         if changed:
             self.queue = reordered
+            self._sync_schedule_order()
             new_order = [str(a.get('game_id', '')) for a in self.queue]
             print(
                 f"[BotOrchestrator] Smart Queue: reordered for active account {active_account_id}. "
@@ -1462,6 +1720,7 @@ class BotOrchestrator:
                 active_account_id, old_order, old_order,
                 trigger="no_change",
             )
+        return changed
 
 
 def start_sequential_orchestrator(
@@ -1499,6 +1758,26 @@ def stop_sequential_orchestrator(group_id: int) -> bool:
     return False
 
 
+async def preview_run_plan(
+    group_id: int,
+    accounts: List[Dict],
+    activities: List[Dict],
+    misc_config: Dict = None,
+) -> dict:
+    """Dry run of the swap planner. Uses the running orchestrator's live state if there is one,
+    otherwise cooldowns seeded from the DB as start() would. Nothing is launched or reordered."""
+    orch = _active_orchestrators.get(group_id)
+    if orch and orch.is_running:
+        plan = orch.plan_order(orch._last_emu_index, orch._last_verified_account_id)
+        return {"group_id": group_id, "source": "running", "cycle": orch.cycle, **plan}
+
+    orch = BotOrchestrator(group_id, accounts, activities, None, misc_config)
+    await orch._load_last_run_times()
+    await orch._seed_cooldowns()
+    orch._swap_costs = await asyncio.to_thread(SwapCosts.from_logs)
+    return {"group_id": group_id, "source": "preview", "cycle": 1, **orch.plan_order()}
+
+
 def get_orchestrator_status(group_id: int) -> dict:
     """Gets current status of a group's orchestrator."""
     if group_id in _active_orchestrators:
@@ -1511,8 +1790,11 @@ def get_orchestrator_status(group_id: int) -> dict:
             "current_idx": orch.current_idx,
             "total_accounts": len(orch.queue),
             "current_activity": orch.current_activity,
-            "activity_statuses": orch.activity_statuses,
+            "activity_statuses": orch.live_activity_statuses(),
             "account_statuses": orch.account_statuses,
+            "parallel": orch._parallel_payload(),
+            "throughput": orch._throughput(),
+            "warm_pool": orch.warm_pool.stats() if orch.warm_pool else None,
             "accounts": [
                 {
                     "id": acc["id"],
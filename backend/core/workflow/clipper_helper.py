@@ -1,22 +1,15 @@
 import subprocess
 
+from backend.core.workflow.adb_client import adb_run
+
 
 def get_clipper_data(adb_path: str, serial: str) -> str:
     """Fetch clipboard data safely using multiple fallbacks."""
-    startupinfo = subprocess.STARTUPINFO()
-    startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-
     try:
         # Fallback 1: Try native Android 'cmd clipboard get' (works on some Android 9+ emulators)
-        native_cmd = [adb_path, "-s", serial, "shell", "cmd", "clipboard", "get"]
-        native_res = subprocess.run(
-            native_cmd,
-            capture_output=True,
-            text=True,
-            startupinfo=startupinfo,
-            timeout=2,
-        )
-        native_text = native_res.stdout.strip()
+        native_text = adb_run(
+            ["shell", "cmd", "clipboard", "get"], serial=serial, timeout=2, adb_path=adb_path
+        ).strip()
         if (
             native_text
             and "cmd: Can't find service" not in native_text
@@ -26,26 +19,17 @@ def get_clipper_data(adb_path: str, serial: str) -> str:
 
         # Fallback 2: Ensure Clipper service is awake, then use broadcast
         # If Android Memory Management killed it, this wakes it up before we ask for data.
-        subprocess.run(
-            [
-                adb_path,
-                "-s",
-                serial,
-                "shell",
-                "am",
-                "startservice",
-                "ca.zgrs.clipper/.ClipboardService",
-            ],
-            capture_output=True,
-            startupinfo=startupinfo,
+        adb_run(
+            ["shell", "am", "startservice", "ca.zgrs.clipper/.ClipboardService"],
+            serial=serial,
             timeout=2,
+            adb_path=adb_path,
         )
 
-        cmd = [adb_path, "-s", serial, "shell", "am", "broadcast", "-a", "clipper.get"]
-        result = subprocess.run(
-            cmd, capture_output=True, text=True, startupinfo=startupinfo, timeout=5
+        output = adb_run(
+            ["shell", "am", "broadcast", "-a", "clipper.get"], serial=serial, timeout=5, adb_path=adb_path
         )
-        for line in result.stdout.strip().split("\n"):
+        for line in output.strip().split("\n"):
             if "data=" in line:
                 parts = line.split('data="')
                 if len(parts) > 1:
@@ -58,14 +42,11 @@ def get_clipper_data(adb_path: str, serial: str) -> str:
 
 def is_app_foreground(adb_path: str, serial: str, package_name: str) -> bool:
     """Check if the target app is currently running in the foreground."""
-    cmd = [adb_path, "-s", serial, "shell", "dumpsys", "window", "windows"]
-    startupinfo = subprocess.STARTUPINFO()
-    startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
     try:
-        result = subprocess.run(
-            cmd, capture_output=True, text=True, startupinfo=startupinfo, timeout=5
+        output = adb_run(
+            ["shell", "dumpsys", "window", "windows"], serial=serial, timeout=5, adb_path=adb_path
         )
-        for line in result.stdout.split("\n"):
+        for line in output.split("\n"):
             if "mCurrentFocus" in line or "mFocusedApp" in line:
                 if package_name in line:
                     return True
@@ -77,26 +58,17 @@ def is_app_foreground(adb_path: str, serial: str, package_name: str) -> bool:
 def open_app(adb_path: str, serial: str, package_name: str) -> bool:
     """Launch the application using monkeys intent. Returns True on success."""
     print(f"[INFO] Launching app {package_name} on {serial}...")
-    cmd = [
-        adb_path,
-        "-s",
-        serial,
-        "shell",
-        "monkey",
-        "-p",
-        package_name,
-        "-c",
-        "android.intent.category.LAUNCHER",
-        "1",
-    ]
-    startupinfo = subprocess.STARTUPINFO()
-    startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-    
+    cmd = ["shell", "monkey", "-p", package_name, "-c", "android.intent.category.LAUNCHER", "1"]
+
     import time
     for attempt in range(3):
-        res = subprocess.run(cmd, startupinfo=startupinfo, capture_output=True, text=True)
-        if "No activities found to run" in res.stdout or "Error:" in res.stdout or "Error:" in res.stderr:
-            print(f"[WARNING] App launch attempt {attempt+1} failed. Output: {res.stdout.strip()} {res.stderr.strip()}")
+        # over the adb socket (shell v1) monkey's stderr arrives in the same output
+        try:
+            output = adb_run(cmd, serial=serial, timeout=60, adb_path=adb_path)
+        except subprocess.TimeoutExpired:
+            output = "Error: launch timed out"
+        if "No activities found to run" in output or "Error:" in output:
+            print(f"[WARNING] App launch attempt {attempt+1} failed. Output: {output.strip()}")
             time.sleep(3)
         else:
             if attempt > 0:
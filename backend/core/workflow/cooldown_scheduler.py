@@ -0,0 +1,285 @@
+"""
+Cooldown Scheduler — in-memory "which account runs next" for BotOrchestrator.
+
+The orchestrator used to walk its queue one account at a time, asking SQLite on every
+pass whether each account's activities were still cooling down, and sleeping in fixed
+10 s chunks when nobody was ready. CooldownScheduler keeps all of that in memory:
+
+- Each account has a next-ready time = max(account cooldown end, activity readiness).
+  Activity readiness follows the orchestrator's skip rules: when the group has heavy
+  activities an account is ready once any heavy activity is off cooldown (light-only
+  swaps are skipped); otherwise once any activity is off cooldown.
+- Accounts still cooling down sit in a heap keyed by next-ready time. Accounts that are
+  due move to a second heap keyed by (round, queue position), which reproduces the old
+  cyclic walk: an account that becomes ready behind the current position waits for the
+  next round, so accounts of one emulator still run back to back.
+- pop() is O(log n); next_ready_in() tells the caller exactly how long to sleep.
+- Partitions (emulator index in parallel mode) give each worker its own pair of heaps.
+
+Cooldown inputs are seeded once from the DB at start (record_account_run /
+record_activity_run) and then updated by the orchestrator as activities finish.
+
+Usage:
+    sched = CooldownScheduler(activities, weight_map, account_cooldown_sec=1800)
+    sched.set_order(queue)
+    acc_id = sched.pop()                 # None → sleep sched.next_ready_in()
+    ...run...
+    sched.record_account_run(acc_id, time.time())
+    sched.finish(acc_id)                 # back in line for its next round
+"""
+
+import heapq
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+@dataclass
+class _Entry:
+    partition: Any
+    pos: int
+    round: int = 1
+    version: int = 0
+    ready_at: float = 0.0
+    queued: bool = True  # False while the account is handed out (running)
+
+
+@dataclass
+class _Cursor:
+    round: int = 1
+    pos: int = -1  # queue position of the last account handed out in this round
+
+
+class CooldownScheduler:
+    """Per-partition pair of heaps: waiting (by next-ready time) and ready (by round, position)."""
+
+    def __init__(
+        self,
+        activities: List[Dict[str, Any]],
+        weight_map: Optional[Dict[str, str]] = None,
+        account_cooldown_sec: float = 0,
+        skip_cooldown: bool = False,
+    ):
+        self.account_cooldown_sec = account_cooldown_sec
+        self.skip_cooldown = skip_cooldown
+
+        # (activity_id, static cooldown sec, is_heavy) — same config rules as the orchestrator
+        self._activities: List[Tuple[str, float, bool]] = []
+        for i, act in enumerate(activities):
+            act_id = act.get("id", act.get("name", f"act_{i}"))
+            act_cfg = act.get("config", {}) or {}
+            weight = act_cfg.get("weight") or (weight_map or {}).get(act_id, "heavy")
+            cd_sec = 0.0
+            if act_cfg.get("cooldown_enabled"):
+                cd_sec = max(0.0, float(act_cfg.get("cooldown_minutes", 0) or 0) * 60)
+            self._activities.append((act_id, cd_sec, weight == "heavy"))
+        heavy = [a for a in self._activities if a[2]]
+        self._gating = heavy or self._activities  # activities that make an account worth running
+
+        self._account_runs: Dict[str, float] = {}
+        self._activity_runs: Dict[Tuple[str, str], Tuple[float, int]] = {}
+
+        self._entries: Dict[str, _Entry] = {}
+        self._waiting: Dict[Any, list] = {}
+        self._ready: Dict[Any, list] = {}
+        self._cursor: Dict[Any, _Cursor] = {}
+        self._prev_cursor: Dict[Any, _Cursor] = {}
+
+        self.pops = 0
+        self.stale_skipped = 0
+
+    # ── Cooldown inputs ───────────────────────────────────────────
+
+    def record_account_run(self, acc_id: str, ts: float):
+        self._account_runs[str(acc_id)] = ts
+        self._reschedule(str(acc_id))
+
+    def record_activity_run(self, acc_id: str, activity_id: str, ts: float, dynamic_cooldown_sec: int = 0):
+        """A SUCCESS run of an activity (same inputs as execution_log.get_effective_cooldown_sec)."""
+        self._activity_runs[(str(acc_id), activity_id)] = (ts, int(dynamic_cooldown_sec or 0))
+        self._reschedule(str(acc_id))
+
+    def cooldown_activity_ids(self) -> List[str]:
+        """Activities with a cooldown configured (the ones worth seeding from the DB)."""
+        return [act_id for act_id, cd_sec, _ in self._activities if cd_sec > 0]
+
+    def activity_run(self, acc_id: str, activity_id: str) -> Tuple[float, int]:
+        """(last_run_epoch, dynamic_cooldown_sec) — in-memory twin of get_effective_cooldown_sec."""
+        return self._activity_runs.get((str(acc_id), activity_id), (0, 0))
+
+    def _activity_ready_at(self, acc_id: str, activity_id: str, static_cd: float) -> float:
+        if static_cd <= 0:
+            return 0.0
+        last_run, dynamic_cd = self.activity_run(acc_id, activity_id)
+        if last_run <= 0:
+            return 0.0
+        return last_run + (dynamic_cd if dynamic_cd > 0 else static_cd)
+
+    def ready_at(self, acc_id: str) -> float:
+        """Epoch time when the account is next worth running (0 = now)."""
+        acc_id = str(acc_id)
+        if self.skip_cooldown:
+            return 0.0
+        account_ready = 0.0
+        last_run = self._account_runs.get(acc_id, 0)
+        if self.account_cooldown_sec > 0 and last_run > 0:
+            account_ready = last_run + self.account_cooldown_sec
+        if not self._gating:
+            return account_ready
+        activity_ready = min(
+            self._activity_ready_at(acc_id, act_id, cd_sec) for act_id, cd_sec, _ in self._gating
+        )
+        return max(account_ready, activity_ready)
+
+    def ready_in(self, acc_id: str, now: Optional[float] = None) -> float:
+        now = time.time() if now is None else now
+        return max(0.0, self.ready_at(acc_id) - now)
+
+    # ── Queue order ───────────────────────────────────────────────
+
+    def set_order(
+        self,
+        accounts: List[Dict[str, Any]],
+        partition_of: Optional[Callable[[Dict[str, Any]], Any]] = None,
+        start_pos: int = 0,
+    ):
+        """(Re)define queue positions and partitions; keeps rounds and cooldown inputs.
+
+        start_pos only applies to the first call: accounts before it wait for round 2.
+        """
+        first = not self._entries
+        known = set()
+        for pos, acc in enumerate(accounts):
+            acc_id = str(acc["id"])
+            known.add(acc_id)
+            partition = partition_of(acc) if partition_of else None
+            entry = self._entries.get(acc_id)
+            if entry is None:
+                self._entries[acc_id] = _Entry(partition=partition, pos=pos)
+            else:
+                entry.partition, entry.pos = partition, pos
+        for acc_id in list(self._entries):
+            if acc_id not in known:
+                del self._entries[acc_id]
+
+        if first:
+            self._cursor = {}
+            for entry in self._entries.values():
+                self._cursor.setdefault(entry.partition, _Cursor(pos=start_pos - 1))
+
+        self._waiting = {}
+        self._ready = {}
+        for acc_id, entry in self._entries.items():
+            self._cursor.setdefault(entry.partition, _Cursor())
+            if entry.queued:
+                self._push(acc_id, entry)
+
+    def turn(self, acc_id: str) -> Tuple[int, int]:
+        entry = self._entries[str(acc_id)]
+        return entry.round, entry.pos
+
+    # ── Scheduling ────────────────────────────────────────────────
+
+    def _push(self, acc_id: str, entry: _Entry):
+        entry.version += 1
+        entry.ready_at = self.ready_at(acc_id)
+        heapq.heappush(self._waiting.setdefault(entry.partition, []), (entry.ready_at, entry.version, acc_id))
+
+    def _reschedule(self, acc_id: str):
+        entry = self._entries.get(acc_id)
+        if entry is not None and entry.queued:
+            self._push(acc_id, entry)
+
+    def _valid(self, acc_id: str, version: int) -> Optional[_Entry]:
+        entry = self._entries.get(acc_id)
+        if entry is None or not entry.queued or entry.version != version:
+            self.stale_skipped += 1
+            return None
+        return entry
+
+    def _promote_due(self, partition: Any, now: float):
+        """Move accounts whose cooldown has ended into the ready heap."""
+        waiting = self._waiting.get(partition, [])
+        cursor = self._cursor.setdefault(partition, _Cursor())
+        while waiting and waiting[0][0] <= now:
+            _, version, acc_id = heapq.heappop(waiting)
+            entry = self._valid(acc_id, version)
+            if entry is None:
+                continue
+            # Behind the cursor → the walk already passed it this round
+            joins = cursor.round if entry.pos > cursor.pos else cursor.round + 1
+            entry.round = max(entry.round, joins)
+            entry.version += 1
+            heapq.heappush(self._ready.setdefault(partition, []), (entry.round, entry.pos, entry.version, acc_id))
+
+    def pop(self, now: Optional[float] = None, partition: Any = None) -> Optional[str]:
+        """Hand out the next eligible account of a partition, or None if all are cooling down."""
+        now = time.time() if now is None else now
+        self._promote_due(partition, now)
+        ready = self._ready.get(partition, [])
+        while ready:
+            _, _, version, acc_id = heapq.heappop(ready)
+            entry = self._valid(acc_id, version)
+            if entry is None:
+                continue
+            entry.queued = False
+            cursor = self._cursor[partition]
+            self._prev_cursor[partition] = _Cursor(cursor.round, cursor.pos)
+            cursor.round, cursor.pos = entry.round, entry.pos
+            self.pops += 1
+            return acc_id
+        return None
+
+    def next_ready_in(self, now: Optional[float] = None, partition: Any = None) -> Optional[float]:
+        """Seconds until pop() can return an account; None when the partition has nothing queued."""
+        now = time.time() if now is None else now
+        if self._ready.get(partition):
+            return 0.0
+        waiting = self._waiting.get(partition, [])
+        while waiting:
+            ready_at, version, acc_id = waiting[0]
+            entry = self._entries.get(acc_id)
+            if entry is None or not entry.queued or entry.version != version:
+                heapq.heappop(waiting)
+                self.stale_skipped += 1
+                continue
+            return max(0.0, ready_at - now)
+        return None
+
+    def finish(self, acc_id: str):
+        """The account's turn is over (ran, failed or skipped): queue it for its next round."""
+        entry = self._entries.get(str(acc_id))
+        if entry is None or entry.queued:
+            return
+        entry.round += 1
+        entry.queued = True
+        self._push(str(acc_id), entry)
+
+    def requeue(self, acc_id: str):
+        """Undo the last pop() without using up the account's turn."""
+        entry = self._entries.get(str(acc_id))
+        if entry is None or entry.queued:
+            return
+        prev = self._prev_cursor.pop(entry.partition, None)
+        if prev is not None:
+            self._cursor[entry.partition] = prev
+        entry.queued = True
+        self._push(str(acc_id), entry)
+
+    def take(self, acc_id: str) -> bool:
+        """Hand out a specific queued account out of turn (e.g. Smart Wait). False if not queued."""
+        entry = self._entries.get(str(acc_id))
+        if entry is None or not entry.queued:
+            return False
+        entry.queued = False
+        entry.version += 1  # invalidates its heap items
+        self.pops += 1
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "accounts": len(self._entries),
+            "queued": sum(1 for e in self._entries.values() if e.queued),
+            "pops": self.pops,
+            "stale_skipped": self.stale_skipped,
+        }
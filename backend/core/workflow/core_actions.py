@@ -17,6 +17,13 @@ from workflow import clipper_helper
 from workflow.state_detector import GameStateDetector
 from workflow.account_detector import AccountDetector
 from workflow.construction_data import CONSTRUCTION_TAPS, CONSTRUCTION_DATA
+from backend.core.workflow.frame_bus import get_frame_bus
+from backend.core.workflow.health_probe import probe_app_health
+from backend.core.workflow.provider_cache import (
+    get_cached_provider, get_seeded_provider, invalidate_provider, store_provider,
+)
+from backend.core.workflow.adb_client import adb_run
+from backend.core.workflow.adaptive_wait import AdaptiveWaiter, poll_policy_for
 
 import numpy as np
 import cv2
@@ -49,38 +56,62 @@ def detect_provider_from_emulator(serial: str, adb_path: str = None) -> str:
     """Auto-detect provider by checking which game package is on the emulator.
     Checks running foreground app first, then falls back to installed packages.
     Returns provider string ('Global' or 'Funtap'), defaults to DEFAULT_PROVIDER.
+
+    Answers are cached per serial (provider_cache) until an APK install or emulator
+    relaunch; only a cache miss asks the device. A provider seeded from the accounts
+    table is used only once `pm list packages` shows its package is the only one installed.
     """
+    cached = get_cached_provider(serial)
+    if cached:
+        return cached
     if adb_path is None:
         adb_path = config.adb_path
-    import subprocess
+    seeded = get_seeded_provider(serial)
+    if seeded:
+        if _confirm_seeded_provider(serial, seeded, adb_path):
+            return seeded
+        invalidate_provider(serial, reason=f"seeded {seeded} not confirmed")
     # 1. Check foreground app
     try:
-        out = subprocess.check_output(
-            [adb_path, "-s", serial, "shell", "dumpsys", "activity", "recents"],
-            timeout=5, text=True, stderr=subprocess.DEVNULL,
-        )
+        out = adb_run(["shell", "dumpsys", "activity", "recents"], serial=serial, timeout=5, adb_path=adb_path)
         for pkg, prov in PACKAGE_PROVIDERS.items():
             if pkg in out:
+                store_provider(serial, prov)
                 return prov
     except Exception:
         pass
     # 2. Fallback: check installed packages
     try:
-        out = subprocess.check_output(
-            [adb_path, "-s", serial, "shell", "pm", "list", "packages"],
-            timeout=5, text=True, stderr=subprocess.DEVNULL,
-        )
+        out = adb_run(["shell", "pm", "list", "packages"], serial=serial, timeout=5, adb_path=adb_path)
         # Check longest package first (most specific): .gp.vn before .gp
         # to prevent substring false-match (.gp is a substring of .gp.vn)
         for pkg in sorted(PACKAGE_PROVIDERS.keys(), key=len, reverse=True):
             if f"package:{pkg}" in out:
+                store_provider(serial, PACKAGE_PROVIDERS[pkg])
                 return PACKAGE_PROVIDERS[pkg]
     except Exception:
         pass
     return DEFAULT_PROVIDER
 
 
-# Global cache to store the last screenshot hash/image for freeze detection
+def _confirm_seeded_provider(serial: str, seeded: str, adb_path: str) -> bool:
+    """One `pm list packages`: the seed holds if its package is the only game build installed."""
+    try:
+        out = adb_run(["shell", "pm", "list", "packages"], serial=serial, timeout=5, adb_path=adb_path)
+    except Exception:
+        return False
+    packages = {line.strip() for line in out.splitlines()}
+    installed = {prov for pkg, prov in PACKAGE_PROVIDERS.items() if f"package:{pkg}" in packages}
+    if installed != {seeded}:
+        return False
+    store_provider(serial, seeded, source="confirmed")
+    return True
+
+
+# Per-serial freeze counter: {"frame_id": bus frame of the previous check (0: that check
+# used a checksum), "checksum": probe frame checksum of the previous check (None: it used a
+# bus frame), "bus_seen": newest bus frame checked so far, "freeze_count": int} (pixel
+# comparison of bus frames is done by the frame bus change gate)
 _FREEZE_CACHE = {}
 _APP_HEALTH_CACHE = {}
 
@@ -277,53 +308,22 @@ def ensure_app_running(serial: str, package_name: str, adb_path: str = config.ad
         return False
     return True
 
-def _parse_pid_output(raw: str) -> list[str]:
-    return [part for part in str(raw or "").split() if part.isdigit()]
-
-
-def _is_package_foreground(serial: str, package_name: str) -> bool:
-    activity_out = adb_helper._run_adb(["shell", "dumpsys", "activity", "activities"], serial=serial) or ""
-    for line in activity_out.splitlines():
-        if any(marker in line for marker in ("topResumedActivity", "mResumedActivity", "ResumedActivity")):
-            if package_name in line:
-                return True
-
-    window_out = adb_helper._run_adb(["shell", "dumpsys", "window", "windows"], serial=serial) or ""
-    for line in window_out.splitlines():
-        if any(marker in line for marker in ("mCurrentFocus", "mFocusedApp")):
-            if package_name in line:
-                return True
-
-    return False
-
-
 def _log_capture_failure_diagnostics(serial: str, package_name: str = "", source: str = "capture") -> None:
     """Emit compact diagnostics when screencap/ERROR_CAPTURE happens repeatedly."""
     try:
         get_state = adb_helper._run_adb(["get-state"], serial=serial, timeout=5) or ""
-        pid_raw = adb_helper._run_adb(["shell", "pidof", package_name], serial=serial, timeout=5) if package_name else ""
-        pids = _parse_pid_output(pid_raw)
-        is_foreground = _is_package_foreground(serial, package_name) if package_name else False
-
-        current_focus = adb_helper._run_adb(
-            ["shell", "dumpsys", "window", "windows"], serial=serial, timeout=5
-        ) or ""
-        focus_line = ""
-        for line in current_focus.splitlines():
-            if any(marker in line for marker in ("mCurrentFocus", "mFocusedApp")):
-                focus_line = " ".join(line.strip().split())
-                break
+        health = probe_app_health(serial, package_name) if package_name else None
 
         print(
             f"[{serial}] [CAPTURE_DIAG] source={source} adb_state='{get_state.strip() or 'EMPTY'}' "
-            f"pid_count={len(pids)} foreground={is_foreground}"
+            f"pid_count={len(health.pids) if health else 0} foreground={health.foreground if health else False}"
         )
         if package_name:
             print(
-                f"[{serial}] [CAPTURE_DIAG] package='{package_name}' pid_raw='{(pid_raw or '').strip() or 'EMPTY'}'"
+                f"[{serial}] [CAPTURE_DIAG] package='{package_name}' pid_raw='{' '.join(health.pids) or 'EMPTY'}'"
             )
-        if focus_line:
-            print(f"[{serial}] [CAPTURE_DIAG] focus={focus_line[:240]}")
+        if health and health.focus:
+            print(f"[{serial}] [CAPTURE_DIAG] focus={health.focus[:240]}")
     except Exception as e:
         print(f"[{serial}] [CAPTURE_DIAG] failed to collect diagnostics: {e}")
 
@@ -341,9 +341,19 @@ def check_app_crash(serial: str, package_name: str = "", adb_path: str = config.
         })
         loading_like_states = {"LOADING SCREEN", "LOADING SCREEN (NETWORK ISSUE)"}
 
+        # Freeze detection reuses the frames the detectors published on the frame bus since
+        # the last check; only when there are none does the probe add a frame checksum.
+        bus = get_frame_bus(serial, adb_path)
+        freeze = _FREEZE_CACHE.get(serial)
+        bus_frame = bus.latest
+        if bus_frame is not None and bus_frame.frame_id <= (freeze["bus_seen"] if freeze else 0):
+            bus_frame = None
+
+        # One adb round trip: pid, foreground activity (+ frame checksum)
+        probe = probe_app_health(serial, package_name, frame_checksum=bus_frame is None, adb_path=adb_path)
+
         # 1. Check PID
-        res = adb_helper._run_adb(["shell", "pidof", package_name], serial=serial)
-        pids = _parse_pid_output(res)
+        pids = probe.pids
         if not pids:
             health["no_pid_count"] += 1
         else:
@@ -354,7 +364,7 @@ def check_app_crash(serial: str, package_name: str = "", adb_path: str = config.
             return True
             
         # 2. Check if it's the foreground app
-        is_foreground = _is_package_foreground(serial, package_name)
+        is_foreground = probe.foreground
         if not is_foreground:
             health["not_foreground_count"] += 1
         else:
@@ -367,44 +377,47 @@ def check_app_crash(serial: str, package_name: str = "", adb_path: str = config.
             return True
             
         # 3. Check for Engine Freeze (screen hasn't changed a single pixel)
-        # We take a fast, low-res screencap (e.g. 1/4 size) to compare.
-        import subprocess
-        proc = subprocess.run([adb_path, "-s", serial, "exec-out", "screencap", "-p"], capture_output=True, timeout=5)
-        if proc.returncode == 0 and len(proc.stdout) > 1000:
-            health["capture_fail_count"] = 0
-            img_data = np.frombuffer(proc.stdout, np.uint8)
-            img = cv2.imdecode(img_data, cv2.IMREAD_GRAYSCALE)
-            
-            if img is not None:
-                # Resize very small to ignore tiny compression artifacts and speed up
-                small = cv2.resize(img, (160, 90))
-                
-                if serial not in _FREEZE_CACHE:
-                    _FREEZE_CACHE[serial] = {"img": small, "freeze_count": 0}
-                else:
-                    prev_small = _FREEZE_CACHE[serial]["img"]
-                    # Compare
-                    diff = cv2.absdiff(small, prev_small)
-                    if np.max(diff) == 0:
-                        # 100% identical pixel for pixel
-                        _FREEZE_CACHE[serial]["freeze_count"] += 1
-                        freeze_threshold = 6 if current_state in loading_like_states else 4
-                        if _FREEZE_CACHE[serial]["freeze_count"] >= freeze_threshold:
-                            if health.get("is_foreground") and pids:
-                                print(f"[{serial}] [CRASH DETECTED] HARD FREEZE while app is still foreground/alive (0 pixel change for {freeze_threshold} consecutive checks).")
-                            else:
-                                print(f"[{serial}] [CRASH DETECTED] Game engine is completely FROZEN (0 pixel change for {freeze_threshold} consecutive checks).")
-                            return True
-                    else:
-                        # Screen changed, reset freeze counter
-                        _FREEZE_CACHE[serial]["freeze_count"] = 0
-                    
-                    _FREEZE_CACHE[serial]["img"] = small
-        else:
+        # The frame bus diffs every published 160x90 thumbnail against its predecessor
+        # (change gate), so a freeze = no changed frame since the one checked last time,
+        # including frames the detectors captured in between. Without a new frame the
+        # probe's screencap checksum stands in for it.
+        if bus_frame is None and not probe.frame_checksum:
             health["capture_fail_count"] += 1
             if health["capture_fail_count"] >= 3:
                 print(f"[{serial}] [CRASH DETECTED] Repeated screencap failure ({health['capture_fail_count']}x).")
                 return True
+            return False
+
+        health["capture_fail_count"] = 0
+        if freeze is None:
+            freeze = _FREEZE_CACHE[serial] = {"frame_id": 0, "checksum": None, "bus_seen": 0, "freeze_count": 0}
+            unchanged = None
+        elif bus_frame is not None:
+            unchanged = bus.unchanged_since(freeze["frame_id"]) if freeze["frame_id"] else None
+        else:
+            unchanged = probe.frame_checksum == freeze["checksum"] if freeze["checksum"] else None
+
+        if unchanged:
+            # 100% identical pixel for pixel
+            freeze["freeze_count"] += 1
+            freeze_threshold = 6 if current_state in loading_like_states else 4
+            if freeze["freeze_count"] >= freeze_threshold:
+                if health.get("is_foreground") and pids:
+                    print(f"[{serial}] [CRASH DETECTED] HARD FREEZE while app is still foreground/alive (0 pixel change for {freeze_threshold} consecutive checks).")
+                else:
+                    print(f"[{serial}] [CRASH DETECTED] Game engine is completely FROZEN (0 pixel change for {freeze_threshold} consecutive checks).")
+                return True
+        else:
+            # Screen changed — or the previous check used the other kind of sample, so there
+            # is nothing to compare against: the freeze count restarts either way
+            freeze["freeze_count"] = 0
+        # Only the sample taken now is a baseline for the next check
+        if bus_frame is not None:
+            freeze["frame_id"] = freeze["bus_seen"] = bus_frame.frame_id
+            freeze["checksum"] = None
+        else:
+            freeze["checksum"] = probe.frame_checksum
+            freeze["frame_id"] = 0
                     
         return False
     except Exception as e:
@@ -502,7 +515,13 @@ def startup_to_lobby(serial: str, detector: GameStateDetector, package_name: str
         return result if isinstance(result, dict) else (_ok() if result else _fail("NAV_LOBBY_UNREACHABLE: back_to_lobby failed"))
 
 def wait_for_state(serial: str, detector: GameStateDetector, target_states: list, timeout_sec: int = 60, package_name: str = "", check_mode: str = "state") -> str:
-    """Blocks and loops until the emulator reaches one of the target_states."""
+    """
+    Blocks and loops until the emulator reaches one of the target_states.
+    Polls on an adaptive schedule (AdaptiveWaiter): fast right after an input, exponential
+    backoff while loading; time-to-target is recorded per (from_state → target) transition.
+    The 0.15 s fast interval needs the change gate (check_state on a gated detector);
+    other modes and ungated detectors start at 0.3 s.
+    """
     NETWORK_ISSUE_STATE = "LOADING SCREEN (NETWORK ISSUE)"
     NETWORK_CONFIRM_XY = (500, 325)
 
@@ -511,6 +530,7 @@ def wait_for_state(serial: str, detector: GameStateDetector, target_states: list
     
     last_crash_check = time.time()
     network_dismiss_count = 0
+    waiter = AdaptiveWaiter(serial, poll_policy_for(check_mode == "state" and detector.change_gate))
     
     while True:
         if time.time() - start_time > timeout_sec:
@@ -535,6 +555,7 @@ def wait_for_state(serial: str, detector: GameStateDetector, target_states: list
             current_state = detector.check_state(serial)
             
         print(f"[{serial}] Current detected state: {current_state}")
+        waiter.observe(current_state)
 
         # ── GLOBAL INTERRUPT: Network Issue popup ──────────────────────
         # "Connection lost due to Network instability" can appear at ANY
@@ -562,7 +583,8 @@ def wait_for_state(serial: str, detector: GameStateDetector, target_states: list
         network_dismiss_count = 0
         
         if current_state in target_states:
-            print(f"[{serial}] -> Target Reached '{current_state}'")
+            elapsed = waiter.reached(current_state)
+            print(f"[{serial}] -> Target Reached '{current_state}' in {elapsed:.2f}s ({waiter.polls} polls)")
             return current_state
             
         if current_state == "ERROR_CAPTURE":
@@ -576,8 +598,8 @@ def wait_for_state(serial: str, detector: GameStateDetector, target_states: list
             continue
 
         if current_state == "LOADING SCREEN":
-            print(f"[{serial}] -> Game is loading. Waiting 3 seconds...")
-            _human_delay(3)
+            delay = waiter.sleep(loading=True)
+            print(f"[{serial}] -> Game is loading. Waited {delay:.2f}s...")
         elif current_state == "UNKNOWN / TRANSITION":
             # ── GLOBAL INTERRUPT: Popup blocking lobby ─────────────────
             # After loading, popups (events/ads) can appear over the lobby,
@@ -595,7 +617,7 @@ def wait_for_state(serial: str, detector: GameStateDetector, target_states: list
                     if check_app_crash(serial, package_name, current_state=current_state):
                         return None
                     last_crash_check = time.time()
-                _human_delay(0.5)
+                waiter.sleep()
         else:
             # Check for crash every 10 seconds to avoid ADB spam
             if package_name and (time.time() - last_crash_check > 10):
@@ -603,7 +625,7 @@ def wait_for_state(serial: str, detector: GameStateDetector, target_states: list
                     return None
                 last_crash_check = time.time()
                 
-            _human_delay(0.5)
+            waiter.sleep()
 
 def go_to_profile(serial: str, detector: GameStateDetector) -> dict:
     """Navigates to the Profile menu."""
@@ -287,6 +287,24 @@ ROI_HINTS = {
     "icon_markers/heal_icon.png":          (650,200,850,400),
 }
 
+# ── Pyramid Hints ─────────────────────────────────────────────────
+# filename -> downscale factor for coarse-to-fine matching (see template_pyramid.py)
+# Opt-in, only used when the template is scanned over the full screen (no ROI hint).
+# Final score is still computed at full resolution → thresholds unchanged.
+# Verify with TEST/detector_perf/report_pyramid.py before adding entries.
+
+PYRAMID_HINTS = {
+    # report_pyramid.py --all --count 40 (synthetic frames): 100% decision agreement,
+    # max score delta <= 0.003, 0 px location error, 2.7-4.2x faster at 0.5.
+    # Left out: templates whose short side drops under 16 px at 0.5
+    # (replenish_resources, already_join_rally); 0.25 is too small for most of the rest.
+    "contructions/con_tavern.png": 0.5,
+    "icon_markers/rss_center.png": 0.5,
+    "tavern/free_draw_btn.png": 0.5,
+    "policy/target_default.png": 0.5,
+    "alliance/no_rally.png": 0.5,
+}
+
 # ── Derived Registries ────────────────────────────────────────────
 
 CATEGORY_REGISTRY = {
@@ -312,3 +330,31 @@ STATE_PRIORITY = [
 ]
 
 STATE_BASE = ["IN-GAME LOBBY (IN_CITY)", "IN-GAME LOBBY (OUT_CITY)"]
+
+
+def _state_conflicts(state: str, order: list) -> list:
+    """
+    States ranked above `state` that could be on screen together with it: they share a
+    template file or a search region (templates without an ROI hint cover the full screen).
+    """
+    full = (0, 0, 960, 540)
+    files = {f for f, s in STATE_CONFIGS.items() if s == state}
+    regions = [ROI_HINTS.get(f, full) for f in files]
+    above = order[:order.index(state)]
+    conflicts = []
+    for other in above:
+        other_files = {f for f, s in STATE_CONFIGS.items() if s == other}
+        if files & other_files or any(
+            a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+            for a in regions for b in (ROI_HINTS.get(f, full) for f in other_files)
+        ):
+            conflicts.append(other)
+    return conflicts
+
+
+# state -> higher-ranked states a predicted hit must still be checked against (state_transitions).
+# Only ranked states: the scan never returns the others, so a prediction must not either.
+STATE_CONFLICTS = {
+    state: _state_conflicts(state, STATE_PRIORITY + STATE_BASE)
+    for state in STATE_PRIORITY + STATE_BASE if state in STATE_CONFIGS.values()
+}
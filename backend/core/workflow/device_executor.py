@@ -0,0 +1,196 @@
+"""
+Device Executor — bounded thread lanes for blocking per-emulator calls.
+
+executor.execute_recipe and BotOrchestrator used to push every blocking ADB /
+core_actions / detector call through asyncio.to_thread, so all emulators shared the
+default thread pool: nothing stopped two actions from racing on one device, nothing
+bounded the total, and queueing delay was invisible.
+
+- One lane per serial: a single named worker thread ("emu-5556"), so calls for one
+  device run strictly one after another.
+- A global cap bounds how many lanes run a call at the same time. The default is
+  max(host cores, emulator lanes, DEVICE_EXECUTOR_MIN_SLOTS) and grows as lanes are
+  added, so every active emulator can always make progress.
+- Long, mostly-sleeping calls (boot, startup_to_lobby, back_to_lobby, full scan, macro
+  replay) go through run_long_on_device: still serialized on their lane, but exempt from
+  the cap, so they never hold a slot that short CPU-bound calls are waiting for.
+- Per-serial metrics: calls, in-flight, queue wait and run time (avg / max).
+
+Usage:
+    state = await run_on_device(serial, detector.check_state, serial)
+    ok = await run_long_on_device(serial, core_actions.back_to_lobby, serial, detector)
+    device_executor_stats()    # {serial: {"calls": ..., "in_flight": ..., ...}}
+"""
+
+import asyncio
+import contextlib
+import functools
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+# ── Module Constants ──────────────────────────────────────────────
+
+DEVICE_EXECUTOR_MIN_SLOTS = 4   # boot waits mostly sleep; don't let a 1-2 core host serialize emulators
+
+
+def default_global_slots() -> int:
+    return max(DEVICE_EXECUTOR_MIN_SLOTS, os.cpu_count() or 1)
+
+
+@dataclass
+class LaneStats:
+    calls: int = 0
+    long_calls: int = 0         # run_long: not counted against the global cap
+    in_flight: int = 0          # queued + running
+    running: int = 0
+    errors: int = 0
+    wait_total_sec: float = 0.0
+    wait_max_sec: float = 0.0
+    run_total_sec: float = 0.0
+    run_max_sec: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        done = max(1, self.calls - self.in_flight)
+        return {
+            "calls": self.calls,
+            "long_calls": self.long_calls,
+            "in_flight": self.in_flight,
+            "running": self.running,
+            "errors": self.errors,
+            "wait_avg_ms": round(self.wait_total_sec / done * 1000, 1),
+            "wait_max_ms": round(self.wait_max_sec * 1000, 1),
+            "run_avg_ms": round(self.run_total_sec / done * 1000, 1),
+            "run_max_ms": round(self.run_max_sec * 1000, 1),
+        }
+
+
+class DeviceExecutor:
+    """Serialized single-thread lane per serial under a global concurrency cap."""
+
+    def __init__(self, global_slots: Optional[int] = None):
+        # An explicit cap is fixed; the default one grows with the number of lanes
+        self._auto_slots = global_slots is None
+        self.global_slots = global_slots or default_global_slots()
+        self._slots = threading.Condition()
+        self._busy = 0
+        self._lanes: Dict[str, ThreadPoolExecutor] = {}
+        self._stats: Dict[str, LaneStats] = {}
+        self._lock = threading.Lock()
+
+    def _lane(self, serial: str) -> ThreadPoolExecutor:
+        with self._lock:
+            lane = self._lanes.get(serial)
+            if lane is None:
+                name = serial.replace("emulator-", "emu-").replace(":", "_")
+                lane = ThreadPoolExecutor(max_workers=1, thread_name_prefix=name)
+                self._lanes[serial] = lane
+                self._stats[serial] = LaneStats()
+                if self._auto_slots and len(self._lanes) > self.global_slots:
+                    with self._slots:
+                        self.global_slots = len(self._lanes)
+                        self._slots.notify_all()
+            return lane
+
+    @contextlib.contextmanager
+    def _slot(self, capped: bool):
+        if not capped:
+            yield
+            return
+        with self._slots:
+            self._slots.wait_for(lambda: self._busy < self.global_slots)
+            self._busy += 1
+        try:
+            yield
+        finally:
+            with self._slots:
+                self._busy -= 1
+                self._slots.notify()
+
+    def _call(self, serial: str, submitted: float, capped: bool, fn: Callable, args, kwargs):
+        stats = self._stats[serial]
+        with self._slot(capped):
+            started = time.perf_counter()
+            waited = started - submitted
+            with self._lock:
+                stats.running += 1
+                stats.wait_total_sec += waited
+                stats.wait_max_sec = max(stats.wait_max_sec, waited)
+            try:
+                return fn(*args, **kwargs)
+            except Exception:
+                with self._lock:
+                    stats.errors += 1
+                raise
+            finally:
+                elapsed = time.perf_counter() - started
+                with self._lock:
+                    stats.running -= 1
+                    stats.in_flight -= 1
+                    stats.run_total_sec += elapsed
+                    stats.run_max_sec = max(stats.run_max_sec, elapsed)
+
+    async def run(self, serial: str, fn: Callable, *args, **kwargs) -> Any:
+        """Run a blocking call on serial's lane and await its result."""
+        return await self._submit(serial, True, fn, args, kwargs)
+
+    async def run_long(self, serial: str, fn: Callable, *args, **kwargs) -> Any:
+        """Like run(), for long mostly-sleeping calls: serialized on the lane, outside the cap."""
+        return await self._submit(serial, False, fn, args, kwargs)
+
+    async def _submit(self, serial: str, capped: bool, fn: Callable, args, kwargs) -> Any:
+        lane = self._lane(serial)
+        with self._lock:
+            stats = self._stats[serial]
+            stats.calls += 1
+            stats.long_calls += not capped
+            stats.in_flight += 1
+        call = functools.partial(self._call, serial, time.perf_counter(), capped, fn, args, kwargs)
+        try:
+            future = lane.submit(call)
+        except RuntimeError:
+            with self._lock:
+                stats.in_flight -= 1
+            raise
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {serial: s.to_dict() for serial, s in self._stats.items()}
+
+    def shutdown(self, wait: bool = False):
+        with self._lock:
+            lanes = list(self._lanes.values())
+            self._lanes.clear()
+        for lane in lanes:
+            lane.shutdown(wait=wait)
+
+
+_executor: Optional[DeviceExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_device_executor() -> DeviceExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = DeviceExecutor()
+        return _executor
+
+
+async def run_on_device(serial: str, fn: Callable, *args, **kwargs) -> Any:
+    """Blocking call for one emulator, serialized with every other call for that serial."""
+    return await get_device_executor().run(serial, fn, *args, **kwargs)
+
+
+async def run_long_on_device(serial: str, fn: Callable, *args, **kwargs) -> Any:
+    """Long, mostly-sleeping call (boot / navigation / scan): same lane, exempt from the global cap."""
+    return await get_device_executor().run_long(serial, fn, *args, **kwargs)
+
+
+def device_executor_stats() -> Dict[str, Any]:
+    executor = get_device_executor()
+    return {"global_slots": executor.global_slots, "lanes": executor.stats()}
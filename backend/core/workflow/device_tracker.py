@@ -0,0 +1,329 @@
+"""
+Device Tracker — one `host:track-devices` stream instead of polling `adb devices`.
+
+ldplayer_manager.wait_for_device ran `adb devices` every 2-3 s per booting emulator,
+and EmulatorManager.discover / `/api/devices/refresh` re-ran the same listing; under
+concurrent boots the calls piled up and could end in `adb kill-server`. The adb server
+pushes the full device list on one long-lived connection whenever it changes.
+
+- One background thread reads the stream and keeps {serial: state, boot_completed}.
+  The connection is reopened with backoff when the server goes away.
+- A serial that turns "device" gets one boot probe thread
+  (`getprop sys.boot_completed` every BOOT_PROBE_INTERVAL_SEC until "1"); going offline
+  or disappearing clears boot_completed.
+- Waiters block on a Condition (threads: wait_until_ready) or await an asyncio future
+  resolved from the tracker thread (wait_ready) — nothing polls the server.
+- While the stream is down (`connected` False) callers fall back to their old polling.
+
+Usage:
+    tracker = start_device_tracker()              # api startup
+    serial = await tracker.wait_ready(["emulator-5554", "127.0.0.1:5555"], timeout=120)
+    tracker.online_serials()                      # ["emulator-5554", ...]
+    device_tracker_stats()
+"""
+
+import asyncio
+import socket
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from backend.core.workflow.adb_client import AdbClient, AdbError, get_adb_client
+
+# ── Module Constants ──────────────────────────────────────────────
+
+TRACKER_RECONNECT_MIN_SEC = 1
+TRACKER_RECONNECT_MAX_SEC = 15
+BOOT_PROBE_INTERVAL_SEC = 1.0
+BOOT_PROBE_TIMEOUT_SEC = 5
+
+
+@dataclass
+class DeviceState:
+    state: str                      # device / offline / unauthorized / ...
+    boot_completed: bool = False
+    changed_at: float = 0.0         # time.time() of the last state change
+
+    @property
+    def ready(self) -> bool:
+        return self.state == "device" and self.boot_completed
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "boot_completed": self.boot_completed,
+            "ready": self.ready,
+            "changed_at": round(self.changed_at, 3),
+        }
+
+
+def _parse_listing(listing: str) -> Dict[str, str]:
+    return dict(line.split("\t", 1) for line in listing.splitlines() if "\t" in line)
+
+
+class DeviceTracker:
+    """Live device map fed by `host:track-devices`; readiness waits for threads and coroutines."""
+
+    def __init__(self, client: Optional[AdbClient] = None) -> None:
+        self._client = client
+        self._cond = threading.Condition()
+        self._devices: Dict[str, DeviceState] = {}
+        self._probing: set = set()
+        self._async_waiters: list = []      # (loop, future, serials)
+        self._stop = threading.Event()
+        self._sock: Optional[socket.socket] = None
+        self._thread: Optional[threading.Thread] = None
+        self.connected = False
+        self.updates = 0
+        self.reconnects = 0
+        self.boot_probes = 0
+        self.waits = 0
+
+    @property
+    def client(self) -> AdbClient:
+        return self._client or get_adb_client()
+
+    # ── Lifecycle ─────────────────────────────────────────────────
+
+    def start(self) -> "DeviceTracker":
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="adb-track-devices", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        sock = self._sock
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self._thread = None
+
+    def wait_connected(self, timeout: float) -> bool:
+        """Block until the first device list arrived (or timeout)."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self.connected, timeout)
+
+    def _run(self) -> None:
+        backoff = TRACKER_RECONNECT_MIN_SEC
+        first = True
+        while not self._stop.is_set():
+            if not first:
+                self.reconnects += 1
+            first = False
+            try:
+                self._track()
+                backoff = TRACKER_RECONNECT_MIN_SEC     # the stream worked; retry quickly
+            except (AdbError, OSError, ValueError) as e:
+                if not self._stop.is_set():
+                    print(f"[ADB] Device tracker: {e} — reconnecting in {backoff}s")
+            with self._cond:
+                self.connected = False
+                self._notify_locked()       # waiters fall back to polling while the stream is down
+            if self._stop.wait(backoff):
+                break
+            backoff = min(backoff * 2, TRACKER_RECONNECT_MAX_SEC)
+
+    def _track(self) -> None:
+        client = self.client
+        sock = client._connect(BOOT_PROBE_TIMEOUT_SEC)
+        self._sock = sock
+        try:
+            client._send(sock, "host:track-devices")
+            client._check_status(sock)
+            sock.settimeout(None)               # blocks until the next change; stop() shuts it down
+            while not self._stop.is_set():
+                listing = client._recv_hex_block(sock).decode("utf-8", errors="replace")
+                self._apply(_parse_listing(listing))
+        finally:
+            self._sock = None
+            sock.close()
+
+    # ── State updates ─────────────────────────────────────────────
+
+    def _apply(self, listing: Dict[str, str]) -> None:
+        now = time.time()
+        probe = []
+        with self._cond:
+            self.updates += 1
+            self.connected = True
+            for serial in list(self._devices):
+                if serial not in listing:
+                    del self._devices[serial]
+            for serial, state in listing.items():
+                current = self._devices.get(serial)
+                if current is None or current.state != state:
+                    self._devices[serial] = DeviceState(state, False, now)
+                if state == "device" and not self._devices[serial].boot_completed and serial not in self._probing:
+                    self._probing.add(serial)
+                    probe.append(serial)
+            self._notify_locked()
+        for serial in probe:
+            threading.Thread(target=self._probe_boot, args=(serial,), name=f"boot-probe-{serial}", daemon=True).start()
+
+    def _probe_boot(self, serial: str) -> None:
+        try:
+            while not self._stop.is_set():
+                with self._cond:
+                    current = self._devices.get(serial)
+                    if current is None or current.state != "device":
+                        return
+                self.boot_probes += 1
+                try:
+                    prop = self.client.shell(serial, "getprop sys.boot_completed", timeout=BOOT_PROBE_TIMEOUT_SEC)
+                except (AdbError, OSError):
+                    prop = ""
+                if prop.strip() == "1":
+                    with self._cond:
+                        current = self._devices.get(serial)
+                        if current is not None and current.state == "device":
+                            current.boot_completed = True
+                            current.changed_at = time.time()
+                            self._notify_locked()
+                    return
+                self._stop.wait(BOOT_PROBE_INTERVAL_SEC)
+        finally:
+            with self._cond:
+                self._probing.discard(serial)
+
+    def _notify_locked(self) -> None:
+        self._cond.notify_all()
+        pending = []
+        for loop, future, serials in self._async_waiters:
+            ready = self._first_ready_locked(serials)
+            if ready is None and self.connected:
+                pending.append((loop, future, serials))
+            else:
+                loop.call_soon_threadsafe(_resolve, future, ready)
+        self._async_waiters = pending
+
+    def _first_ready_locked(self, serials: List[str]) -> Optional[str]:
+        for serial in serials:
+            current = self._devices.get(serial)
+            if current is not None and current.ready:
+                return serial
+        return None
+
+    # ── Queries and waits ─────────────────────────────────────────
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._cond:
+            return {serial: d.to_dict() for serial, d in sorted(self._devices.items())}
+
+    def online_serials(self) -> List[str]:
+        """Serials in "device" state — what `adb devices` listing filtered by adb_helper.list_devices gives."""
+        with self._cond:
+            return sorted(s for s, d in self._devices.items() if d.state == "device")
+
+    def is_ready(self, serial: str) -> bool:
+        with self._cond:
+            current = self._devices.get(serial)
+            return current is not None and current.ready
+
+    def seen(self, serials: Union[str, Iterable[str]]) -> bool:
+        """True if any of the serials is listed at all (in any state)."""
+        serials = [serials] if isinstance(serials, str) else list(serials)
+        with self._cond:
+            return any(s in self._devices for s in serials)
+
+    def wait_until_ready(self, serials: Union[str, Iterable[str]], timeout: float) -> Optional[str]:
+        """
+        Block until one of the serials is online and booted; returns it.
+
+        None on timeout or when the stream drops (check `connected` and poll instead).
+        """
+        serials = [serials] if isinstance(serials, str) else list(serials)
+        self.waits += 1
+        with self._cond:
+            found: List[Optional[str]] = [None]
+
+            def _ready() -> bool:
+                found[0] = self._first_ready_locked(serials)
+                return found[0] is not None or not self.connected
+
+            self._cond.wait_for(_ready, timeout)
+            return found[0]
+
+    async def wait_ready(self, serials: Union[str, Iterable[str]], timeout: float) -> Optional[str]:
+        """Async wait_until_ready: resolved from the tracker thread, no executor lane held."""
+        serials = [serials] if isinstance(serials, str) else list(serials)
+        self.waits += 1
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._cond:
+            ready = self._first_ready_locked(serials)
+            if ready is not None or not self.connected:
+                return ready
+            self._async_waiters.append((loop, future, serials))
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            with self._cond:
+                self._async_waiters = [w for w in self._async_waiters if w[1] is not future]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            states: Dict[str, int] = {}
+            for d in self._devices.values():
+                states[d.state] = states.get(d.state, 0) + 1
+            return {
+                "connected": self.connected,
+                "updates": self.updates,
+                "reconnects": self.reconnects,
+                "boot_probes": self.boot_probes,
+                "waits": self.waits,
+                "async_waiters": len(self._async_waiters),
+                "devices": states,
+                "ready": sum(1 for d in self._devices.values() if d.ready),
+            }
+
+
+def _resolve(future: "asyncio.Future", serial: Optional[str]) -> None:
+    if not future.done():
+        future.set_result(serial)
+
+
+# ── Process-wide tracker ──────────────────────────────────────────
+
+_tracker: Optional[DeviceTracker] = None
+_tracker_lock = threading.Lock()
+
+
+def start_device_tracker(client: Optional[AdbClient] = None) -> DeviceTracker:
+    """Start the shared tracker (idempotent)."""
+    global _tracker
+    with _tracker_lock:
+        if _tracker is None:
+            _tracker = DeviceTracker(client)
+        return _tracker.start()
+
+
+def get_device_tracker() -> Optional[DeviceTracker]:
+    """The shared tracker, or None if it was never started (callers then poll as before)."""
+    return _tracker
+
+
+def stop_device_tracker() -> None:
+    global _tracker
+    with _tracker_lock:
+        tracker, _tracker = _tracker, None
+    if tracker is not None:
+        tracker.stop()
+
+
+def device_tracker_stats() -> Dict[str, Any]:
+    tracker = _tracker
+    if tracker is None:
+        return {"connected": False, "running": False}
+    data = tracker.stats()
+    data["running"] = True
+    data["snapshot"] = tracker.snapshot()
+    return data
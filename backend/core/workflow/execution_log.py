@@ -1,30 +1,61 @@
-import aiosqlite
 import json
 from datetime import datetime
+from typing import Callable, Dict, List
 from backend.config import config
+from backend.core.workflow import log_writer
+from backend.storage import db_pool
+from backend.storage.database import TASK_DAILY_STATE_FINISH_SQL, TASK_DAILY_STATE_LOG_SQL
+
+# ── Activity events (in-process listeners, e.g. orchestrator metrics cache) ──
+
+_activity_listeners: List[Callable[[dict], None]] = []
+_open_activities: Dict[int, dict] = {}  # log_id -> row fields needed by finish events
+
+
+def add_activity_listener(fn: Callable[[dict], None]):
+    """Call fn(event) whenever an account activity finishes (or is marked manually)."""
+    if fn not in _activity_listeners:
+        _activity_listeners.append(fn)
+
+
+def remove_activity_listener(fn: Callable[[dict], None]):
+    if fn in _activity_listeners:
+        _activity_listeners.remove(fn)
+
+
+def publish_activity_event(event: dict):
+    """Fan an activity event out to listeners.
+
+    Event keys: account_id, group_id, activity_id, status (SUCCESS / FAILED / ... / UNDO),
+    started_at (ISO string), source, result.
+    """
+    for fn in list(_activity_listeners):
+        try:
+            fn(event)
+        except Exception as e:
+            print(f"[ExecutionLog] Activity listener failed: {e}")
 
 
 async def create_run(run_id: str, meta: dict):
-    """Create a new execution run record."""
-    async with aiosqlite.connect(config.db_path) as db:
-        await db.execute(
-            """INSERT INTO task_runs (
-                run_id, source_page, trigger_type, triggered_by, target_id, 
-                status, started_at, duration_ms, metadata_json
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-            (
-                run_id,
-                meta.get("source_page", "workflow"),
-                meta.get("trigger_type", "manual"),
-                meta.get("triggered_by", "system"),
-                meta.get("target_id", 0),
-                "RUNNING",
-                datetime.now().isoformat(),
-                0,
-                json.dumps(meta),
-            ),
-        )
-        await db.commit()
+    """Create a new execution run record (queued on the write-behind log)."""
+    await log_writer.add(
+        config.db_path,
+        """INSERT INTO task_runs (
+            run_id, source_page, trigger_type, triggered_by, target_id, 
+            status, started_at, duration_ms, metadata_json
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        (
+            run_id,
+            meta.get("source_page", "workflow"),
+            meta.get("trigger_type", "manual"),
+            meta.get("triggered_by", "system"),
+            meta.get("target_id", 0),
+            "RUNNING",
+            datetime.now().isoformat(),
+            0,
+            json.dumps(meta),
+        ),
+    )
 
 
 async def append_step_log(
@@ -38,39 +69,42 @@ async def append_step_log(
     latency_ms: int = 0,
 ):
     """Append a step log to an existing run."""
-    async with aiosqlite.connect(config.db_path) as db:
-        await db.execute(
-            """INSERT INTO task_run_steps (
-                run_id, step_index, function_id, input_json, output_json, 
-                status, error_code, error_message, started_at, ended_at, latency_ms
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-            (
-                run_id,
-                step_index,
-                function_id,
-                json.dumps(input_dict) if input_dict else "{}",
-                json.dumps(output_dict) if output_dict else "{}",
-                status,
-                "",  # error_code
-                error_msg,
-                datetime.now().isoformat(),  # started_at
-                datetime.now().isoformat(),  # ended_at (approx)
-                latency_ms,
-            ),
-        )
-        await db.commit()
+    await log_writer.add(
+        config.db_path,
+        """INSERT INTO task_run_steps (
+            run_id, step_index, function_id, input_json, output_json, 
+            status, error_code, error_message, started_at, ended_at, latency_ms
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        (
+            run_id,
+            step_index,
+            function_id,
+            json.dumps(input_dict) if input_dict else "{}",
+            json.dumps(output_dict) if output_dict else "{}",
+            status,
+            "",  # error_code
+            error_msg,
+            datetime.now().isoformat(),  # started_at
+            datetime.now().isoformat(),  # ended_at (approx)
+            latency_ms,
+        ),
+    )
 
 
 async def complete_run(run_id: str, status: str, duration_ms: int):
     """Mark a run as complete or failed with final duration."""
-    async with aiosqlite.connect(config.db_path) as db:
-        await db.execute(
-            """UPDATE task_runs SET 
-                status = ?, ended_at = ?, duration_ms = ?
-            WHERE run_id = ?""",
-            (status, datetime.now().isoformat(), duration_ms, run_id),
-        )
-        await db.commit()
+    await log_writer.add(
+        config.db_path,
+        """UPDATE task_runs SET 
+            status = ?, ended_at = ?, duration_ms = ?
+        WHERE run_id = ?""",
+        (status, datetime.now().isoformat(), duration_ms, run_id),
+    )
+
+
+async def flush(durable: bool = False):
+    """Write queued log records now (durable=True: also checkpoint the WAL)."""
+    await log_writer.flush(durable)
 
 
 # ── Account Activity Logs (v2 fact table for Task page) ──
@@ -87,29 +121,52 @@ async def start_account_activity(
     source: str = "workflow",
     metadata: dict = None,
 ) -> int:
-    """Insert a RUNNING row into account_activity_logs. Returns the row id."""
-    async with aiosqlite.connect(config.db_path) as db:
-        cursor = await db.execute(
+    """Insert a RUNNING row into account_activity_logs. Returns the row id.
+
+    The id comes from a block reserved by log_writer, so the caller does not wait for
+    the INSERT to reach the disk. task_daily_state is updated in the same transaction.
+    """
+    started_at = datetime.now().isoformat()
+    log_id = await log_writer.next_id(config.db_path, "account_activity_logs")
+    row = {
+        "id": log_id,
+        "run_id": run_id,
+        "account_id": account_id,
+        "game_id": game_id,
+        "emulator_id": emulator_id,
+        "group_id": group_id,
+        "activity_id": activity_id,
+        "activity_name": activity_name,
+        "status": "RUNNING",
+        "started_at": started_at,
+        "source": source,
+        "metadata_json": json.dumps(metadata) if metadata else "{}",
+        "duration_ms": 0,
+        "error_message": "",
+    }
+    await log_writer.add_many(config.db_path, [
+        (
             """INSERT INTO account_activity_logs (
-                run_id, account_id, game_id, emulator_id, group_id,
-                activity_id, activity_name, status, started_at,
+                id, run_id, account_id, game_id, emulator_id, group_id,
+                activity_id, activity_name, status, started_at, started_date,
                 source, metadata_json
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, 'RUNNING', ?, ?, ?)""",
-            (
-                run_id,
-                account_id,
-                game_id,
-                emulator_id,
-                group_id,
-                activity_id,
-                activity_name,
-                datetime.now().isoformat(),
-                source,
-                json.dumps(metadata) if metadata else "{}",
-            ),
-        )
-        await db.commit()
-        return cursor.lastrowid
+            ) VALUES (
+                :id, :run_id, :account_id, :game_id, :emulator_id, :group_id,
+                :activity_id, :activity_name, :status, :started_at, substr(:started_at, 1, 10),
+                :source, :metadata_json
+            )""",
+            row,
+        ),
+        (TASK_DAILY_STATE_LOG_SQL, row),
+    ])
+    _open_activities[log_id] = {
+        "account_id": account_id,
+        "group_id": group_id,
+        "activity_id": activity_id,
+        "started_at": started_at,
+        "source": source,
+    }
+    return log_id
 
 
 async def finish_account_activity(
@@ -120,9 +177,9 @@ async def finish_account_activity(
     duration_ms: int = 0,
     result: dict = None,
 ):
-    """Update an account_activity_logs row to its final status."""
-    async with aiosqlite.connect(config.db_path) as db:
-        await db.execute(
+    """Update an account_activity_logs row to its final status (and its task_daily_state row)."""
+    await log_writer.add_many(config.db_path, [
+        (
             """UPDATE account_activity_logs SET
                 status = ?, error_code = ?, error_message = ?,
                 finished_at = ?, duration_ms = ?, result_json = ?
@@ -136,13 +193,22 @@ async def finish_account_activity(
                 json.dumps(result) if result else "{}",
                 log_id,
             ),
-        )
-        await db.commit()
+        ),
+        (
+            TASK_DAILY_STATE_FINISH_SQL,
+            {"log_id": log_id, "status": status, "duration_ms": duration_ms or 0, "error_message": error_message or ""},
+        ),
+    ])
+
+    row = _open_activities.pop(log_id, None)
+    if row is not None:
+        publish_activity_event({**row, "status": status, "result": result or {}})
 
 
 async def get_last_account_run(account_id: int) -> float:
     """Return the timestamp of the most recent started_at for any activity on an account."""
-    async with aiosqlite.connect(config.db_path) as db:
+    await log_writer.flush()
+    async with db_pool.reader() as db:
         async with db.execute(
             """SELECT started_at FROM account_activity_logs 
                WHERE account_id = ? 
@@ -160,7 +226,8 @@ async def get_last_account_run(account_id: int) -> float:
 
 async def get_last_activity_run(account_id: int, activity_id: str) -> float:
     """Return the timestamp of the most recent SUCCESS run for a specific activity on an account."""
-    async with aiosqlite.connect(config.db_path) as db:
+    await log_writer.flush()
+    async with db_pool.reader() as db:
         async with db.execute(
             """SELECT started_at FROM account_activity_logs 
                WHERE account_id = ? AND activity_id = ? AND status = 'SUCCESS'
@@ -189,7 +256,8 @@ async def get_effective_cooldown_sec(
     FAILED runs always return dynamic_cooldown_sec=0 (uses static cooldown).
     """
     status_filter = "status IN ('SUCCESS', 'FAILED')" if include_failures else "status = 'SUCCESS'"
-    async with aiosqlite.connect(config.db_path) as db:
+    await log_writer.flush()
+    async with db_pool.reader() as db:
         async with db.execute(
             f"""SELECT started_at, result_json, status FROM account_activity_logs
                WHERE account_id = ? AND activity_id = ? AND {status_filter}
@@ -3,6 +3,7 @@ import time
 from typing import Callable, Coroutine
 from backend.core.workflow import core_actions
 from backend.core.workflow import adb_helper
+from backend.core.workflow.device_executor import run_long_on_device, run_on_device
 from backend.core.workflow.state_detector import GameStateDetector
 from backend.core import full_scan as full_scan_module
 from backend.storage.database import Database, database as _main_db
@@ -58,7 +59,8 @@ async def execute_recipe(
     current_dir = os.path.dirname(os.path.abspath(__file__))
     templates_dir = os.path.join(current_dir, "templates")
 
-    detector = GameStateDetector(adb_path=config.adb_path, templates_dir=templates_dir)
+    # Change gate on: wait_for_state polls this detector on the adaptive schedule
+    detector = GameStateDetector(adb_path=config.adb_path, templates_dir=templates_dir, change_gate=True)
 
     # Set debug context so _fail() can capture screenshots
     core_actions._set_debug_context(serial, detector)
@@ -139,7 +141,7 @@ async def execute_recipe(
             elif fn_id == "act_click_xy":
                 x = int(config.get("x", 0))
                 y = int(config.get("y", 0))
-                await asyncio.to_thread(adb_helper.tap, serial, x, y)
+                await run_on_device(serial, adb_helper.tap, serial, x, y)
                 await asyncio.sleep(0.5)
 
             elif fn_id == "act_swipe":
@@ -148,14 +150,14 @@ async def execute_recipe(
                 x2 = int(config.get("endX", 0))
                 y2 = int(config.get("endY", 0))
                 duration = int(config.get("durationMs", 500))
-                await asyncio.to_thread(
-                    adb_helper.swipe, serial, x1, y1, x2, y2, duration
+                await run_on_device(
+                    serial, adb_helper.swipe, serial, x1, y1, x2, y2, duration
                 )
                 await asyncio.sleep(0.5)
 
             elif fn_id == "act_input_text":
                 text = str(config.get("text", ""))
-                await asyncio.to_thread(adb_helper.input_text, serial, text)
+                await run_on_device(serial, adb_helper.input_text, serial, text)
                 await asyncio.sleep(1)
 
             # App/System Controls
@@ -163,8 +165,8 @@ async def execute_recipe(
                 pkg = config.get("package") or core_actions.get_package_for_provider(
                     core_actions.detect_provider_from_emulator(serial)
                 )
-                was_running = await asyncio.to_thread(
-                    _run_core_action, core_actions.ensure_app_running, serial, pkg
+                was_running = await run_on_device(
+                    serial, _run_core_action, core_actions.ensure_app_running, serial, pkg
                 )
                 if was_running is None:
                     ok = False  # App launch failed entirely
@@ -175,11 +177,11 @@ async def execute_recipe(
                 pkg = config.get("package") or core_actions.get_package_for_provider(
                     core_actions.detect_provider_from_emulator(serial)
                 )
-                await asyncio.to_thread(adb_helper.kill_app, serial, pkg)
+                await run_on_device(serial, adb_helper.kill_app, serial, pkg)
                 await asyncio.sleep(2)
 
             elif fn_id in ("sys_back_btn", "adb_press_back"):
-                await asyncio.to_thread(adb_helper.press_back, serial)
+                await run_on_device(serial, adb_helper.press_back, serial)
                 await asyncio.sleep(1.5)
 
             # ── Startup / Boot ──
@@ -188,7 +190,8 @@ async def execute_recipe(
                 detected_pkg = config.get("package") or core_actions.get_package_for_provider(
                     core_actions.detect_provider_from_emulator(serial)
                 )
-                ok = await asyncio.to_thread(
+                ok = await run_long_on_device(
+                    serial,
                     _run_core_action,
                     core_actions.startup_to_lobby,
                     serial,
@@ -201,7 +204,8 @@ async def execute_recipe(
             elif fn_id == "scan_full":
                 import asyncio as _aio
 
-                result = await asyncio.to_thread(
+                result = await run_long_on_device(
+                    serial,
                     full_scan_module.start_full_scan,
                     emulator_index,
                     emulator_name,
@@ -341,12 +345,12 @@ async def execute_recipe(
             elif fn_id == "adb_tap":
                 x = int((config or {}).get("x", 0))
                 y = int((config or {}).get("y", 0))
-                await asyncio.to_thread(adb_helper.tap, serial, x, y)
+                await run_on_device(serial, adb_helper.tap, serial, x, y)
                 await asyncio.sleep(0.5)
 
             # ── Check Game State (registry id: check_state) ──
             elif fn_id == "check_state":
-                current_state = await asyncio.to_thread(detector.check_state, serial)
+                current_state = await run_on_device(serial, detector.check_state, serial)
                 await log(f"  Detected State: {current_state}", "info")
 
             # ── Run Macro (registry id: run_macro) ──
@@ -369,7 +373,8 @@ async def execute_recipe(
                                 f"  Macro '{macro_file}' loop {loop_i + 1}/{loop_count}",
                                 "info",
                             )
-                            res = await asyncio.to_thread(
+                            res = await run_long_on_device(
+                                serial,
                                 macro_replay.start_replay,
                                 emulator_index,
                                 filepath,
@@ -424,28 +429,28 @@ async def execute_recipe(
 
             # Game Navigation Macros
             elif fn_id == "nav_to_lobby":
-                ok = await asyncio.to_thread(
-                    _run_core_action, core_actions.back_to_lobby, serial, detector
+                ok = await run_long_on_device(
+                    serial, _run_core_action, core_actions.back_to_lobby, serial, detector
                 )
 
             elif fn_id == "nav_to_profile":
-                ok = await asyncio.to_thread(
-                    _run_core_action, core_actions.go_to_profile, serial, detector
+                ok = await run_on_device(
+                    serial, _run_core_action, core_actions.go_to_profile, serial, detector
                 )
 
             elif fn_id == "nav_to_items":
-                ok = await asyncio.to_thread(
-                    _run_core_action, core_actions.go_to_resources, serial, detector
+                ok = await run_on_device(
+                    serial, _run_core_action, core_actions.go_to_resources, serial, detector
                 )
 
             # Advanced / State Dependent
             elif fn_id == "adv_detect_state":
-                current_state = await asyncio.to_thread(detector.check_state, serial)
+                current_state = await run_on_device(serial, detector.check_state, serial)
                 await log(f"  Detected State: {current_state}", "info")
 
             elif fn_id == "adv_copy_id":
-                player_id = await asyncio.to_thread(
-                    _run_core_action, core_actions.extract_player_id, serial, detector
+                player_id = await run_on_device(
+                    serial, _run_core_action, core_actions.extract_player_id, serial, detector
                 )
                 if player_id:
                     await log(f"  Successfully copied Player ID: {player_id}", "ok")
@@ -454,33 +459,33 @@ async def execute_recipe(
                     ok = False
 
             elif fn_id == "nav_to_pet_token":
-                ok = await asyncio.to_thread(
-                    _run_core_action, core_actions.go_to_pet_token, serial, detector
+                ok = await run_on_device(
+                    serial, _run_core_action, core_actions.go_to_pet_token, serial, detector
                 )
 
             elif fn_id == "nav_to_capture_pet":
-                ok = await asyncio.to_thread(
-                    _run_core_action, core_actions.go_to_capture_pet, serial, detector
+                ok = await run_on_device(
+                    serial, _run_core_action, core_actions.go_to_capture_pet, serial, detector
                 )
 
             elif fn_id == "nav_to_market":
-                ok = await asyncio.to_thread(
-                    _run_core_action, core_actions.go_to_market, serial, detector
+                ok = await run_on_device(
+                    serial, _run_core_action, core_actions.go_to_market, serial, detector
                 )
 
             elif fn_id == "nav_to_resources":
-                ok = await asyncio.to_thread(
-                    _run_core_action, core_actions.go_to_resources, serial, detector
+                ok = await run_on_device(
+                    serial, _run_core_action, core_actions.go_to_resources, serial, detector
                 )
 
             elif fn_id == "nav_to_hall":
-                ok = await asyncio.to_thread(
-                    _run_core_action, core_actions.go_to_hall, serial, detector
+                ok = await run_on_device(
+                    serial, _run_core_action, core_actions.go_to_hall, serial, detector
                 )
 
             elif fn_id == "nav_to_rss_center_farm":
-                ok = await asyncio.to_thread(
-                    _run_core_action, core_actions.go_to_rss_center_farm, serial, detector
+                ok = await run_on_device(
+                    serial, _run_core_action, core_actions.go_to_rss_center_farm, serial, detector
                 )
 
             elif fn_id == "nav_to_farming":
@@ -498,7 +503,8 @@ async def execute_recipe(
                     "info",
                 )
 
-                ok = await asyncio.to_thread(
+                ok = await run_on_device(
+                    serial,
                     _run_core_action,
                     core_actions.go_to_farming,
                     serial,
@@ -511,13 +517,13 @@ async def execute_recipe(
 
             elif fn_id == "check_mail":
                 mail_type = (config or {}).get("mail_type", "all")
-                ok = await asyncio.to_thread(
-                    _run_core_action, core_actions.check_mail, serial, detector, mail_type=mail_type
+                ok = await run_on_device(
+                    serial, _run_core_action, core_actions.check_mail, serial, detector, mail_type=mail_type
                 )
 
             elif fn_id == "claim_city_resources":
-                claimed = await asyncio.to_thread(
-                    _run_core_action, core_actions.claim_city_resources, serial, detector
+                claimed = await run_on_device(
+                    serial, _run_core_action, core_actions.claim_city_resources, serial, detector
                 )
                 # claim_city_resources returns int (count), not bool.
                 # 0 claimed is still a success (nothing to collect).
@@ -532,26 +538,27 @@ async def execute_recipe(
                         tier = val if val == "default" else int(val)
                         training_list.append((house, tier))
 
-                ok = await asyncio.to_thread(
-                    _run_core_action, core_actions.train_troops, serial, detector, training_list=training_list
+                ok = await run_on_device(
+                    serial, _run_core_action, core_actions.train_troops, serial, detector, training_list=training_list
                 )
 
             elif fn_id == "claim_alliance_resource":
-                ok = await asyncio.to_thread(
-                    _run_core_action, core_actions.claim_alliance_resource, serial, detector
+                ok = await run_on_device(
+                    serial, _run_core_action, core_actions.claim_alliance_resource, serial, detector
                 )
 
             # ── Merged Workflow Mappings ──
             elif fn_id == "nav_to_alliance_help":
-                ok = await asyncio.to_thread(
-                    _run_core_action, core_actions.alliance_help, serial, detector
+                ok = await run_on_device(
+                    serial, _run_core_action, core_actions.alliance_help, serial, detector
                 )
 
             elif fn_id == "nav_to_tavern_chest":
                 draw_x10_silver = str((config or {}).get("draw_x10_silver", "false")).lower() == "true"
                 draw_x10_gold = str((config or {}).get("draw_x10_gold", "false")).lower() == "true"
                 draw_x10_artifact = str((config or {}).get("draw_x10_artifact", "false")).lower() == "true"
-                ok = await asyncio.to_thread(
+                ok = await run_on_device(
+                    serial,
                     _run_core_action,
                     core_actions.claim_daily_chests, serial, detector,
                     draw_x10_silver=draw_x10_silver,
@@ -560,13 +567,13 @@ async def execute_recipe(
                 )
 
             elif fn_id == "nav_to_heal_troops":
-                ok = await asyncio.to_thread(
-                    _run_core_action, core_actions.heal_troops, serial, detector
+                ok = await run_on_device(
+                    serial, _run_core_action, core_actions.heal_troops, serial, detector
                 )
 
             elif fn_id == "nav_to_darkling_legions":
-                ok = await asyncio.to_thread(
-                    _run_core_action, core_actions.attack_darkling_legions_v1_basic, serial, detector
+                ok = await run_on_device(
+                    serial, _run_core_action, core_actions.attack_darkling_legions_v1_basic, serial, detector
                 )
 
             elif fn_id == "nav_to_chat_hero":
@@ -577,8 +584,8 @@ async def execute_recipe(
                 )
                 if _os.path.exists(chat_module_path):
                     from backend.core.workflow import chat_with_hero
-                    ok = await asyncio.to_thread(
-                        _run_core_action, chat_with_hero.run_chat_with_hero, serial, detector
+                    ok = await run_on_device(
+                        serial, _run_core_action, chat_with_hero.run_chat_with_hero, serial, detector
                     )
                 else:
                     await log(f"  chat_with_hero.py not found at {chat_module_path}", "warn")
@@ -596,7 +603,8 @@ async def execute_recipe(
                         ok = True
                         continue
 
-                ok = await asyncio.to_thread(
+                ok = await run_on_device(
+                    serial,
                     _run_core_action,
                     core_actions.research_technology, serial, detector,
                     research_type=research_type,
@@ -605,26 +613,28 @@ async def execute_recipe(
 
             elif fn_id == "nav_to_buy_merchant":
                 max_refreshes = int((config or {}).get("max_refreshes", 5))
-                ok = await asyncio.to_thread(
+                ok = await run_on_device(
+                    serial,
                     _run_core_action,
                     core_actions.buy_merchant_items, serial, detector,
                     max_refreshes=max_refreshes
                 )
 
             elif fn_id == "nav_to_claim_vip_gift":
-                ok = await asyncio.to_thread(
-                    _run_core_action, core_actions.claim_daily_vip_gift, serial, detector
+                ok = await run_on_device(
+                    serial, _run_core_action, core_actions.claim_daily_vip_gift, serial, detector
                 )
 
             elif fn_id == "nav_to_festival_of_fortitude":
-                ok = await asyncio.to_thread(
-                    _run_core_action, core_actions.process_festival_of_fortitude_event, serial, detector
+                ok = await run_on_device(
+                    serial, _run_core_action, core_actions.process_festival_of_fortitude_event, serial, detector
                 )
 
             elif fn_id == "nav_to_clean_trash":
                 duration = float((config or {}).get("duration", 60))
                 score_threshold = float((config or {}).get("score_threshold", 0.30))
-                ok = await asyncio.to_thread(
+                ok = await run_on_device(
+                    serial,
                     _run_core_action,
                     core_actions.clean_trash_pet_sanctuary, serial, detector,
                     duration=duration, score_threshold=score_threshold
@@ -632,7 +642,8 @@ async def execute_recipe(
 
             elif fn_id == "nav_to_season_policies":
                 policy_account_id = (config or {}).get("account_id", "default")
-                ok = await asyncio.to_thread(
+                ok = await run_on_device(
+                    serial,
                     _run_core_action,
                     core_actions.process_season_policies, serial, detector,
                     account_id=policy_account_id
@@ -653,7 +664,8 @@ async def execute_recipe(
                         ok = True
                         continue
 
-                ok = await asyncio.to_thread(
+                ok = await run_on_device(
+                    serial,
                     _run_core_action,
                     core_actions.upgrade_construction, serial, detector,
                     max_depth=max_depth,
@@ -662,23 +674,23 @@ async def execute_recipe(
                 )
 
             elif fn_id == "nav_to_claim_quest_reward":
-                ok = await asyncio.to_thread(
-                    _run_core_action, core_actions.claim_quest_reward, serial, detector
+                ok = await run_on_device(
+                    serial, _run_core_action, core_actions.claim_quest_reward, serial, detector
                 )
 
             elif fn_id == "nav_to_donate_alliance_tech":
-                ok = await asyncio.to_thread(
-                    _run_core_action, core_actions.donate_alliance_technology, serial, detector
+                ok = await run_on_device(
+                    serial, _run_core_action, core_actions.donate_alliance_technology, serial, detector
                 )
 
             elif fn_id == "nav_to_claim_scout_sentry":
-                ok = await asyncio.to_thread(
-                    _run_core_action, core_actions.claim_scout_sentry_post, serial, detector
+                ok = await run_on_device(
+                    serial, _run_core_action, core_actions.claim_scout_sentry_post, serial, detector
                 )
 
             elif fn_id == "nav_to_claim_vip_reward":
-                ok = await asyncio.to_thread(
-                    _run_core_action, core_actions.claim_daily_vip_reward, serial, detector
+                ok = await run_on_device(
+                    serial, _run_core_action, core_actions.claim_daily_vip_reward, serial, detector
                 )
 
             else:
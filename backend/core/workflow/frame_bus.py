@@ -0,0 +1,197 @@
+"""
+Frame Bus — process-wide, per-serial frame sharing for every screen consumer.
+
+GameStateDetector, AccountDetector, name_detector, trash_detector, PolicyV3Engine
+and check_app_crash all read the same emulator, often within milliseconds of each
+other. They now pull from one FrameBus per serial, so a single capture serves all.
+
+Each published frame carries:
+- frame_id:     process-wide monotonic id (comparable across serials/detectors)
+- timestamp_ms: wall-clock capture time
+- bgr / gray:   full-resolution frame (gray straight from the raw payload when available)
+- thumb:        THUMB_SIZE grayscale thumbnail (freeze / change detection)
+- changed:      thumb differs from the previous published frame at all (freeze detection)
+- scene_id:     id of the first frame of the current "scene" — frames whose thumb stays
+                within GATE_MAX_DIFF of that anchor share it, so consumers can reuse
+                results computed on any frame of the same scene (change gate)
+
+Freshness is expressed as "a frame newer than id N" instead of a blind refetch:
+    bus = get_frame_bus(serial, adb_path)
+    f = bus.get()                      # reuse latest if < max_age_ms old
+    f = bus.get(newer_than=f.frame_id) # must be captured after f
+Concurrent requests for a new frame are single-flighted: one capture, all waiters served.
+"""
+
+import itertools
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import cv2
+import numpy as np
+
+from backend.core.workflow.frame_source import get_frame_source, get_frame_source_mode
+
+# ── Module Constants ──────────────────────────────────────────────
+
+BUS_MAX_AGE_MS = 100        # Same window as the detector's screenshot cache
+THUMB_SIZE = (160, 90)      # (w, h) — matches check_app_crash freeze comparison
+GATE_MAX_DIFF = 8           # Max per-pixel thumb difference still counted as "same scene"
+
+_frame_ids = itertools.count(1)
+
+
+@dataclass(frozen=True)
+class BusFrame:
+    """One published capture. Arrays are shared — treat them as read-only."""
+    frame_id: int
+    serial: str
+    timestamp_ms: float
+    bgr: np.ndarray
+    gray: np.ndarray
+    thumb: np.ndarray
+    changed: bool = True
+    scene_id: int = 0
+
+    @property
+    def age_ms(self) -> float:
+        return time.time() * 1000 - self.timestamp_ms
+
+
+class FrameBus:
+    """Latest-frame holder for one serial with single-flight capture."""
+
+    def __init__(self, serial: str, adb_path: str, mode: str) -> None:
+        self.serial = serial
+        self.adb_path = adb_path
+        self.mode = mode
+        self._latest: Optional[BusFrame] = None
+        self._cond = threading.Condition()
+        self._capturing = False
+        self._scene_thumb: Optional[np.ndarray] = None
+        self._scene_id = 0
+        self.last_change_id = 0     # Last frame that differed (at all) from its predecessor
+        self.captures = 0
+        self.reuses = 0
+        self.scenes = 0
+
+    @property
+    def latest(self) -> Optional[BusFrame]:
+        return self._latest
+
+    def _usable(self, frame: Optional[BusFrame], newer_than: int, max_age_ms: float) -> bool:
+        return frame is not None and frame.frame_id > newer_than and frame.age_ms < max_age_ms
+
+    def get(self, newer_than: int = 0, max_age_ms: float = BUS_MAX_AGE_MS) -> Optional[BusFrame]:
+        """
+        Return a frame with frame_id > newer_than, at most max_age_ms old.
+        Captures only when the latest frame doesn't qualify (or joins an in-flight capture).
+        """
+        with self._cond:
+            while True:
+                if self._usable(self._latest, newer_than, max_age_ms):
+                    self.reuses += 1
+                    return self._latest
+                if not self._capturing:
+                    self._capturing = True
+                    break
+                # Another consumer is capturing: wait for it instead of capturing twice
+                seen_id = self._latest.frame_id if self._latest else 0
+                while self._capturing:
+                    self._cond.wait()
+                if self._latest is not None and self._latest.frame_id > max(seen_id, newer_than):
+                    self.reuses += 1
+                    return self._latest
+                if self._latest is None or self._latest.frame_id == seen_id:
+                    return None  # That capture failed; don't stampede the device
+
+        try:
+            bgr, gray = get_frame_source(self.serial, self.adb_path, self.mode).grab_pair()
+            frame = self.publish(bgr, gray) if bgr is not None else None
+        finally:
+            with self._cond:
+                self._capturing = False
+                self._cond.notify_all()
+        return frame
+
+    def publish(self, bgr: np.ndarray, gray: Optional[np.ndarray] = None) -> BusFrame:
+        """Publish a captured frame to every consumer of this serial."""
+        if gray is None:
+            gray = cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY)
+        thumb = cv2.resize(gray, THUMB_SIZE, interpolation=cv2.INTER_AREA)
+        frame_id = next(_frame_ids)
+
+        with self._cond:
+            prev = self._latest
+            changed = prev is None or bool(np.any(cv2.absdiff(thumb, prev.thumb)))
+            # Compare against the scene anchor, not the predecessor: slow fades can't drift past the gate
+            if (not changed and self._scene_id) or (
+                self._scene_thumb is not None and int(cv2.absdiff(thumb, self._scene_thumb).max()) <= GATE_MAX_DIFF
+            ):
+                scene_id = self._scene_id
+            else:
+                scene_id = self._scene_id = frame_id
+                self._scene_thumb = thumb
+                self.scenes += 1
+            if changed:
+                self.last_change_id = frame_id
+
+            frame = BusFrame(
+                frame_id=frame_id,
+                serial=self.serial,
+                timestamp_ms=time.time() * 1000,
+                bgr=bgr,
+                gray=gray,
+                thumb=thumb,
+                changed=changed,
+                scene_id=scene_id,
+            )
+            self._latest = frame
+            self.captures += 1
+        return frame
+
+    def unchanged_since(self, frame_id: int) -> bool:
+        """True if no frame published after frame_id differed from its predecessor (freeze check)."""
+        return 0 < self.last_change_id <= frame_id
+
+    def stats(self) -> dict:
+        latest = self._latest
+        return {
+            "captures": self.captures,
+            "reuses": self.reuses,
+            "scenes": self.scenes,
+            "last_change_id": self.last_change_id,
+            "latest_frame_id": latest.frame_id if latest else 0,
+            "latest_age_ms": round(latest.age_ms, 1) if latest else None,
+        }
+
+
+# ── Per-serial registry ───────────────────────────────────────────
+
+_BUSES: dict[tuple[str, str, str], FrameBus] = {}
+_BUSES_LOCK = threading.Lock()
+
+
+def get_frame_bus(serial: str, adb_path: str, mode: Optional[str] = None) -> FrameBus:
+    """Return the shared FrameBus for this serial (and capture mode)."""
+    key = (serial, adb_path, mode or get_frame_source_mode())
+    with _BUSES_LOCK:
+        bus = _BUSES.get(key)
+        if bus is None:
+            bus = FrameBus(*key)
+            _BUSES[key] = bus
+        return bus
+
+
+def drop_frame_bus(serial: str) -> None:
+    """Forget frames for this serial (e.g. emulator quit) so nobody reuses a dead screen."""
+    with _BUSES_LOCK:
+        for key in [k for k in _BUSES if k[0] == serial]:
+            _BUSES.pop(key)
+
+
+def frame_bus_stats() -> dict:
+    """Per-serial bus stats: {serial: {captures, reuses, scenes, last_change_id, latest_frame_id, latest_age_ms}}."""
+    with _BUSES_LOCK:
+        return {serial: bus.stats() for (serial, _, _), bus in _BUSES.items()}
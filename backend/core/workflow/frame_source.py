@@ -0,0 +1,389 @@
+"""
+Frame Source — pluggable screen capture layer shared by every detector.
+
+One FrameSource per serial, reused by GameStateDetector, AccountDetector,
+name_detector and check_app_crash instead of each forking its own adb process.
+
+Sources (mode → class):
+- "stream": StreamFrameSource     — one long-lived `adb shell` per serial. Sends raw `screencap`
+                                    (no -p) over stdin and reads the RGBA payload into a reusable buffer.
+                                    No process spawn, no PNG encode on device, no PNG decode on host.
+- "raw":    RawFrameSource        — one `adb exec-out screencap` (no -p) per frame, no PNG round-trip.
+- "png":    SubprocessFrameSource — legacy path — `adb exec-out screencap -p` + cv2.imdecode per frame.
+                                    Also used as the automatic fallback when the stream breaks.
+
+Raw frames are decoded by decode_raw_screencap(): the payload is wrapped zero-copy with
+np.frombuffer and BGR + gray are both converted straight from RGBA (no BGR→gray second pass).
+
+Usage:
+    from backend.core.workflow.frame_source import get_frame_source
+    frame = get_frame_source(serial, adb_path).grab()              # BGR np.ndarray or None
+    frame, gray = get_frame_source(serial, adb_path).grab_pair()   # gray is None for "png"
+"""
+
+import logging
+import struct
+import subprocess
+import sys
+import threading
+import time
+from typing import Optional
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# ── Module Constants ──────────────────────────────────────────────
+
+FRAME_SOURCE_MODES = ("stream", "raw", "png")
+DEFAULT_FRAME_SOURCE_MODE = "stream"
+
+SCREENCAP_TIMEOUT_SEC = 5
+STREAM_OPEN_TIMEOUT_SEC = 5
+STREAM_RETRY_COOLDOWN_SEC = 30   # After a stream failure, use the PNG path for this long
+
+# `screencap` raw header: width, height, pixel format (+ dataspace on Android 9 / SDK 28+)
+RAW_HEADER_SIZE_LEGACY = 12
+RAW_HEADER_SIZE_SDK28 = 16
+RAW_BYTES_PER_PIXEL = 4
+# android.graphics.PixelFormat values with 4 bytes per pixel in R,G,B,A byte order
+RAW_RGBA_FORMATS = {1, 2}        # RGBA_8888, RGBX_8888
+RAW_MAX_SIDE = 8192              # Larger width/height means a corrupt header, not a frame
+
+
+def _startupinfo():
+    """Hide the console window on Windows; no-op elsewhere (fake adb / Linux benchmarks)."""
+    if sys.platform != "win32":
+        return None
+    startupinfo = subprocess.STARTUPINFO()
+    startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+    return startupinfo
+
+
+def parse_raw_header(header: bytes) -> tuple[int, int, int]:
+    """Unpack (width, height, pixel_format) from a raw screencap header."""
+    return struct.unpack_from("<III", header, 0)
+
+
+def check_raw_header(width: int, height: int, fmt: int) -> None:
+    """Raise ValueError unless the header describes an RGBA frame of plausible size."""
+    if fmt not in RAW_RGBA_FORMATS:
+        raise ValueError(f"unsupported raw pixel format {fmt}")
+    if not (0 < width <= RAW_MAX_SIDE and 0 < height <= RAW_MAX_SIDE):
+        raise ValueError(f"implausible raw frame size {width}x{height}")
+
+
+def raw_header_size(data_len: int, width: int, height: int) -> int:
+    """Infer header size (12 or 16 bytes) from a complete one-shot raw dump."""
+    return data_len - width * height * RAW_BYTES_PER_PIXEL
+
+
+def decode_raw_screencap(data, header_size: Optional[int] = None) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Decode a raw `screencap` dump (header + RGBA payload) into (bgr, gray).
+
+    The RGBA pixels are wrapped zero-copy with np.frombuffer; the only copies are the
+    two cv2.cvtColor outputs. Raises ValueError on truncated or non-RGBA dumps.
+    """
+    if len(data) < RAW_HEADER_SIZE_LEGACY:
+        raise ValueError(f"raw dump too short ({len(data)} bytes)")
+    width, height, fmt = parse_raw_header(data)
+    check_raw_header(width, height, fmt)
+    if header_size is None:
+        header_size = raw_header_size(len(data), width, height)
+    if header_size not in (RAW_HEADER_SIZE_LEGACY, RAW_HEADER_SIZE_SDK28):
+        raise ValueError(f"raw dump size mismatch ({len(data)} bytes for {width}x{height})")
+
+    rgba = np.frombuffer(
+        data, np.uint8, count=width * height * RAW_BYTES_PER_PIXEL, offset=header_size,
+    ).reshape(height, width, RAW_BYTES_PER_PIXEL)
+    return cv2.cvtColor(rgba, cv2.COLOR_RGBA2BGR), cv2.cvtColor(rgba, cv2.COLOR_RGBA2GRAY)
+
+
+# ── Sources ───────────────────────────────────────────────────────
+
+class FrameSource:
+    """
+    Base class: grab_pair() returns (bgr, gray) — gray may be None when the source
+    has no cheaper way to produce it than the caller. Thread-safe per instance.
+    """
+
+    name = "base"
+
+    def __init__(self, serial: str, adb_path: str) -> None:
+        self.serial = serial
+        self.adb_path = adb_path
+        self._lock = threading.Lock()
+        self.frames_captured = 0
+        self.total_capture_ms = 0.0
+
+    def grab_pair(self) -> tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        with self._lock:
+            t0 = time.perf_counter()
+            frame, gray = self._grab()
+            if frame is not None:
+                self.frames_captured += 1
+                self.total_capture_ms += (time.perf_counter() - t0) * 1000
+            return frame, gray
+
+    def grab(self) -> Optional[np.ndarray]:
+        return self.grab_pair()[0]
+
+    def _grab(self) -> tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+    def stats(self) -> dict:
+        avg = self.total_capture_ms / self.frames_captured if self.frames_captured else 0.0
+        return {
+            "source": self.name,
+            "frames": self.frames_captured,
+            "avg_capture_ms": round(avg, 2),
+        }
+
+
+class SubprocessFrameSource(FrameSource):
+    """Legacy capture: one `adb exec-out screencap -p` process per frame."""
+
+    name = "png"
+    screencap_args = ("screencap", "-p")
+
+    def _run_screencap(self) -> Optional[bytes]:
+        cmd = [self.adb_path, "-s", self.serial, "exec-out", *self.screencap_args]
+        try:
+            result = subprocess.run(
+                cmd, capture_output=True, startupinfo=_startupinfo(), timeout=SCREENCAP_TIMEOUT_SEC,
+            )
+        except subprocess.TimeoutExpired:
+            logger.warning("Screencap timeout on %s", self.serial)
+            return None
+        except Exception as e:
+            logger.error("Screencap failed on %s: %s", self.serial, e)
+            return None
+
+        if not result.stdout:
+            stderr_text = (result.stderr or b"").decode("utf-8", errors="ignore").strip()
+            logger.warning(
+                "Screencap empty on %s | returncode=%s | stderr=%s",
+                self.serial,
+                result.returncode,
+                stderr_text[:240] or "<empty>",
+            )
+            return None
+        return result.stdout
+
+    def _grab(self) -> tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        data = self._run_screencap()
+        if data is None:
+            return None, None
+        img = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+        if img is None:
+            logger.warning("Screencap decode failed on %s | bytes=%d", self.serial, len(data))
+        return img, None
+
+
+class RawFrameSource(SubprocessFrameSource):
+    """One-shot raw capture: `adb exec-out screencap` (no -p), decoded without a PNG round-trip."""
+
+    name = "raw"
+    screencap_args = ("screencap",)
+
+    def _grab(self) -> tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        data = self._run_screencap()
+        if data is None:
+            return None, None
+        try:
+            return decode_raw_screencap(data)
+        except ValueError as e:
+            logger.warning("Raw screencap decode failed on %s | bytes=%d | %s", self.serial, len(data), e)
+            return None, None
+
+
+class StreamFrameSource(FrameSource):
+    """
+    Persistent capture: one `adb shell` per serial, raw RGBA frames over its stdout.
+
+    The raw payload is read into a reusable bytearray (no per-frame 2 MB allocation);
+    only the BGR/gray conversions allocate, because callers keep frames across grabs.
+    Any stream error kills the shell and serves the frame via SubprocessFrameSource.
+    """
+
+    name = "stream"
+
+    def __init__(self, serial: str, adb_path: str) -> None:
+        super().__init__(serial, adb_path)
+        self._proc: Optional[subprocess.Popen] = None
+        self._header_size = RAW_HEADER_SIZE_SDK28
+        self._buffer = bytearray()
+        self._fallback = SubprocessFrameSource(serial, adb_path)
+        self._disabled_until = 0.0
+        self.fallback_count = 0
+
+    # ── Shell lifecycle ───────────────────────────────────────────
+
+    def _open(self) -> None:
+        self._proc = subprocess.Popen(
+            [self.adb_path, "-s", self.serial, "shell", "-T"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            startupinfo=_startupinfo(),
+            bufsize=0,
+        )
+        # Android 9+ appends a 4-byte dataspace to the raw header
+        sdk_line = self._run_line("getprop ro.build.version.sdk", STREAM_OPEN_TIMEOUT_SEC)
+        sdk = int(sdk_line) if sdk_line.isdigit() else 28
+        self._header_size = RAW_HEADER_SIZE_SDK28 if sdk >= 28 else RAW_HEADER_SIZE_LEGACY
+        logger.info("Frame stream opened on %s (sdk=%d, header=%dB)", self.serial, sdk, self._header_size)
+
+    def close(self) -> None:
+        proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        try:
+            proc.kill()
+            proc.wait(timeout=2)
+        except Exception:
+            pass
+
+    # ── Blocking I/O guarded by a kill-watchdog (works on Windows pipes too) ──
+
+    def _with_watchdog(self, timeout: float, fn):
+        proc = self._proc
+        timer = threading.Timer(timeout, proc.kill)
+        timer.daemon = True
+        timer.start()
+        try:
+            return fn()
+        finally:
+            timer.cancel()
+
+    def _read_exact(self, view: memoryview) -> None:
+        stdout = self._proc.stdout
+        got = 0
+        while got < len(view):
+            n = stdout.readinto(view[got:])
+            if not n:
+                raise EOFError("frame stream closed")
+            got += n
+
+    def _run_line(self, command: str, timeout: float) -> str:
+        self._proc.stdin.write(command.encode() + b"\n")
+        self._proc.stdin.flush()
+        line = self._with_watchdog(timeout, self._proc.stdout.readline)
+        if not line:
+            raise EOFError("frame stream closed")
+        return line.decode("utf-8", errors="ignore").strip()
+
+    def _read_frame(self) -> tuple[np.ndarray, np.ndarray]:
+        self._proc.stdin.write(b"screencap\n")
+        self._proc.stdin.flush()
+
+        def _read() -> tuple[np.ndarray, np.ndarray]:
+            view = memoryview(self._buffer)
+            if len(view) < self._header_size:
+                self._buffer = bytearray(self._header_size)
+                view = memoryview(self._buffer)
+            self._read_exact(view[:self._header_size])
+            width, height, fmt = parse_raw_header(view)
+            try:
+                check_raw_header(width, height, fmt)
+            except ValueError:
+                self.close()   # unread payload would be parsed as the next header
+                raise
+            size = self._header_size + width * height * RAW_BYTES_PER_PIXEL
+            if len(self._buffer) != size:
+                header = bytes(view[:self._header_size])
+                self._buffer = bytearray(size)
+                self._buffer[:self._header_size] = header
+                view = memoryview(self._buffer)
+            self._read_exact(view[self._header_size:])
+            return decode_raw_screencap(self._buffer, self._header_size)
+
+        return self._with_watchdog(SCREENCAP_TIMEOUT_SEC, _read)
+
+    def _grab(self) -> tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        if time.monotonic() >= self._disabled_until:
+            try:
+                if self._proc is None or self._proc.poll() is not None:
+                    self._open()
+                return self._read_frame()
+            except Exception as e:
+                logger.warning("Frame stream failed on %s (%s) — falling back to subprocess", self.serial, e)
+                self.close()
+                self._disabled_until = time.monotonic() + STREAM_RETRY_COOLDOWN_SEC
+        self.fallback_count += 1
+        return self._fallback._grab()
+
+    def stats(self) -> dict:
+        data = super().stats()
+        data["fallbacks"] = self.fallback_count
+        data["stream_open"] = self._proc is not None and self._proc.poll() is None
+        return data
+
+
+_SOURCE_CLASSES = {
+    "stream": StreamFrameSource,
+    "raw": RawFrameSource,
+    "png": SubprocessFrameSource,
+}
+
+
+# ── Per-serial registry ───────────────────────────────────────────
+
+_SOURCES: dict[tuple[str, str, str], FrameSource] = {}
+_SOURCES_LOCK = threading.Lock()
+_mode = DEFAULT_FRAME_SOURCE_MODE
+
+
+def set_frame_source_mode(mode: str) -> None:
+    """Switch the default capture backend for all serials. Closes open sources."""
+    global _mode
+    if mode not in FRAME_SOURCE_MODES:
+        raise ValueError(f"Unknown frame source mode: {mode!r} (expected one of {FRAME_SOURCE_MODES})")
+    with _SOURCES_LOCK:
+        _mode = mode
+        for source in _SOURCES.values():
+            source.close()
+        _SOURCES.clear()
+
+
+def get_frame_source_mode() -> str:
+    return _mode
+
+
+def get_frame_source(serial: str, adb_path: str, mode: Optional[str] = None) -> FrameSource:
+    """Return the shared FrameSource for this serial (and mode), creating it on first use."""
+    mode = mode or _mode
+    if mode not in FRAME_SOURCE_MODES:
+        raise ValueError(f"Unknown frame source mode: {mode!r} (expected one of {FRAME_SOURCE_MODES})")
+    key = (serial, adb_path, mode)
+    with _SOURCES_LOCK:
+        source = _SOURCES.get(key)
+        if source is None:
+            source = _SOURCE_CLASSES[mode](serial, adb_path)
+            _SOURCES[key] = source
+        return source
+
+
+def close_frame_source(serial: str) -> None:
+    """Close every source for this serial (e.g. emulator quit/relaunch)."""
+    with _SOURCES_LOCK:
+        for key in [k for k in _SOURCES if k[0] == serial]:
+            _SOURCES.pop(key).close()
+
+
+def close_all_frame_sources() -> None:
+    with _SOURCES_LOCK:
+        for source in _SOURCES.values():
+            source.close()
+        _SOURCES.clear()
+
+
+def frame_source_stats() -> dict:
+    """Per-serial capture stats: {serial: {source, frames, avg_capture_ms, ...}}."""
+    with _SOURCES_LOCK:
+        return {serial: source.stats() for (serial, _, _), source in _SOURCES.items()}
@@ -0,0 +1,148 @@
+"""
+Health Probe — app pid, foreground activity and frame checksum in one adb round trip.
+
+check_app_crash ran up to three adb calls per check (`pidof`, `dumpsys activity` and
+`dumpsys window` for the foreground test) and captured a full PNG screencap for freeze
+detection — every 10 s per emulator while wait_for_state polls. The probe sends one
+compound shell command instead:
+
+- `pidof <package>`, then the resumed-activity line (`dumpsys activity activities`,
+  grep'd on the device); `dumpsys window windows` focus lines only if that misses.
+- Optionally a frame checksum (`screencap | md5sum`): 32 hex chars instead of a PNG.
+  check_app_crash only asks for it when the detectors published no frame since its
+  last check — otherwise freeze detection reuses their frames from the frame bus.
+- Per-serial cost is recorded (avg / max ms, share of wall time), so the probe's
+  overhead per emulator is visible at /api/workflow/health-probe.
+
+Usage:
+    health = probe_app_health(serial, package_name, frame_checksum=True)
+    health.pids, health.foreground, health.focus, health.frame_checksum
+    health_probe_stats()    # {serial: {"probes": ..., "avg_ms": ..., "duty_pct": ...}}
+"""
+
+import shlex
+import subprocess
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from backend.core.workflow.adb_client import adb_run
+
+# ── Module Constants ──────────────────────────────────────────────
+
+HEALTH_PROBE_TIMEOUT_SEC = 10
+SECTION_MARKER = "__codm_probe__"
+FOREGROUND_MARKERS = ("ResumedActivity", "mCurrentFocus", "mFocusedApp")
+
+
+@dataclass
+class AppHealth:
+    pids: List[str]
+    foreground: bool
+    focus: str = ""                          # first resumed-activity / focus line
+    frame_checksum: Optional[str] = None     # None: not requested; "": screencap failed
+    probe_ms: float = 0.0
+
+
+@dataclass
+class ProbeStats:
+    probes: int = 0
+    with_checksum: int = 0
+    timeouts: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    first_at: float = field(default_factory=time.monotonic)
+
+    def to_dict(self) -> Dict[str, Any]:
+        elapsed_ms = max(1.0, (time.monotonic() - self.first_at) * 1000)
+        return {
+            "probes": self.probes,
+            "with_checksum": self.with_checksum,
+            "timeouts": self.timeouts,
+            "avg_ms": round(self.total_ms / self.probes, 1) if self.probes else 0.0,
+            "max_ms": round(self.max_ms, 1),
+            "duty_pct": round(self.total_ms / elapsed_ms * 100, 3),
+        }
+
+
+def build_probe_command(package_name: str, frame_checksum: bool = False) -> str:
+    """The compound shell command; sections are separated by SECTION_MARKER lines."""
+    pkg = shlex.quote(package_name)
+    parts = [
+        f"pidof {pkg}",
+        f"echo {SECTION_MARKER}",
+        "A=$(dumpsys activity activities | grep -E 'ResumedActivity')",
+        'echo "$A"',
+        f"case \"$A\" in *{package_name}*) ;; *) dumpsys window windows | grep -E 'mCurrentFocus|mFocusedApp';; esac",
+    ]
+    if frame_checksum:
+        parts += [f"echo {SECTION_MARKER}", "(screencap | md5sum || screencap | cksum) 2>/dev/null"]
+    return "; ".join(parts)
+
+
+def parse_probe_output(out: str, package_name: str, frame_checksum: bool = False) -> AppHealth:
+    sections = [[]]
+    for line in (out or "").splitlines():
+        if line.strip() == SECTION_MARKER:
+            sections.append([])
+        else:
+            sections[-1].append(line)
+    sections += [[] for _ in range(3 - len(sections))]
+
+    pids = [part for line in sections[0] for part in line.split() if part.isdigit()]
+    focus_lines = [
+        " ".join(line.strip().split())
+        for line in sections[1]
+        if any(marker in line for marker in FOREGROUND_MARKERS)
+    ]
+    foreground = bool(package_name) and any(package_name in line for line in focus_lines)
+    checksum = None
+    if frame_checksum:
+        words = " ".join(sections[2]).split()
+        checksum = words[0] if words else ""
+    return AppHealth(pids=pids, foreground=foreground, focus=focus_lines[0] if focus_lines else "",
+                     frame_checksum=checksum)
+
+
+# ── Probe + per-serial instrumentation ────────────────────────────
+
+_STATS: Dict[str, ProbeStats] = {}
+_STATS_LOCK = threading.Lock()
+
+
+def probe_app_health(serial: str, package_name: str, frame_checksum: bool = False,
+                     adb_path: Optional[str] = None, timeout: float = HEALTH_PROBE_TIMEOUT_SEC) -> AppHealth:
+    """One `adb shell` round trip → AppHealth. A timeout reads as an empty reply."""
+    t0 = time.perf_counter()
+    timed_out = False
+    try:
+        out = adb_run(["shell", build_probe_command(package_name, frame_checksum)],
+                      serial=serial, timeout=timeout, adb_path=adb_path)
+    except subprocess.TimeoutExpired:
+        out, timed_out = "", True
+    health = parse_probe_output(out, package_name, frame_checksum)
+    health.probe_ms = (time.perf_counter() - t0) * 1000
+
+    with _STATS_LOCK:
+        stats = _STATS.setdefault(serial, ProbeStats())
+        stats.probes += 1
+        stats.with_checksum += int(frame_checksum)
+        stats.timeouts += int(timed_out)
+        stats.total_ms += health.probe_ms
+        stats.max_ms = max(stats.max_ms, health.probe_ms)
+    return health
+
+
+def reset_health_probe_stats(serial: Optional[str] = None) -> None:
+    with _STATS_LOCK:
+        if serial is None:
+            _STATS.clear()
+        else:
+            _STATS.pop(serial, None)
+
+
+def health_probe_stats() -> Dict[str, Dict[str, Any]]:
+    """Per-serial probe cost: {serial: {probes, with_checksum, timeouts, avg_ms, max_ms, duty_pct}}."""
+    with _STATS_LOCK:
+        return {serial: stats.to_dict() for serial, stats in _STATS.items()}
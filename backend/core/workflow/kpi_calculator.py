@@ -14,9 +14,8 @@ import os
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional
 
-import aiosqlite
-
 from backend.config import config
+from backend.storage import db_pool
 
 
 _SWAP_LOG_DIR = os.path.join(
@@ -60,14 +59,14 @@ async def compute_kpi_summary(group_id: int, orchestrator_status: Optional[dict]
 async def _calc_fairness_index(group_id: int, today: str) -> Optional[float]:
     """Fairness = 1 - (σ / μ) of runs per account today. 1.0 = perfect."""
     try:
-        async with aiosqlite.connect(config.db_path) as db:
+        async with db_pool.reader() as db:
             cursor = await db.execute(
                 """SELECT account_id, COUNT(*) as cnt
                    FROM account_activity_logs
-                   WHERE group_id = ? AND status = 'SUCCESS'
-                     AND started_at LIKE ?
+                   WHERE group_id = ? AND started_date = ?
+                     AND status = 'SUCCESS'
                    GROUP BY account_id""",
-                (group_id, f"{today}%"),
+                (group_id, today),
             )
             rows = await cursor.fetchall()
 
@@ -92,14 +91,14 @@ async def _calc_fairness_index(group_id: int, today: str) -> Optional[float]:
 async def _calc_success_rate(group_id: int, today: str) -> tuple:
     """Returns (success_rate_pct, total_runs, total_errors)."""
     try:
-        async with aiosqlite.connect(config.db_path) as db:
+        async with db_pool.reader() as db:
             cursor = await db.execute(
                 """SELECT status, COUNT(*) as cnt
                    FROM account_activity_logs
-                   WHERE group_id = ? AND started_at LIKE ?
+                   WHERE group_id = ? AND started_date = ?
                      AND status IN ('SUCCESS', 'FAILED')
                    GROUP BY status""",
-                (group_id, f"{today}%"),
+                (group_id, today),
             )
             rows = await cursor.fetchall()
 
@@ -181,14 +180,14 @@ async def _calc_execute_time_pct(
 ) -> tuple:
     """Returns (execute_time_pct, total_execution_ms)."""
     try:
-        async with aiosqlite.connect(config.db_path) as db:
+        async with db_pool.reader() as db:
             cursor = await db.execute(
                 """SELECT SUM(duration_ms)
                    FROM account_activity_logs
-                   WHERE group_id = ? AND started_at LIKE ?
+                   WHERE group_id = ? AND started_date = ?
                      AND status IN ('SUCCESS', 'FAILED')
                      AND duration_ms > 0""",
-                (group_id, f"{today}%"),
+                (group_id, today),
             )
             row = await cursor.fetchone()
 
@@ -208,13 +207,13 @@ async def _calc_execute_time_pct(
 
         if total_runtime_ms <= 0:
             # Fallback: estimate from first and last log entries today
-            async with aiosqlite.connect(config.db_path) as db:
+            async with db_pool.reader() as db:
                 cursor = await db.execute(
                     """SELECT MIN(started_at), MAX(finished_at)
                        FROM account_activity_logs
-                       WHERE group_id = ? AND started_at LIKE ?
+                       WHERE group_id = ? AND started_date = ?
                          AND status IN ('SUCCESS', 'FAILED')""",
-                    (group_id, f"{today}%"),
+                    (group_id, today),
                 )
                 row = await cursor.fetchone()
 
@@ -0,0 +1,278 @@
+"""
+Log Writer — write-behind batching for execution_log records.
+
+create_run / append_step_log / start_account_activity / finish_account_activity /
+complete_run each took the DB writer, ran one statement and committed, on the
+orchestrator's critical path between two game actions. WriteBehindLog queues those
+statements and writes them in grouped transactions from a background task.
+
+- Flushes when LOG_FLUSH_MAX_RECORDS are queued or LOG_FLUSH_INTERVAL_SEC after the
+  first queued record, whichever comes first; callers only wait if LOG_MAX_PENDING
+  records pile up (the disk can't keep up).
+- account_activity_logs ids are reserved in blocks (sqlite_sequence is bumped past the
+  block, so AUTOINCREMENT inserts elsewhere never collide), so start_account_activity
+  returns its row id without waiting on the disk.
+- stop() / flush(durable=True) write everything and checkpoint the WAL.
+- A write that fails as a whole (e.g. the database is locked or unreachable) leaves its
+  records queued; the flusher retries them LOG_FLUSH_INTERVAL_SEC later.
+- Until start() runs on the current event loop (scripts, tests) every record is
+  written immediately, as before.
+
+Usage:
+    log_writer.start()                                # app startup
+    await log_writer.add(db_path, "INSERT ...", params)
+    await log_writer.add_many(db_path, [(sql1, params1), (sql2, params2)])   # one transaction
+    row_id = await log_writer.next_id(db_path, "account_activity_logs")
+    await log_writer.stop()                           # shutdown: durable flush
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from backend.storage import db_pool
+
+# ── Module Constants ──────────────────────────────────────────────
+
+LOG_FLUSH_MAX_RECORDS = 64      # flush as soon as this many records are queued
+LOG_FLUSH_INTERVAL_SEC = 0.5    # ...or this long after the first one
+LOG_MAX_PENDING = 5000          # callers wait for a flush above this (backpressure)
+LOG_ID_BLOCK = 256              # row ids reserved per sqlite_sequence bump
+
+
+@dataclass
+class _Record:
+    """Statements that are written (or dropped) together."""
+    db_path: str
+    statements: List[Tuple[str, Any]]
+
+
+class WriteBehindLog:
+    """Queue of log statements flushed in grouped transactions."""
+
+    def __init__(
+        self,
+        max_records: int = LOG_FLUSH_MAX_RECORDS,
+        interval_sec: float = LOG_FLUSH_INTERVAL_SEC,
+        max_pending: int = LOG_MAX_PENDING,
+    ):
+        self.max_records = max_records
+        self.interval_sec = interval_sec
+        self.max_pending = max_pending
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._pending: List[_Record] = []
+        self._dirty: Set[str] = set()       # databases written since the last durable flush
+        self._ids: Dict[Tuple[str, str], List[int]] = {}   # (db_path, table) -> [next, end)
+        self._locks_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._bind()
+
+        self.records = 0
+        self.batches = 0
+        self.max_batch = 0
+        self.failed = 0
+        self.flush_total_sec = 0.0
+
+    # ── Lifecycle ──
+
+    def _bind(self):
+        """asyncio primitives for the running loop (scripts may run several loops in turn)."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if loop is not self._locks_loop or loop is None:
+            self._locks_loop = loop
+            self._flush_lock = asyncio.Lock()
+            self._id_lock = asyncio.Lock()
+            self._wake = asyncio.Event()
+            self._full = asyncio.Event()
+
+    @property
+    def active(self) -> bool:
+        """Write-behind is on for the running event loop."""
+        if self._task is None or self._task.done():
+            return False
+        try:
+            return asyncio.get_running_loop() is self.loop
+        except RuntimeError:
+            return False
+
+    def start(self):
+        """Start the background flusher on the running event loop."""
+        if self.active:
+            return
+        self.loop = asyncio.get_running_loop()
+        self._bind()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the flusher and write everything still queued, durably."""
+        task, self._task = self._task, None
+        if task is not None and not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        await self.flush(durable=True)
+
+    async def _run(self):
+        while True:
+            await self._wake.wait()
+            try:
+                await asyncio.wait_for(self._full.wait(), self.interval_sec)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            self._full.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"[ExecutionLog] Log flush failed ({e}); {len(self._pending)} records kept for retry.")
+                self._wake.set()
+
+    # ── Records ──
+
+    async def add(self, db_path: str, sql: str, params: Any):
+        """Queue one statement; written immediately when write-behind is off."""
+        await self.add_many(db_path, [(sql, params)])
+
+    async def add_many(self, db_path: str, statements: List[Tuple[str, Any]]):
+        """Queue statements that must land in the same transaction (e.g. a log row and its read model)."""
+        self._pending.append(_Record(db_path, statements))
+        if not self.active or len(self._pending) >= self.max_pending:
+            await self.flush()
+            return
+        self._wake.set()
+        if len(self._pending) >= self.max_records:
+            self._full.set()
+
+    async def next_id(self, db_path: str, table: str) -> int:
+        """Next AUTOINCREMENT id of table, handed out from a reserved block."""
+        key = (db_path, table)
+        self._bind()
+        async with self._id_lock:
+            block = self._ids.get(key)
+            if block is None or block[0] >= block[1]:
+                block = self._ids[key] = list(await self._reserve(db_path, table))
+            row_id = block[0]
+            block[0] += 1
+            return row_id
+
+    async def _reserve(self, db_path: str, table: str) -> Tuple[int, int]:
+        async with db_pool.writer(db_path) as db:
+            cursor = await db.execute(f"SELECT MAX(id) FROM {table}")
+            max_id = (await cursor.fetchone())[0] or 0
+            cursor = await db.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (table,))
+            row = await cursor.fetchone()
+            start = max(max_id, row[0] if row else 0) + 1
+            end = start + LOG_ID_BLOCK
+            if row:
+                await db.execute("UPDATE sqlite_sequence SET seq = ? WHERE name = ?", (end - 1, table))
+            else:
+                await db.execute("INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)", (table, end - 1))
+            await db.commit()
+        return start, end
+
+    async def flush(self, durable: bool = False):
+        """Write all queued records, one transaction per database.
+
+        durable=True also checkpoints the WAL of every database written behind since the
+        last durable flush (with synchronous=NORMAL a plain commit is not fsynced).
+        """
+        self._bind()
+        async with self._flush_lock:
+            batch = list(self._pending)
+            started = time.perf_counter()
+            by_db: Dict[str, List[_Record]] = {}
+            for rec in batch:
+                by_db.setdefault(rec.db_path, []).append(rec)
+            behind = self.active
+            written: Set[int] = set()
+            try:
+                for db_path, records in by_db.items():
+                    await self._write(db_path, records)
+                    written.update(map(id, records))
+                    if behind:
+                        self._dirty.add(db_path)
+            finally:
+                # Records leave the queue only once written; records added meanwhile stay queued
+                self._pending = [rec for rec in self._pending if id(rec) not in written]
+            if durable:
+                dirty, self._dirty = self._dirty, set()
+                for db_path in dirty:
+                    async with db_pool.writer(db_path) as db:
+                        await db.execute("PRAGMA wal_checkpoint(FULL)")
+            if batch:
+                self.records += len(batch)
+                self.batches += 1
+                self.max_batch = max(self.max_batch, len(batch))
+                self.flush_total_sec += time.perf_counter() - started
+
+    async def _write(self, db_path: str, records: List[_Record]):
+        async with db_pool.writer(db_path) as db:
+            try:
+                for rec in records:
+                    for sql, params in rec.statements:
+                        await db.execute(sql, params)
+                await db.commit()
+                return
+            except Exception as e:
+                await db.rollback()
+                print(f"[ExecutionLog] Batch of {len(records)} log records failed ({e}); retrying one by one.")
+            # One bad record must not take the rest of the batch down with it
+            for rec in records:
+                try:
+                    for sql, params in rec.statements:
+                        await db.execute(sql, params)
+                    await db.commit()
+                except Exception as e:
+                    await db.rollback()
+                    self.failed += 1
+                    print(f"[ExecutionLog] Dropped log record: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "active": self._task is not None and not self._task.done(),
+            "pending": len(self._pending),
+            "records": self.records,
+            "batches": self.batches,
+            "avg_batch": round(self.records / self.batches, 1) if self.batches else 0,
+            "max_batch": self.max_batch,
+            "failed": self.failed,
+            "flush_avg_ms": round(self.flush_total_sec / self.batches * 1000, 2) if self.batches else 0,
+        }
+
+
+_log = WriteBehindLog()
+
+
+def get_log_writer() -> WriteBehindLog:
+    return _log
+
+
+def start():
+    _log.start()
+
+
+async def stop():
+    await _log.stop()
+
+
+async def add(db_path: str, sql: str, params: Any):
+    await _log.add(db_path, sql, params)
+
+
+async def add_many(db_path: str, statements: List[Tuple[str, Any]]):
+    await _log.add_many(db_path, statements)
+
+
+async def next_id(db_path: str, table: str) -> int:
+    return await _log.next_id(db_path, table)
+
+
+async def flush(durable: bool = False):
+    await _log.flush(durable)
+
+
+def stats() -> Dict[str, Any]:
+    return _log.stats()
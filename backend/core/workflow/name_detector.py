@@ -11,7 +11,6 @@ import cv2
 import numpy as np
 import pytesseract
 from pytesseract import Output
-import subprocess
 
 # Root directory (Part3_Control_EMU)
 root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
@@ -28,6 +27,7 @@ config.load()
 pytesseract.pytesseract.tesseract_cmd = config.tesseract_path
 
 from workflow import adb_helper
+from backend.core.workflow.frame_bus import get_frame_bus
 
 def _preprocess_strategies(scaled_gray: np.ndarray) -> list:
     """
@@ -110,18 +110,10 @@ def locate_text_on_screen(screen_img: np.ndarray, target_text: str) -> tuple:
 
 
 def screencap_memory(adb_path: str, serial: str) -> np.ndarray:
-    """Captures screen directly to RAM."""
-    cmd = [adb_path, "-s", serial, "exec-out", "screencap", "-p"]
-    startupinfo = subprocess.STARTUPINFO()
-    startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-    
+    """Captures screen directly to RAM (shared per-serial frame bus)."""
     try:
-        result = subprocess.run(cmd, capture_output=True, startupinfo=startupinfo, timeout=5)
-        if not result.stdout:
-            return None
-        image_array = np.frombuffer(result.stdout, np.uint8)
-        img = cv2.imdecode(image_array, cv2.IMREAD_COLOR)
-        return img
+        bus_frame = get_frame_bus(serial, adb_path).get()
+        return bus_frame.bgr if bus_frame is not None else None
     except Exception as e:
         print(f"[ERROR] Screencap failed: {e}")
         return None
@@ -22,9 +22,9 @@ Usage:
 import time
 import cv2
 import numpy as np
-import subprocess
 
 from backend.core.workflow import adb_helper
+from backend.core.workflow.frame_bus import get_frame_bus
 from backend.core.workflow.policy.data import (
     COLUMNS, COLUMN_Y_POSITIONS, SCROLL_RIGHT, SCROLL_LEFT_RESET,
     CLOSE_POPUP_POS, GOVERNANCE_CARD_POSITIONS,
@@ -232,15 +232,15 @@ class PolicyV3Engine:
         self.account_id = account_id
         self.debug_dir = debug_dir
         self._replenish_hit = False
+        self._last_frame_id = 0
 
     def _screencap(self):
-        cmd = [self.adb_path, "-s", self.serial, "exec-out", "screencap", "-p"]
-        si = subprocess.STARTUPINFO()
-        si.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+        """Fresh frame from the shared bus: newer than our last one, may be the detector's."""
         try:
-            r = subprocess.run(cmd, capture_output=True, startupinfo=si, timeout=5)
-            if r.stdout:
-                return cv2.imdecode(np.frombuffer(r.stdout, np.uint8), cv2.IMREAD_COLOR)
+            bus_frame = get_frame_bus(self.serial, self.adb_path).get(newer_than=self._last_frame_id)
+            if bus_frame is not None:
+                self._last_frame_id = bus_frame.frame_id
+                return bus_frame.bgr
         except Exception as e:
             _log(f"Screencap error: {e}")
         return None
@@ -0,0 +1,125 @@
+"""
+Provider Cache — per-serial memo of which game build (provider) an emulator runs.
+
+core_actions.detect_provider_from_emulator shells out (`dumpsys activity recents`, then
+`pm list packages`) and back_to_lobby, the orchestrator's _ensure_lobby, executor steps
+and full_scan._scan_worker call it at the start of every run — the same answer dozens
+of times per emulator per hour. It only changes when the installed APKs change or the
+emulator is relaunched.
+
+- Keyed by serial; an entry remembers where it came from ("detected" / "accounts" /
+  "confirmed").
+- Invalidated by apk_manager installs and by ldplayer_manager launch / quit.
+- Seeded at startup from the accounts table's `provider` column (active account of the
+  emulator, else the provider all its accounts agree on). The column defaults to
+  'Global', so a seed is only a hint: get_cached_provider does not serve it until the
+  device confirms it (one `pm list packages` in detect_provider_from_emulator).
+- Only positive detections are stored: the DEFAULT_PROVIDER fallback (nothing matched,
+  or adb failed) is never cached.
+
+Usage:
+    provider = get_cached_provider(serial)        # None on miss (or unconfirmed seed)
+    seed = get_seeded_provider(serial)            # hint to confirm against the device
+    store_provider(serial, "Global")
+    invalidate_provider(serial, reason="apk_install")
+    seed_providers_from_accounts()
+    provider_cache_stats()
+"""
+
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from backend.config import config
+
+# ── Module Constants ──────────────────────────────────────────────
+
+KNOWN_PROVIDERS = ("Funtap", "Global")     # keys of core_actions.PROVIDER_PACKAGES
+
+
+_entries: Dict[str, Dict[str, Any]] = {}    # serial -> {"provider", "source", "at"}
+_lock = threading.Lock()
+_counters = {"hits": 0, "misses": 0, "stores": 0, "seeded": 0, "confirmed": 0, "invalidations": 0}
+
+
+def get_cached_provider(serial: str) -> Optional[str]:
+    """The known provider; None on a miss or while the entry is an unconfirmed seed."""
+    with _lock:
+        entry = _entries.get(serial)
+        if entry is not None and entry["source"] == "accounts":
+            entry = None
+        _counters["hits" if entry else "misses"] += 1
+        return entry["provider"] if entry else None
+
+
+def get_seeded_provider(serial: str) -> Optional[str]:
+    """The accounts-table seed for this serial, if it has not been confirmed yet."""
+    with _lock:
+        entry = _entries.get(serial)
+        return entry["provider"] if entry and entry["source"] == "accounts" else None
+
+
+def store_provider(serial: str, provider: str, source: str = "detected") -> None:
+    if provider not in KNOWN_PROVIDERS:
+        return
+    with _lock:
+        _entries[serial] = {"provider": provider, "source": source, "at": time.time()}
+        _counters[{"accounts": "seeded", "confirmed": "confirmed"}.get(source, "stores")] += 1
+
+
+def invalidate_provider(serial: Optional[str] = None, reason: str = "") -> None:
+    """Forget one serial (None: all) — the next detect_provider_from_emulator asks the device."""
+    with _lock:
+        dropped = list(_entries) if serial is None else [serial] if serial in _entries else []
+        for key in dropped:
+            del _entries[key]
+        _counters["invalidations"] += len(dropped)
+    if dropped and reason:
+        print(f"[ProviderCache] Invalidated {', '.join(dropped)} ({reason})")
+
+
+def seed_providers_from_accounts(db_path: Optional[str] = None) -> int:
+    """Seed serials that have no entry yet from the accounts table. Returns how many were seeded."""
+    try:
+        with sqlite3.connect(db_path or config.db_path) as conn:
+            rows = conn.execute(
+                """SELECT e.serial, a.provider, a.is_active
+                   FROM accounts a
+                   JOIN emulators e ON a.emulator_id = e.id
+                   WHERE a.provider IN ({})""".format(",".join("?" * len(KNOWN_PROVIDERS))),
+                KNOWN_PROVIDERS,
+            ).fetchall()
+    except sqlite3.Error as e:
+        print(f"[ProviderCache] Seed skipped: {e}")
+        return 0
+
+    by_serial: Dict[str, Dict[str, Any]] = {}
+    for serial, provider, is_active in rows:
+        seen = by_serial.setdefault(serial, {"active": None, "all": set()})
+        seen["all"].add(provider)
+        if is_active:
+            seen["active"] = provider
+
+    seeded = 0
+    for serial, seen in by_serial.items():
+        provider = seen["active"] or (next(iter(seen["all"])) if len(seen["all"]) == 1 else None)
+        with _lock:
+            known = serial in _entries
+        if provider and not known:
+            store_provider(serial, provider, source="accounts")
+            seeded += 1
+    return seeded
+
+
+def provider_cache_stats() -> Dict[str, Any]:
+    with _lock:
+        lookups = _counters["hits"] + _counters["misses"]
+        return {
+            **_counters,
+            "hit_rate": round(_counters["hits"] / lookups, 3) if lookups else 0.0,
+            "entries": {
+                serial: {"provider": e["provider"], "source": e["source"], "age_sec": round(time.time() - e["at"], 1)}
+                for serial, e in sorted(_entries.items())
+            },
+        }
@@ -0,0 +1,214 @@
+"""
+ROI Learner — learn per-template search regions from where templates actually match.
+
+ROI_HINTS is hand-maintained; every template missing from it is scanned over the full
+960x540 frame. The learner records the placement of each full-screen template hit and,
+once a template has ROI_LEARN_MIN_HITS hits, offers the union of its last
+ROI_LEARN_WINDOW placements plus ROI_LEARN_MARGIN as its search region.
+
+- Learned ROIs persist in <templates_dir>/learned_roi.json (keyed by template filename),
+  at most once per ROI_SAVE_INTERVAL_SEC from the match path; flush() at exit writes
+  whatever is left.
+- Hand-written ROI_HINTS always win; learned ROIs only apply to un-hinted templates.
+- A miss inside the learned ROI is trusted as a miss. The full frame is re-checked only
+  on a new bus scene, every ROI_FALLBACK_EVERY misses or ROI_FALLBACK_INTERVAL_SEC per
+  template (should_fallback); a hit found there grows the ROI, so a moved button is picked
+  up on the next match. Placements older than the window drop out, so the ROI shrinks
+  back once the button stays at its new spot.
+
+Usage:
+    learner = get_roi_learner(templates_dir)
+    roi = learner.roi_for("tavern/free_draw_btn.png")   # None until learned
+    learner.record("tavern/free_draw_btn.png", (x, y), (w, h))
+"""
+
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# ── Module Constants ──────────────────────────────────────────────
+
+LEARNED_ROI_FILE = "learned_roi.json"
+ROI_LEARN_MIN_HITS = 5          # Hits before a learned ROI is used
+ROI_LEARN_MARGIN = 20           # Same safety padding as the hand-written ROI_HINTS
+ROI_LEARN_MAX_AREA_RATIO = 0.5  # Wider than this → not worth cropping, keep full-frame
+ROI_LEARN_WINDOW = 20           # Recent placements whose union is the ROI (older ones age out)
+ROI_SAVE_INTERVAL_SEC = 60      # Min time between writes of learned_roi.json from record()
+ROI_FALLBACK_EVERY = 10         # ROI misses in a row before the full frame is re-checked
+ROI_FALLBACK_INTERVAL_SEC = 5.0 # ... or this long since the template's last full-frame search
+SCREEN_SIZE = (960, 540)
+
+
+class RoiLearner:
+    """Thread-safe per-template placement history with JSON persistence."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        # filename -> {"bbox": [x1, y1, x2, y2], "hits": int, "recent": [[x1, y1, x2, y2], ...]}
+        self._entries: dict[str, dict] = {}
+        self._dirty = False
+        self._saved_at = 0.0
+        self._rois: dict[str, tuple[int, int, int, int]] = {}
+        # filename -> {"misses": ROI misses since the last full-frame search, "at": its time, "scene": its bus scene}
+        self._misses: dict[str, dict] = {}
+        self.roi_hits = 0        # matched inside a learned ROI
+        self.roi_misses = 0      # learned ROI missed, trusted as a miss
+        self.fallbacks = 0       # learned ROI missed → full-frame search
+        self.fallback_hits = 0   # ... and full frame found it (ROI grown)
+        self._load()
+
+    # ── Persistence ───────────────────────────────────────────────
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            for filename, item in data.get("templates", {}).items():
+                bbox = list(item["bbox"])
+                recent = [list(p) for p in item.get("recent", [bbox])][-ROI_LEARN_WINDOW:]
+                self._entries[filename] = {"bbox": bbox, "hits": int(item["hits"]), "recent": recent}
+                self._refresh(filename)
+            logger.info("Loaded %d learned ROIs from %s", len(self._rois), self.path)
+        except Exception as e:
+            logger.warning("Ignoring unreadable learned ROI file %s: %s", self.path, e)
+            self._entries.clear()
+            self._rois.clear()
+
+    def save(self) -> None:
+        """Write learned ROIs atomically (tmp file + rename)."""
+        with self._lock:
+            data = {
+                "version": 1, "screen": list(SCREEN_SIZE),
+                "templates": {k: {**v, "recent": list(v["recent"])} for k, v in self._entries.items()},
+            }
+            self._dirty = False
+            self._saved_at = time.monotonic()
+        tmp = self.path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=1, sort_keys=True)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logger.warning("Could not save learned ROIs to %s: %s", self.path, e)
+
+    def flush(self) -> None:
+        """Write pending changes now (registered at exit for shared learners)."""
+        if self._dirty:
+            self.save()
+
+    # ── Learning ──────────────────────────────────────────────────
+
+    def _refresh(self, filename: str) -> None:
+        """Recompute the usable ROI for filename (caller holds the lock or is in __init__)."""
+        item = self._entries[filename]
+        if item["hits"] < ROI_LEARN_MIN_HITS:
+            self._rois.pop(filename, None)
+            return
+        x1, y1, x2, y2 = item["bbox"]
+        sw, sh = SCREEN_SIZE
+        roi = (
+            max(0, x1 - ROI_LEARN_MARGIN), max(0, y1 - ROI_LEARN_MARGIN),
+            min(sw, x2 + ROI_LEARN_MARGIN), min(sh, y2 + ROI_LEARN_MARGIN),
+        )
+        if (roi[2] - roi[0]) * (roi[3] - roi[1]) > ROI_LEARN_MAX_AREA_RATIO * sw * sh:
+            self._rois.pop(filename, None)
+        else:
+            self._rois[filename] = roi
+
+    def roi_for(self, filename: str) -> Optional[tuple[int, int, int, int]]:
+        """Learned (x1, y1, x2, y2) for this template, or None if not learned yet."""
+        return self._rois.get(filename)
+
+    def record(
+        self, filename: str, loc: tuple[int, int], size: tuple[int, int], fallback: bool = False,
+    ) -> None:
+        """Record a hit at top-left loc for a template of size (w, h)."""
+        x, y = loc
+        w, h = size
+        placement = [x, y, x + w, y + h]
+        with self._lock:
+            item = self._entries.get(filename)
+            if item is None:
+                item = {"bbox": placement, "hits": 0, "recent": []}
+                self._entries[filename] = item
+            recent = item["recent"]
+            recent.append(placement)
+            del recent[:-ROI_LEARN_WINDOW]
+            bbox = [min(p[0] for p in recent), min(p[1] for p in recent),
+                    max(p[2] for p in recent), max(p[3] for p in recent)]
+            changed = bbox != item["bbox"] or item["hits"] + 1 == ROI_LEARN_MIN_HITS
+            item["bbox"] = bbox
+            item["hits"] += 1
+            if fallback:
+                self.fallback_hits += 1
+            elif filename in self._rois:
+                self.roi_hits += 1
+            if changed:
+                self._refresh(filename)
+                self._dirty = True
+            due = self._dirty and time.monotonic() - self._saved_at >= ROI_SAVE_INTERVAL_SEC
+        # Only persist when the usable ROI could have changed, and not more than once a minute
+        if due:
+            self.save()
+
+    def should_fallback(self, filename: str, scene_id: int = 0) -> bool:
+        """
+        After a miss inside the learned ROI: True when the full frame is due for a re-check
+        (new bus scene, ROI_FALLBACK_EVERY misses or ROI_FALLBACK_INTERVAL_SEC since the
+        last one). scene_id 0 = unknown (injected frame), only the count and time apply.
+        """
+        now = time.monotonic()
+        with self._lock:
+            item = self._misses.setdefault(filename, {"misses": 0, "at": None, "scene": 0})
+            item["misses"] += 1
+            due = (
+                item["at"] is None
+                or item["misses"] >= ROI_FALLBACK_EVERY
+                or now - item["at"] >= ROI_FALLBACK_INTERVAL_SEC
+                or (scene_id and scene_id != item["scene"])
+            )
+            if due:
+                item.update(misses=0, at=now, scene=scene_id)
+                self.fallbacks += 1
+            else:
+                self.roi_misses += 1
+            return due
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "learned": len(self._rois),
+                "tracked": len(self._entries),
+                "roi_hits": self.roi_hits,
+                "roi_misses": self.roi_misses,
+                "fallbacks": self.fallbacks,
+                "fallback_hits": self.fallback_hits,
+                "rois": {k: list(v) for k, v in self._rois.items()},
+            }
+
+
+# ── Per-templates_dir registry ────────────────────────────────────
+
+_LEARNERS: dict[str, RoiLearner] = {}
+_LEARNERS_LOCK = threading.Lock()
+
+
+def get_roi_learner(templates_dir: str) -> RoiLearner:
+    """Shared learner for a templates directory (one per process, like the frame bus)."""
+    path = os.path.join(os.path.abspath(templates_dir), LEARNED_ROI_FILE)
+    with _LEARNERS_LOCK:
+        learner = _LEARNERS.get(path)
+        if learner is None:
+            learner = RoiLearner(path)
+            _LEARNERS[path] = learner
+            atexit.register(learner.flush)
+        return learner
@@ -0,0 +1,236 @@
+"""
+Run Planner — swap-minimizing account order for one orchestrator cycle.
+
+A cross-emulator swap (quit, 3 s, launch, up to 180 s of wait_for_device, 5 s grace) is
+the most expensive thing the sequential orchestrator does, and an in-game account swap
+is the next one. _reorder_queue_for_active_account only moves the active account to the
+front of its emulator group; the planner picks the whole cycle order:
+
+- Accounts are grouped into one block per emulator; inside a block the account already
+  logged in goes first, then accounts by cooldown expiry.
+- Block orders are scored with a simulation of the CooldownScheduler walk (accounts that
+  are still cooling down are skipped, the walk sleeps when nobody is ready), so swap time
+  is weighed against waiting for cooldowns to expire.
+- Swap costs are the median durations measured from swap_logger entries
+  (cross_emu_swap start → complete, ensure_correct_account start → swap_loop_done),
+  with defaults until enough swaps have been logged.
+
+Usage:
+    costs = SwapCosts.from_logs()
+    plan = plan_cycle(queue, ready_at, costs, current_emu=0, active_game_id="123")
+    plan["order"]                    # account ids, planned order
+    plan["estimated_savings_sec"]    # vs. the queue order as given (round-robin)
+"""
+
+import itertools
+import statistics
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.core.workflow import swap_logger
+
+# ── Module Constants ──────────────────────────────────────────────
+
+DEFAULT_CROSS_EMU_SWAP_SEC = 75.0   # quit + 3 s + launch + typical boot + 5 s grace
+DEFAULT_IN_GAME_SWAP_SEC = 40.0     # swap_account UI flow + verification
+DEFAULT_ACCOUNT_RUN_SEC = 300.0     # until the orchestrator has measured a run
+SWAP_LOG_DAYS = 7                   # swap_logger history used for measured costs
+PLANNER_MAX_PERMUTE_EMULATORS = 5   # exhaustive block orders up to here, greedy above
+
+
+def _parse_ts(value: Any) -> Optional[float]:
+    try:
+        return datetime.fromisoformat(str(value)).timestamp()
+    except ValueError:
+        return None
+
+
+class SwapCosts:
+    """Measured swap durations (seconds) with defaults for pairs never observed."""
+
+    def __init__(
+        self,
+        cross_emu: Optional[Dict[Tuple[int, int], List[float]]] = None,
+        in_game: Optional[List[float]] = None,
+    ):
+        self._cross = cross_emu or {}
+        self._in_game = in_game or []
+        all_cross = [d for durations in self._cross.values() for d in durations]
+        self._cross_median = statistics.median(all_cross) if all_cross else DEFAULT_CROSS_EMU_SWAP_SEC
+        self._in_game_median = statistics.median(self._in_game) if self._in_game else DEFAULT_IN_GAME_SWAP_SEC
+
+    @classmethod
+    def from_entries(cls, entries) -> "SwapCosts":
+        """Pair swap_logger start / end entries into durations."""
+        cross: Dict[Tuple[int, int], List[float]] = {}
+        in_game: List[float] = []
+        cross_started: Dict[Tuple[int, int], float] = {}
+        ensure_started: Dict[str, float] = {}
+        for entry in entries:
+            ts = _parse_ts(entry.get("ts"))
+            if ts is None:
+                continue
+            event, phase = entry.get("event"), entry.get("phase")
+            if event == "cross_emu_swap":
+                key = (entry.get("old_emu"), entry.get("new_emu"))
+                if phase == "start":
+                    cross_started[key] = ts
+                elif phase == "complete" and key in cross_started:
+                    started = cross_started.pop(key)
+                    if entry.get("success"):
+                        cross.setdefault(key, []).append(ts - started)
+            elif event == "ensure_correct_account":
+                serial = entry.get("serial")
+                if phase == "start":
+                    ensure_started[serial] = ts
+                elif phase == "swap_loop_done" and serial in ensure_started:
+                    in_game.append(ts - ensure_started.pop(serial))
+                elif phase in ("already_correct", "failed"):
+                    ensure_started.pop(serial, None)
+        return cls(cross, in_game)
+
+    @classmethod
+    def from_logs(cls, days: int = SWAP_LOG_DAYS, log_dir: Optional[str] = None) -> "SwapCosts":
+        return cls.from_entries(swap_logger.read_entries(days=days, log_dir=log_dir))
+
+    def cross_emu(self, old_emu: Optional[int], new_emu: int) -> float:
+        durations = self._cross.get((old_emu, new_emu))
+        return statistics.median(durations) if durations else self._cross_median
+
+    def in_game(self) -> float:
+        return self._in_game_median
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "cross_emu_sec": round(self._cross_median, 1),
+            "cross_emu_samples": sum(len(d) for d in self._cross.values()),
+            "in_game_sec": round(self._in_game_median, 1),
+            "in_game_samples": len(self._in_game),
+        }
+
+
+@dataclass
+class PlanStep:
+    account_id: str
+    game_id: str
+    lord_name: Optional[str]
+    emu_index: int
+    swap: str           # 'first_launch', 'cross_emu', 'in_game', 'none'
+    wait_sec: float     # cooldown sleep before this account
+    swap_sec: float
+    start_sec: float    # offset from plan time when activities start
+
+
+def simulate(
+    order: List[Dict[str, Any]],
+    ready_at: Dict[str, float],
+    costs: SwapCosts,
+    now: float,
+    current_emu: Optional[int] = None,
+    active_game_id: Optional[str] = None,
+    run_sec: Optional[Dict[str, float]] = None,
+    default_run_sec: float = DEFAULT_ACCOUNT_RUN_SEC,
+) -> Tuple[float, List[PlanStep]]:
+    """Walk order the way CooldownScheduler does; returns (cycle seconds, steps)."""
+    run_sec = run_sec or {}
+    t, pos, wait = now, -1, 0.0
+    emu, active = current_emu, active_game_id
+    pending = list(range(len(order)))
+    steps: List[PlanStep] = []
+    while pending:
+        due = [i for i in pending if ready_at.get(str(order[i]["id"]), 0.0) <= t]
+        if not due:
+            resume = min(ready_at.get(str(order[i]["id"]), 0.0) for i in pending)
+            wait += resume - t
+            t = resume
+            continue
+        ahead = [i for i in due if i > pos]
+        pos = min(ahead) if ahead else min(due)
+        pending.remove(pos)
+
+        acc = order[pos]
+        acc_id = str(acc["id"])
+        acc_emu = int(acc["emu_index"])
+        game_id = str(acc.get("game_id") or "").strip()
+        if emu is None:
+            swap, swap_sec = "first_launch", costs.cross_emu(None, acc_emu)
+        elif emu != acc_emu:
+            swap, swap_sec = "cross_emu", costs.cross_emu(emu, acc_emu)
+        elif active and active == game_id:
+            swap, swap_sec = "none", 0.0
+        else:
+            swap, swap_sec = "in_game", costs.in_game()
+        t += swap_sec
+        steps.append(PlanStep(
+            acc_id, game_id, acc.get("lord_name"), acc_emu, swap,
+            round(wait, 1), round(swap_sec, 1), round(t - now, 1),
+        ))
+        t += run_sec.get(acc_id, default_run_sec)
+        emu, active, wait = acc_emu, game_id, 0.0
+    return t - now, steps
+
+
+def _block_orders(emus: List[int], current_emu: Optional[int]):
+    if len(emus) <= PLANNER_MAX_PERMUTE_EMULATORS:
+        yield from itertools.permutations(emus)
+    else:
+        # Too many to enumerate: start on the running emulator, keep the rest in queue order
+        first = [current_emu] if current_emu in emus else []
+        yield tuple(first + [e for e in emus if e not in first])
+
+
+def plan_cycle(
+    queue: List[Dict[str, Any]],
+    ready_at: Dict[str, float],
+    costs: SwapCosts,
+    now: Optional[float] = None,
+    current_emu: Optional[int] = None,
+    active_game_id: Optional[str] = None,
+    run_sec: Optional[Dict[str, float]] = None,
+    default_run_sec: float = DEFAULT_ACCOUNT_RUN_SEC,
+) -> Dict[str, Any]:
+    """Cheapest per-emulator block order for the cycle, compared with the queue order as given.
+
+    queue holds accounts with an emulator (emu_index) in the current (round-robin) order;
+    ready_at maps account id → epoch when it is next eligible (0 = now).
+    """
+    now = time.time() if now is None else now
+    active_game_id = str(active_game_id).strip() if active_game_id else None
+
+    def score(order):
+        return simulate(order, ready_at, costs, now, current_emu, active_game_id, run_sec, default_run_sec)
+
+    blocks: Dict[int, List[Dict[str, Any]]] = {}
+    for i, acc in enumerate(queue):
+        blocks.setdefault(int(acc["emu_index"]), []).append(acc)
+    for emu, accs in blocks.items():
+        accs.sort(key=lambda a: (
+            not (emu == current_emu and active_game_id and str(a.get("game_id") or "").strip() == active_game_id),
+            ready_at.get(str(a["id"]), 0.0),
+            queue.index(a),
+        ))
+
+    rr_sec, rr_steps = score(queue)
+    best_sec, best_steps, best_order = rr_sec, rr_steps, list(queue)
+    for emus in _block_orders(list(blocks), current_emu):
+        order = [acc for emu in emus for acc in blocks[emu]]
+        sec, steps = score(order)
+        if sec < best_sec - 1e-6:
+            best_sec, best_steps, best_order = sec, steps, order
+
+    def cross_swaps(steps):
+        return sum(1 for s in steps if s.swap == "cross_emu")
+
+    return {
+        "order": [str(a["id"]) for a in best_order],
+        "steps": [asdict(s) for s in best_steps],
+        "planned_sec": round(best_sec, 1),
+        "round_robin_sec": round(rr_sec, 1),
+        "estimated_savings_sec": round(rr_sec - best_sec, 1),
+        "cross_emu_swaps": cross_swaps(best_steps),
+        "round_robin_cross_emu_swaps": cross_swaps(rr_steps),
+        "round_robin_steps": [asdict(s) for s in rr_steps],
+        "swap_costs": costs.stats(),
+    }
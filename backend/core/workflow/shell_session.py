@@ -0,0 +1,265 @@
+"""
+Shell Session — persistent `adb shell` per serial for input commands.
+
+adb_helper used to spawn one `adb -s SERIAL shell input ...` process per tap, swipe and
+back press — thousands of spawns per hour across a fleet, 50–150 ms each on Windows.
+A ShellSession keeps one `adb shell -T` open per serial and pipes commands over stdin.
+
+- Replies are framed by a sentinel: `<command>; echo __codm_done_<n>__ $?` — everything
+  before the sentinel is the command's stdout (the sentinel may share the last line when
+  that output has no trailing newline), the sentinel carries its exit code.
+- Health check: a session idle for SHELL_HEALTH_CHECK_IDLE_SEC is pinged (`:` + sentinel)
+  before the next command; a dead or silent shell is reopened (reconnect) first.
+- A command is never re-sent once written — if the shell dies mid-command the session is
+  closed and "" is returned, same as a one-shot timeout. A write that fails (broken stdin
+  pipe) never reached the shell: the session is reopened and the command sent once more,
+  then goes through the one-shot path if that fails too.
+- Fallback: if the shell cannot be (re)opened, commands go through the one-shot
+  `adb shell <command>` path for SHELL_RETRY_COOLDOWN_SEC before the next attempt.
+
+Usage:
+    from backend.core.workflow.shell_session import run_shell
+    out = run_shell(serial, adb_path, "input tap 480 270")
+    shell_session_stats()    # {serial: {"commands": ..., "fallbacks": ..., ...}}
+"""
+
+import itertools
+import logging
+import subprocess
+import sys
+import threading
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# ── Module Constants ──────────────────────────────────────────────
+
+SHELL_COMMAND_TIMEOUT_SEC = 30     # same bound as adb_helper._run_adb
+SHELL_OPEN_TIMEOUT_SEC = 5
+SHELL_HEALTH_CHECK_IDLE_SEC = 30   # ping before reuse after this much silence
+SHELL_RETRY_COOLDOWN_SEC = 30      # after an open failure, use the one-shot path for this long
+SHELL_SENTINEL = "__codm_done_"
+
+
+def _startupinfo():
+    """Hide the console window on Windows; no-op elsewhere (fake adb / Linux benchmarks)."""
+    if sys.platform != "win32":
+        return None
+    startupinfo = subprocess.STARTUPINFO()
+    startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+    return startupinfo
+
+
+class ShellClosedError(Exception):
+    """The persistent shell exited or stopped answering."""
+
+
+class ShellWriteError(ShellClosedError):
+    """The command could not be written to the shell's stdin — it never ran."""
+
+
+class ShellSession:
+    """One long-lived `adb -s SERIAL shell -T` with sentinel-framed replies. Thread-safe."""
+
+    def __init__(self, serial: str, adb_path: str) -> None:
+        self.serial = serial
+        self.adb_path = adb_path
+        self._lock = threading.Lock()
+        self._proc: Optional[subprocess.Popen] = None
+        self._opened = False
+        self._seq = itertools.count(1)
+        self._last_ok = 0.0
+        self._disabled_until = 0.0
+        self.commands = 0
+        self.fallback_count = 0
+        self.reconnects = 0
+        self.failures = 0
+        self.total_command_ms = 0.0
+
+    # ── Shell lifecycle ───────────────────────────────────────────
+
+    def _open(self) -> None:
+        self.close()
+        if self._opened:
+            self.reconnects += 1
+        self._opened = True
+        self._proc = subprocess.Popen(
+            [self.adb_path, "-s", self.serial, "shell", "-T"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            startupinfo=_startupinfo(),
+        )
+        self._exchange(":", SHELL_OPEN_TIMEOUT_SEC)
+        logger.info("Shell session opened on %s", self.serial)
+
+    def close(self) -> None:
+        proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        try:
+            proc.kill()
+            proc.wait(timeout=2)
+        except Exception:
+            pass
+
+    @property
+    def is_open(self) -> bool:
+        return self._proc is not None and self._proc.poll() is None
+
+    def _ensure_healthy(self) -> None:
+        """Reopen a dead shell; ping one that has been idle for a while."""
+        if not self.is_open:
+            self._open()
+        elif time.monotonic() - self._last_ok > SHELL_HEALTH_CHECK_IDLE_SEC:
+            try:
+                self._exchange(":", SHELL_OPEN_TIMEOUT_SEC)
+            except (OSError, ShellClosedError):
+                self._open()
+
+    # ── Sentinel-framed exchange (guarded by a kill-watchdog, works on Windows pipes too) ──
+
+    def _exchange(self, command: str, timeout: float) -> tuple[str, int]:
+        proc = self._proc
+        token = f"{SHELL_SENTINEL}{next(self._seq)}__"
+        try:
+            proc.stdin.write(f"{command}; echo {token} $?\n".encode())
+            proc.stdin.flush()
+        except OSError as e:
+            raise ShellWriteError(f"shell stdin closed on {self.serial} ({e})") from e
+
+        timer = threading.Timer(timeout, proc.kill)
+        timer.daemon = True
+        timer.start()
+        try:
+            lines = []
+            while True:
+                raw = proc.stdout.readline()
+                if not raw:
+                    raise ShellClosedError(f"shell closed on {self.serial}")
+                line = raw.decode("utf-8", errors="ignore").rstrip("\r\n")
+                at = line.find(token)
+                if at >= 0:
+                    lines.append(line[:at])
+                    rc = line[at + len(token):].strip()
+                    self._last_ok = time.monotonic()
+                    return "\n".join(lines).strip(), int(rc) if rc.lstrip("-").isdigit() else -1
+                lines.append(line)
+        finally:
+            timer.cancel()
+
+    # ── Commands ──────────────────────────────────────────────────
+
+    def run(self, command: str, timeout: float = SHELL_COMMAND_TIMEOUT_SEC) -> str:
+        """Run one shell command on the device and return its stdout (stripped)."""
+        with self._lock:
+            t0 = time.perf_counter()
+            self.commands += 1
+            try:
+                return self._run(command, timeout)
+            finally:
+                self.total_command_ms += (time.perf_counter() - t0) * 1000
+
+    def _run(self, command: str, timeout: float) -> str:
+        attempts = 2 if time.monotonic() >= self._disabled_until else 0   # 2: one resend after a broken stdin
+        for _ in range(attempts):
+            try:
+                self._ensure_healthy()
+            except Exception as e:
+                logger.warning("Shell session failed to open on %s (%s) — using one-shot adb", self.serial, e)
+                self.close()
+                self._disabled_until = time.monotonic() + SHELL_RETRY_COOLDOWN_SEC
+                break
+            try:
+                return self._exchange(command, timeout)[0]
+            except ShellWriteError as e:
+                # Never reached the shell: reopen and send it again
+                logger.warning("Shell session stdin broken on %s before %r (%s)", self.serial, command, e)
+                self.close()
+            except Exception as e:
+                # The command may already have run: don't resend it, just drop the shell
+                logger.warning("Shell session lost on %s during %r (%s)", self.serial, command, e)
+                self.failures += 1
+                self.close()
+                return ""
+        self.fallback_count += 1
+        return self._run_oneshot(command, timeout)
+
+    def _run_oneshot(self, command: str, timeout: float) -> str:
+        try:
+            result = subprocess.run(
+                [self.adb_path, "-s", self.serial, "shell", command],
+                capture_output=True,
+                text=True,
+                startupinfo=_startupinfo(),
+                timeout=timeout,
+            )
+            return result.stdout.strip()
+        except subprocess.TimeoutExpired:
+            return ""
+        except Exception as e:
+            print(f"[ADB] Error: {e}")
+            return ""
+
+    def ping(self) -> bool:
+        """Health check: True if the persistent shell answers (opening it if needed)."""
+        with self._lock:
+            try:
+                self._ensure_healthy()
+                return True
+            except Exception:
+                self.close()
+                return False
+
+    def stats(self) -> dict:
+        avg = self.total_command_ms / self.commands if self.commands else 0.0
+        return {
+            "commands": self.commands,
+            "avg_command_ms": round(avg, 2),
+            "fallbacks": self.fallback_count,
+            "reconnects": self.reconnects,
+            "failures": self.failures,
+            "open": self.is_open,
+        }
+
+
+# ── Per-serial registry ───────────────────────────────────────────
+
+_SESSIONS: dict[tuple[str, str], ShellSession] = {}
+_SESSIONS_LOCK = threading.Lock()
+
+
+def get_shell_session(serial: str, adb_path: str) -> ShellSession:
+    """Return the shared ShellSession for this serial, creating it on first use."""
+    key = (serial, adb_path)
+    with _SESSIONS_LOCK:
+        session = _SESSIONS.get(key)
+        if session is None:
+            session = ShellSession(serial, adb_path)
+            _SESSIONS[key] = session
+        return session
+
+
+def run_shell(serial: str, adb_path: str, command: str, timeout: float = SHELL_COMMAND_TIMEOUT_SEC) -> str:
+    return get_shell_session(serial, adb_path).run(command, timeout)
+
+
+def close_shell_session(serial: str) -> None:
+    """Close the session for this serial (e.g. emulator quit/relaunch)."""
+    with _SESSIONS_LOCK:
+        for key in [k for k in _SESSIONS if k[0] == serial]:
+            _SESSIONS.pop(key).close()
+
+
+def close_all_shell_sessions() -> None:
+    with _SESSIONS_LOCK:
+        for session in _SESSIONS.values():
+            session.close()
+        _SESSIONS.clear()
+
+
+def shell_session_stats() -> dict:
+    """Per-serial session stats: {serial: {commands, avg_command_ms, fallbacks, ...}}."""
+    with _SESSIONS_LOCK:
+        return {serial: session.stats() for (serial, _), session in _SESSIONS.items()}
@@ -1,19 +1,38 @@
 """
 Game State Detector — Production-grade template matching engine.
 
-Loads templates into RAM once and uses ADB screencap-to-memory for zero disk I/O.
+Loads templates into RAM once and captures through the shared per-serial FrameSource
+(persistent adb shell, raw frames) for zero disk I/O and no per-frame process spawn.
 
 Optimizations:
 - Grayscale matching: 3x faster than color (1 channel vs 3)
 - ROI cropping: scan only relevant screen region per template
 - Early exit cache: check last matched state first (~90% hit rate)
 - Screenshot cache: skip ADB if last capture < max_age_ms
+- Shared frame bus: one capture per serial serves every detector (see frame_bus.py);
+  invalidate() means "next frame must be newer than the one I have", not a blind refetch
+- Raw capture modes ("stream"/"raw"): no PNG encode on device, no imdecode on host;
+  BGR + gray come straight from the RGBA payload (see CAPTURE_MODES)
 - Unified template loader + single _find_template engine (DRY)
+- Batched full scan: check_state_full scores state + construction + special in one
+  parallel pass (batch_matcher.py) and exposes the full score vectors
+- Coarse-to-fine pyramid for full-screen templates opted in via PYRAMID_HINTS
+  (template_pyramid.py): scan at 1/2 or 1/4 scale, confirm at full resolution
+- Learned ROIs for un-hinted templates (roi_learner.py): tight region learned from
+  where the template actually matched; a miss there is trusted, the full frame is only
+  re-checked on a new bus scene or every few misses / seconds per template
+- Frame-change gate (change_gate=True): check_state / check_state_full on a frame of the
+  same bus scene (thumbnail within GATE_MAX_DIFF of the scene anchor, see frame_bus.py)
+  reuse the last classification, no matching. On for the polling detectors (orchestrator
+  per-emulator, executor) that wait_for_state drives. Template lookups that return
+  coordinates are never gated — a near-identical frame may have moved a button
+- Transition-ranked state scan (state_transitions.py): after the last-state check, the
+  states most likely to follow (given the last tap/back) are tried before the priority scan;
+  a confident hit only re-checks the higher-ranked states that overlap it (STATE_CONFLICTS)
 """
 
 import logging
 import os
-import subprocess
 import time
 from dataclasses import dataclass, field
 from typing import Optional
@@ -21,17 +40,33 @@ from typing import Optional
 import cv2
 import numpy as np
 
+from backend.core.workflow.batch_matcher import BatchMatcher, BatchScores, match_many
+from backend.core.workflow.frame_bus import FrameBus, get_frame_bus
+from backend.core.workflow.frame_source import FRAME_SOURCE_MODES
+from backend.core.workflow.roi_learner import RoiLearner, get_roi_learner
+from backend.core.workflow.state_transitions import TransitionModel, get_transition_model
+from backend.core.workflow.template_pyramid import ScaledFrameCache, build_entry_pyramid, match_entry
+
 logger = logging.getLogger(__name__)
 
 # ── Module Constants ──────────────────────────────────────────────
 
 SCREEN_RESOLUTION = (960, 540)
-SCREENCAP_TIMEOUT_SEC = 5
 SCREEN_CACHE_MAX_AGE_MS = 100
 
+# Capture modes (see frame_source.py):
+#   "stream" — persistent adb shell, raw RGBA (default)
+#   "raw"    — one `exec-out screencap` per frame, raw RGBA, no PNG round-trip
+#   "png"    — legacy `exec-out screencap -p` + cv2.imdecode
+CAPTURE_MODES = FRAME_SOURCE_MODES
+DEFAULT_CAPTURE_MODE = "stream"
+
 UNKNOWN_STATE = "UNKNOWN / TRANSITION"
 ERROR_CAPTURE = "ERROR_CAPTURE"
 
+# A predicted (non-last) state must clear threshold by this much to be taken ahead of the scan
+TRANSITION_CONFIDENT_MARGIN = 0.05
+
 # Default thresholds per category (can be overridden per-call)
 DEFAULT_THRESHOLDS = {
     "state": 0.80,
@@ -45,7 +80,7 @@ DEFAULT_THRESHOLDS = {
 
 # ── Type Aliases ──────────────────────────────────────────────────
 
-TemplateEntry = dict          # {"color": np.ndarray, "gray": np.ndarray, "roi": tuple|None}
+TemplateEntry = dict          # {"file", "color", "gray", "roi": tuple|None, "pyramid": dict|None}
 TemplateDict = dict           # {name: list[TemplateEntry]}
 MatchResult = tuple           # (name, center_x, center_y)
 
@@ -59,9 +94,11 @@ from backend.core.workflow.detector_configs import (  # noqa: E402
     ICON_CONFIGS,
     ACCOUNT_CONFIGS,
     ROI_HINTS,
+    PYRAMID_HINTS,
     CATEGORY_REGISTRY as _CATEGORY_REGISTRY,
     STATE_PRIORITY as _STATE_PRIORITY,
     STATE_BASE as _STATE_BASE,
+    STATE_CONFLICTS as _STATE_CONFLICTS,
 )
 
 
@@ -72,25 +109,47 @@ NEAR_MISS_MARGIN = 0.15  # Warn when confidence is within this margin below thre
 
 @dataclass
 class _ScreenCache:
-    """Cached ADB screenshot with grayscale pre-computation."""
+    """This detector's view of the serial's frame bus, with grayscale pre-computation."""
     frame: Optional[np.ndarray] = None
     gray: Optional[np.ndarray] = None
     timestamp_ms: float = 0.0
     max_age_ms: float = SCREEN_CACHE_MAX_AGE_MS
+    frame_id: int = 0        # Bus id of the cached frame (0 = not from the bus)
+    min_frame_id: int = 0    # Next bus frame must be newer than this (set by invalidate)
+    scene_id: int = 0        # Bus scene of the cached frame (0 = unknown → never gated)
 
     @property
     def is_fresh(self) -> bool:
         return self.frame is not None and (time.time() * 1000 - self.timestamp_ms) < self.max_age_ms
 
-    def update(self, frame: np.ndarray) -> None:
+    def update(
+        self, frame: np.ndarray, gray: Optional[np.ndarray] = None,
+        frame_id: int = 0, timestamp_ms: Optional[float] = None, scene_id: int = 0,
+    ) -> None:
+        """Store frame; gray is computed only when the capture did not already provide it."""
         self.frame = frame
-        self.gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame is not None else None
-        self.timestamp_ms = time.time() * 1000
+        if gray is None and frame is not None:
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        self.gray = gray
+        self.frame_id = frame_id
+        self.scene_id = scene_id
+        self.timestamp_ms = timestamp_ms if timestamp_ms is not None else time.time() * 1000
 
     def invalidate(self) -> None:
+        self.min_frame_id = max(self.min_frame_id, self.frame_id)
         self.frame = None
         self.gray = None
         self.timestamp_ms = 0.0
+        self.scene_id = 0
+
+
+@dataclass
+class _ChangeGate:
+    """Results computed on the current bus scene, keyed by (check, args)."""
+    scene_id: int = 0
+    results: dict = field(default_factory=dict)
+    hits: int = 0
+    misses: int = 0
 
 
 @dataclass
@@ -117,15 +176,32 @@ class GameStateDetector:
         match = detector.check_activity(serial, target="CREATE_LEGION")
     """
 
-    def __init__(self, adb_path: str, templates_dir: str) -> None:
+    def __init__(
+        self, adb_path: str, templates_dir: str, capture_mode: str = DEFAULT_CAPTURE_MODE,
+        learn_rois: bool = True, learn_transitions: bool = True, change_gate: bool = False,
+    ) -> None:
+        if capture_mode not in CAPTURE_MODES:
+            raise ValueError(f"Unknown capture_mode {capture_mode!r} (expected one of {CAPTURE_MODES})")
         self.adb_path = adb_path
         self.templates_dir = templates_dir
+        self.capture_mode = capture_mode
         self.roi_hints = ROI_HINTS
+        self.pyramid_hints = PYRAMID_HINTS
 
         # Consolidated template registry: {category: {name: [TemplateEntry]}}
         self._registry: dict[str, TemplateDict] = {}
         self._last_matched_state: Optional[str] = None
         self._cache = _ScreenCache()
+        self._batch_matchers: dict[tuple[str, bool], BatchMatcher] = {}
+        self._scaled_frames = ScaledFrameCache()
+        # Shared per templates_dir; None disables ROI learning (hand ROI_HINTS only)
+        self.roi_learner: Optional[RoiLearner] = get_roi_learner(templates_dir) if learn_rois else None
+        self.transitions: Optional[TransitionModel] = (
+            get_transition_model(templates_dir) if learn_transitions else None
+        )
+        self.match_calls = 0   # matchTemplate calls through _match_single (cost accounting)
+        self.change_gate = change_gate
+        self._gate = _ChangeGate()
 
         # Diagnostic instrumentation
         self.diagnostic_mode: bool = False
@@ -223,7 +299,7 @@ class GameStateDetector:
     # ── Template Loading ──────────────────────────────────────────
 
     def _load_template_group(self, configs: dict, target_dict: TemplateDict, label: str) -> None:
-        """Load one category of templates into target_dict. Stores color + gray + ROI."""
+        """Load one category of templates into target_dict. Stores color + gray + ROI (+ pyramid)."""
         loaded = 0
         for filename, name in configs.items():
             path = os.path.join(self.templates_dir, filename)
@@ -239,11 +315,15 @@ class GameStateDetector:
             gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
             roi = self.roi_hints.get(filename)
 
-            target_dict.setdefault(name, []).append({
+            entry = {
+                "file": filename,
                 "color": img,
                 "gray": gray,
                 "roi": roi,
-            })
+            }
+            # Pyramid only pays off for full-screen scans; ROI templates are already cheap
+            entry["pyramid"] = None if roi else build_entry_pyramid(entry, self.pyramid_hints.get(filename))
+            target_dict.setdefault(name, []).append(entry)
             loaded += 1
 
         if loaded > 0:
@@ -259,47 +339,24 @@ class GameStateDetector:
 
     # ── Screencap ─────────────────────────────────────────────────
 
+    def frame_bus(self, serial: str) -> FrameBus:
+        """Shared per-serial frame bus this detector captures through."""
+        return get_frame_bus(serial, self.adb_path, self.capture_mode)
+
     def screencap_memory(self, serial: str) -> Optional[np.ndarray]:
-        """Capture screen directly to RAM with caching."""
+        """Capture screen directly to RAM with caching (shared per-serial frame bus)."""
         if self._cache.is_fresh:
             return self._cache.frame
 
-        cmd = [self.adb_path, "-s", serial, "exec-out", "screencap", "-p"]
-        startupinfo = subprocess.STARTUPINFO()
-        startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-
-        try:
-            result = subprocess.run(cmd, capture_output=True, startupinfo=startupinfo, timeout=SCREENCAP_TIMEOUT_SEC)
-            if not result.stdout:
-                stderr_text = (result.stderr or b"").decode("utf-8", errors="ignore").strip()
-                logger.warning(
-                    "Screencap empty on %s | returncode=%s | stderr=%s",
-                    serial,
-                    result.returncode,
-                    stderr_text[:240] or "<empty>",
-                )
-                return None
-
-            image_array = np.frombuffer(result.stdout, np.uint8)
-            img = cv2.imdecode(image_array, cv2.IMREAD_COLOR)
-            if img is None:
-                stderr_text = (result.stderr or b"").decode("utf-8", errors="ignore").strip()
-                logger.warning(
-                    "Screencap decode failed on %s | bytes=%d | returncode=%s | stderr=%s",
-                    serial,
-                    len(result.stdout),
-                    result.returncode,
-                    stderr_text[:240] or "<empty>",
-                )
-                return None
-            self._cache.update(img)
-            return img
-        except subprocess.TimeoutExpired:
-            logger.warning("Screencap timeout on %s", serial)
-            return None
-        except Exception as e:
-            logger.error("Screencap failed on %s: %s", serial, e)
+        bus_frame = self.frame_bus(serial).get(
+            newer_than=self._cache.min_frame_id, max_age_ms=self._cache.max_age_ms,
+        )
+        if bus_frame is None:
             return None
+        self._cache.update(
+            bus_frame.bgr, bus_frame.gray, bus_frame.frame_id, bus_frame.timestamp_ms, bus_frame.scene_id,
+        )
+        return bus_frame.bgr
 
     def _get_gray(self, screen: np.ndarray) -> np.ndarray:
         """Get grayscale version of screen, using cache if available."""
@@ -307,6 +364,31 @@ class GameStateDetector:
             return self._cache.gray
         return cv2.cvtColor(screen, cv2.COLOR_BGR2GRAY)
 
+    def _gated(self, key: tuple, compute):
+        """
+        Frame-change gate for state classification: reuse a result computed earlier on the
+        same bus scene. Only frames captured through the bus carry a scene id; injected
+        frames always match.
+        """
+        scene = self._cache.scene_id if self.change_gate else 0
+        if not scene:
+            return compute()
+        gate = self._gate
+        if gate.scene_id != scene:
+            gate.scene_id = scene
+            gate.results.clear()
+        elif key in gate.results:
+            gate.hits += 1
+            return gate.results[key]
+        gate.misses += 1
+        result = compute()
+        gate.results[key] = result
+        return result
+
+    def gate_stats(self) -> dict:
+        """Change-gate counters: hits = scans skipped because the screen had not changed."""
+        return {"scene_id": self._gate.scene_id, "hits": self._gate.hits, "misses": self._gate.misses}
+
     # ── Core Matching Engine ──────────────────────────────────────
 
     def _match_single(
@@ -321,7 +403,9 @@ class GameStateDetector:
         Match one template entry against screen.
         Returns (max_val, max_loc) with loc in absolute screen coordinates.
         """
-        if use_color and screen_color is not None:
+        self.match_calls += 1
+        use_color = use_color and screen_color is not None
+        if use_color:
             tmpl = entry["color"]
             screen_src = screen_color
         else:
@@ -329,26 +413,42 @@ class GameStateDetector:
             screen_src = screen_gray
 
         roi = entry.get("roi")
-
         if roi:
             x1, y1, x2, y2 = roi
             region = screen_src[y1:y2, x1:x2]
-            if region.shape[0] < tmpl.shape[0] or region.shape[1] < tmpl.shape[1]:
-                region = screen_src
-                roi = None
-        else:
-            region = screen_src
+            if region.shape[0] >= tmpl.shape[0] and region.shape[1] >= tmpl.shape[1]:
+                return self._match_region(region, tmpl, (x1, y1))
+            return self._match_region(screen_src, tmpl, (0, 0))
+
+        # Un-hinted template: learned ROI first; a miss there stands unless the learner
+        # says a full-frame re-check (pyramid if opted in) is due
+        learner = self.roi_learner
+        learned = learner.roi_for(entry.get("file")) if learner else None
+        if learned:
+            x1, y1, x2, y2 = learned
+            max_val, max_loc = self._match_region(screen_src[y1:y2, x1:x2], tmpl, (x1, y1))
+            if max_val >= threshold:
+                learner.record(entry["file"], max_loc, (tmpl.shape[1], tmpl.shape[0]))
+                return max_val, max_loc
+            if not learner.should_fallback(entry["file"], self._cache.scene_id):
+                return max_val, max_loc
+
+        pyramid = match_entry(screen_src, entry, threshold, use_color, self._scaled_frames)
+        max_val, max_loc = pyramid if pyramid is not None else self._match_region(screen_src, tmpl, (0, 0))
+        if learner and max_val >= threshold and "file" in entry:
+            learner.record(entry["file"], max_loc, (tmpl.shape[1], tmpl.shape[0]), fallback=bool(learned))
+        return max_val, max_loc
 
+    @staticmethod
+    def _match_region(
+        region: np.ndarray, tmpl: np.ndarray, offset: tuple[int, int],
+    ) -> tuple[float, tuple[int, int]]:
+        """matchTemplate on region; loc translated back to absolute screen coordinates."""
         if region.shape[0] < tmpl.shape[0] or region.shape[1] < tmpl.shape[1]:
             return 0.0, (0, 0)
-
         res = cv2.matchTemplate(region, tmpl, cv2.TM_CCOEFF_NORMED)
         _, max_val, _, max_loc = cv2.minMaxLoc(res)
-
-        if roi:
-            max_loc = (max_loc[0] + roi[0], max_loc[1] + roi[1])
-
-        return max_val, max_loc
+        return max_val, (max_loc[0] + offset[0], max_loc[1] + offset[1])
 
     # ── Diagnostic Helpers ─────────────────────────────────────────
 
@@ -437,15 +537,66 @@ class GameStateDetector:
                     return name
         return None
 
+    # ── Batched Matching (full score vectors) ─────────────────────
+
+    def _batch_matcher(self, category: str, use_color: bool = False) -> BatchMatcher:
+        key = (category, use_color)
+        matcher = self._batch_matchers.get(key)
+        if matcher is None:
+            matcher = BatchMatcher(self._registry.get(category, {}), use_color=use_color)
+            self._batch_matchers[key] = matcher
+        return matcher
+
+    def score_categories(
+        self, screen: np.ndarray, categories: list[str], threshold: float = 0.8,
+        use_color: bool = False, _caller: str = "score_categories",
+    ) -> dict[str, BatchScores]:
+        """Score every template of every category against one frame in a single parallel pass."""
+        matchers = [self._batch_matcher(c, use_color) for c in categories]
+        results = match_many(
+            matchers, self._get_gray(screen), screen if use_color else None, threshold=threshold,
+        )
+        if self.roi_learner:
+            # Feed un-hinted hits to the learner (batch groups themselves stay static)
+            for matcher, scores in zip(matchers, results):
+                for i in np.flatnonzero(scores.scores >= threshold):
+                    entry = matcher.entries[i]
+                    if entry.get("roi") is None and "file" in entry:
+                        self.roi_learner.record(entry["file"], scores.locs[i], scores.sizes[i])
+        if self.diagnostic_mode:
+            for scores in results:
+                for name, conf, ms in zip(scores.names, scores.scores, scores.times_ms):
+                    self._record_diag(_caller, name, float(conf), threshold, float(ms), conf >= threshold, use_color)
+        return dict(zip(categories, results))
+
+    def _classify_state(self, scores: BatchScores, threshold: float, serial: Optional[str] = None) -> str:
+        """Same decision as _match_state_from_screen, read off a full score vector."""
+        last = self._last_matched_state
+        state = None
+        if last and scores.score(last) >= threshold:
+            state = last
+        if state is None:
+            state = scores.first_passing(list(_STATE_PRIORITY) + list(_STATE_BASE), threshold)
+        self._last_matched_state = state
+        if self.transitions:
+            self.transitions.observe(serial, last, state)
+        return state or UNKNOWN_STATE
+
     # ── State Detection (unique logic — priority ordering + early exit cache) ──
 
-    def _match_state_from_screen(self, screen: np.ndarray, threshold: float = 0.8) -> str:
-        """Core state matching with early-exit cache + priority ordering."""
+    def _match_state_from_screen(
+        self, screen: np.ndarray, threshold: float = 0.8, serial: Optional[str] = None,
+    ) -> str:
+        """Core state matching: last state → predicted next states (never above priority) → priority → base."""
         screen_gray = self._get_gray(screen)
         state_dict = self.templates
         diag = self.diagnostic_mode
+        scores: dict[str, float] = {}   # each state is matched at most once per frame
 
-        def _check_entries(state_name: str) -> bool:
+        def _score(state_name: str) -> float:
+            if state_name in scores:
+                return scores[state_name]
+            best = 0.0
             for entry in state_dict[state_name]:
                 t0 = time.perf_counter()
                 max_val, _ = self._match_single(screen_gray, entry, threshold)
@@ -453,35 +604,46 @@ class GameStateDetector:
                 matched = max_val >= threshold
                 if diag:
                     self._record_diag("check_state", state_name, max_val, threshold, elapsed, matched)
+                best = max(best, max_val)
                 if matched:
-                    return True
-            return False
-
-        # Early exit: try last matched state first (~90% hit rate in steady states)
-        if self._last_matched_state and self._last_matched_state in state_dict:
-            if _check_entries(self._last_matched_state):
-                return self._last_matched_state
-
-        # Priority scan
-        for state_name in _STATE_PRIORITY:
-            if state_name == self._last_matched_state:
-                continue
-            if state_name in state_dict:
-                if _check_entries(state_name):
-                    self._last_matched_state = state_name
-                    return state_name
-
-        # Base states
-        for state_name in _STATE_BASE:
-            if state_name == self._last_matched_state:
-                continue
-            if state_name in state_dict:
-                if _check_entries(state_name):
-                    self._last_matched_state = state_name
+                    break
+            scores[state_name] = best
+            return best
+
+        def _decide() -> Optional[str]:
+            last = self._last_matched_state
+            # Early exit: try last matched state first (~90% hit rate in steady states)
+            if last and last in state_dict and _score(last) >= threshold:
+                return last
+
+            order = list(_STATE_PRIORITY) + list(_STATE_BASE)
+
+            # Likely next states (learned transitions) — a confident hit skips the scan after
+            # checking only the higher-ranked states that share a template or screen region
+            # with it (STATE_CONFLICTS), so overlapping screens still resolve by priority
+            if self.transitions:
+                action = self.transitions.last_action(serial)
+                for state_name in self.transitions.predict(last, action):
+                    if state_name not in state_dict or state_name not in _STATE_CONFLICTS:
+                        continue
+                    if _score(state_name) < threshold + TRANSITION_CONFIDENT_MARGIN:
+                        continue
+                    conflicts = _STATE_CONFLICTS[state_name]
+                    if not any(s in state_dict and _score(s) >= threshold for s in conflicts):
+                        return state_name
+
+            # Priority scan, then base states
+            for state_name in order:
+                if state_name in state_dict and _score(state_name) >= threshold:
                     return state_name
+            return None
 
-        self._last_matched_state = None
-        return UNKNOWN_STATE
+        prev = self._last_matched_state
+        state = _decide()
+        self._last_matched_state = state
+        if self.transitions:
+            self.transitions.observe(serial, prev, state)
+        return state or UNKNOWN_STATE
 
     # ── Public API ────────────────────────────────────────────────
 
@@ -494,24 +656,40 @@ class GameStateDetector:
         screen = self.screencap_memory(serial)
         if screen is None:
             return ERROR_CAPTURE
-        return self._match_state_from_screen(screen, threshold)
+        return self._gated(
+            ("check_state", threshold), lambda: self._match_state_from_screen(screen, threshold, serial),
+        )
 
     def check_state_full(self, serial: str, threshold: float = 0.8) -> dict:
-        """Comprehensive state check. Single screencap, checks ALL categories."""
+        """
+        Comprehensive state check. Single screencap, ALL categories scored in one batched pass.
+        "scores" holds the full per-category score vectors ({category: BatchScores}).
+        """
         screen = self.screencap_memory(serial)
         if screen is None:
-            return {"state": ERROR_CAPTURE, "construction": None, "special": None, "screen": None}
+            return {"state": ERROR_CAPTURE, "construction": None, "special": None, "screen": None, "scores": {}}
+
+        return self._gated(
+            ("check_state_full", threshold), lambda: self._state_full_from_screen(screen, threshold, serial),
+        )
 
-        state = self._match_state_from_screen(screen, threshold)
+    def _state_full_from_screen(self, screen: np.ndarray, threshold: float, serial: Optional[str] = None) -> dict:
+        scores = self.score_categories(
+            screen, ["state", "construction", "special"], threshold, _caller="check_state_full",
+        )
+        state = self._classify_state(scores["state"], threshold, serial)
         construction = None
         special = None
 
         if state == UNKNOWN_STATE:
-            construction = self._find_name_only(screen, self.construction_templates, threshold=threshold)
+            construction = scores["construction"].first_passing(self.construction_templates, threshold)
             if not construction:
-                special = self._find_name_only(screen, self.special_templates, threshold=threshold)
+                special = scores["special"].first_passing(self.special_templates, threshold)
 
-        return {"state": state, "construction": construction, "special": special, "screen": screen}
+        return {
+            "state": state, "construction": construction, "special": special,
+            "screen": screen, "scores": scores,
+        }
 
     def is_menu_expanded(self, serial: str, threshold: float = 0.8) -> bool:
         """Checks if the expandable lobby menu is currently open."""
@@ -0,0 +1,191 @@
+"""
+State Transitions — learned "what screen comes next" model for state polling.
+
+check_state scans STATE_PRIORITY + STATE_BASE with only a last-state early exit, so
+every transition (lobby → menu, menu → lobby after BACK, ...) pays for most of the
+list. TransitionModel counts observed (previous state, last input) → next state and
+ranks the likely next states, so the detector can test those first.
+
+- Input events are reported by adb_helper (tap / swipe / back / text) via note_action(),
+  which also timestamps them for adaptive polling (last_input_at).
+- Observations come from GameStateDetector.check_state (online) and from workflow
+  logs ("[serial] Current detected state: X" lines) via fit_log_lines().
+- Counts persist in <templates_dir>/state_transitions.json next to learned ROIs.
+
+Usage:
+    model = get_transition_model(templates_dir)
+    model.note_action(serial, "back")
+    model.rank("IN-GAME LOBBY (PROFILE MENU)", "back")   # [(state, p), ...]
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import Counter
+from typing import Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# ── Module Constants ──────────────────────────────────────────────
+
+TRANSITIONS_FILE = "state_transitions.json"
+TRANSITION_ACTIONS = ("none", "tap", "swipe", "back", "text")
+TRANSITION_MIN_COUNT = 3        # Context needs this many observations before it predicts
+TRANSITION_MIN_PROB = 0.10      # Ignore unlikely next states
+TRANSITION_TOP_K = 3            # Predicted states tested ahead of the priority scan
+TRANSITION_SAVE_EVERY = 50      # Observations between autosaves
+
+NO_STATE = "-"                  # Key for "no known previous state"
+
+_LOG_STATE_RE = re.compile(r"^\[(?P<serial>[^\]]+)\] Current detected state: (?P<state>.+?)\s*$")
+_LOG_ACTION_RE = re.compile(r"^\[(?P<serial>[^\]]+)\].*?\b(?P<action>BACK|back|Tap|tap|Swipe|swipe)", re.ASCII)
+
+
+def _context(prev: Optional[str], action: str) -> str:
+    return f"{prev or NO_STATE}|{action if action in TRANSITION_ACTIONS else 'none'}"
+
+
+class TransitionModel:
+    """Counts of next state per (previous state, last action), with JSON persistence."""
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._counts: dict[str, Counter] = {}
+        self._last_action: dict[str, str] = {}
+        self._unsaved = 0
+        if path:
+            self._load()
+
+    # ── Persistence ───────────────────────────────────────────────
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self._counts = {ctx: Counter(nxt) for ctx, nxt in data.get("counts", {}).items()}
+            logger.info("Loaded %d transition contexts from %s", len(self._counts), self.path)
+        except Exception as e:
+            logger.warning("Ignoring unreadable transition file %s: %s", self.path, e)
+            self._counts = {}
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        with self._lock:
+            data = {"version": 1, "counts": {ctx: dict(c) for ctx, c in self._counts.items()}}
+            self._unsaved = 0
+        tmp = self.path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=1, sort_keys=True)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logger.warning("Could not save transitions to %s: %s", self.path, e)
+
+    # ── Input events ──────────────────────────────────────────────
+
+    def note_action(self, serial: str, action: str) -> None:
+        """Remember the last input sent to serial (consumed by the next observation)."""
+        self._last_action[serial] = action
+
+    def last_action(self, serial: Optional[str]) -> str:
+        return self._last_action.get(serial, "none") if serial else "none"
+
+    # ── Learning / prediction ─────────────────────────────────────
+
+    def observe(self, serial: Optional[str], prev: Optional[str], state: Optional[str]) -> None:
+        """Record prev → state under the last action sent to serial, then clear that action."""
+        action = self._last_action.pop(serial, "none") if serial else "none"
+        self.add(prev, action, state)
+
+    def add(self, prev: Optional[str], action: str, state: Optional[str]) -> None:
+        with self._lock:
+            self._counts.setdefault(_context(prev, action), Counter())[state or NO_STATE] += 1
+            self._unsaved += 1
+            due = self.path and self._unsaved >= TRANSITION_SAVE_EVERY
+        if due:
+            self.save()
+
+    def rank(self, prev: Optional[str], action: str = "none") -> list[tuple[str, float]]:
+        """Likely next states for this context, most probable first. [] when not learned yet."""
+        with self._lock:
+            counts = self._counts.get(_context(prev, action))
+            if not counts and action != "none":
+                counts = self._counts.get(_context(prev, "none"))
+            if not counts:
+                return []
+            total = sum(counts.values())
+            if total < TRANSITION_MIN_COUNT:
+                return []
+            return [
+                (state, n / total) for state, n in counts.most_common()
+                if state != NO_STATE and n / total >= TRANSITION_MIN_PROB
+            ]
+
+    def predict(self, prev: Optional[str], action: str = "none", k: int = TRANSITION_TOP_K) -> list[str]:
+        return [state for state, _ in self.rank(prev, action)[:k]]
+
+    def fit_log_lines(self, lines: Iterable[str]) -> int:
+        """Learn from workflow stdout logs. Returns the number of transitions added."""
+        prev: dict[str, Optional[str]] = {}
+        action: dict[str, str] = {}
+        added = 0
+        for line in lines:
+            m = _LOG_STATE_RE.match(line)
+            if m:
+                serial, state = m.group("serial"), m.group("state")
+                state = None if state == "None" else state
+                if serial in prev:
+                    self.add(prev[serial], action.pop(serial, "none"), state)
+                    added += 1
+                prev[serial] = state
+                continue
+            m = _LOG_ACTION_RE.match(line)
+            if m:
+                action[m.group("serial")] = m.group("action").lower()
+        return added
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "contexts": len(self._counts),
+                "observations": sum(sum(c.values()) for c in self._counts.values()),
+            }
+
+
+# ── Per-templates_dir registry + input hook ───────────────────────
+
+_MODELS: dict[str, TransitionModel] = {}
+_MODELS_LOCK = threading.Lock()
+_LAST_INPUT_AT: dict[str, float] = {}
+
+
+def get_transition_model(templates_dir: str) -> TransitionModel:
+    """Shared model for a templates directory (one per process)."""
+    path = os.path.join(os.path.abspath(templates_dir), TRANSITIONS_FILE)
+    with _MODELS_LOCK:
+        model = _MODELS.get(path)
+        if model is None:
+            model = TransitionModel(path)
+            _MODELS[path] = model
+        return model
+
+
+def note_action(serial: str, action: str) -> None:
+    """Input hook for adb_helper: report a tap / swipe / back to every loaded model."""
+    _LAST_INPUT_AT[serial] = time.time()
+    with _MODELS_LOCK:
+        models = list(_MODELS.values())
+    for model in models:
+        model.note_action(serial, action)
+
+
+def last_input_at(serial: str) -> float:
+    """Wall-clock time of the last input sent to serial (0.0 if none yet)."""
+    return _LAST_INPUT_AT.get(serial, 0.0)
@@ -12,8 +12,8 @@ Writes structured JSONL logs to `logs/swap_account/` to track:
 
 import os
 import json
-from datetime import datetime
-from typing import Optional, Any
+from datetime import datetime, timedelta
+from typing import Iterator, Optional, Any
 
 _LOG_DIR = os.path.join(
     os.path.dirname(os.path.abspath(__file__)), "logs", "swap_account"
@@ -36,6 +36,24 @@ def _write_entry(entry: dict):
         pass  # Never crash the orchestrator
 
 
+def read_entries(event: Optional[str] = None, days: int = 7, log_dir: Optional[str] = None) -> Iterator[dict]:
+    """Yield logged entries of the last `days` days (oldest first), optionally of one event type."""
+    log_dir = log_dir or _LOG_DIR
+    for offset in range(days - 1, -1, -1):
+        day = (datetime.now() - timedelta(days=offset)).strftime("%Y-%m-%d")
+        log_file = os.path.join(log_dir, f"swap_{day}.jsonl")
+        if not os.path.exists(log_file):
+            continue
+        with open(log_file, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if event is None or entry.get("event") == event:
+                    yield entry
+
+
 def log_cross_emu_swap(
     old_emu: int,
     new_emu: int,
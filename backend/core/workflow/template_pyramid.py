@@ -0,0 +1,146 @@
+"""
+Template Pyramid — coarse-to-fine matching for templates searched over the full frame.
+
+Templates without an ROI hint are matched against the whole 960x540 frame, the slowest
+path in the detector. For templates opted in via PYRAMID_HINTS (detector_configs.py):
+
+1. Coarse: match the downscaled template (1/2 or 1/4) against the downscaled frame.
+2. Keep the top PYRAMID_TOP_K candidates (NMS). The best one is always refined; the
+   others only if their coarse score is within PYRAMID_COARSE_MARGIN of threshold.
+3. Fine: re-match at full resolution only in a small window around each candidate.
+
+Full-resolution scores/locations are returned, so thresholds stay unchanged.
+Accuracy/latency per template: TEST/detector_perf/report_pyramid.py.
+"""
+
+import threading
+from typing import Optional
+
+import cv2
+import numpy as np
+
+# ── Module Constants ──────────────────────────────────────────────
+
+PYRAMID_TOP_K = 3                # Candidates refined at full resolution
+PYRAMID_COARSE_MARGIN = 0.25     # Runner-up candidates refined only if coarse >= threshold - margin
+PYRAMID_REFINE_PAD = 4           # Full-res pixels around the upscaled candidate (covers rounding)
+PYRAMID_MIN_TEMPLATE_PX = 12     # Downscaled template side must stay >= this, else no pyramid
+
+
+def downscale(img: np.ndarray, scale: float) -> np.ndarray:
+    h, w = img.shape[:2]
+    return cv2.resize(img, (max(1, round(w * scale)), max(1, round(h * scale))), interpolation=cv2.INTER_AREA)
+
+
+def supports_scale(tmpl: np.ndarray, scale: float) -> bool:
+    """True when the template is still big enough to be discriminative at this scale."""
+    h, w = tmpl.shape[:2]
+    return min(h, w) * scale >= PYRAMID_MIN_TEMPLATE_PX
+
+
+def _top_k(res: np.ndarray, k: int, suppress: tuple[int, int]) -> list[tuple[float, tuple[int, int]]]:
+    """Top-k peaks of a match map with box NMS (suppress = (w, h) in map pixels)."""
+    res = res.copy()
+    sw, sh = suppress
+    peaks = []
+    for _ in range(k):
+        _, max_val, _, (x, y) = cv2.minMaxLoc(res)
+        if max_val <= -1.0:
+            break
+        peaks.append((max_val, (x, y)))
+        res[max(0, y - sh):y + sh + 1, max(0, x - sw):x + sw + 1] = -1.0
+    return peaks
+
+
+def match_coarse_to_fine(
+    screen: np.ndarray,
+    tmpl: np.ndarray,
+    tmpl_small: np.ndarray,
+    screen_small: np.ndarray,
+    scale: float,
+    threshold: float,
+) -> tuple[float, tuple[int, int]]:
+    """
+    Coarse-to-fine TM_CCOEFF_NORMED. Returns (max_val, max_loc) at full resolution;
+    when no refine window fits, falls back to a plain full-resolution match.
+    """
+    if screen_small.shape[0] < tmpl_small.shape[0] or screen_small.shape[1] < tmpl_small.shape[1]:
+        return 0.0, (0, 0)
+
+    coarse = cv2.matchTemplate(screen_small, tmpl_small, cv2.TM_CCOEFF_NORMED)
+    th, tw = tmpl.shape[:2]
+    candidates = _top_k(coarse, PYRAMID_TOP_K, (tmpl_small.shape[1] // 2, tmpl_small.shape[0] // 2))
+    if not candidates:
+        return 0.0, (0, 0)
+
+    best_val, best_loc = -1.0, (0, 0)
+    sh, sw = screen.shape[:2]
+    pad = PYRAMID_REFINE_PAD + int(round(1 / scale))
+    for rank, (coarse_val, (cx, cy)) in enumerate(candidates):
+        # Thin/text templates lose a lot at odd offsets when downscaled → always confirm the top peak
+        if rank > 0 and coarse_val < threshold - PYRAMID_COARSE_MARGIN:
+            continue
+        fx, fy = int(round(cx / scale)), int(round(cy / scale))
+        x1, y1 = max(0, fx - pad), max(0, fy - pad)
+        x2, y2 = min(sw, fx + tw + pad), min(sh, fy + th + pad)
+        region = screen[y1:y2, x1:x2]
+        if region.shape[0] < th or region.shape[1] < tw:
+            continue
+        res = cv2.matchTemplate(region, tmpl, cv2.TM_CCOEFF_NORMED)
+        _, max_val, _, (mx, my) = cv2.minMaxLoc(res)
+        if max_val > best_val:
+            best_val, best_loc = max_val, (mx + x1, my + y1)
+
+    if best_val < 0:
+        # A coarse score never decides a match — confirm over the whole frame instead
+        if sh < th or sw < tw:
+            return 0.0, (0, 0)
+        _, max_val, _, max_loc = cv2.minMaxLoc(cv2.matchTemplate(screen, tmpl, cv2.TM_CCOEFF_NORMED))
+        return float(max_val), max_loc
+    return float(best_val), best_loc
+
+
+def build_entry_pyramid(entry: dict, scale: Optional[float]) -> Optional[dict]:
+    """Pre-downscaled template pair for a TemplateEntry, or None if the template is too small."""
+    if not scale or not supports_scale(entry["gray"], scale):
+        return None
+    return {
+        "scale": scale,
+        "gray": downscale(entry["gray"], scale),
+        "color": downscale(entry["color"], scale),
+    }
+
+
+def match_entry(
+    screen: np.ndarray, entry: dict, threshold: float, use_color: bool, cache: "ScaledFrameCache",
+) -> Optional[tuple[float, tuple[int, int]]]:
+    """Full-frame pyramid match for a TemplateEntry; None when the entry has no pyramid."""
+    pyr = entry.get("pyramid")
+    if pyr is None:
+        return None
+    key = "color" if use_color else "gray"
+    scale = pyr["scale"]
+    return match_coarse_to_fine(screen, entry[key], pyr[key], cache.get(screen, scale), scale, threshold)
+
+
+class ScaledFrameCache:
+    """Downscaled screens for the most recent frames, so N pyramid templates share one resize."""
+
+    MAX_ENTRIES = 4   # gray + color at up to two scales for the current frame
+
+    def __init__(self) -> None:
+        # (id(screen), scale) -> (screen, small); screen kept so its id can't be recycled
+        self._frames: dict[tuple[int, float], tuple[np.ndarray, np.ndarray]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, screen: np.ndarray, scale: float) -> np.ndarray:
+        key = (id(screen), scale)
+        with self._lock:
+            hit = self._frames.get(key)
+            if hit is not None and hit[0] is screen:
+                return hit[1]
+            if len(self._frames) >= self.MAX_ENTRIES:
+                self._frames.clear()
+            small = downscale(screen, scale)
+            self._frames[key] = (screen, small)
+            return small
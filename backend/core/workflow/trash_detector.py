@@ -6,7 +6,7 @@ against a clean baseline image. Includes multi-frame voting and pixel stability
 to reject pet idle animations.
 
 Adapted from standalone clean_game_trash module for production use.
-Uses detector.screencap_memory() instead of file-based screenshots.
+Uses the detector's shared frame bus instead of file-based screenshots.
 """
 from __future__ import annotations
 
@@ -107,23 +107,28 @@ def detect_with_voting(
     stability_threshold: float = _STABILITY_THRESHOLD,
 ) -> list[Detection]:
     """
-    Capture N frames via detector.screencap_memory(), detect trash on each,
+    Capture N distinct frames via the detector's frame bus, detect trash on each,
     apply position voting + pixel stability to filter false positives.
 
     Returns list of confirmed Detection objects.
     """
     frames_detections: list[list[Detection]] = []
     frame_images: list[np.ndarray] = []
+    bus = detector.frame_bus(serial)
+    last_frame_id = 0
 
     for i in range(num_frames):
         if i > 0:
             time.sleep(frame_interval)
 
-        screen = detector.screencap_memory(serial)
-        if screen is None:
+        # Each vote needs a distinct capture; a frame another consumer just took is fine
+        bus_frame = bus.get(newer_than=last_frame_id)
+        if bus_frame is None:
             frames_detections.append([])
             continue
 
+        last_frame_id = bus_frame.frame_id
+        screen = bus_frame.bgr
         frame_images.append(screen)
         detections = detect_trash(screen, clean_img, score_threshold=score_threshold)
         frames_detections.append(detections)
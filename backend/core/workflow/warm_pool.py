@@ -0,0 +1,165 @@
+"""
+Warm Pool — pre-boot the next emulators while the current one works.
+
+In sequential mode a cross-emulator swap launches the next emulator, waits 60–180 s for
+Android to boot and then runs startup_to_lobby, all after the previous account finished.
+WarmPool runs that boot + lobby work in the background for the emulators coming up in
+the queue, so the swap only has to wait for whatever is left of it.
+
+- WarmBudget caps how many emulators may be warm at once: max_warm, and how many extra
+  instances fit the RAM / CPU budget next to the one that is working.
+- refresh(active, lookahead) starts warm-up tasks for the lookahead window and shuts
+  down idle warm instances that fell out of it.
+- claim(emu) hands a warm (or still warming) emulator to the swap and waits for it;
+  release(emu) keeps the emulator just left warm if it is still in the window.
+
+Usage:
+    pool = WarmPool(WarmBudget(max_warm=1), warm_fn=orch._warm_emulator, quit_fn=orch._quit_emulator)
+    pool.refresh(active_emu=0, lookahead=[1, 2])
+    ok = await pool.claim(1)      # None → was not warm, do a normal cross-emu swap
+    await pool.shutdown()       # quits the warm instances that were never claimed
+"""
+
+import asyncio
+import os
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+# ── Module Constants ──────────────────────────────────────────────
+
+DEFAULT_RAM_PER_EMULATOR_MB = 2048
+DEFAULT_CORES_PER_EMULATOR = 2
+
+
+@dataclass
+class WarmBudget:
+    max_warm: int = 1
+    ram_budget_mb: int = 0          # RAM for all emulators incl. the active one; 0 = no limit
+    ram_per_emulator_mb: int = DEFAULT_RAM_PER_EMULATOR_MB
+    cpu_budget_cores: int = 0       # host cores for emulators; 0 = all cores
+    cores_per_emulator: int = DEFAULT_CORES_PER_EMULATOR
+
+    @classmethod
+    def from_misc(cls, misc: Dict[str, Any]) -> "WarmBudget":
+        def _int(key: str, default: int) -> int:
+            try:
+                return int(misc.get(key, default) or 0)
+            except (TypeError, ValueError):
+                return default
+
+        return cls(
+            max_warm=_int("max_warm_emulators", 1),
+            ram_budget_mb=_int("warm_ram_budget_mb", 0),
+            ram_per_emulator_mb=_int("ram_per_emulator_mb", DEFAULT_RAM_PER_EMULATOR_MB) or DEFAULT_RAM_PER_EMULATOR_MB,
+            cpu_budget_cores=_int("warm_cpu_budget_cores", 0),
+            cores_per_emulator=_int("cores_per_emulator", DEFAULT_CORES_PER_EMULATOR) or DEFAULT_CORES_PER_EMULATOR,
+        )
+
+    def capacity(self, running: int = 1) -> int:
+        """Warm instances allowed next to `running` working emulators."""
+        limits = [self.max_warm]
+        if self.ram_budget_mb > 0:
+            limits.append(self.ram_budget_mb // self.ram_per_emulator_mb - running)
+        cores = self.cpu_budget_cores if self.cpu_budget_cores > 0 else (os.cpu_count() or 1)
+        limits.append(cores // self.cores_per_emulator - running)
+        return max(0, min(limits))
+
+
+class WarmPool:
+    """Background warm-up tasks per emulator index."""
+
+    def __init__(
+        self,
+        budget: WarmBudget,
+        warm_fn: Callable[[int], Awaitable[bool]],
+        quit_fn: Callable[[int], Awaitable[Any]],
+    ):
+        self.budget = budget
+        self._warm_fn = warm_fn
+        self._quit_fn = quit_fn
+        self._tasks: Dict[int, asyncio.Task] = {}
+        self._quits: List[asyncio.Task] = []
+        self.window: List[int] = []
+
+        self.started = 0
+        self.hits = 0       # claims that found the emulator warm or warming
+        self.misses = 0
+        self.cooled = 0     # warm instances shut down outside the window
+
+    def refresh(self, active_emu: Optional[int], lookahead: List[int]) -> List[int]:
+        """Warm the first emulators of lookahead that fit the budget; cool the rest. Returns the window."""
+        window = [e for e in dict.fromkeys(lookahead) if e != active_emu][: self.budget.capacity()]
+        for emu in list(self._tasks):
+            if emu not in window:
+                self._cool(emu)
+        for emu in window:
+            if emu not in self._tasks:
+                print(f"[BotOrchestrator] Warm Pool: pre-booting Emu {emu} in the background.")
+                self._tasks[emu] = asyncio.create_task(self._warm_fn(emu))
+                self.started += 1
+        self.window = window
+        return window
+
+    def _cool(self, emu: int):
+        task = self._tasks.pop(emu)
+        print(f"[BotOrchestrator] Warm Pool: Emu {emu} left the lookahead window. Shutting it down.")
+        self._quits.append(asyncio.create_task(self._cool_down(emu, task)))
+        self.cooled += 1
+
+    async def _cool_down(self, emu: int, task: asyncio.Future):
+        """Cancel the warm-up and let it unwind before quitting, so it can't relaunch the instance."""
+        if not task.done():
+            task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        await self._quit_fn(emu)
+
+    def is_warm(self, emu: int) -> bool:
+        return emu in self._tasks
+
+    async def release(self, emu: int):
+        """The emulator the run just left: keep it warm if it is in the window, else shut it down."""
+        if emu in self._tasks:
+            return
+        if emu in self.window:
+            done = asyncio.get_running_loop().create_future()
+            done.set_result(True)
+            self._tasks[emu] = done
+        else:
+            await self._quit_fn(emu)
+
+    async def claim(self, emu: int) -> Optional[bool]:
+        """Take emu out of the pool, waiting for its warm-up. None if it was not being warmed."""
+        task = self._tasks.pop(emu, None)
+        if task is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        try:
+            return bool(await task)
+        except Exception as e:
+            print(f"[BotOrchestrator] Warm Pool: warm-up of Emu {emu} failed: {e}")
+            return False
+
+    async def shutdown(self):
+        """Stop pending warm-ups and quit every pooled instance; the active (claimed) one is left running."""
+        pooled = list(self._tasks.items())
+        self._tasks.clear()
+        self._quits += [asyncio.create_task(self._cool_down(emu, task)) for emu, task in pooled]
+        await asyncio.gather(*self._quits, return_exceptions=True)
+        self._quits.clear()
+
+    @staticmethod
+    def _succeeded(task: asyncio.Future) -> bool:
+        return task.done() and not task.cancelled() and task.exception() is None and bool(task.result())
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "capacity": self.budget.capacity(),
+            "window": list(self.window),
+            "warming": sorted(e for e, t in self._tasks.items() if not t.done()),
+            "warm": sorted(e for e, t in self._tasks.items() if self._succeeded(t)),
+            "started": self.started,
+            "hits": self.hits,
+            "misses": self.misses,
+            "cooled": self.cooled,
+        }
@@ -10,6 +10,7 @@ import json
 import os
 from datetime import datetime
 from backend.config import config
+from backend.storage import db_pool
 
 
 # ──────────────────────────────────────────────
@@ -194,6 +195,26 @@ CREATE INDEX IF NOT EXISTS idx_accounts_emu ON accounts(emulator_id);
 CREATE INDEX IF NOT EXISTS idx_accounts_game_id ON accounts(game_id);
 CREATE INDEX IF NOT EXISTS idx_snap_game_id ON scan_snapshots(game_id);
 
+-- Read model: latest scan per game_id and per emulator with resources pivoted
+-- (maintained by save_scan_snapshot; NULL resource = not in that scan)
+CREATE TABLE IF NOT EXISTS account_latest_scan (
+    scope           TEXT NOT NULL,                  -- 'game' (key = game_id) / 'emu' (key = emulators.id)
+    scope_key       TEXT NOT NULL,
+    snapshot_id     INTEGER NOT NULL,
+    lord_name       TEXT DEFAULT '',
+    power           INTEGER DEFAULT 0,
+    hall_level      INTEGER DEFAULT 0,
+    market_level    INTEGER DEFAULT 0,
+    pet_token       INTEGER DEFAULT 0,
+    scan_status     TEXT DEFAULT '',
+    created_at      TEXT,
+    gold            INTEGER, gold_total INTEGER,
+    wood            INTEGER, wood_total INTEGER,
+    ore             INTEGER, ore_total  INTEGER,
+    mana            INTEGER, mana_total INTEGER,
+    PRIMARY KEY (scope, scope_key)
+);
+
 -- Activity execution history per account (v2 — fact table for Task page)
 CREATE TABLE IF NOT EXISTS account_activity_logs (
     id              INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -208,6 +229,7 @@ CREATE TABLE IF NOT EXISTS account_activity_logs (
     error_code      TEXT DEFAULT '',
     error_message   TEXT DEFAULT '',
     started_at      TEXT NOT NULL,
+    started_date    TEXT,           -- YYYY-MM-DD of started_at, for index range/equality filters
     finished_at     TEXT,
     duration_ms     INTEGER DEFAULT 0,
     attempts        INTEGER DEFAULT 1,
@@ -286,6 +308,193 @@ CREATE INDEX IF NOT EXISTS idx_debug_serial_time ON debug_logs(serial, created_a
 """
 
 
+SCAN_RESOURCE_TYPES = ("gold", "wood", "ore", "mana")
+
+LATEST_SCAN_COLUMNS = (
+    "snapshot_id", "lord_name", "power", "hall_level", "market_level", "pet_token",
+    "scan_status", "created_at",
+) + tuple(col for res in SCAN_RESOURCE_TYPES for col in (res, f"{res}_total"))
+
+
+def _latest_scan_upsert_sql(scope_key_expr: str, where: str) -> str:
+    """INSERT ... SELECT into account_latest_scan: snapshot row + pivoted resources."""
+    pivot = ",\n               ".join(
+        f"MAX(CASE WHEN r.resource_type = '{res}' THEN r.bag_value END), "
+        f"MAX(CASE WHEN r.resource_type = '{res}' THEN r.total_value END)"
+        for res in SCAN_RESOURCE_TYPES
+    )
+    return f"""INSERT INTO account_latest_scan (scope, scope_key, {", ".join(LATEST_SCAN_COLUMNS)})
+        SELECT ?, {scope_key_expr}, s.id, s.lord_name, s.power, s.hall_level, s.market_level,
+               s.pet_token, s.scan_status, s.created_at,
+               {pivot}
+        FROM scan_snapshots s
+        LEFT JOIN scan_resources r ON r.snapshot_id = s.id
+        WHERE {where}
+        GROUP BY s.id
+        ON CONFLICT(scope, scope_key) DO UPDATE SET
+            {", ".join(f"{col} = excluded.{col}" for col in LATEST_SCAN_COLUMNS)}"""
+
+
+_LATEST_SCAN_BY_GAME_SQL = _latest_scan_upsert_sql("s.game_id", "s.id = ?")
+_LATEST_SCAN_BY_EMU_SQL = _latest_scan_upsert_sql("CAST(s.emulator_id AS TEXT)", "s.id = ?")
+
+# Accounts + emulator + latest scan in one query: by game_id, else the emulator's latest
+_ACCOUNT_SELECT_SQL = f"""SELECT
+       a.id as account_id, a.game_id,
+       a.lord_name as acc_lord_name,
+       a.login_method, a.email, a.provider, a.alliance, a.note,
+       a.is_active,
+       a.created_at as account_created_at, a.updated_at,
+       e.id as emulator_db_id, e.emu_index, e.serial, e.name as emu_name,
+       e.status as emu_status, e.last_seen_at,
+       {", ".join(f"g.{col} AS g_{col}" for col in LATEST_SCAN_COLUMNS)},
+       {", ".join(f"x.{col} AS x_{col}" for col in LATEST_SCAN_COLUMNS)}
+   FROM accounts a
+   LEFT JOIN emulators e ON a.emulator_id = e.id
+   LEFT JOIN account_latest_scan g
+          ON g.scope = 'game' AND g.scope_key = a.game_id
+   LEFT JOIN account_latest_scan x
+          ON g.snapshot_id IS NULL AND x.scope = 'emu' AND x.scope_key = CAST(e.id AS TEXT)"""
+
+
+# task_daily_state row per (date, account, activity): runs / duration summed over the day,
+# the other columns come from the day's latest log (started_at, then id).
+_TASK_DAILY_LATEST_COLUMNS = (
+    "game_id", "group_id", "emulator_id", "emulator_name",
+    "activity_name", "status", "last_run", "last_error",
+)
+
+_TASK_DAILY_LATEST_WINS = ",\n        ".join(
+    f"{col} = CASE WHEN excluded.last_run >= COALESCE(last_run, '') THEN excluded.{col} ELSE {col} END"
+    for col in _TASK_DAILY_LATEST_COLUMNS
+)
+
+# A new account_activity_logs row (named params as in the log row; status RUNNING for
+# workflow starts, SUCCESS for manual marks)
+TASK_DAILY_STATE_LOG_SQL = f"""INSERT INTO task_daily_state (
+        date, account_id, game_id, group_id, emulator_id, emulator_name,
+        activity_id, activity_name, status, last_run, runs_today, total_duration_ms, last_error
+    ) VALUES (
+        substr(:started_at, 1, 10), :account_id, :game_id, :group_id, :emulator_id,
+        COALESCE((SELECT name FROM emulators WHERE emu_index = :emulator_id), ''),
+        :activity_id, :activity_name, :status, :started_at, 1, :duration_ms, :error_message
+    )
+    ON CONFLICT(date, account_id, activity_id) DO UPDATE SET
+        runs_today = runs_today + 1,
+        total_duration_ms = total_duration_ms + excluded.total_duration_ms,
+        {_TASK_DAILY_LATEST_WINS}"""
+
+# A log row that just got its final status (:log_id, :status, :duration_ms, :error_message)
+TASK_DAILY_STATE_FINISH_SQL = """WITH l AS (
+        SELECT substr(started_at, 1, 10) AS date, account_id, activity_id, started_at
+        FROM account_activity_logs WHERE id = :log_id
+    )
+    UPDATE task_daily_state SET
+        total_duration_ms = total_duration_ms + :duration_ms,
+        status = CASE WHEN last_run = (SELECT started_at FROM l) THEN :status ELSE status END,
+        last_error = CASE WHEN last_run = (SELECT started_at FROM l) THEN :error_message ELSE last_error END
+    WHERE (date, account_id, activity_id) = (SELECT date, account_id, activity_id FROM l)"""
+
+# Full recompute from the logs (repair tool); :account_id / :activity_id NULL = all
+TASK_DAILY_STATE_DELETE_SQL = """DELETE FROM task_daily_state
+    WHERE date = :date
+      AND (:account_id IS NULL OR account_id = :account_id)
+      AND (:activity_id IS NULL OR activity_id = :activity_id)"""
+
+TASK_DAILY_STATE_REBUILD_SQL = """
+    WITH daily_logs AS (
+        SELECT
+            aal.account_id,
+            aal.game_id,
+            aal.group_id,
+            aal.emulator_id,
+            aal.activity_id,
+            aal.activity_name,
+            aal.status,
+            aal.started_at,
+            aal.duration_ms,
+            aal.error_message,
+            ROW_NUMBER() OVER (
+                PARTITION BY aal.account_id, aal.activity_id
+                ORDER BY aal.started_at DESC, aal.id DESC
+            ) AS rn
+        FROM account_activity_logs aal
+        WHERE aal.started_date = :date
+          AND (:account_id IS NULL OR aal.account_id = :account_id)
+          AND (:activity_id IS NULL OR aal.activity_id = :activity_id)
+    ),
+    latest AS (
+        SELECT * FROM daily_logs WHERE rn = 1
+    ),
+    agg AS (
+        SELECT
+            account_id,
+            activity_id,
+            COUNT(*) AS runs_today,
+            COALESCE(SUM(duration_ms), 0) AS total_duration_ms
+        FROM daily_logs
+        GROUP BY account_id, activity_id
+    )
+    INSERT INTO task_daily_state (
+        date, account_id, game_id, group_id,
+        emulator_id, emulator_name,
+        activity_id, activity_name, status,
+        last_run, runs_today, total_duration_ms, last_error
+    )
+    SELECT
+        :date,
+        l.account_id,
+        l.game_id,
+        l.group_id,
+        l.emulator_id,
+        COALESCE(e.name, ''),
+        l.activity_id,
+        l.activity_name,
+        l.status,
+        l.started_at,
+        a.runs_today,
+        a.total_duration_ms,
+        COALESCE(l.error_message, '')
+    FROM latest l
+    JOIN agg a
+      ON a.account_id = l.account_id
+     AND a.activity_id = l.activity_id
+    LEFT JOIN emulators e ON l.emulator_id = e.emu_index
+"""
+
+
+def _attach_latest_scan(acc: dict) -> dict:
+    """Fold the g_* (by game_id) / x_* (emulator fallback) columns into the account dict."""
+    by_game = {col: acc.pop(f"g_{col}") for col in LATEST_SCAN_COLUMNS}
+    by_emu = {col: acc.pop(f"x_{col}") for col in LATEST_SCAN_COLUMNS}
+    scan = by_game if by_game["snapshot_id"] is not None else by_emu
+
+    if scan["snapshot_id"] is not None:
+        acc["lord_name"] = scan["lord_name"] or acc.get("acc_lord_name", "")
+        acc["power"] = scan["power"]
+        acc["hall_level"] = scan["hall_level"]
+        acc["market_level"] = scan["market_level"]
+        acc["pet_token"] = scan["pet_token"]
+        acc["scan_status"] = scan["scan_status"]
+        acc["last_scan_at"] = scan["created_at"]
+        acc["scan_id"] = scan["snapshot_id"]
+        for res in SCAN_RESOURCE_TYPES:
+            if scan[res] is not None:
+                acc[res] = scan[res]
+                acc[f"{res}_total"] = scan[f"{res}_total"]
+    else:
+        acc["lord_name"] = acc.get("acc_lord_name", "")
+        acc["power"] = 0
+        acc["hall_level"] = 0
+        acc["market_level"] = 0
+        acc["pet_token"] = 0
+        acc["last_scan_at"] = ""
+
+    # Clean up internal key
+    acc.pop("acc_lord_name", None)
+    return acc
+
+
 # ──────────────────────────────────────────────
 # Migration: v1 → v2
 # ──────────────────────────────────────────────
@@ -473,6 +682,60 @@ def _ensure_debug_logs_resolve_columns(conn: sqlite3.Connection):
         print("[DB Migration] Added resolve columns to debug_logs")
 
 
+# Per-day filters on account_activity_logs (KPI, Monitor, Task page) go through these;
+# the group index also carries account_id / duration_ms so the KPI aggregates never
+# touch the table. Created here rather than in CREATE_TABLES_SQL because older
+# databases only get started_date from the migration below.
+ACTIVITY_LOG_DATE_INDEXES_SQL = """
+CREATE INDEX IF NOT EXISTS idx_aal_group_date_status
+    ON account_activity_logs(group_id, started_date, status, account_id, duration_ms);
+CREATE INDEX IF NOT EXISTS idx_aal_account_date
+    ON account_activity_logs(account_id, started_date, started_at DESC);
+CREATE TRIGGER IF NOT EXISTS trg_aal_started_date
+    AFTER INSERT ON account_activity_logs
+    WHEN NEW.started_date IS NULL
+BEGIN
+    UPDATE account_activity_logs SET started_date = substr(NEW.started_at, 1, 10) WHERE id = NEW.id;
+END;
+"""
+
+
+def _ensure_activity_log_started_date(conn: sqlite3.Connection):
+    """Add and backfill account_activity_logs.started_date, then its indexes."""
+    cols = [row[1] for row in conn.execute("PRAGMA table_info(account_activity_logs)").fetchall()]
+    if "started_date" not in cols:
+        conn.execute("ALTER TABLE account_activity_logs ADD COLUMN started_date TEXT")
+        cursor = conn.execute(
+            "UPDATE account_activity_logs SET started_date = substr(started_at, 1, 10) WHERE started_date IS NULL"
+        )
+        conn.commit()
+        print(f"[DB Migration] Added started_date to account_activity_logs ({cursor.rowcount} rows backfilled)")
+    conn.executescript(ACTIVITY_LOG_DATE_INDEXES_SQL)
+
+
+def _ensure_account_latest_scan(conn: sqlite3.Connection):
+    """Backfill account_latest_scan from scan_snapshots when the read model is new."""
+    if conn.execute("SELECT 1 FROM account_latest_scan LIMIT 1").fetchone():
+        return
+    if not conn.execute("SELECT 1 FROM scan_snapshots LIMIT 1").fetchone():
+        return
+    for scope, key_col, key_expr, key_filter in (
+        ("game", "game_id", "s.game_id", "game_id != ''"),
+        ("emu", "emulator_id", "CAST(s.emulator_id AS TEXT)", "emulator_id IS NOT NULL"),
+    ):
+        latest = f"""s.id IN (
+            SELECT id FROM (
+                SELECT id, ROW_NUMBER() OVER (
+                    PARTITION BY {key_col} ORDER BY created_at DESC, id DESC
+                ) AS rn
+                FROM scan_snapshots WHERE {key_filter}
+            ) WHERE rn = 1
+        )"""
+        conn.execute(_latest_scan_upsert_sql(key_expr, latest), (scope,))
+    conn.commit()
+    print("[DB Migration] Backfilled account_latest_scan from scan_snapshots")
+
+
 # Database class
 # ──────────────────────────────────────────────
 
@@ -489,6 +752,7 @@ class Database:
         os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
         conn = sqlite3.connect(self.db_path)
         conn.execute("PRAGMA foreign_keys = ON")
+        conn.execute("PRAGMA journal_mode = WAL")  # persistent; lets pooled readers run alongside the writer
 
         # Create tables (IF NOT EXISTS is safe)
         conn.executescript(CREATE_TABLES_SQL)
@@ -497,6 +761,14 @@ class Database:
         _migrate_v1_to_v2(conn)
         _migrate_v2_to_v3(conn)
         _ensure_debug_logs_resolve_columns(conn)
+        _ensure_activity_log_started_date(conn)
+        _ensure_account_latest_scan(conn)
+
+        # Repair today's Task page rows (maintained incrementally while the app runs)
+        today = {"date": datetime.now().strftime("%Y-%m-%d"), "account_id": None, "activity_id": None}
+        conn.execute(TASK_DAILY_STATE_DELETE_SQL, today)
+        conn.execute(TASK_DAILY_STATE_REBUILD_SQL, today)
+        conn.commit()
 
         # Add required_runs column if missing (KPI support)
         cols = [row[1] for row in conn.execute("PRAGMA table_info(task_template_items)").fetchall()]
@@ -509,8 +781,13 @@ class Database:
         self._initialized = True
         print(f"[DB] Initialized at {self.db_path}")
 
-    def _get_conn(self):
-        return aiosqlite.connect(self.db_path)
+    def _get_conn(self, foreign_keys: bool = False):
+        """Shared writer connection (serialized); see backend.storage.db_pool."""
+        return db_pool.writer(self.db_path, foreign_keys)
+
+    def _read_conn(self):
+        """Pooled read-only connection."""
+        return db_pool.reader(self.db_path)
 
     # ──────────────────────────────────────────
     # Emulators
@@ -525,8 +802,7 @@ class Database:
         status: str = "ONLINE",
     ) -> int:
         """Insert or update an emulator. Returns emulator id."""
-        async with self._get_conn() as db:
-            await db.execute("PRAGMA foreign_keys = ON")
+        async with self._get_conn(foreign_keys=True) as db:
             await db.execute(
                 """INSERT INTO emulators (emu_index, serial, name, resolution, status, last_seen_at)
                    VALUES (?, ?, ?, ?, ?, ?)
@@ -557,7 +833,7 @@ class Database:
         self, emu_index: int | None = None, serial: str | None = None
     ) -> int | None:
         """Get emulator DB id by index or serial."""
-        async with self._get_conn() as db:
+        async with self._read_conn() as db:
             if emu_index is not None:
                 cursor = await db.execute(
                     "SELECT id FROM emulators WHERE emu_index = ?", (emu_index,)
@@ -573,7 +849,7 @@ class Database:
 
     async def get_all_emulators(self) -> list[dict]:
         """Get all registered emulators."""
-        async with self._get_conn() as db:
+        async with self._read_conn() as db:
             db.row_factory = aiosqlite.Row
             cursor = await db.execute("SELECT * FROM emulators ORDER BY emu_index")
             return [dict(row) for row in await cursor.fetchall()]
@@ -607,8 +883,7 @@ class Database:
         # Ensure emulator exists
         emu_id = await self.upsert_emulator(emulator_index, serial, emulator_name)
 
-        async with self._get_conn() as db:
-            await db.execute("PRAGMA foreign_keys = ON")
+        async with self._get_conn(foreign_keys=True) as db:
 
             # Insert snapshot
             cursor = await db.execute(
@@ -635,7 +910,7 @@ class Database:
 
             # Insert resources
             resources = parsed_data.get("resources", {})
-            for res_type in ("gold", "wood", "ore", "mana"):
+            for res_type in SCAN_RESOURCE_TYPES:
                 res_data = resources.get(res_type, {})
                 if isinstance(res_data, dict):
                     bag = res_data.get("bag", 0) or 0
@@ -659,6 +934,11 @@ class Database:
                         (snap_id, res_type, bag, total, bag_raw, total_raw),
                     )
 
+            # Latest-scan read model, in the same transaction
+            await db.execute(_LATEST_SCAN_BY_EMU_SQL, ("emu", snap_id))
+            if game_id:
+                await db.execute(_LATEST_SCAN_BY_GAME_SQL, ("game", snap_id))
+
             await db.commit()
             return snap_id
 
@@ -668,7 +948,7 @@ class Database:
         """Get latest scan data for a specific emulator.
         Returns data in a format compatible with the old emulator_data table.
         """
-        async with self._get_conn() as db:
+        async with self._read_conn() as db:
             db.row_factory = aiosqlite.Row
 
             if serial:
@@ -719,7 +999,7 @@ class Database:
 
     async def get_all_emulator_data(self) -> list[dict]:
         """Get latest scan data for ALL emulators (one row per emulator)."""
-        async with self._get_conn() as db:
+        async with self._read_conn() as db:
             db.row_factory = aiosqlite.Row
             cursor = await db.execute(
                 """SELECT s.*, e.emu_index as emulator_index, e.serial, e.name as emulator_name
@@ -756,7 +1036,7 @@ class Database:
         self, emulator_index: int, limit: int = 20
     ) -> list[dict]:
         """Get scan history for a specific emulator."""
-        async with self._get_conn() as db:
+        async with self._read_conn() as db:
             db.row_factory = aiosqlite.Row
             cursor = await db.execute(
                 """SELECT s.*, e.emu_index as emulator_index, e.serial, e.name as emulator_name
@@ -796,7 +1076,7 @@ class Database:
             "delta": {...computed deltas}
         }
         """
-        async with self._get_conn() as db:
+        async with self._read_conn() as db:
             db.row_factory = aiosqlite.Row
 
             # 1. Get the LATEST scan for this game_id
@@ -930,7 +1210,7 @@ class Database:
         self, limit: int = 50, serial: str | None = None
     ) -> list[dict]:
         """Get scan snapshot history (replaces old scan_results query)."""
-        async with self._get_conn() as db:
+        async with self._read_conn() as db:
             db.row_factory = aiosqlite.Row
             if serial:
                 cursor = await db.execute(
@@ -984,7 +1264,7 @@ class Database:
 
     async def get_task_logs(self, limit=100) -> list[dict]:
         """Get task execution history."""
-        async with self._get_conn() as db:
+        async with self._read_conn() as db:
             db.row_factory = aiosqlite.Row
             cursor = await db.execute(
                 """SELECT t.*, e.serial, e.name as emulator_name
@@ -1104,7 +1384,7 @@ class Database:
         self, emulator_index: int | None = None, limit: int = 50
     ) -> list[dict]:
         """Get macro execution history."""
-        async with self._get_conn() as db:
+        async with self._read_conn() as db:
             db.row_factory = aiosqlite.Row
             if emulator_index is not None:
                 cursor = await db.execute(
@@ -1273,7 +1553,7 @@ class Database:
     async def get_task_history(self, limit: int = 200) -> list[dict]:
         """Get unified task execution history from task_runs + scan_snapshots."""
         results = list(await self.get_task_runs(limit=limit))
-        async with self._get_conn() as db:
+        async with self._read_conn() as db:
             db.row_factory = aiosqlite.Row
 
             # Query scan_snapshots (full scans not routed through task_queue)
@@ -1328,123 +1608,24 @@ class Database:
             results.sort(key=lambda x: x.get("started_at", "") or "", reverse=True)
             return results[:limit]
 
-    async def rebuild_task_daily_state(self, target_date: str) -> int:
-        """Rebuild task_daily_state read model for a specific YYYY-MM-DD date."""
-        async with self._get_conn() as db:
-            db.row_factory = aiosqlite.Row
-
-            # Full rebuild for the requested date to avoid stale rows.
-            await db.execute("DELETE FROM task_daily_state WHERE date = ?", (target_date,))
-
-            # Build daily account x activity state from immutable activity logs.
-            cursor = await db.execute(
-                """
-                WITH daily_logs AS (
-                    SELECT
-                        aal.account_id,
-                        aal.game_id,
-                        aal.group_id,
-                        aal.emulator_id,
-                        aal.activity_id,
-                        aal.activity_name,
-                        aal.status,
-                        aal.started_at,
-                        aal.duration_ms,
-                        aal.error_message,
-                        ROW_NUMBER() OVER (
-                            PARTITION BY aal.account_id, aal.activity_id
-                            ORDER BY aal.started_at DESC, aal.id DESC
-                        ) AS rn
-                    FROM account_activity_logs aal
-                    WHERE date(aal.started_at) = ?
-                ),
-                latest AS (
-                    SELECT
-                        account_id,
-                        game_id,
-                        group_id,
-                        emulator_id,
-                        activity_id,
-                        activity_name,
-                        status,
-                        started_at AS last_run,
-                        error_message
-                    FROM daily_logs
-                    WHERE rn = 1
-                ),
-                agg AS (
-                    SELECT
-                        account_id,
-                        activity_id,
-                        COUNT(*) AS runs_today,
-                        COALESCE(SUM(duration_ms), 0) AS total_duration_ms
-                    FROM daily_logs
-                    GROUP BY account_id, activity_id
-                )
-                SELECT
-                    ? AS date,
-                    l.account_id,
-                    l.game_id,
-                    l.group_id,
-                    l.emulator_id,
-                    COALESCE(e.name, '') AS emulator_name,
-                    l.activity_id,
-                    l.activity_name,
-                    l.status,
-                    l.last_run,
-                    a.runs_today,
-                    a.total_duration_ms,
-                    COALESCE(l.error_message, '') AS last_error
-                FROM latest l
-                JOIN agg a
-                  ON a.account_id = l.account_id
-                 AND a.activity_id = l.activity_id
-                LEFT JOIN emulators e ON l.emulator_id = e.emu_index
-                """,
-                (target_date, target_date),
-            )
-            rows = [dict(r) for r in await cursor.fetchall()]
-
-            for row in rows:
-                await db.execute(
-                    """
-                    INSERT INTO task_daily_state (
-                        date, account_id, game_id, group_id,
-                        emulator_id, emulator_name,
-                        activity_id, activity_name, status,
-                        last_run, runs_today, total_duration_ms, last_error
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ON CONFLICT(date, account_id, activity_id) DO UPDATE SET
-                        game_id = excluded.game_id,
-                        group_id = excluded.group_id,
-                        emulator_id = excluded.emulator_id,
-                        emulator_name = excluded.emulator_name,
-                        activity_name = excluded.activity_name,
-                        status = excluded.status,
-                        last_run = excluded.last_run,
-                        runs_today = excluded.runs_today,
-                        total_duration_ms = excluded.total_duration_ms,
-                        last_error = excluded.last_error
-                    """,
-                    (
-                        row["date"],
-                        row["account_id"],
-                        row.get("game_id", ""),
-                        row.get("group_id"),
-                        row.get("emulator_id"),
-                        row.get("emulator_name", ""),
-                        row["activity_id"],
-                        row.get("activity_name", row["activity_id"]),
-                        row.get("status", "PENDING"),
-                        row.get("last_run"),
-                        row.get("runs_today", 0),
-                        row.get("total_duration_ms", 0),
-                        row.get("last_error", ""),
-                    ),
-                )
+    async def rebuild_task_daily_state(
+        self,
+        target_date: str,
+        account_id: int | None = None,
+        activity_id: str | None = None,
+    ) -> int:
+        """Recompute task_daily_state for a YYYY-MM-DD date from account_activity_logs.
 
+        Rows are maintained incrementally as activities are logged (execution_log, manual
+        marks); this is the repair tool, and the manual UNDO path scoped to one
+        account / activity. Returns the number of rows written.
+        """
+        params = {"date": target_date, "account_id": account_id, "activity_id": activity_id}
+        async with self._get_conn() as db:
+            await db.execute(TASK_DAILY_STATE_DELETE_SQL, params)
+            cursor = await db.execute(TASK_DAILY_STATE_REBUILD_SQL, params)
             await db.commit()
-            return len(rows)
+            return cursor.rowcount
 
     async def rebuild_task_daily_state_for_today(self) -> int:
         """Convenience utility to rebuild task_daily_state for today's date."""
@@ -1455,7 +1636,7 @@ class Database:
         self, emulator_index: int | None = None, limit: int = 50
     ) -> list[dict]:
         """Get task execution history."""
-        async with self._get_conn() as db:
+        async with self._read_conn() as db:
             db.row_factory = aiosqlite.Row
             schema_cursor = await db.execute("PRAGMA table_info(task_runs)")
             cols = {row[1] for row in await schema_cursor.fetchall()}
@@ -1718,173 +1899,38 @@ class Database:
         acc["last_scan_at"] = acc.get("last_scan_at", "")
 
     async def get_all_accounts(self) -> list[dict]:
-        """Get all accounts with emulator info + latest scan data + resources."""
-        async with self._get_conn() as db:
+        """Get all accounts with emulator info + latest scan data + resources (one query)."""
+        async with self._read_conn() as db:
             db.row_factory = aiosqlite.Row
-
             cursor = await db.execute(
-                """SELECT
-                       a.id as account_id, a.game_id,
-                       a.lord_name as acc_lord_name,
-                       a.login_method, a.email, a.provider, a.alliance, a.note,
-                       a.is_active,
-                       a.created_at as account_created_at, a.updated_at,
-                       e.id as emulator_db_id, e.emu_index, e.serial, e.name as emu_name,
-                       e.status as emu_status, e.last_seen_at
-                   FROM accounts a
-                   LEFT JOIN emulators e ON a.emulator_id = e.id
+                f"""{_ACCOUNT_SELECT_SQL}
                    ORDER BY a.is_active DESC, e.emu_index, a.game_id"""
             )
-            accounts = [dict(row) for row in await cursor.fetchall()]
-
-            for acc in accounts:
-                game_id = acc["game_id"]
-
-                # Try to find latest scan by game_id first, fallback to emulator_id
-                scan_row = None
-                if game_id:
-                    scan_cur = await db.execute(
-                        """SELECT * FROM scan_snapshots
-                           WHERE game_id = ?
-                           ORDER BY created_at DESC LIMIT 1""",
-                        (game_id,),
-                    )
-                    scan_row = await scan_cur.fetchone()
-
-                if not scan_row and acc.get("emulator_db_id"):
-                    scan_cur = await db.execute(
-                        """SELECT * FROM scan_snapshots
-                           WHERE emulator_id = ?
-                           ORDER BY created_at DESC LIMIT 1""",
-                        (acc["emulator_db_id"],),
-                    )
-                    scan_row = await scan_cur.fetchone()
-
-                if scan_row:
-                    scan = dict(scan_row)
-                    acc["lord_name"] = scan.get("lord_name", "") or acc.get(
-                        "acc_lord_name", ""
-                    )
-                    acc["power"] = scan.get("power", 0)
-                    acc["hall_level"] = scan.get("hall_level", 0)
-                    acc["market_level"] = scan.get("market_level", 0)
-                    acc["pet_token"] = scan.get("pet_token", 0)
-                    acc["scan_status"] = scan.get("scan_status", "")
-                    acc["last_scan_at"] = scan.get("created_at", "")
-                    acc["scan_id"] = scan["id"]
-
-                    res_cur = await db.execute(
-                        "SELECT * FROM scan_resources WHERE snapshot_id = ?",
-                        (scan["id"],),
-                    )
-                    for res in await res_cur.fetchall():
-                        rd = dict(res)
-                        rtype = rd["resource_type"]
-                        acc[rtype] = rd.get("bag_value", 0)
-                        acc[f"{rtype}_total"] = rd.get("total_value", 0)
-                else:
-                    acc["lord_name"] = acc.get("acc_lord_name", "")
-                    acc["power"] = 0
-                    acc["hall_level"] = 0
-                    acc["market_level"] = 0
-                    acc["pet_token"] = 0
-                    acc["last_scan_at"] = ""
-
-                # Clean up internal key
-                acc.pop("acc_lord_name", None)
-
-            return accounts
+            return [_attach_latest_scan(dict(row)) for row in await cursor.fetchall()]
 
     async def get_account_by_game_id(self, game_id: str) -> dict | None:
         """Get single account by game_id with full scan data."""
-        async with self._get_conn() as db:
+        async with self._read_conn() as db:
             db.row_factory = aiosqlite.Row
             cursor = await db.execute(
-                """SELECT
-                       a.id as account_id, a.game_id,
-                       a.lord_name as acc_lord_name,
-                       a.login_method, a.email, a.provider, a.alliance, a.note,
-                       a.is_active,
-                       a.created_at as account_created_at, a.updated_at,
-                       e.id as emulator_db_id, e.emu_index, e.serial, e.name as emu_name,
-                       e.status as emu_status, e.last_seen_at
-                   FROM accounts a
-                   LEFT JOIN emulators e ON a.emulator_id = e.id
+                f"""{_ACCOUNT_SELECT_SQL}
                    WHERE a.game_id = ?""",
                 (game_id,),
             )
             row = await cursor.fetchone()
-            if not row:
-                return None
-            acc = dict(row)
-
-            # Attach latest scan by game_id
-            scan_cur = await db.execute(
-                """SELECT * FROM scan_snapshots
-                   WHERE game_id = ?
-                   ORDER BY created_at DESC LIMIT 1""",
-                (game_id,),
-            )
-            scan_row = await scan_cur.fetchone()
-
-            if not scan_row and acc.get("emulator_db_id"):
-                scan_cur = await db.execute(
-                    """SELECT * FROM scan_snapshots
-                       WHERE emulator_id = ?
-                       ORDER BY created_at DESC LIMIT 1""",
-                    (acc["emulator_db_id"],),
-                )
-                scan_row = await scan_cur.fetchone()
-
-            if scan_row:
-                scan = dict(scan_row)
-                acc["lord_name"] = scan.get("lord_name", "") or acc.get(
-                    "acc_lord_name", ""
-                )
-                acc["power"] = scan.get("power", 0)
-                acc["hall_level"] = scan.get("hall_level", 0)
-                acc["market_level"] = scan.get("market_level", 0)
-                acc["pet_token"] = scan.get("pet_token", 0)
-                acc["last_scan_at"] = scan.get("created_at", "")
-                acc["scan_id"] = scan["id"]
-                res_cur = await db.execute(
-                    "SELECT * FROM scan_resources WHERE snapshot_id = ?",
-                    (scan["id"],),
-                )
-                for res in await res_cur.fetchall():
-                    rd = dict(res)
-                    rtype = rd["resource_type"]
-                    acc[rtype] = rd.get("bag_value", 0)
-                    acc[f"{rtype}_total"] = rd.get("total_value", 0)
-            else:
-                acc["lord_name"] = acc.get("acc_lord_name", "")
-                acc["power"] = 0
-                acc["hall_level"] = 0
-                acc["market_level"] = 0
-                acc["pet_token"] = 0
-                acc["last_scan_at"] = ""
-
-            acc.pop("acc_lord_name", None)
-            return acc
+            return _attach_latest_scan(dict(row)) if row else None
 
     async def get_account_by_emu_index(self, emu_index: int) -> list[dict]:
         """Get all accounts linked to an emulator index."""
-        async with self._get_conn() as db:
+        async with self._read_conn() as db:
             db.row_factory = aiosqlite.Row
             cursor = await db.execute(
-                """SELECT a.game_id FROM accounts a
-                   JOIN emulators e ON a.emulator_id = e.id
+                f"""{_ACCOUNT_SELECT_SQL}
                    WHERE e.emu_index = ?
                    ORDER BY a.is_active DESC""",
                 (emu_index,),
             )
-            rows = await cursor.fetchall()
-            results = []
-            for row in rows:
-                acc = await self.get_account_by_game_id(row["game_id"])
-                if acc:
-                    results.append(acc)
-            return results
+            return [_attach_latest_scan(dict(row)) for row in await cursor.fetchall()]
 
     async def update_account(self, game_id: str, **fields) -> bool:
         """Update specific account fields by game_id."""
@@ -1917,7 +1963,7 @@ class Database:
 
     async def get_pending_accounts(self) -> list[dict]:
         """Get all pending accounts."""
-        async with self._get_conn() as db:
+        async with self._read_conn() as db:
             db.row_factory = aiosqlite.Row
             cursor = await db.execute(
                 """SELECT p.*, e.emu_index, e.name as emu_name
@@ -1938,7 +1984,7 @@ class Database:
         note: str = "",
     ) -> int:
         """Confirm a pending account → create it in accounts table. Returns account id."""
-        async with self._get_conn() as db:
+        async with self._read_conn() as db:
             db.row_factory = aiosqlite.Row
             cursor = await db.execute(
                 "SELECT * FROM pending_accounts WHERE id = ? AND status = 'pending'",
@@ -1988,7 +2034,7 @@ class Database:
 
     async def get_all_schedules(self) -> list[dict]:
         """Get all schedules ordered by created_at."""
-        async with self._get_conn() as db:
+        async with self._read_conn() as db:
             db.row_factory = aiosqlite.Row
             cursor = await db.execute(
                 "SELECT * FROM schedules ORDER BY is_enabled DESC, created_at DESC"
@@ -1997,7 +2043,7 @@ class Database:
 
     async def get_schedule(self, schedule_id: int) -> dict | None:
         """Get single schedule by id."""
-        async with self._get_conn() as db:
+        async with self._read_conn() as db:
             db.row_factory = aiosqlite.Row
             cursor = await db.execute(
                 "SELECT * FROM schedules WHERE id = ?", (schedule_id,)
@@ -2093,7 +2139,7 @@ class Database:
 
     async def get_all_groups(self) -> list[dict]:
         """Get all account groups."""
-        async with self._get_conn() as db:
+        async with self._read_conn() as db:
             db.row_factory = aiosqlite.Row
             cursor = await db.execute(
                 "SELECT * FROM account_groups ORDER BY created_at DESC"
@@ -2176,7 +2222,7 @@ class Database:
         self, serial: str = None, limit: int = 100, status: str = "active"
     ) -> list[dict]:
         """Get debug log entries, optionally filtered by serial and resolve state."""
-        async with self._get_conn() as db:
+        async with self._read_conn() as db:
             db.row_factory = aiosqlite.Row
             where_parts = []
             params: list = []
@@ -0,0 +1,193 @@
+"""
+DB Pool — shared aiosqlite connections (one writer, N readers) in WAL mode.
+
+Database, execution_log, kpi_calculator and the API handlers used to open a fresh
+aiosqlite.connect (a new thread plus a file open) for every call, in the default
+rollback-journal mode where readers and the writer block each other.
+
+- The pool keeps one writer connection (serialized by an asyncio.Lock) and N reader
+  connections (query_only) open for the life of the app.
+- WAL journal plus synchronous=NORMAL, a larger page cache and mmap; readers never wait
+  for the writer.
+- Each connection keeps a statement cache (cached_statements), so repeated SQL is
+  prepared once per connection instead of once per call.
+- Without an open pool (scripts, tests) writer() / reader() fall back to a one-off
+  connection with the same pragmas, so callers don't care which mode they run in.
+
+Usage:
+    await open_pool(config.db_path)      # app startup
+    async with writer() as db:
+        await db.execute("INSERT ...")
+        await db.commit()
+    async with reader() as db:
+        rows = await (await db.execute("SELECT ...")).fetchall()
+    await close_pool()                   # app shutdown
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional
+
+import aiosqlite
+
+from backend.config import config
+
+# ── Module Constants ──────────────────────────────────────────────
+
+POOL_READERS = 4
+STATEMENT_CACHE_SIZE = 256
+
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous = NORMAL",      # WAL: durable at checkpoints, no fsync per commit
+    "PRAGMA cache_size = -16000",       # 16 MB page cache per connection
+    "PRAGMA mmap_size = 134217728",     # 128 MB memory-mapped reads
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA busy_timeout = 5000",
+)
+
+
+async def connect(db_path: str, readonly: bool = False) -> aiosqlite.Connection:
+    """Open a connection with the pool's pragmas (WAL is set by writers; it persists in the file)."""
+    db = await aiosqlite.connect(db_path, cached_statements=STATEMENT_CACHE_SIZE)
+    if not readonly:
+        await db.execute("PRAGMA journal_mode = WAL")
+    for pragma in CONNECTION_PRAGMAS:
+        await db.execute(pragma)
+    if readonly:
+        await db.execute("PRAGMA query_only = ON")
+    return db
+
+
+async def _reset(db: aiosqlite.Connection):
+    """Return a borrowed connection to its pooled state."""
+    if db.in_transaction:
+        await db.rollback()
+    db.row_factory = None
+
+
+class ConnectionPool:
+    """One writer and `readers` read-only connections to a single database file."""
+
+    def __init__(self, db_path: str, readers: int = POOL_READERS):
+        self.db_path = db_path
+        self.readers = max(1, readers)
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._writer: Optional[aiosqlite.Connection] = None
+        self._write_lock = asyncio.Lock()
+        self._idle: "asyncio.Queue[aiosqlite.Connection]" = asyncio.Queue()
+        self._all: List[aiosqlite.Connection] = []
+        self.writes = 0
+        self.reads = 0
+
+    async def open(self):
+        self.loop = asyncio.get_running_loop()
+        self._writer = await connect(self.db_path)
+        self._all.append(self._writer)
+        for _ in range(self.readers):
+            db = await connect(self.db_path, readonly=True)
+            self._all.append(db)
+            self._idle.put_nowait(db)
+
+    async def close(self):
+        conns, self._all = self._all, []
+        self._writer = None
+        for db in conns:
+            await db.close()
+
+    @asynccontextmanager
+    async def writer(self, foreign_keys: bool = False):
+        async with self._write_lock:
+            db = self._writer
+            if foreign_keys:
+                await db.execute("PRAGMA foreign_keys = ON")
+            try:
+                self.writes += 1
+                yield db
+            finally:
+                await _reset(db)
+                if foreign_keys:
+                    await db.execute("PRAGMA foreign_keys = OFF")
+
+    @asynccontextmanager
+    async def reader(self):
+        db = await self._idle.get()
+        try:
+            self.reads += 1
+            yield db
+        finally:
+            await _reset(db)
+            self._idle.put_nowait(db)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "db_path": self.db_path,
+            "readers": self.readers,
+            "idle_readers": self._idle.qsize(),
+            "writer_busy": self._write_lock.locked(),
+            "writes": self.writes,
+            "reads": self.reads,
+        }
+
+
+_pool: Optional[ConnectionPool] = None
+
+
+async def open_pool(db_path: Optional[str] = None, readers: int = POOL_READERS) -> ConnectionPool:
+    """Open the shared pool on the running event loop (replaces a previously opened one)."""
+    global _pool
+    await close_pool()
+    pool = ConnectionPool(db_path or config.db_path, readers)
+    await pool.open()
+    _pool = pool
+    return pool
+
+
+async def close_pool():
+    global _pool
+    pool, _pool = _pool, None
+    if pool is not None:
+        await pool.close()
+
+
+def get_pool(db_path: Optional[str] = None) -> Optional[ConnectionPool]:
+    """The open pool for db_path on this event loop, or None."""
+    pool = _pool
+    if pool is None or pool.db_path != (db_path or config.db_path):
+        return None
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+    return pool if pool.loop is loop else None
+
+
+@asynccontextmanager
+async def writer(db_path: Optional[str] = None, foreign_keys: bool = False):
+    """The pooled writer connection, or a one-off connection when no pool is open."""
+    pool = get_pool(db_path)
+    if pool is not None:
+        async with pool.writer(foreign_keys) as db:
+            yield db
+        return
+    db = await connect(db_path or config.db_path)
+    try:
+        if foreign_keys:
+            await db.execute("PRAGMA foreign_keys = ON")
+        yield db
+    finally:
+        await db.close()
+
+
+@asynccontextmanager
+async def reader(db_path: Optional[str] = None):
+    """A pooled read-only connection, or a one-off connection when no pool is open."""
+    pool = get_pool(db_path)
+    if pool is not None:
+        async with pool.reader() as db:
+            yield db
+        return
+    db = await connect(db_path or config.db_path, readonly=True)
+    try:
+        yield db
+    finally:
+        await db.close()